@@ -0,0 +1,94 @@
+"""bench_channel_lookup
+
+チャンネル名からのチャンネルの取得 (`CachedChannels.get_channel_from_id_or_name(channel_name=...)`) で、
+全てのチャンネルの走査と、チャンネル名の索引の参照時間を比較します。
+
+このベンチマークにおけるポイント:
+    1. 指定数のサーバーに、指定数ずつチャンネルを持つ疑似的なBotを生成する (Discordには接続しない)
+    2. 索引を作る前 (走査) と作った後 (索引) で、最後のサーバーのチャンネル名の取得を指定回数だけ繰り返す
+    3. 走査は全てのチャンネル数 (サーバー数とチャンネル数の積) に比例し、索引はチャンネル数によらず一定になる
+        ```bash
+        $ python benchmarks/bench_channel_lookup.py --guilds 1 10 100 --channels 200
+        ```
+"""
+
+import asyncio
+import logging
+import timeit
+from argparse import ArgumentParser
+from collections.abc import Iterator
+from functools import partial
+from types import SimpleNamespace
+from typing import Any, cast
+
+from concord.infrastructure.discord.cached_channels import CachedChannels
+
+
+class FakeBot:
+    def __init__(self, guilds: int, channels: int) -> None:
+        self.guilds = [
+            SimpleNamespace(
+                channels=[
+                    SimpleNamespace(id=guild * channels + index, name=f"g{guild}-c{index}")
+                    for index in range(channels)
+                ],
+            )
+            for guild in range(guilds)
+        ]
+
+    def get_all_channels(self) -> Iterator[SimpleNamespace]:
+        for guild in self.guilds:
+            yield from guild.channels
+
+
+class FakeBotConfig:
+    def get_channel_to_id_mapping(self) -> dict[str, int]:
+        return {}
+
+    def get_id_to_channel_mapping(self) -> dict[int, str]:
+        return {}
+
+    def get_default_channel_id(self, name: str) -> int:
+        return 1 if name == "dev_channel" else 2
+
+
+def make_cached_channels(guilds: int, channels: int) -> CachedChannels:
+    logger = logging.getLogger("bench_channel_lookup")
+    logger.addHandler(logging.NullHandler())
+    return CachedChannels(
+        bot=cast("Any", FakeBot(guilds, channels)),
+        config=cast("Any", SimpleNamespace(bot=FakeBotConfig())),
+        logger=logger,
+    )
+
+
+def build_index(cached_channels: CachedChannels) -> None:
+    asyncio.run(cached_channels.rebuild_channel_index())
+
+
+def main() -> None:
+    parser = ArgumentParser()
+    parser.add_argument("--guilds", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--channels", type=int, default=200)
+    parser.add_argument("--iterations", type=int, default=1_000)
+    args = parser.parse_args()
+
+    print(f"{'guilds':>7} {'channels':>9} {'scan[us]':>10} {'index[us]':>10} {'build[ms]':>10} {'speedup':>8}")  # noqa: T201
+    for guilds in args.guilds:
+        cached_channels = make_cached_channels(guilds, args.channels)
+        name = f"g{guilds - 1}-c{args.channels - 1}"
+
+        def lookup(cached_channels: CachedChannels = cached_channels, name: str = name) -> None:
+            cached_channels.get_channel_from_id_or_name(channel_name=name)
+
+        scan_us = timeit.timeit(lookup, number=args.iterations) / args.iterations * 1_000_000
+        build_ms = timeit.timeit(partial(build_index, cached_channels), number=1) * 1000
+        index_us = timeit.timeit(lookup, number=args.iterations) / args.iterations * 1_000_000
+        print(  # noqa: T201
+            f"{guilds:>7} {guilds * args.channels:>9} {scan_us:>10.2f} {index_us:>10.3f} {build_ms:>10.2f} "
+            f"{scan_us / index_us:>7.0f}x",
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""bench_config
+
+設定ファイルのアクセサ (`ConfigBOT` のプロパティ) とスナップショット (`ConfigArgs.snapshot`) の参照時間を比較します。
+
+このベンチマークにおけるポイント:
+    1. 一時ディレクトリに、チャンネルと除外するツールを指定数だけ持つ設定ファイルを生成する
+    2. `name`, `discord_token`, `tool_exclusion`, チャンネルIDの参照を、それぞれ指定回数だけ繰り返す
+    3. アクセサは参照のたびに `ConfigParser` の検索と値の補間 (`tool_exclusion` は正規表現での分割とログ出力) を行う
+    4. スナップショットは最初の1回だけ解析し、以降は属性の参照だけになる
+        ```bash
+        $ python benchmarks/bench_config.py --iterations 100000 --channels 50
+        ```
+"""
+
+import logging
+import tempfile
+import timeit
+from argparse import ArgumentParser
+from pathlib import Path
+
+from concord.infrastructure.config.from_files import ConfigArgs
+from concord.model.config_snapshot import ConfigSnapshot
+
+CONFIG_TEMPLATE = """[Discord.Bot]
+name = bench_bot
+description = A benchmark bot
+
+[Discord.API]
+token = bench_token
+
+[Discord.DefaultChannel]
+dev_channel = 1
+log_channel = 2
+
+[Discord.Channel]
+{channels}
+
+[Discord.Tool]
+exclusions = [{exclusions}]
+"""
+
+
+def generate_config(config_dir: Path, channels: int, exclusions: int) -> None:
+    (config_dir / "bench_bot.ini").write_text(
+        CONFIG_TEMPLATE.format(
+            channels="\n".join(f"channel{index} = {1000 + index}" for index in range(channels)),
+            exclusions=", ".join(f"Tool{index}*" for index in range(exclusions)),
+        ),
+        encoding="utf-8",
+    )
+
+
+def build_snapshot(config_dir: Path, logger: logging.Logger) -> ConfigSnapshot:
+    return ConfigArgs(bot_name="bench_bot", logger=logger, config_dir=config_dir).snapshot
+
+
+def main() -> None:
+    parser = ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=100_000)
+    parser.add_argument("--channels", type=int, default=50)
+    parser.add_argument("--exclusions", type=int, default=10)
+    args = parser.parse_args()
+
+    logger = logging.getLogger("bench_config")
+    logger.setLevel(logging.INFO)
+    logger.addHandler(logging.NullHandler())
+    with tempfile.TemporaryDirectory() as tmp:
+        generate_config(Path(tmp), args.channels, args.exclusions)
+        config = ConfigArgs(bot_name="bench_bot", logger=logger, config_dir=Path(tmp))
+        build = timeit.timeit(lambda: build_snapshot(Path(tmp), logger), number=10) / 10
+        snapshot = config.snapshot
+        cases = {
+            "name": (lambda: config.bot.name, lambda: snapshot.bot.name),
+            "discord_token": (lambda: config.bot.discord_token, lambda: snapshot.bot.discord_token),
+            "tool_exclusion": (lambda: config.bot.tool_exclusion, lambda: snapshot.bot.tool.exclusions),
+            "channel id": (
+                lambda: config.bot.get_channel_to_id_mapping()["channel0"],
+                lambda: snapshot.bot.channels["channel0"],
+            ),
+        }
+
+        print(f"snapshot build: {build * 1000:.3f} ms")  # noqa: T201
+        print(f"{'value':>15} {'accessor[us]':>13} {'snapshot[us]':>13} {'speedup':>8}")  # noqa: T201
+        for name, (accessor, attribute) in cases.items():
+            accessor_us = timeit.timeit(accessor, number=args.iterations) / args.iterations * 1_000_000
+            snapshot_us = timeit.timeit(attribute, number=args.iterations) / args.iterations * 1_000_000
+            print(f"{name:>15} {accessor_us:>13.3f} {snapshot_us:>13.3f} {accessor_us / snapshot_us:>7.0f}x")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,345 @@
+"""bench_gateway_profile
+
+全てのインテントとキャッシュを有効にして接続した場合 (`Intents.all()`) と、
+読み込んだツールが必要とするものだけで接続した場合 (`[Discord.Gateway]` が `auto`) の、
+`on_ready` までの時間とメモリを比較します。
+
+このベンチマークにおけるポイント:
+    1. 一時ディレクトリに、プレフィックスコマンドだけを持つツールを生成する
+    2. ローカルに偽のゲートウェイ (REST APIとWebSocket) を立て、IDENTIFYのインテントに応じて
+       サーバー・メンバー・プレゼンスを送る (全メンバーの取得の要求にも応じる)
+    3. プロファイルごとにプロセスを起動し、`Agent` と同じ手順 (importしたツールの要件からプロファイルを決め、
+       接続前のBotに反映する) で接続して、`on_ready` までの秒数と常駐メモリ (RSS) の増加量を測る
+    4. Discordには接続しないため、Discordのトークンは不要
+        ```bash
+        $ python benchmarks/bench_gateway_profile.py --guilds 4 --members 25000
+        ```
+"""
+
+import asyncio
+import json
+import sys
+import tempfile
+import time
+from argparse import SUPPRESS, ArgumentParser
+from pathlib import Path
+from typing import Any
+
+import yarl
+from aiohttp import WSMsgType, web
+from discord import Intents
+from discord.ext.commands import Bot, Cog
+from discord.gateway import DiscordWebSocket
+from discord.http import Route
+
+from concord.infrastructure.discord.dynamic_import import import_classes_from_directory
+from concord.infrastructure.discord.gateway_profile import (
+    apply_gateway_profile,
+    resolve_gateway_profile,
+    tool_requirements,
+)
+from concord.infrastructure.discord.memory import current_rss_bytes
+from concord.model.gateway_profile import GatewaySettings
+from concord.model.startup import PreparedTools
+
+PROFILES = {
+    # 変更前の `Agent` と同じ (`Intents.all()` と、discord.pyの既定のキャッシュ)
+    "all": GatewaySettings(intents=("all",), member_cache=("all",), chunk_guilds_at_startup=True, max_messages=1000),
+    "auto": GatewaySettings(),
+}
+TOOL_TEMPLATE = """from discord.ext import commands
+
+
+class Tool{index}(commands.Cog):
+    def __init__(self, agent: object) -> None:
+        self.agent = agent
+
+    @commands.command(name="tool{index}")
+    async def run(self, ctx: commands.Context) -> None:
+        await ctx.send("tool{index}")
+"""
+BOT_ID = "1"
+APPLICATION_ID = "2"
+CHUNK_SIZE = 1000
+ONLINE_RATIO = 0.2
+
+
+def generate_tools(root: Path, tools: int) -> Path:
+    tool_root = root / "tools"
+    for index in range(tools):
+        tool_dir = tool_root / f"tool{index:03d}"
+        tool_dir.mkdir(parents=True)
+        (tool_dir / "__tool__.py").write_text(TOOL_TEMPLATE.format(index=index), encoding="utf-8")
+    return tool_root
+
+
+def _user(user_id: int | str) -> dict[str, Any]:
+    return {
+        "id": str(user_id),
+        "username": f"user{user_id}",
+        "discriminator": "0",
+        "avatar": None,
+        "global_name": None,
+    }
+
+
+def _member(user_id: int) -> dict[str, Any]:
+    return {
+        "user": _user(user_id),
+        "roles": [],
+        "joined_at": "2024-01-01T00:00:00+00:00",
+        "deaf": False,
+        "mute": False,
+        "flags": 0,
+    }
+
+
+def _presence(user_id: int) -> dict[str, Any]:
+    return {
+        "user": {"id": str(user_id)},
+        "status": "online",
+        "activities": [{"name": "benchmark", "type": 0}],
+        "client_status": {"desktop": "online"},
+    }
+
+
+def _json_response(data: dict[str, Any]) -> web.Response:
+    # discord.pyは `application/json` (charsetなし) の場合だけJSONとして読む
+    return web.Response(body=json.dumps(data).encode(), content_type="application/json")
+
+
+class FakeGateway:
+    """IDENTIFYのインテントに応じてイベントを送る、ゲートウェイとREST APIの最小限の偽物"""
+
+    def __init__(self, guilds: int, members: int) -> None:
+        self.guild_ids = [10_000 + index for index in range(guilds)]
+        self.members = members
+
+    def app(self) -> web.Application:
+        app = web.Application(middlewares=[self.ratelimit_headers])
+        app.router.add_get("/api/v10/users/@me", self.users_me)
+        app.router.add_get("/api/v10/oauth2/applications/@me", self.application)
+        app.router.add_get("/gateway", self.gateway)
+        return app
+
+    @web.middleware
+    async def ratelimit_headers(self, request: web.Request, handler: Any) -> web.StreamResponse:  # noqa: ANN401
+        # レート制限のヘッダーが無いと、discord.pyは制限の解除を待ち続ける
+        response = await handler(request)
+        response.headers.update(
+            {
+                "X-Ratelimit-Bucket": request.path,
+                "X-Ratelimit-Limit": "50",
+                "X-Ratelimit-Remaining": "49",
+                "X-Ratelimit-Reset-After": "0.001",
+            },
+        )
+        return response
+
+    async def users_me(self, _: web.Request) -> web.Response:
+        return _json_response({**_user(BOT_ID), "bot": True})
+
+    async def application(self, _: web.Request) -> web.Response:
+        return _json_response(
+            {
+                "id": APPLICATION_ID,
+                "name": "benchmark",
+                "description": "",
+                "icon": None,
+                "bot_public": False,
+                "bot_require_code_grant": False,
+                "verify_key": "",
+                "flags": 0,
+                "owner": _user(3),
+            },
+        )
+
+    def _user_ids(self, guild_id: int) -> range:
+        start = guild_id * 1_000_000
+        return range(start, start + self.members)
+
+    def _guild_create(self, guild_id: int, intents: Intents) -> dict[str, Any]:
+        members = [_member(int(BOT_ID))]
+        presences = []
+        if intents.presences:
+            # 大きなサーバーでは、オンラインのメンバーとそのプレゼンスだけが送られる
+            online = self._user_ids(guild_id)[: int(self.members * ONLINE_RATIO)]
+            members.extend(_member(user_id) for user_id in online)
+            presences = [_presence(user_id) for user_id in online]
+        return {
+            "id": str(guild_id),
+            "name": f"guild{guild_id}",
+            "owner_id": "3",
+            "member_count": self.members + 1,
+            "large": True,
+            "roles": [
+                {
+                    "id": str(guild_id),
+                    "name": "@everyone",
+                    "permissions": "0",
+                    "position": 0,
+                    "color": 0,
+                    "hoist": False,
+                    "managed": False,
+                    "mentionable": False,
+                },
+            ],
+            "channels": [
+                {"id": str(guild_id * 100 + index), "type": 0, "name": f"channel{index}", "position": index}
+                for index in range(20)
+            ],
+            "members": members,
+            "presences": presences,
+            "emojis": [],
+            "stickers": [],
+            "threads": [],
+            "voice_states": [],
+        }
+
+    async def gateway(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse(max_msg_size=0)
+        await ws.prepare(request)
+        sequence = 0
+        intents = Intents.none()
+
+        async def dispatch(event: str, data: dict[str, Any]) -> None:
+            nonlocal sequence
+            sequence += 1
+            await ws.send_str(json.dumps({"op": 0, "t": event, "s": sequence, "d": data}))
+
+        await ws.send_str(json.dumps({"op": 10, "d": {"heartbeat_interval": 41250}}))
+        async for message in ws:
+            if message.type != WSMsgType.TEXT:
+                break
+            payload = json.loads(message.data)
+            if payload["op"] == 1:
+                await ws.send_str(json.dumps({"op": 11}))
+            elif payload["op"] == 2:
+                intents = Intents._from_value(payload["d"]["intents"])  # noqa: SLF001
+                await dispatch(
+                    "READY",
+                    {
+                        "v": 10,
+                        "user": {**_user(BOT_ID), "bot": True},
+                        "guilds": [{"id": str(guild_id), "unavailable": True} for guild_id in self.guild_ids],
+                        "session_id": "benchmark",
+                        "resume_gateway_url": str(request.url),
+                        "application": {"id": APPLICATION_ID, "flags": 0},
+                    },
+                )
+                for guild_id in self.guild_ids:
+                    await dispatch("GUILD_CREATE", self._guild_create(guild_id, intents))
+            elif payload["op"] == 8:
+                await self._send_chunks(payload["d"], intents, dispatch)
+        return ws
+
+    async def _send_chunks(self, request: dict[str, Any], intents: Intents, dispatch: Any) -> None:  # noqa: ANN401
+        guild_id = int(request["guild_id"])
+        user_ids = self._user_ids(guild_id) if intents.members else range(0)
+        chunk_count = max(1, -(-len(user_ids) // CHUNK_SIZE))
+        for index in range(chunk_count):
+            chunk = user_ids[index * CHUNK_SIZE : (index + 1) * CHUNK_SIZE]
+            data: dict[str, Any] = {
+                "guild_id": str(guild_id),
+                "members": [_member(user_id) for user_id in chunk],
+                "chunk_index": index,
+                "chunk_count": chunk_count,
+                "nonce": request.get("nonce"),
+            }
+            if request.get("presences") and intents.presences:
+                data["presences"] = [_presence(user_id) for user_id in chunk[: int(len(chunk) * ONLINE_RATIO)]]
+            await dispatch("GUILD_MEMBERS_CHUNK", data)
+
+
+def measure_single(port: int, profile_name: str, tool_root: Path) -> dict[str, Any]:
+    """プロファイル1つで偽のゲートウェイに接続し、`on_ready` までを測る (子プロセスで実行される)"""
+    Route.BASE = f"http://127.0.0.1:{port}/api/v10"
+    DiscordWebSocket.DEFAULT_GATEWAY = yarl.URL(f"ws://127.0.0.1:{port}/gateway")
+
+    async def run() -> dict[str, Any]:
+        rss_before = current_rss_bytes()
+        started = time.perf_counter()
+        bot = Bot(intents=Intents.all(), command_prefix="/")
+        classes = import_classes_from_directory(tool_root.as_posix(), base_class=Cog)
+        profile = resolve_gateway_profile(PROFILES[profile_name], tool_requirements(PreparedTools(tuple(classes))))
+        apply_gateway_profile(bot, profile)
+        ready = asyncio.Event()
+
+        async def on_ready() -> None:
+            ready.set()
+
+        bot.add_listener(on_ready)
+        async with bot:
+            connecting = asyncio.create_task(bot.start("dummy"))
+            waiting = asyncio.create_task(ready.wait())
+            await asyncio.wait([connecting, waiting], return_when=asyncio.FIRST_COMPLETED)
+            if not waiting.done():
+                waiting.cancel()
+                connecting.result()
+            seconds = time.perf_counter() - started
+            result = {
+                "profile": profile_name,
+                "seconds": seconds,
+                "rss_bytes": current_rss_bytes() - rss_before,
+                "members": sum(len(guild.members) for guild in bot.guilds),
+                "intents": len(profile.intents),
+            }
+            await bot.close()
+            await connecting
+        return result
+
+    return asyncio.run(run())
+
+
+async def run_profiles(gateway: FakeGateway, tool_root: Path) -> list[dict[str, Any]]:
+    runner = web.AppRunner(gateway.app())
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]  # type: ignore[union-attr] # noqa: SLF001
+    results = []
+    try:
+        for profile_name in PROFILES:
+            process = await asyncio.create_subprocess_exec(
+                sys.executable,
+                __file__,
+                "--single",
+                str(port),
+                profile_name,
+                tool_root.as_posix(),
+                stdout=asyncio.subprocess.PIPE,
+            )
+            stdout, _ = await process.communicate()
+            results.append(json.loads(stdout))
+    finally:
+        await runner.cleanup()
+    return results
+
+
+def main() -> None:
+    parser = ArgumentParser()
+    parser.add_argument("--guilds", type=int, default=4)
+    parser.add_argument("--members", type=int, default=25000)
+    parser.add_argument("--tools", type=int, default=10)
+    parser.add_argument("--single", nargs=3, metavar=("PORT", "PROFILE", "TOOLS"), help=SUPPRESS)
+    args = parser.parse_args()
+    if args.single is not None:
+        port, profile_name, tool_root = args.single
+        print(json.dumps(measure_single(int(port), profile_name, Path(tool_root))))  # noqa: T201
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tool_root = generate_tools(Path(tmp), args.tools)
+        results = asyncio.run(run_profiles(FakeGateway(args.guilds, args.members), tool_root))
+
+    mib = 2**20
+    print(f"{'profile':>8} {'intents':>8} {'members':>8} {'ready[s]':>9} {'rss[MiB]':>9}")  # noqa: T201
+    for result in results:
+        print(  # noqa: T201
+            f"{result['profile']:>8} {result['intents']:>8} {result['members']:>8}"
+            f" {result['seconds']:>9.2f} {result['rss_bytes'] / mib:>9.1f}",
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""bench_log_calls
+
+ロガーの呼び出し1回あたりにイベントループを止める時間を、ファイルのハンドラーを直接付けた場合 (変更前)、
+`get_logger` のキューを介した場合、`--flight-recorder` でDEBUGのログをメモリに残す場合で比較します。
+
+このベンチマークにおけるポイント:
+    1. イベントループのタスクから、DEBUGレベルのロガーを指定回数だけ呼ぶ
+       (`{name}.background.log` と `{name}.log` の2つに書き込む)
+    2. 呼び出し1回ごとの時間を測り、平均・99パーセンタイル・最大と合計を出す (これがイベントループを止めた時間になる)
+    3. `--fsync` を付けると書き込みのたびに `os.fsync` し、遅いディスクやネットワークファイルシステムを模す
+    4. キューを介した場合は、ループを止めずに後からスレッドで書き込むため、書き込み終えるまでの時間も併せて出す
+    5. 最後にERRORのログを1つ出し、`{name}.log` に書き込んだ行数を数える
+       (flightでは直近のログだけが整形されて書き込まれ、それ以外は整形されずに捨てられる)
+        ```bash
+        $ python benchmarks/bench_log_calls.py --records 2000 --flight-recorder 200 --fsync
+        ```
+"""
+
+import asyncio
+import logging
+import os
+import statistics
+import tempfile
+import time
+from argparse import ArgumentParser
+from collections.abc import Iterator
+from contextlib import contextmanager
+from logging import FileHandler, Logger
+from pathlib import Path
+from typing import Any
+
+from concord.infrastructure.logging.logger_factory import (
+    get_background_log,
+    get_logger,
+    my_logger,
+    stop_log_listeners,
+)
+
+
+@contextmanager
+def fsync_on_flush() -> Iterator[None]:
+    """書き込みのたびにディスクへの同期を待つようにする"""
+    original = FileHandler.flush
+
+    def flush(self: FileHandler) -> None:
+        original(self)
+        if self.stream is not None:
+            os.fsync(self.stream.fileno())
+
+    FileHandler.flush = flush  # type: ignore[method-assign]
+    try:
+        yield
+    finally:
+        FileHandler.flush = original  # type: ignore[method-assign]
+
+
+def direct_logger(name: str, log_dir: Path) -> Logger:
+    """変更前と同じく、ファイルのハンドラーをロガーに直接付ける"""
+    get_background_log(name, log_dir)
+    return my_logger(name, logging.DEBUG, log_dir)
+
+
+async def log_records(logger: Logger, records: int) -> list[float]:
+    durations: list[float] = []
+    for index in range(records):
+        started = time.perf_counter()
+        logger.debug("processed request %d from %s", index, "bench")
+        durations.append(time.perf_counter() - started)
+        if index % 100 == 0:
+            # 他のタスクに順番を譲る
+            await asyncio.sleep(0)
+    return durations
+
+
+def run(mode: str, records: int, flight_recorder: int, log_dir: Path) -> dict[str, Any]:
+    name = f"bench_{mode}"
+    if mode == "direct":
+        logger = direct_logger(name, log_dir)
+    elif mode == "queued":
+        logger = get_logger(name, logging.DEBUG, log_dir)
+    else:
+        logger = get_logger(name, logging.INFO, log_dir, flight_recorder=flight_recorder)
+    started = time.perf_counter()
+    durations = asyncio.run(log_records(logger, records))
+    logger.error("request failed")
+    if mode == "direct":
+        for handler in list(logger.handlers):
+            logger.removeHandler(handler)
+            handler.close()
+    else:
+        stop_log_listeners()
+    written = time.perf_counter() - started
+    lines = (log_dir / f"{name}.log").read_text(encoding="utf-8").count("\n")
+    expected = (min(records, flight_recorder) if mode == "flight" else records) + 1
+    if lines != expected:
+        msg = f"{mode}: {lines} of {expected} records written"
+        raise RuntimeError(msg)
+    ordered = sorted(durations)
+    return {
+        "mode": mode,
+        "mean_us": statistics.fmean(durations) * 1e6,
+        "p99_us": ordered[int(len(ordered) * 0.99) - 1] * 1e6,
+        "max_us": ordered[-1] * 1e6,
+        "blocked_s": sum(durations),
+        "written_s": written,
+        "lines": lines,
+    }
+
+
+def main() -> None:
+    parser = ArgumentParser()
+    parser.add_argument("--records", type=int, default=2000)
+    parser.add_argument("--flight-recorder", type=int, default=200, help="flightでメモリに残すログの数")
+    parser.add_argument("--fsync", action="store_true", help="書き込みのたびにos.fsyncする")
+    args = parser.parse_args()
+
+    print(  # noqa: T201
+        f"{'mode':>8} {'records':>8} {'mean[us]':>9} {'p99[us]':>9} {'max[us]':>9}"
+        f" {'blocked[s]':>11} {'written[s]':>11} {'lines':>6}",
+    )
+    for mode in ("direct", "queued", "flight"):
+        with tempfile.TemporaryDirectory() as tmp:
+            if args.fsync:
+                with fsync_on_flush():
+                    result = run(mode, args.records, args.flight_recorder, Path(tmp))
+            else:
+                result = run(mode, args.records, args.flight_recorder, Path(tmp))
+        print(  # noqa: T201
+            f"{result['mode']:>8} {args.records:>8} {result['mean_us']:>9.1f} {result['p99_us']:>9.1f}"
+            f" {result['max_us']:>9.1f} {result['blocked_s']:>11.3f} {result['written_s']:>11.3f}"
+            f" {result['lines']:>6}",
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""bench_log_shipping
+
+ログチャンネルへのログの送信を、1件ずつ送る場合 (変更前) と、まとめて送る場合 (`LogPipeline`) で比較します。
+
+このベンチマークにおけるポイント:
+    1. ローカルにDiscordのREST APIの代わりを立て、メッセージの送信に
+       レート制限 (`X-RateLimit-*` ヘッダーと429) をかける
+    2. ログを一度に大量に積み、全てを送り終えるまでの秒数・メッセージの数・429の数を測る
+    3. まとめて送る場合は、別のスレッドから `LogPipeline` にログを積み、イベントループのタスクが
+       `LogShipper` で送信する (大きすぎるまとまりは添付ファイルになる)。キューはログの数より大きくし、捨てない
+    4. Discordには接続しないため、Discordのトークンは不要
+        ```bash
+        $ python benchmarks/bench_log_shipping.py --records 500 --limit 5 --window 0.25
+        ```
+"""
+
+import asyncio
+import json
+import logging
+import queue
+import time
+from argparse import ArgumentParser
+from typing import Any
+
+from aiohttp import web
+from discord import Client, Intents
+from discord.http import Route
+
+from concord.infrastructure.logging.log_shipper import CODE_BLOCK_PREFIX, CODE_BLOCK_SUFFIX
+from concord.infrastructure.logging.logger_notifier import LogPipeline
+
+CHANNEL_ID = 100
+RECORD = "2024-01-01 00:00:00,000 - bench - INFO - processed request {index} (module: bench, func: handle)"
+
+
+def _json_response(data: dict[str, Any], status: int = 200, headers: dict[str, str] | None = None) -> web.Response:
+    # discord.pyは `application/json` (charsetなし) の場合だけJSONとして読む
+    return web.Response(
+        body=json.dumps(data).encode(),
+        status=status,
+        content_type="application/json",
+        headers=headers,
+    )
+
+
+def _user(user_id: str) -> dict[str, Any]:
+    return {"id": user_id, "username": "bench", "discriminator": "0", "avatar": None, "global_name": None, "bot": True}
+
+
+class FakeDiscord:
+    """メッセージの送信にレート制限をかける、REST APIの最小限の偽物"""
+
+    def __init__(self, limit: int, window: float) -> None:
+        self.limit = limit
+        self.window = window
+        self.window_start = 0.0
+        self.used = 0
+        self.messages = 0
+        self.rate_limited = 0
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/api/v10/users/@me", self.users_me)
+        app.router.add_get("/api/v10/oauth2/applications/@me", self.application)
+        app.router.add_post("/api/v10/channels/{channel_id}/messages", self.create_message)
+        return app
+
+    async def users_me(self, _: web.Request) -> web.Response:
+        return _json_response(_user("1"), headers=self._headers(remaining=49))
+
+    async def application(self, _: web.Request) -> web.Response:
+        data = {
+            "id": "2",
+            "name": "bench",
+            "description": "",
+            "icon": None,
+            "bot_public": False,
+            "bot_require_code_grant": False,
+            "verify_key": "",
+            "flags": 0,
+            "owner": _user("3"),
+        }
+        return _json_response(data, headers=self._headers(remaining=49))
+
+    def _headers(self, *, remaining: int, reset_after: float = 0.001) -> dict[str, str]:
+        return {
+            "X-RateLimit-Bucket": "messages",
+            "X-RateLimit-Limit": str(self.limit),
+            "X-RateLimit-Remaining": str(remaining),
+            "X-RateLimit-Reset-After": f"{reset_after:.3f}",
+            "Via": "1.1 bench",
+        }
+
+    async def create_message(self, request: web.Request) -> web.Response:
+        await request.read()
+        now = time.monotonic()
+        if now - self.window_start >= self.window:
+            self.window_start = now
+            self.used = 0
+        reset_after = self.window - (now - self.window_start)
+        if self.used >= self.limit:
+            self.rate_limited += 1
+            return _json_response(
+                {"message": "You are being rate limited.", "retry_after": reset_after, "global": False},
+                status=429,
+                headers={**self._headers(remaining=0, reset_after=reset_after), "X-RateLimit-Scope": "user"},
+            )
+        self.used += 1
+        self.messages += 1
+        data = {
+            "id": str(1000 + self.messages),
+            "channel_id": request.match_info["channel_id"],
+            "type": 0,
+            "content": "",
+            "author": _user("1"),
+            "attachments": [],
+            "embeds": [],
+            "mentions": [],
+            "mention_roles": [],
+            "pinned": False,
+            "mention_everyone": False,
+            "tts": False,
+            "timestamp": "2024-01-01T00:00:00+00:00",
+            "edited_timestamp": None,
+            "flags": 0,
+        }
+        return _json_response(data, headers=self._headers(remaining=self.limit - self.used, reset_after=reset_after))
+
+
+async def ship_each(records: "queue.Queue[str]", channel: Any, count: int) -> None:  # noqa: ANN401
+    """変更前と同じく、1件ずつメッセージにして送る"""
+    for _ in range(count):
+        await channel.send(content=f"{CODE_BLOCK_PREFIX}{records.get_nowait()}{CODE_BLOCK_SUFFIX}")
+
+
+async def ship_batched(records: "queue.Queue[str]", channel: Any, count: int) -> LogPipeline:  # noqa: ANN401
+    """BOTと同じく、他のスレッドから積んだログをイベントループのタスクでまとめて送る"""
+    pipeline = LogPipeline(channel, maxsize=count, linger=0.05)
+    pipeline.start()
+
+    def produce() -> None:
+        for _ in range(count):
+            pipeline.submit(records.get_nowait(), logging.INFO)
+
+    await asyncio.to_thread(produce)
+    await pipeline.close(drain_timeout=60)
+    stats = pipeline.stats()
+    if stats.shipped != count:
+        raise RuntimeError(pipeline.last_error or f"{stats}")
+    return pipeline
+
+
+async def run(mode: str, records: int, limit: int, window: float) -> dict[str, Any]:
+    fake = FakeDiscord(limit, window)
+    runner = web.AppRunner(fake.app())
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]  # type: ignore[union-attr] # noqa: SLF001
+    Route.BASE = f"http://127.0.0.1:{port}/api/v10"
+    client = Client(intents=Intents.none())
+    try:
+        await client.login("dummy")
+        channel = client.get_partial_messageable(CHANNEL_ID)
+        source: queue.Queue[str] = queue.Queue()
+        for index in range(records):
+            source.put(RECORD.format(index=index))
+        started = time.perf_counter()
+        attachments = 0
+        if mode == "each":
+            await ship_each(source, channel, records)
+        else:
+            attachments = (await ship_batched(source, channel, records)).shipper.stats().attachments
+        seconds = time.perf_counter() - started
+    finally:
+        await client.close()
+        await runner.cleanup()
+    return {
+        "mode": mode,
+        "seconds": seconds,
+        "messages": fake.messages,
+        "attachments": attachments,
+        "rate_limited": fake.rate_limited,
+    }
+
+
+def main() -> None:
+    parser = ArgumentParser()
+    parser.add_argument("--records", type=int, default=500)
+    parser.add_argument("--limit", type=int, default=5, help="レート制限の窓あたりのメッセージ数")
+    parser.add_argument("--window", type=float, default=0.25, help="レート制限の窓の秒数 (Discordでは5秒)")
+    args = parser.parse_args()
+
+    print(f"{'mode':>8} {'records':>8} {'seconds':>8} {'records/s':>10} {'messages':>9} {'files':>6} {'429':>5}")  # noqa: T201
+    for mode in ("each", "batched"):
+        result = asyncio.run(run(mode, args.records, args.limit, args.window))
+        print(  # noqa: T201
+            f"{result['mode']:>8} {args.records:>8} {result['seconds']:>8.2f}"
+            f" {args.records / result['seconds']:>10.1f} {result['messages']:>9}"
+            f" {result['attachments']:>6} {result['rate_limited']:>5}",
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""bench_multi_bot
+
+複数のBOTを別々のプロセスで動かした場合と、1つのプロセス (`AgentHost`) で動かした場合のメモリを比較します。
+
+このベンチマークにおけるポイント:
+    1. 一時ディレクトリに、指定数のBOTの設定ファイルと、全てのBOTが読み込むツールを生成する
+    2. BOTごとにプロセスを起動し、`Agent` の生成とツールのimportを済ませた時点の常駐メモリ (RSS) を合計する
+    3. 1つのプロセスで `AgentHost` から全てのBOTを生成・importし、プロセスのRSSとBOTごとの増加量を出力する
+    4. ゲートウェイには接続しないため、Discordのトークンは不要 (接続後のキャッシュの分は含まれない)
+        ```bash
+        $ python benchmarks/bench_multi_bot.py --bots 12 --tools 30
+        ```
+"""
+
+import asyncio
+import json
+import subprocess
+import sys
+import tempfile
+from argparse import SUPPRESS, ArgumentParser
+from pathlib import Path
+
+from concord.infrastructure.discord.agent import Agent
+from concord.infrastructure.discord.host import AgentHost
+from concord.infrastructure.discord.memory import current_rss_bytes
+from concord.model.argument import Args
+
+CONFIG_TEMPLATE = """[Discord.Bot]
+name = {name}
+description = benchmark bot
+
+[Discord.API]
+token = dummy
+
+[Discord.DefaultChannel]
+dev_channel = 1
+log_channel = 2
+
+[Discord.Tool]
+exclusions =
+"""
+TOOL_TEMPLATE = """from discord.ext import commands
+
+
+class Tool{index}(commands.Cog):
+    def __init__(self, agent: object) -> None:
+        self.agent = agent
+        self.table = {{str(i): i * {index} for i in range(2000)}}
+
+    @commands.command(name="tool{index}")
+    async def run(self, ctx: commands.Context) -> None:
+        await ctx.send(str(len(self.table)))
+"""
+
+
+def generate(root: Path, bots: int, tools: int) -> list[Args]:
+    (root / "configs").mkdir(parents=True)
+    (root / "configs" / "API.ini").write_text("", encoding="utf-8")
+    tool_root = root / "tools"
+    for index in range(tools):
+        tool_dir = tool_root / f"tool{index:03d}"
+        tool_dir.mkdir(parents=True)
+        (tool_dir / "__tool__.py").write_text(TOOL_TEMPLATE.format(index=index), encoding="utf-8")
+    names = [f"bot{index:02d}" for index in range(bots)]
+    for name in names:
+        (root / "configs" / f"{name}.ini").write_text(CONFIG_TEMPLATE.format(name=name), encoding="utf-8")
+    return [Args(bot_name=name, tool_directory_paths=[tool_root], is_debug=False) for name in names]
+
+
+async def prepare(agents: list[Agent]) -> None:
+    previous = None
+    for agent in agents:
+        previous = agent.start_preparing_tools(after=previous)
+    if previous is not None:
+        await previous
+
+
+def measure_single(root: Path, bot_name: str) -> int:
+    """1つのプロセスで1つのBOTを生成・importしたときのRSS (子プロセスで実行される)"""
+
+    async def run() -> int:
+        args = Args(bot_name=bot_name, tool_directory_paths=[root / "tools"], is_debug=False)
+        agent = Agent(root, args=args)
+        await prepare([agent])
+        return current_rss_bytes()
+
+    return asyncio.run(run())
+
+
+def measure_host(root: Path, bots: list[Args]) -> tuple[int, AgentHost]:
+    async def run() -> tuple[int, AgentHost]:
+        host = AgentHost(bots, root)
+        await prepare(host.create_agents())
+        return current_rss_bytes(), host
+
+    return asyncio.run(run())
+
+
+def main() -> None:
+    parser = ArgumentParser()
+    parser.add_argument("--bots", type=int, default=12)
+    parser.add_argument("--tools", type=int, default=30)
+    parser.add_argument("--single", nargs=2, metavar=("ROOT", "BOT"), help=SUPPRESS)
+    args = parser.parse_args()
+    if args.single is not None:
+        print(json.dumps(measure_single(Path(args.single[0]), args.single[1])))  # noqa: T201
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        bots = generate(root, args.bots, args.tools)
+        separate = [
+            int(
+                subprocess.run(  # noqa: S603
+                    [sys.executable, __file__, "--single", root.as_posix(), bot.bot_name],
+                    check=True,
+                    capture_output=True,
+                    text=True,
+                ).stdout.strip(),
+            )
+            for bot in bots
+        ]
+        host_rss, host = measure_host(root, bots)
+
+    mib = 2**20
+    print(f"{'bots':>5} {'tools':>6} {'separate[MiB]':>14} {'host[MiB]':>10}")  # noqa: T201
+    print(f"{args.bots:>5} {args.tools:>6} {sum(separate) / mib:>14.1f} {host_rss / mib:>10.1f}")  # noqa: T201
+    print(host.format_memory())  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""bench_tool_bundle
+
+ツールディレクトリとツールのバンドル (zipファイル) の読み込み時間を比較します。
+
+このベンチマークにおけるポイント:
+    1. 一時ディレクトリに `__tool__.py` とその他のファイルを持つツールを指定数だけ生成する
+    2. ディレクトリ (`import_classes_from_directory`)、ソースのみのバンドル、バイトコード入りのバンドル
+       (`import_classes_from_bundle`) の順に読み込み時間を計測する
+    3. ディレクトリは初回 (`__pycache__` なし) と2回目 (`__pycache__` あり) の両方を計測する
+    4. ファイル数が多いほど、ネットワーク越しのディスクではディレクトリの走査とファイルを開く回数が効いてくる
+       (ページキャッシュは落とさないため、ローカルディスクでは差が小さく出る)
+        ```bash
+        $ python benchmarks/bench_tool_bundle.py --counts 50 200 500
+        ```
+"""
+
+import shutil
+import tempfile
+import time
+from argparse import ArgumentParser
+from pathlib import Path
+
+from concord.infrastructure.discord.dynamic_import import import_classes_from_bundle, import_classes_from_directory
+from concord.infrastructure.discord.tool_bundle import build_tool_bundle
+
+TOOL_TEMPLATE = """from dataclasses import dataclass
+
+
+@dataclass
+class Entry{index}:
+    key: str
+    value: int
+
+
+class Tool{index}:
+{methods}
+"""
+METHOD_TEMPLATE = """    def method{index}(self, values: list[int]) -> dict[str, int]:
+        result = {{str(v): v * {index} for v in values if v % 3 != {index} % 3}}
+        return {{k: v for k, v in sorted(result.items()) if v > {index}}}
+"""
+
+
+def generate_tools(root: Path, count: int, methods: int) -> None:
+    for index in range(count):
+        tool_dir = root / f"tool{index:04d}"
+        (tool_dir / "assets").mkdir(parents=True)
+        (tool_dir / "__tool__.py").write_text(
+            TOOL_TEMPLATE.format(
+                index=index,
+                methods="\n".join(METHOD_TEMPLATE.format(index=i) for i in range(methods)),
+            ),
+            encoding="utf-8",
+        )
+        (tool_dir / "README.md").write_text("tool\n", encoding="utf-8")
+        (tool_dir / "assets" / "data.json").write_text("{}\n", encoding="utf-8")
+
+
+def measure_directory(root: Path) -> float:
+    start = time.perf_counter()
+    import_classes_from_directory(directory_path=root.as_posix(), include_name=["__tool__.py"])
+    return time.perf_counter() - start
+
+
+def measure_bundle(bundle_path: Path) -> float:
+    start = time.perf_counter()
+    import_classes_from_bundle(bundle_path)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = ArgumentParser()
+    parser.add_argument("--counts", type=int, nargs="+", default=[50, 200, 500])
+    parser.add_argument("--methods", type=int, default=20)
+    args = parser.parse_args()
+
+    header = f"{'tools':>6} {'dir(cold)[s]':>13} {'dir(warm)[s]':>13} {'zip(src)[s]':>12} {'zip(pyc)[s]':>12}"
+    print(header)  # noqa: T201
+    for count in args.counts:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp) / "tools"
+            generate_tools(root, count, args.methods)
+            source_bundle = Path(tmp) / "tools_src.zip"
+            bytecode_bundle = Path(tmp) / "tools_pyc.zip"
+            build_tool_bundle(root, source_bundle, ["__tool__.py"])
+            build_tool_bundle(root, bytecode_bundle, ["__tool__.py"], compile_bytecode=True)
+            for pycache in root.rglob("__pycache__"):
+                shutil.rmtree(pycache)
+
+            directory_cold = measure_directory(root)
+            directory_warm = measure_directory(root)
+            bundle_source = measure_bundle(source_bundle)
+            bundle_bytecode = measure_bundle(bytecode_bundle)
+        row = f"{count:>6} {directory_cold:>13.3f} {directory_warm:>13.3f}"
+        row += f" {bundle_source:>12.3f} {bundle_bytecode:>12.3f}"
+        print(row)  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
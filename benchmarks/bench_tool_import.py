@@ -0,0 +1,72 @@
+"""bench_tool_import
+
+ツール数に対して、`import_classes_from_directory` の起動時間がどのように伸びるかを計測します。
+
+このベンチマークにおけるポイント:
+    1. 一時ディレクトリに `__tool__.py` を持つツールを指定数だけ生成する
+    2. 各ツールはimport時に重い依存ライブラリを読み込む状況を模して、少し待機する
+    3. 逐次インポート (max_workers=1) と並列インポートの所要時間を比較する
+        ```bash
+        $ python benchmarks/bench_tool_import.py --counts 10 50 100 200 --workers 8
+        ```
+"""
+
+import tempfile
+import time
+from argparse import ArgumentParser
+from pathlib import Path
+
+from concord.infrastructure.discord.dynamic_import import import_classes_from_directory
+
+TOOL_TEMPLATE = """import time
+
+time.sleep({import_cost})  # 重い依存ライブラリのimportを模擬する
+
+TABLE = {{i: str(i) * 4 for i in range(2000)}}
+
+
+class Tool{index}:
+    def run(self) -> int:
+        return len(TABLE)
+"""
+
+
+def generate_tools(root: Path, count: int, import_cost: float) -> None:
+    for index in range(count):
+        tool_dir = root / f"tool{index:04d}"
+        tool_dir.mkdir()
+        (tool_dir / "__tool__.py").write_text(
+            TOOL_TEMPLATE.format(index=index, import_cost=import_cost),
+            encoding="utf-8",
+        )
+
+
+def measure(root: Path, max_workers: int) -> float:
+    start = time.perf_counter()
+    import_classes_from_directory(
+        directory_path=root.as_posix(),
+        include_name=["__tool__.py"],
+        max_workers=max_workers,
+    )
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = ArgumentParser()
+    parser.add_argument("--counts", type=int, nargs="+", default=[10, 50, 100, 200])
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--import-cost", type=float, default=0.005)
+    args = parser.parse_args()
+
+    print(f"{'tools':>6} {'serial[s]':>10} {'parallel[s]':>12} {'speedup':>8}")  # noqa: T201
+    for count in args.counts:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            generate_tools(root, count, args.import_cost)
+            serial = measure(root, max_workers=1)
+            parallel = measure(root, max_workers=args.workers)
+        print(f"{count:>6} {serial:>10.3f} {parallel:>12.3f} {serial / parallel:>7.2f}x")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+"""02_multi_bot
+
+このサンプルでは、1つのプロセスで複数のBOTを動かす方法を示します。
+
+このサンプルにおけるポイント:
+    1. `AgentHost` をimportする
+    2. `AgentHost` のインスタンスを作成し、引数としてconfigsやlogsを置いてもよいディレクトリを指定する
+       (BOTごとに `configs/{BOT}.ini` を置く)
+    3. `AgentHost` のrunメソッドを、asyncio.run()内で実行すると、全てのBOTが1つのイベントループで起動して常駐する
+    4. ツールのモジュール・スレッドプール・HTTPのコネクタは全てのBOTで共有され、Cogとチャンネルは各BOTに閉じる
+        ```bash
+        examples/ex02_multi_bot$ python main.py --bot-names bot1 bot2 bot3 \
+            --tool-directory-paths ../ex01_load_test_tools/applications
+        ```
+"""
+
+import asyncio
+from pathlib import Path
+
+from concord import AgentHost
+
+if __name__ == "__main__":
+    config_and_log_dirpath = Path(__file__).parent
+    host = AgentHost(utils_dirpath=config_and_log_dirpath)
+    asyncio.run(host.run())
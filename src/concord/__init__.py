@@ -1,3 +1,3 @@
-from .infrastructure import Agent
+from .infrastructure import Agent, AgentHost
 
-__all__ = ["Agent"]
+__all__ = ["Agent", "AgentHost"]
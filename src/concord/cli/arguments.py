@@ -2,23 +2,17 @@ from argparse import ArgumentParser
 from pathlib import Path
 
 from concord.exception.import_module import DirectoryNotFoundError
+from concord.infrastructure.discord.tool_bundle import is_tool_bundle
 from concord.model.argument import Args
 
 
-def on_launch() -> Args:
-    parser = ArgumentParser()
-    parser.add_argument(
-        "--bot-name",
-        type=str,
-        required=True,
-        help="BOTの名前を指定します。",
-    )
+def _add_tool_arguments(parser: ArgumentParser) -> None:
     parser.add_argument(
         "--tool-directory-paths",
         type=str,
         required=False,
         default="",
-        help="ツールのディレクトリパスを指定します。複数指定する場合はスペースで区切ります。",
+        help="ツールのディレクトリパスかバンドル (.zip) を指定します。複数指定する場合はスペースで区切ります。",
     )
     parser.add_argument(
         "--is-debug",
@@ -27,6 +21,57 @@ def on_launch() -> Args:
         default=False,
         help="デバッグモードかどうかを指定します。",
     )
+    parser.add_argument(
+        "--flight-recorder",
+        type=int,
+        required=False,
+        default=0,
+        help="直近のDEBUGのログをメモリに残す数を指定します。ERROR以上のログが出たときに書き出します (0は残さない)。",
+    )
+
+
+def _resolve_tool_directory_paths(raw_paths: object) -> list[Path]:
+    if not isinstance(raw_paths, str):
+        msg = "Invalid arguments: tool_directory_paths must be a string or list[Path]"
+        raise TypeError(msg)
+    resolved_and_validated_paths: list[Path] = []
+    if len(raw_paths) != 0:
+        for raw_path in raw_paths.split():
+            path = Path(raw_path)
+            path = path if path.is_absolute() else (Path.cwd() / path)
+            path = path.resolve()
+            if not (path.is_dir() or is_tool_bundle(path)) or not path.exists():
+                raise DirectoryNotFoundError(path)
+            resolved_and_validated_paths.append(path)
+    return list(set(resolved_and_validated_paths))
+
+
+def _validate_is_debug(is_debug: object) -> bool:
+    if not isinstance(is_debug, bool):
+        msg = "Invalid arguments: is_debug must be a bool"
+        raise TypeError(msg)
+    return is_debug
+
+
+def _validate_flight_recorder(flight_recorder: object) -> int:
+    if not isinstance(flight_recorder, int) or isinstance(flight_recorder, bool):
+        msg = "Invalid arguments: flight_recorder must be an int"
+        raise TypeError(msg)
+    if flight_recorder < 0:
+        msg = f"Invalid arguments: flight_recorder must not be negative: {flight_recorder}"
+        raise ValueError(msg)
+    return flight_recorder
+
+
+def on_launch() -> Args:
+    parser = ArgumentParser()
+    parser.add_argument(
+        "--bot-name",
+        type=str,
+        required=True,
+        help="BOTの名前を指定します。",
+    )
+    _add_tool_arguments(parser)
     args = parser.parse_args()
 
     # typing
@@ -34,28 +79,46 @@ def on_launch() -> Args:
     if not isinstance(bot_name, str):
         msg = "Invalid arguments: bot_name must be a string"
         raise TypeError(msg)
-    if isinstance(args.tool_directory_paths, str):
-        resolved_and_validated_paths: list[Path] = []
-        raw_paths = args.tool_directory_paths
-        if len(raw_paths) != 0:
-            for raw_path in raw_paths.split():
-                path = Path(raw_path)
-                path = path if path.is_absolute() else (Path.cwd() / path)
-                path = path.resolve()
-                if not path.is_dir() or not path.exists():
-                    raise DirectoryNotFoundError(path)
-                resolved_and_validated_paths.append(path)
-        resolved_and_validated_paths = list(set(resolved_and_validated_paths))
-    else:
-        msg = "Invalid arguments: tool_directory_paths must be a string or list[Path]"
-        raise TypeError(msg)
-    is_debug = args.is_debug
-    if not isinstance(is_debug, bool):
-        msg = "Invalid arguments: is_debug must be a bool"
-        raise TypeError(msg)
 
     return Args(
         bot_name=bot_name,
-        tool_directory_paths=resolved_and_validated_paths,
-        is_debug=is_debug,
+        tool_directory_paths=_resolve_tool_directory_paths(args.tool_directory_paths),
+        is_debug=_validate_is_debug(args.is_debug),
+        flight_recorder=_validate_flight_recorder(args.flight_recorder),
     )
+
+
+def on_launch_host() -> list[Args]:
+    """1つのプロセスで複数のBOTを動かす場合の引数を読む (ツールのディレクトリは全てのBOTで共通)"""
+    parser = ArgumentParser()
+    parser.add_argument(
+        "--bot-names",
+        type=str,
+        nargs="+",
+        required=True,
+        help="BOTの名前を指定します。複数指定する場合はスペースで区切ります。",
+    )
+    _add_tool_arguments(parser)
+    args = parser.parse_args()
+
+    # typing
+    bot_names = args.bot_names
+    if not isinstance(bot_names, list) or not all(isinstance(bot_name, str) for bot_name in bot_names):
+        msg = "Invalid arguments: bot_names must be a list of strings"
+        raise TypeError(msg)
+    if len(set(bot_names)) != len(bot_names):
+        msg = f"Invalid arguments: bot_names must be unique: {bot_names}"
+        raise ValueError(msg)
+    tool_directory_paths = _resolve_tool_directory_paths(args.tool_directory_paths)
+    is_debug = _validate_is_debug(args.is_debug)
+    flight_recorder = _validate_flight_recorder(args.flight_recorder)
+
+    return [
+        Args(
+            bot_name=bot_name,
+            tool_directory_paths=list(tool_directory_paths),
+            is_debug=is_debug,
+            flight_recorder=flight_recorder,
+        )
+        for bot_name in bot_names
+    ]
@@ -0,0 +1,56 @@
+"""ツールディレクトリから、ツールのバンドル (zipファイル) を作る
+
+作成したバンドルは、ディレクトリの代わりに `--tool-directory-paths` に指定できる。
+
+```bash
+python -m concord.cli.bundle path/to/tools path/to/tools.zip --compile
+```
+"""
+
+import sys
+from argparse import ArgumentParser
+from pathlib import Path
+
+from concord.infrastructure.discord.tool_bundle import BUNDLE_SUFFIX, build_tool_bundle
+
+
+def main() -> int:
+    parser = ArgumentParser()
+    parser.add_argument(
+        "tool_directory_path",
+        type=Path,
+        help="ツールのディレクトリパスを指定します。",
+    )
+    parser.add_argument(
+        "bundle_path",
+        type=Path,
+        help=f"作成するバンドルのパス ({BUNDLE_SUFFIX}) を指定します。",
+    )
+    parser.add_argument(
+        "--compile",
+        action="store_true",
+        default=False,
+        help="バイトコードにコンパイルして格納します (BOTを動かすPythonと同じバージョンで実行してください)。",
+    )
+    args = parser.parse_args()
+
+    if not args.tool_directory_path.is_dir():
+        print(f"Directory not found: {args.tool_directory_path}", file=sys.stderr)  # noqa: T201
+        return 1
+    if args.bundle_path.suffix != BUNDLE_SUFFIX:
+        print(f"Bundle path must end with {BUNDLE_SUFFIX}: {args.bundle_path}", file=sys.stderr)  # noqa: T201
+        return 1
+    manifest = build_tool_bundle(
+        args.tool_directory_path,
+        args.bundle_path,
+        include_name=["__tool__.py"],
+        compile_bytecode=args.compile,
+    )
+    for tool in manifest.tools:
+        print(tool.path)  # noqa: T201
+    print(f"{len(manifest.tools)} tools bundled into {args.bundle_path}")  # noqa: T201
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
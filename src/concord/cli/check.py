@@ -0,0 +1,65 @@
+"""ツールのモジュールを実行せずに、ツールディレクトリに含まれるCogを一覧表示する
+
+```bash
+python -m concord.cli.check path/to/tools1 path/to/tools2
+```
+"""
+
+import sys
+import time
+from argparse import ArgumentParser
+from pathlib import Path
+
+from concord.exception.import_module import ImportModuleError
+from concord.infrastructure.discord.static_discovery import StaticDiscoveryCache, discover_cogs_from_directory
+from concord.infrastructure.discord.tool_manifest import DEFAULT_CACHE_DIR
+
+
+def main() -> int:
+    parser = ArgumentParser()
+    parser.add_argument(
+        "tool_directory_paths",
+        type=Path,
+        nargs="+",
+        help="ツールのディレクトリパスを指定します。",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=DEFAULT_CACHE_DIR,
+        help="解析結果のキャッシュを置くディレクトリを指定します。",
+    )
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    cache = StaticDiscoveryCache(args.cache_dir / "static_discovery.json")
+    exit_code = 0
+    count = 0
+    for tool_directory_path in args.tool_directory_paths:
+        try:
+            cogs = discover_cogs_from_directory(
+                directory_path=tool_directory_path.as_posix(),
+                include_name=["__tool__.py"],
+                cache=cache,
+            )
+        except (FileNotFoundError, ImportModuleError) as e:
+            print(e, file=sys.stderr)  # noqa: T201
+            exit_code = 1
+            continue
+        for cog in cogs:
+            count += 1
+            print(f"{cog.name} ({cog.module_path}:{cog.lineno})")  # noqa: T201
+            for command in cog.commands:
+                print(f"    command  {command.name} [{command.decorator}]")  # noqa: T201
+            for listener in cog.listeners:
+                print(f"    listener {listener.event}")  # noqa: T201
+            for task in cog.tasks:
+                print(f"    task     {task}")  # noqa: T201
+    cache.save()
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    print(f"{count} cogs found in {elapsed_ms:.1f} ms (cache hits: {cache.hits})")  # noqa: T201
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,3 @@
-from .discord import Agent
+from .discord import Agent, AgentHost
 
-__all__ = ["Agent"]
+__all__ = ["Agent", "AgentHost"]
@@ -1,13 +1,49 @@
+import asyncio
+import configparser
 import logging
 import re
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
 from pathlib import Path
+from types import MappingProxyType
 from typing import Literal
 
+from concord.infrastructure.discord.channel_cache import DEFAULT_NEGATIVE_TTL
+from concord.infrastructure.discord.file_watcher import WATCHER_BACKENDS, FileWatcher
+from concord.infrastructure.logging.logger_notifier import DEFAULT_QUEUE_SIZE
 from concord.model.config import BaseConfigArgs
+from concord.model.config_registry import ConfigRegistryStats
+from concord.model.config_snapshot import (
+    TOOL_LOADING_MODES,
+    BotSettings,
+    ChannelCacheSettings,
+    ConfigChange,
+    ConfigSnapshot,
+    LogSettings,
+    ToolSettings,
+)
+from concord.model.gateway_profile import GatewaySettings
+from concord.model.log_shipping import LOG_OVERFLOW_POLICIES
 
 DEFAULT_CONFIG_DIR = Path(__file__).parent.parent.parent.parent / "configs"
 DEFAULT_CHANNEL_LIST_SECTION_NAME = "Discord.Channel"
 DEFAULT_CHANNELS = Literal["dev_channel", "log_channel"]
+DEFAULT_REGISTRY_SIZE = 32
+LIST_SEPARATOR = re.compile(r"[\s,]+")
+INLINE_COMMENT = re.compile(r"(^|\s)#.*$")
+
+
+def _split_list(value: str) -> list[str]:
+    """空白かカンマで区切られた `[a, b]` 形式の文字列を、list[str]に変換する
+
+    行末の `# ...` のコメントは取り除く。外側の `[` と `]` は両方ある場合だけ取り除く
+    (`Debug[0-9]` のようなglobの文字クラスは残す)。
+    """
+    value = INLINE_COMMENT.sub("", value).strip()
+    if value.startswith("[") and value.endswith("]"):
+        value = value[1:-1]
+    return [s for s in LIST_SEPARATOR.split(value) if len(s) != 0]
 
 
 class ConfigAPI(BaseConfigArgs):
@@ -39,6 +75,16 @@ class ConfigAPI(BaseConfigArgs):
         """
         return self.get(section=developer, option=key)
 
+    def api_tokens(self) -> MappingProxyType[str, MappingProxyType[str, str]]:
+        """全てのAPIトークンを、値を補間した状態で読み出す
+
+        Returns:
+            MappingProxyType[str, MappingProxyType[str, str]]: 開発者名とキーからAPIトークンへの対応
+        """
+        return MappingProxyType(
+            {section: MappingProxyType(dict(self.config[section])) for section in self.config.sections()},
+        )
+
 
 class ConfigBOT(BaseConfigArgs):
     """BOT設定ファイルの読み込みを行うクラス
@@ -130,26 +176,11 @@ class ConfigBOT(BaseConfigArgs):
         Returns:
             list[str]: ツールの除外リスト
         """
-
-        def convert_str_to_list(arg: str) -> list[str]:
-            """空白かピリオドで分割された文字列をlist[str]に変換する
-
-            Args:
-                arg (str): 変換するstr
-
-            Returns:
-                list[str]: 変換されたlist[str]
-            """
-            parsed_arg: list[str] = [s for s in re.split(r"\W", arg.strip("[").strip("]").strip()) if len(s) != 0]
-            return parsed_arg
-
-        try:
-            exclusions = self.get(section="Discord.Tool", option="exclusions")
-        except KeyError:
-            msg = "Not found: section 'Discord.Task' or property 'exclusions'"
-            self._logger.exception(msg)
+        if not self.config.has_option("Discord.Tool", "exclusions"):
+            msg = "Not found: section 'Discord.Tool' or property 'exclusions'"
+            self._logger.info(msg)
             return []
-        tool_exclusion = convert_str_to_list(exclusions)
+        tool_exclusion = _split_list(self.get(section="Discord.Tool", option="exclusions"))
         msg = f"Excluded tools: [{', '.join(tool_exclusion)}]"
         self._logger.info(msg)
         return tool_exclusion
@@ -159,6 +190,294 @@ class ConfigBOT(BaseConfigArgs):
         msg = "Unexpected access"
         raise NameError(msg)
 
+    @property
+    def tool_inclusion(self) -> list[str] | None:
+        """ツールの包含リストを取得する
+
+        Returns:
+            list[str] | None: ツールの包含リスト (未設定の場合はNoneで、全てのツールが対象)
+        """
+        if not self.config.has_option("Discord.Tool", "inclusions"):
+            return None
+        value = self.config.get("Discord.Tool", "inclusions")
+        return _split_list(value)
+
+    @tool_inclusion.setter
+    def tool_inclusion(self, value: list[str]) -> None:  # noqa: ARG002
+        msg = "Unexpected access"
+        self._logger.error(msg)
+        raise NameError(msg)
+
+    @property
+    def tool_import_workers(self) -> int:
+        """ツールのインポートに使うスレッド数を取得する
+
+        Returns:
+            int: スレッド数 (未設定の場合は1で、逐次インポートとなる)
+        """
+        if not self.config.has_option("Discord.Tool", "import_workers"):
+            return 1
+        return self.config.getint("Discord.Tool", "import_workers")
+
+    @tool_import_workers.setter
+    def tool_import_workers(self, value: int) -> None:  # noqa: ARG002
+        msg = "Unexpected access"
+        self._logger.error(msg)
+        raise NameError(msg)
+
+    @property
+    def tool_prune_patterns(self) -> list[str] | None:
+        """ツールの探索時に枝刈りするディレクトリ名のパターンを取得する
+
+        Returns:
+            list[str] | None: パターンのリスト (未設定の場合はNoneで、既定のパターンを使う)
+        """
+        if not self.config.has_option("Discord.Tool", "prune_patterns"):
+            return None
+        value = self.config.get("Discord.Tool", "prune_patterns")
+        return _split_list(value)
+
+    @tool_prune_patterns.setter
+    def tool_prune_patterns(self, value: list[str]) -> None:  # noqa: ARG002
+        msg = "Unexpected access"
+        self._logger.error(msg)
+        raise NameError(msg)
+
+    @property
+    def tool_loading_mode(self) -> TOOL_LOADING_MODES:
+        """ツールの読み込み方法を取得する
+
+        Returns:
+            TOOL_LOADING_MODES: "eager" (起動時に全て読み込む、既定値) または "lazy" (初回の呼び出し時に読み込む)
+        """
+        if not self.config.has_option("Discord.Tool", "loading"):
+            return "eager"
+        value = self.config.get("Discord.Tool", "loading").strip().lower()
+        if value == "eager":
+            return "eager"
+        if value == "lazy":
+            return "lazy"
+        msg = f"Invalid value of option 'loading' in the section 'Discord.Tool': {value}"
+        self._logger.error(msg)
+        raise ValueError(msg)
+
+    @tool_loading_mode.setter
+    def tool_loading_mode(self, value: str) -> None:  # noqa: ARG002
+        msg = "Unexpected access"
+        self._logger.error(msg)
+        raise NameError(msg)
+
+    @property
+    def tool_register_timeout(self) -> float:
+        """ツール1つのCogの生成と登録 (`add_cog`) を待つ秒数を取得する
+
+        Returns:
+            float: 秒数 (未設定の場合は30秒)
+        """
+        if not self.config.has_option("Discord.Tool", "register_timeout"):
+            return 30.0
+        return self.config.getfloat("Discord.Tool", "register_timeout")
+
+    @tool_register_timeout.setter
+    def tool_register_timeout(self, value: float) -> None:  # noqa: ARG002
+        msg = "Unexpected access"
+        self._logger.error(msg)
+        raise NameError(msg)
+
+    @property
+    def tool_hot_reload(self) -> bool:
+        """変更されたツールのファイルを、BOTを再起動せずに読み込み直すかどうかを取得する
+
+        Returns:
+            bool: 読み込み直す場合はTrue (未設定の場合はFalse)
+        """
+        if not self.config.has_option("Discord.Tool", "hot_reload"):
+            return False
+        return self.config.getboolean("Discord.Tool", "hot_reload")
+
+    @tool_hot_reload.setter
+    def tool_hot_reload(self, value: bool) -> None:  # noqa: ARG002
+        msg = "Unexpected access"
+        self._logger.error(msg)
+        raise NameError(msg)
+
+    @property
+    def tool_profile_import(self) -> bool:
+        """起動時のツールのimportを、cProfileで計測するかどうかを取得する
+
+        Returns:
+            bool: 計測する場合はTrue (未設定の場合はFalse)
+        """
+        if not self.config.has_option("Discord.Tool", "profile_import"):
+            return False
+        return self.config.getboolean("Discord.Tool", "profile_import")
+
+    @tool_profile_import.setter
+    def tool_profile_import(self, value: bool) -> None:  # noqa: ARG002
+        msg = "Unexpected access"
+        self._logger.error(msg)
+        raise NameError(msg)
+
+    @property
+    def config_hot_reload(self) -> bool:
+        """設定ファイルの変更を監視し、BOTを再起動せずに読み込み直すかどうかを取得する
+
+        Returns:
+            bool: 読み込み直す場合はTrue (未設定の場合はFalse)
+        """
+        if not self.config.has_option("Discord.Config", "hot_reload"):
+            return False
+        return self.config.getboolean("Discord.Config", "hot_reload")
+
+    @config_hot_reload.setter
+    def config_hot_reload(self, value: bool) -> None:  # noqa: ARG002
+        msg = "Unexpected access"
+        self._logger.error(msg)
+        raise NameError(msg)
+
+    @property
+    def channel_cache_ttl(self) -> float | None:
+        """キャッシュしたチャンネルのインスタンスを使う秒数を取得する
+
+        Returns:
+            float | None: 秒数 (未設定の場合はNoneで、削除や更新のイベントがあるまで使い続ける)
+        """
+        if not self.config.has_option("Discord.ChannelCache", "ttl"):
+            return None
+        return self.config.getfloat("Discord.ChannelCache", "ttl")
+
+    @channel_cache_ttl.setter
+    def channel_cache_ttl(self, value: float | None) -> None:  # noqa: ARG002
+        msg = "Unexpected access"
+        self._logger.error(msg)
+        raise NameError(msg)
+
+    @property
+    def channel_negative_ttl(self) -> float:
+        """REST APIで見つからなかった・権限が無かったチャンネルの結果を使う秒数を取得する
+
+        Returns:
+            float: 秒数 (未設定の場合は30秒、0の場合は保持しない)
+        """
+        if not self.config.has_option("Discord.ChannelCache", "negative_ttl"):
+            return DEFAULT_NEGATIVE_TTL
+        return self.config.getfloat("Discord.ChannelCache", "negative_ttl")
+
+    @channel_negative_ttl.setter
+    def channel_negative_ttl(self, value: float) -> None:  # noqa: ARG002
+        msg = "Unexpected access"
+        self._logger.error(msg)
+        raise NameError(msg)
+
+    @property
+    def log_queue_size(self) -> int:
+        """ログチャンネルへ送るログを、キューに置ける数の上限を取得する
+
+        Returns:
+            int: 上限 (未設定の場合は1000)
+        """
+        if not self.config.has_option("Discord.Log", "queue_size"):
+            return DEFAULT_QUEUE_SIZE
+        value = self.config.getint("Discord.Log", "queue_size")
+        if value <= 0:
+            msg = f"Invalid value of option 'queue_size' in the section 'Discord.Log': {value}"
+            self._logger.error(msg)
+            raise ValueError(msg)
+        return value
+
+    @log_queue_size.setter
+    def log_queue_size(self, value: int) -> None:  # noqa: ARG002
+        msg = "Unexpected access"
+        self._logger.error(msg)
+        raise NameError(msg)
+
+    @property
+    def log_overflow(self) -> LOG_OVERFLOW_POLICIES:
+        """ログチャンネルへ送るログのキューが、一杯の場合の扱いを取得する
+
+        Returns:
+            LOG_OVERFLOW_POLICIES: "drop_oldest" (古いログを捨てる、既定値)、
+                "drop_debug" (DEBUGのログを先に捨てる) または "block" (ログを出したスレッドを待たせる)
+        """
+        if not self.config.has_option("Discord.Log", "overflow"):
+            return "drop_oldest"
+        value = self.config.get("Discord.Log", "overflow").strip().lower()
+        if value == "drop_oldest":
+            return "drop_oldest"
+        if value == "drop_debug":
+            return "drop_debug"
+        if value == "block":
+            return "block"
+        msg = f"Invalid value of option 'overflow' in the section 'Discord.Log': {value}"
+        self._logger.error(msg)
+        raise ValueError(msg)
+
+    @log_overflow.setter
+    def log_overflow(self, value: str) -> None:  # noqa: ARG002
+        msg = "Unexpected access"
+        self._logger.error(msg)
+        raise NameError(msg)
+
+    @property
+    def log_flight_recorder_to_channel(self) -> bool:
+        """`--flight-recorder` で残したDEBUGのログを、ログチャンネルにも書き出すかどうかを取得する
+
+        Returns:
+            bool: 書き出す場合はTrue (未設定の場合はFalseで、ファイルにだけ書き出す)
+        """
+        if not self.config.has_option("Discord.Log", "flight_recorder_to_channel"):
+            return False
+        return self.config.getboolean("Discord.Log", "flight_recorder_to_channel")
+
+    @log_flight_recorder_to_channel.setter
+    def log_flight_recorder_to_channel(self, value: bool) -> None:  # noqa: ARG002
+        msg = "Unexpected access"
+        self._logger.error(msg)
+        raise NameError(msg)
+
+    @property
+    def gateway_settings(self) -> GatewaySettings:
+        """ゲートウェイに接続するときの、インテントとキャッシュの設定を取得する
+
+        Returns:
+            GatewaySettings: 設定値 (未設定の項目は `auto` で、読み込んだツールの要件から決める)
+        """
+        section = "Discord.Gateway"
+        intents: tuple[str, ...] = ("auto",)
+        if self.config.has_option(section, "intents"):
+            intents = tuple(s.lower() for s in _split_list(self.config.get(section, "intents")))
+        member_cache: tuple[str, ...] = ("auto",)
+        if self.config.has_option(section, "member_cache"):
+            member_cache = tuple(s.lower() for s in _split_list(self.config.get(section, "member_cache")))
+        chunk_guilds_at_startup: bool | None = None
+        if self.config.has_option(section, "chunk_guilds_at_startup"):
+            value = self.config.get(section, "chunk_guilds_at_startup").strip().lower()
+            if value != "auto":
+                chunk_guilds_at_startup = self.config.getboolean(section, "chunk_guilds_at_startup")
+        max_messages: int | None = None
+        if self.config.has_option(section, "max_messages"):
+            value = self.config.get(section, "max_messages").strip().lower()
+            if value == "none":
+                max_messages = 0
+            elif value != "auto":
+                max_messages = self.config.getint(section, "max_messages")
+                if max_messages < 0:
+                    msg = f"Invalid value of option 'max_messages' in the section '{section}': {value}"
+                    self._logger.error(msg)
+                    raise ValueError(msg)
+        return GatewaySettings(
+            intents=intents,
+            member_cache=member_cache,
+            chunk_guilds_at_startup=chunk_guilds_at_startup,
+            max_messages=max_messages,
+        )
+
+    @gateway_settings.setter
+    def gateway_settings(self, value: GatewaySettings) -> None:  # noqa: ARG002
+        msg = "Unexpected access"
+        self._logger.error(msg)
+        raise NameError(msg)
+
     def get_default_channel_id(self, name: DEFAULT_CHANNELS) -> int:
         """デフォルトチャンネルのIDを取得する
 
@@ -235,10 +554,148 @@ class ConfigBOT(BaseConfigArgs):
             self._logger.warning(msg)
         return _mapping
 
+    def settings(self) -> BotSettings:
+        """設定ファイルを解析し、変更できない設定値にまとめる
+
+        Returns:
+            BotSettings: BOTの設定値
+        """
+        channels = self.get_channel_to_id_mapping()
+        tool = ToolSettings(
+            exclusions=tuple(self.tool_exclusion),
+            inclusions=_tuple_or_none(self.tool_inclusion),
+            import_workers=self.tool_import_workers,
+            prune_patterns=_tuple_or_none(self.tool_prune_patterns),
+            loading_mode=self.tool_loading_mode,
+            register_timeout=self.tool_register_timeout,
+            hot_reload=self.tool_hot_reload,
+            profile_import=self.tool_profile_import,
+        )
+        channel_cache = ChannelCacheSettings(
+            ttl=self.channel_cache_ttl,
+            negative_ttl=self.channel_negative_ttl,
+        )
+        log = LogSettings(
+            queue_size=self.log_queue_size,
+            overflow=self.log_overflow,
+            flight_recorder_to_channel=self.log_flight_recorder_to_channel,
+        )
+        return BotSettings(
+            name=self.name,
+            description=self.description,
+            discord_token=self.discord_token,
+            dev_channel_id=self.get_default_channel_id(name="dev_channel"),
+            log_channel_id=self.get_default_channel_id(name="log_channel"),
+            channels=MappingProxyType(channels),
+            channel_names=MappingProxyType({channel_id: name for name, channel_id in channels.items()}),
+            tool=tool,
+            config_hot_reload=self.config_hot_reload,
+            channel_cache=channel_cache,
+            log=log,
+            gateway=self.gateway_settings,
+        )
+
+
+def _tuple_or_none(values: list[str] | None) -> tuple[str, ...] | None:
+    return None if values is None else tuple(values)
+
+
+class ConfigRegistry:
+    """ツールの設定ファイルを解析済みの状態でキャッシュする
+
+    設定ファイルは、設定ファイルのディレクトリからの相対パスで探す。
+    ファイルの (mtime, サイズ, inode) が変わった場合は解析し直す。
+    上限を超えた場合は、最も長く使われていないものから捨てる。
+    ただし、`set_value` で変更してまだ書き込んでいない値を持つ設定は、ファイルが変わっても捨てない。
+
+    Args:
+        config_dir (Path): 設定ファイルのディレクトリ
+        logger (logging.Logger): Logger
+        max_entries (int): キャッシュする設定ファイルの数の上限
+    """
+
+    def __init__(
+        self,
+        *,
+        config_dir: Path,
+        logger: logging.Logger,
+        max_entries: int = DEFAULT_REGISTRY_SIZE,
+    ) -> None:
+        self._config_dir = config_dir
+        self._logger = logger
+        self._max_entries = max_entries
+        self._entries: OrderedDict[Path, tuple[tuple[int, int, int] | None, BaseConfigArgs]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+        self._evictions = 0
+
+    def get(self, file_stem: str) -> BaseConfigArgs:
+        """設定ファイル `{file_stem}.ini` を、解析済みの状態で取得する
+
+        Args:
+            file_stem (str): 設定ファイルの名前 (設定ファイルのディレクトリからの相対パス)
+
+        Returns:
+            BaseConfigArgs: 設定ファイル
+        """
+        filepath = self._config_dir / f"{file_stem}.ini"
+        stamp = self._stamp(filepath)
+        with self._lock:
+            entry = self._entries.get(filepath)
+            if entry is not None and (entry[0] == stamp or entry[1].has_pending_writes):
+                self._hits += 1
+                self._entries.move_to_end(filepath)
+                return entry[1]
+            if entry is not None:
+                self._invalidations += 1
+            self._misses += 1
+        config = BaseConfigArgs(
+            filepath=filepath,
+            logger=self._logger,
+        )
+        # 解析をここで済ませ、以降の参照ではファイルを読まない
+        _ = config.config
+        with self._lock:
+            self._entries[filepath] = (stamp, config)
+            self._entries.move_to_end(filepath)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+        return config
+
+    def clear(self) -> None:
+        """キャッシュした設定を全て捨てる"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> ConfigRegistryStats:
+        """キャッシュの統計を返す"""
+        with self._lock:
+            return ConfigRegistryStats(
+                hits=self._hits,
+                misses=self._misses,
+                invalidations=self._invalidations,
+                evictions=self._evictions,
+                size=len(self._entries),
+            )
+
+    @staticmethod
+    def _stamp(filepath: Path) -> tuple[int, int, int] | None:
+        try:
+            stat = filepath.stat()
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
 
 class ConfigArgs:
     """設定ファイルを読み込むクラス
 
+    `start_watching` で設定ファイルの監視を始めると、変更されたファイルをバックグラウンドで解析し直し、
+    `snapshot` を新しい設定値に差し替えてから、`subscribe` で登録した関数に変更を通知する。
+
     Args:
         bot_name (str): BOTの名前
         logger (logging.Logger): ロガー
@@ -255,6 +712,11 @@ class ConfigArgs:
         api_filepath = config_dir / "API.ini" if config_dir is not None else None
         bot_filepath = config_dir / f"{bot_name}.ini" if config_dir is not None else None
         self._logger = logger
+        self._bot_name = bot_name
+        self.registry = ConfigRegistry(
+            config_dir=config_dir if config_dir is not None else DEFAULT_CONFIG_DIR,
+            logger=self._logger,
+        )
         self.api = ConfigAPI(
             logger=self._logger,
             filepath=api_filepath,
@@ -264,17 +726,166 @@ class ConfigArgs:
             logger=self._logger,
             filepath=bot_filepath,
         )
+        self._snapshot: ConfigSnapshot | None = None
+        self._snapshot_lock = threading.Lock()
+        self._subscribers: list[Callable[[ConfigChange], None]] = []
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._watcher: FileWatcher | None = None
+
+    @property
+    def snapshot(self) -> ConfigSnapshot:
+        """設定ファイルを1度だけ解析した、変更できない設定値
+
+        属性の参照だけで値を取り出せるため、ツールのコマンドやイベントの中など、頻繁に呼ばれる処理ではこちらを使う。
+        `bot` や `api` の `set_value` で変更した値は反映されない。
+        設定ファイルの再読み込みでは、解析し終えた新しい設定値に丸ごと差し替えるため、
+        参照した設定値が途中の状態になることはない。
+
+        Returns:
+            ConfigSnapshot: 設定値
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._snapshot_lock:
+                if self._snapshot is None:
+                    self._snapshot = ConfigSnapshot(bot=self.bot.settings(), api_tokens=self.api.api_tokens())
+                snapshot = self._snapshot
+        return snapshot
+
+    @property
+    def is_watching(self) -> bool:
+        return self._watcher is not None and self._watcher.is_running
+
+    def subscribe(self, callback: Callable[[ConfigChange], None]) -> Callable[[], None]:
+        """設定値の変更を通知する関数を登録する
+
+        `start_watching` を呼んだイベントループの中で呼ばれるため、時間のかかる処理はタスクに分けること。
+
+        Args:
+            callback (Callable[[ConfigChange], None]): 変更を受け取る関数
+
+        Returns:
+            Callable[[], None]: 登録を解除する関数
+        """
+        self._subscribers.append(callback)
+
+        def unsubscribe() -> None:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+        return unsubscribe
+
+    def reload(self) -> ConfigChange | None:
+        """設定ファイルを解析し直し、設定値を差し替えて変更を通知する
+
+        解析に失敗した場合は、変更前の設定値を使い続ける。
+        `enable_write_behind` で遅れて書き込む設定は、まだ書き込んでいない変更を書き込んでから解析し直し、
+        読み込み直した `bot` と `api` に引き継ぐ。
+
+        Returns:
+            ConfigChange | None: 変更 (変更が無い場合や、解析に失敗した場合はNone)
+        """
+        with self._snapshot_lock:
+            previous = self._snapshot
+            # `set_value` で変更してまだ書き込んでいない値を、解析し直す前にファイルへ書き込む
+            self.api.flush()
+            self.bot.flush()
+            try:
+                api = ConfigAPI(logger=self._logger, filepath=self.api.filepath)
+                bot = ConfigBOT(bot_name=self._bot_name, logger=self._logger, filepath=self.bot.filepath)
+                if self.bot.channel_list_section_name != DEFAULT_CHANNEL_LIST_SECTION_NAME:
+                    bot.channel_list_section_name = self.bot.channel_list_section_name
+                snapshot = ConfigSnapshot(bot=bot.settings(), api_tokens=api.api_tokens())
+            except (OSError, ValueError, KeyError, configparser.Error):
+                msg = "Failed to reload the config files, keeping the previous values"
+                self._logger.exception(msg)
+                return None
+            self.api.hand_over_write_behind(api)
+            self.bot.hand_over_write_behind(bot)
+            self.api, self.bot, self._snapshot = api, bot, snapshot
+        if previous is None:
+            return None
+        change = ConfigChange.between(previous, snapshot)
+        if len(change.changed) == 0:
+            return None
+        msg = f"Reloaded the config files: {sorted(change.changed)}"
+        self._logger.info(msg)
+        self._publish(change)
+        return change
+
+    def start_watching(
+        self,
+        *,
+        backend: WATCHER_BACKENDS = "auto",
+        poll_interval: float = 1.0,
+        debounce: float = 0.2,
+    ) -> None:
+        """設定ファイルの監視を開始する (イベントループの中から呼ぶ)
+
+        Args:
+            backend (WATCHER_BACKENDS): ファイルの監視の方法
+            poll_interval (float): ポーリングの間隔 (秒)
+            debounce (float): 変更をまとめて扱うまでの待ち時間 (秒)
+        """
+        if self.is_watching:
+            return
+        self._loop = asyncio.get_running_loop()
+        # 変更前の設定値と比べられるよう、監視を始める前に解析しておく
+        _ = self.snapshot
+        self._watcher = FileWatcher(
+            file_paths=[self.bot.filepath, self.api.filepath],
+            callback=self._on_files_changed,
+            logger=self._logger,
+            backend=backend,
+            poll_interval=poll_interval,
+            debounce=debounce,
+        )
+        self._watcher.start()
+
+    def _on_files_changed(self, file_paths: list[Path], detected_at: float) -> None:  # noqa: ARG002
+        """監視スレッドから呼ばれ、設定ファイルを読み込み直す"""
+        self.reload()
+
+    def stop_watching(self) -> None:
+        """設定ファイルの監視を停止する"""
+        if self._watcher is not None:
+            self._watcher.stop()
+            self._watcher = None
+        self._loop = None
+
+    def _publish(self, change: ConfigChange) -> None:
+        """監視スレッドからの変更は、イベントループに渡してから通知する"""
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            self._notify(change)
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._notify(change)
+        else:
+            loop.call_soon_threadsafe(self._notify, change)
+
+    def _notify(self, change: ConfigChange) -> None:
+        for callback in tuple(self._subscribers):
+            try:
+                callback(change)
+            except Exception:
+                msg = f"Failed to handle the config change {sorted(change.changed)}"
+                self._logger.exception(msg)
 
     def load_config_from(self, *, file_stem: str) -> BaseConfigArgs:
         """設定ファイルを読み込む
 
+        BOTの設定ファイルと同じディレクトリから探し、解析済みの設定をキャッシュから返す
+        (ファイルが更新されていれば解析し直す)。
+
         Args:
             file_stem (str): 設定ファイルの名前
 
         Returns:
             BaseConfigArgs: 設定ファイル
         """
-        return BaseConfigArgs(
-            filepath=DEFAULT_CONFIG_DIR / f"{file_stem}.ini",
-            logger=self._logger,
-        )
+        return self.registry.get(file_stem)
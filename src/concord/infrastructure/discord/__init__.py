@@ -1,3 +1,4 @@
 from .agent import Agent
+from .host import AgentHost
 
-__all__ = ["Agent"]
+__all__ = ["Agent", "AgentHost"]
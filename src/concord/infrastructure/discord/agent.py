@@ -1,23 +1,52 @@
+import asyncio
+import cProfile
 import logging
 import pprint
+import time
 import traceback
+from concurrent.futures import Executor
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
+import aiohttp
 from discord import Intents
 from discord.ext.commands import Bot, Cog
 
 from concord.cli.arguments import on_launch
 from concord.infrastructure.config.from_files import ConfigArgs
-from concord.infrastructure.discord.dynamic_import import import_classes_from_directory
-from concord.infrastructure.logging.logger_factory import get_logger
-from concord.infrastructure.logging.logger_notifier import DiscordLogHandler
+from concord.infrastructure.discord.dynamic_import import (
+    ToolModuleCache,
+    import_classes_from_bundle,
+    import_classes_from_directory,
+)
+from concord.infrastructure.discord.gateway_profile import (
+    BASE_REQUIREMENTS,
+    apply_gateway_profile,
+    resolve_gateway_profile,
+    tool_requirements,
+)
+from concord.infrastructure.discord.hot_reload import ToolReloader
+from concord.infrastructure.discord.lazy_loader import LazyToolLoader
+from concord.infrastructure.discord.memory import current_rss_bytes
+from concord.infrastructure.discord.startup_timeline import StartupTimeline
+from concord.infrastructure.discord.static_discovery import StaticDiscoveryCache, discover_cogs_from_directory
+from concord.infrastructure.discord.tool_bundle import is_tool_bundle
+from concord.infrastructure.discord.tool_filter import ToolFilter
+from concord.infrastructure.discord.tool_manifest import DEFAULT_CACHE_DIR, manifest_path_for
+from concord.infrastructure.logging.logger_factory import DEFAULT_LOG_DIR, get_flight_recorder, get_logger
+from concord.infrastructure.logging.logger_notifier import DiscordLogHandler, LogPipeline
+from concord.model.argument import Args
+from concord.model.config import flush_pending_writes
+from concord.model.gateway_profile import GatewayProfile, GatewayRequirements, GatewaySettings
+from concord.model.startup import PreparedTools
+from concord.model.tool_registration import ToolRegistration, ToolStartupReport
 
 from .cached_channels import CachedChannels
 from .on_connecting import OnConnecting
 from .on_ready import OnReady
 
 if TYPE_CHECKING:
+    from concord.model.discovered_tool import DiscoveredCog
     from concord.model.import_class import LoadedClass
 
 
@@ -30,37 +59,115 @@ class Agent:
         - bot_name (str): BOTの名前
         - tool_directory_path (Path, optional): ツールのディレクトリパス
         - is_debug (bool, optional): デバッグモードかどうか
+        - flight_recorder (int, optional): 直近のDEBUGのログをメモリに残し、ERROR以上のログが出たときに書き出す数
+
+        1つのプロセスで複数のBOTを動かす場合 (`AgentHost`) は、引数を `args` で与え、
+        ツールのモジュールのキャッシュ・スレッドプール・HTTPのコネクタを共有する。
+
+    Args:
+        utils_dirpath (Path | None): configs・logs・cachesを置くディレクトリ
+        args (Args | None): 起動時の引数 (Noneの場合はコマンドラインから読む)
+        module_cache (ToolModuleCache | None): 他のBOTと共有する、ツールのimportの結果
+        executor (Executor | None): 他のBOTと共有する、ツールの並列のimportに使うスレッドプール
+        connector (aiohttp.BaseConnector | None): 他のBOTと共有する、DiscordとのHTTPのコネクタ
     """
 
-    def __init__(self, utils_dirpath: Path | None = None) -> None:
+    def __init__(
+        self,
+        utils_dirpath: Path | None = None,
+        *,
+        args: Args | None = None,
+        module_cache: ToolModuleCache | None = None,
+        executor: Executor | None = None,
+        connector: aiohttp.BaseConnector | None = None,
+    ) -> None:
+        self.timeline = StartupTimeline()
         log_dirpath = utils_dirpath / "logs" if utils_dirpath is not None else None
         config_dirpath = utils_dirpath / "configs" if utils_dirpath is not None else None
-        args = on_launch()
+        self._cache_dirpath = utils_dirpath / "caches" if utils_dirpath is not None else DEFAULT_CACHE_DIR
+        self._log_dirpath = log_dirpath or DEFAULT_LOG_DIR
+        if args is None:
+            with self.timeline.phase("on_launch"):
+                args = on_launch()
         log_level = logging.DEBUG if args.is_debug else logging.INFO
+        self._bot_name = args.bot_name
+        self._module_cache = module_cache
+        self._executor = executor
+        self.import_memory_bytes: int | None = None
         self.logger = get_logger(
             name=args.bot_name,
             level=log_level,
             log_dir=log_dirpath,
+            flight_recorder=args.flight_recorder,
         )
         self._tool_directory_paths = args.tool_directory_paths
-        self.config = ConfigArgs(
-            bot_name=args.bot_name,
-            logger=self.logger,
-            config_dir=config_dirpath,
-        )
-        self.bot = Bot(
-            intents=Intents.all(),
-            command_prefix=("/"),
-            description=self.config.bot.description,
-            # help_command=None,
-        )
+        with self.timeline.phase("config"):
+            self.config = ConfigArgs(
+                bot_name=args.bot_name,
+                logger=self.logger,
+                config_dir=config_dirpath,
+            )
+        bot_options: dict[str, Any] = {} if connector is None else {"connector": connector}
+        with self.timeline.phase("bot init"):
+            self.bot = Bot(
+                # 接続する前に `run` で、ツールが必要とするインテントとキャッシュに絞る
+                intents=Intents.all(),
+                command_prefix=("/"),
+                description=self.config.bot.description,
+                # help_command=None,
+                **bot_options,
+            )
         self.cached_channels = CachedChannels(
             bot=self.bot,
             config=self.config,
             logger=self.logger,
+            channel_cache_ttl=self.config.bot.channel_cache_ttl,
+            channel_negative_ttl=self.config.bot.channel_negative_ttl,
         )
+        self.cached_channels.register_listeners()
+        self.config.subscribe(self.cached_channels.on_config_change)
+        self.lazy_tools: LazyToolLoader | None = None
+        if self.config.bot.tool_loading_mode == "lazy":
+            self.lazy_tools = LazyToolLoader(
+                bot=self.bot,
+                cog_factory=lambda cog_class: cog_class(agent=self),
+                logger=self.logger,
+            )
+        self.startup_report: ToolStartupReport | None = None
+        self.tool_reloader: ToolReloader | None = None
+        if self.config.bot.tool_hot_reload is True:
+            if self.lazy_tools is not None:
+                msg = "Hot reload is not supported with lazy tool loading, disabled"
+                self.logger.warning(msg)
+            else:
+                self.tool_reloader = ToolReloader(
+                    bot=self.bot,
+                    cog_factory=lambda cog_class: cog_class(agent=self),
+                    logger=self.logger,
+                    tool_filter=self._create_tool_filter(StaticDiscoveryCache(logger=self.logger)),
+                    tool_roots=self._tool_directory_paths,
+                )
+        self.connection: OnConnecting | None = None
+        self.gateway_profile: GatewayProfile | None = None
+        self.log_pipeline: LogPipeline | None = None
+        self._log_handler: DiscordLogHandler | None = None
+        self._started = False
+        self._starting = False
+        self._loaded_extensions: list[str] | None = None
+        self._prepared_tools: asyncio.Task[PreparedTools] | None = None
+        self._import_profile: cProfile.Profile | None = None
+        if self.config.bot.tool_profile_import is True:
+            self._import_profile = cProfile.Profile()
+        self._close_bot = self.bot.close
+        self.bot.setup_hook = self.setup_hook  # type: ignore[method-assign]
+        self.bot.close = self.close  # type: ignore[method-assign]
         self.bot.event(self.on_ready)
 
+    @property
+    def bot_name(self) -> str:
+        """BOTの名前 (起動時の引数)"""
+        return self._bot_name
+
     async def greetings(self) -> str:
         """グリーティングメッセージを返す"""
         user = self.bot.user
@@ -73,51 +180,150 @@ class Agent:
         msg += f"Channels: {len(list(self.bot.get_all_channels()))}"
         return msg
 
+    async def setup_hook(self) -> None:
+        """setup_hookのオーバーライド (ゲートウェイへの接続前に1回だけ呼ばれる)
+
+        - デフォルトコグの追加
+        """
+        self.timeline.mark("setup_hook")
+        self.logger.info("function `setup_hook` called")
+
+        # Add: cog
+        with self.timeline.phase("add default cogs"):
+            self.connection = OnConnecting(logger=self.logger)
+            await self.bot.add_cog(self.connection)
+            await self.bot.add_cog(OnReady(bot=self.bot, logger=self.logger))
+        self.logger.info("add cog `OnConnecting` and `OnReady`")
+
+    async def close(self) -> None:
+        """closeのオーバーライド
+
+        - ログチャンネルへのログを送りきってから、HTTPのセッションとゲートウェイへの接続を閉じる
+        """
+        await self._close_log_pipeline()
+        await self._close_bot()
+
+    async def _close_log_pipeline(self) -> None:
+        """ログチャンネルへのログの送信を終える (2回目以降は何もしない)"""
+        if self._log_handler is not None:
+            self.logger.removeHandler(self._log_handler)
+            recorder = get_flight_recorder(self.logger.name)
+            if recorder is not None:
+                recorder.remove_target(self._log_handler)
+            self._log_handler = None
+        pipeline, self.log_pipeline = self.log_pipeline, None
+        if pipeline is None:
+            return
+        await pipeline.close()
+        stats = pipeline.stats()
+        msg = f"log pipeline: {stats.shipped} shipped, {stats.failed} failed, {stats.dropped} dropped"
+        msg += f" ({stats.dropped_overflow} overflow, {stats.dropped_debug} debug,"
+        msg += f" {stats.dropped_timeout} timeout, {stats.dropped_closed} closed)"
+        self.logger.info(msg)
+
     async def on_ready(self) -> None:
         """on_readyのオーバーライド
 
-        - デフォルトコグの追加
-        - extensionの読み込み
+        `on_ready` はゲートウェイへの再接続 (セッションの張り直し) のたびに呼ばれるため、
+        起動処理は成功するまで1回ずつ行い、成功した後は何もしない (再接続の記録は `OnConnecting` が行う)。
+        起動処理が失敗した場合は、次の `on_ready` でやり直す。
+        """
+        if self._started:
+            self.logger.info("function `on_ready` called after reconnecting, skip startup")
+            return
+        if self._starting:
+            # 起動処理の途中で再接続しても、二重に起動処理をしない
+            self.logger.info("function `on_ready` called during startup, skip startup")
+            return
+        self._starting = True
+        self.timeline.mark("ready")
+        try:
+            await self._startup()
+        except Exception:
+            self.logger.exception("Startup failed, retry on the next `on_ready`")
+            raise
+        else:
+            self._started = True
+        finally:
+            self._starting = False
+
+    async def _startup(self) -> None:
+        """初回の `on_ready` で1回だけ行う起動処理
+
+        - extensionの読み込み (`run` で接続と並行に始めたimportの完了を待ってから、Cogを登録する)
+        - 全てのチャンネルの取得と、送信できるかの確認
         - ログイン確認
         - ログチャンネルへのログ送信
+        - 起動のタイムラインの書き出しと、devチャンネルへの要約の投稿
         """
         self.logger.info("function `on_ready` called")
 
-        # Add: cog
-        await self.bot.add_cog(OnConnecting(logger=self.logger))
-        await self.bot.add_cog(OnReady(bot=self.bot, logger=self.logger))
-        self.logger.info("add cog `OnConnecting` and `OnReady`")
+        # Load: extension (起動処理のやり直しでは、登録済みのツールを登録し直さない)
+        loaded_extensions = self._loaded_extensions
+        if loaded_extensions is None:
+            with self.timeline.phase("wait tool import"):
+                prepared = await self._wait_prepared_tools()
+            with self.timeline.phase("tool registration"):
+                if self.lazy_tools is not None:
+                    loaded_extensions = await self._register_lazy_tools(self.lazy_tools, prepared)
+                else:
+                    loaded_extensions = await self._load_tools(prepared)
+            self._loaded_extensions = loaded_extensions
+            self.timeline.mark("tools attached")
 
-        # Load: extension
-        loaded_extensions: list[str] = []
-        for tool_directory_path in self._tool_directory_paths:
-            tools: list[LoadedClass[type[Cog]]] = import_classes_from_directory(
-                directory_path=tool_directory_path.as_posix(),
-                base_class=Cog,
-                include_name=["__tool__.py"],
-                logger=self.logger,
-            )
-            for tool in tools:
-                try:
-                    await self.bot.add_cog(tool.class_type(agent=self))
-                    loaded_extensions.append(tool.class_type.__name__)
-                except Exception:
-                    msg = f"failed to load extension : {tool.name}\n{traceback.format_exc()}"
-                    self.logger.exception(msg)
-                    raise
-
-        msg = f"load extension from `tool_directory_paths`: {loaded_extensions}"
-        self.logger.info(msg)
+            msg = f"load extension from `tool_directory_paths`: {loaded_extensions}"
+            self.logger.info(msg)
+            if self.tool_reloader is not None:
+                self.tool_reloader.start()
+            if self.config.bot.config_hot_reload is True:
+                self.config.start_watching()
+
+        # Check: 全てのチャンネル (設定ファイルの誤りや権限の不足を、ツールが使う前に見つける)
+        with self.timeline.phase("channel prewarm"):
+            channel_report = await self.cached_channels.prewarm()
+        self.logger.info(channel_report.format())
 
         # Log: ログイン確認
-        msg = await self.greetings()
+        with self.timeline.phase("greetings"):
+            msg = await self.greetings()
         self.logger.info(msg)
 
         # Log: ログチャンネルへのログ送信 (ログイン後から送信可能になる)
-        self.logger.addHandler(DiscordLogHandler(self.cached_channels.log_channel))
-        self.logger.info("Enabled logging to discord")
+        # ログの送信はBOTのイベントループのタスクで行う (HTTPのセッションを共有し、終了時に送りきる)
+        if self.log_pipeline is None:
+            self._enable_log_channel()
 
         # Check: Post message
+        with self.timeline.phase("dev channel messages"):
+            await self._send_startup_messages(loaded_extensions)
+            await self.cached_channels.dev_channel.send(f"```\n{channel_report.format()}\n```")
+        self.timeline.mark("first message posted")
+        self.logger.info(self._format_timeline(self.timeline))
+
+        # Report: 起動のタイムライン (起動時間の悪化に気付けるよう、devチャンネルにも要約を投稿する)
+        await self._write_startup_report()
+        await self.cached_channels.dev_channel.send(f"```\n{self.timeline.summary()}\n```")
+        msg = "Sent message to dev channel"
+        self.logger.info(msg)
+
+    def _enable_log_channel(self) -> None:
+        """ログチャンネルへのログの送信を始める"""
+        self.log_pipeline = LogPipeline(
+            self.cached_channels.log_channel,
+            maxsize=self.config.bot.log_queue_size,
+            overflow=self.config.bot.log_overflow,
+        )
+        self.log_pipeline.start()
+        self._log_handler = DiscordLogHandler(self.log_pipeline)
+        self.logger.addHandler(self._log_handler)
+        recorder = get_flight_recorder(self.logger.name)
+        if recorder is not None and self.config.bot.log_flight_recorder_to_channel is True:
+            # ERROR以上のログが出たときに、直近のDEBUGのログもログチャンネルに送る
+            recorder.add_target(self._log_handler)
+        self.logger.info("Enabled logging to discord")
+
+    async def _send_startup_messages(self, loaded_extensions: list[str]) -> None:
+        """devチャンネルに、起動の挨拶と使えるコマンド・隔離したツールを投稿する"""
         await self.cached_channels.dev_channel.send("Good morning, Master.\nGood work today.")
         if len(loaded_extensions) > 0:
             await self.cached_channels.dev_channel.send(
@@ -130,9 +336,247 @@ class Agent:
             )
         else:
             await self.cached_channels.dev_channel.send("No commands available")
-        msg = "Sent message to dev channel"
+        if self.startup_report is not None and len(self.startup_report.quarantined) > 0:
+            await self.cached_channels.dev_channel.send(
+                "Quarantined tools:\n"
+                + "\n".join(
+                    f"- {registration.name}: {registration.error}" for registration in self.startup_report.quarantined
+                ),
+            )
+
+    async def _write_startup_report(self) -> None:
+        """起動のタイムライン (とimportのプロファイル) を、ログのディレクトリに書き出す"""
+        try:
+            written = await asyncio.to_thread(
+                self.timeline.write,
+                self._log_dirpath,
+                self._bot_name,
+                profile=self._import_profile,
+            )
+        except OSError:
+            self.logger.exception("Failed to write startup report")
+            return
+        msg = f"wrote startup report: {[path.as_posix() for path in written]}"
         self.logger.info(msg)
 
+    def start_preparing_tools(self, *, after: "asyncio.Future[Any] | None" = None) -> "asyncio.Task[PreparedTools]":
+        """ツールの準備 (import、遅延読み込みの場合は静的解析) をワーカースレッドで始める
+
+        既に始めている場合は、そのタスクを返す。
+
+        Args:
+            after (asyncio.Future[Any] | None): 完了を待ってから始めるタスク
+                (複数のBOTのimportを順に行い、BOTごとのメモリの増加量を測るため)
+
+        Returns:
+            asyncio.Task[PreparedTools]: 準備のタスク
+        """
+        if self._prepared_tools is None:
+            self._prepared_tools = asyncio.create_task(self._prepare_tools(after))
+        return self._prepared_tools
+
+    async def _prepare_tools(self, after: "asyncio.Future[Any] | None" = None) -> PreparedTools:
+        """ワーカースレッドで、ツールのimport (遅延読み込みの場合は静的解析) を行う"""
+        if after is not None:
+            # 先のBOTの準備が失敗しても、このBOTの準備は行う
+            await asyncio.wait([after])
+        return await asyncio.to_thread(self._prepare_tools_sync)
+
+    async def _wait_prepared_tools(self) -> PreparedTools:
+        """`run` で始めたツールの準備の完了を待つ (始まっていない場合は、ここで準備する)"""
+        return await self.start_preparing_tools()
+
+    def _prepare_tools_sync(self) -> PreparedTools:
+        """ツールをimport (遅延読み込みの場合は静的解析) し、Cogの生成・登録の直前まで済ませる
+
+        ゲートウェイへの接続と並行に、ワーカースレッドで実行される。
+        Cogの生成はイベントループで行う (コンストラクタが `tasks.loop` のタスクを開始するため)。
+        設定の `profile_import` が有効な場合は、cProfileで計測する。
+        """
+        self.timeline.mark("tool import started")
+        rss_before = current_rss_bytes()
+        if self._import_profile is not None:
+            self._import_profile.enable()
+        try:
+            return self._import_tools()
+        finally:
+            if self._import_profile is not None:
+                self._import_profile.disable()
+            self.import_memory_bytes = current_rss_bytes() - rss_before
+            self.timeline.mark("tool import finished")
+
+    def _import_tools(self) -> PreparedTools:
+        """ツールのディレクトリとバンドルを順に読み込む"""
+        cache = StaticDiscoveryCache(self._cache_dirpath / "static_discovery.json", logger=self.logger)
+        tool_filter = self._create_tool_filter(cache)
+        tools: list[LoadedClass[type[Cog]]] = []
+        cogs: list[DiscoveredCog] = []
+        for tool_directory_path in self._tool_directory_paths:
+            if is_tool_bundle(tool_directory_path):
+                # バンドルは、ファイル単位で遅延させられないため遅延読み込みでもimportする
+                tools.extend(
+                    import_classes_from_bundle(
+                        tool_directory_path,
+                        base_class=Cog,
+                        logger=self.logger,
+                        tool_filter=tool_filter,
+                        module_cache=self._module_cache,
+                    ),
+                )
+            elif self.lazy_tools is not None:
+                discovered = discover_cogs_from_directory(
+                    directory_path=tool_directory_path.as_posix(),
+                    include_name=["__tool__.py"],
+                    logger=self.logger,
+                    prune_patterns=self.config.bot.tool_prune_patterns,
+                    manifest_path=manifest_path_for(self._cache_dirpath, tool_directory_path),
+                    cache=cache,
+                )
+                cogs.extend(tool_filter.select_cogs(tool_directory_path.resolve(), discovered))
+            else:
+                tools.extend(
+                    import_classes_from_directory(
+                        directory_path=tool_directory_path.as_posix(),
+                        base_class=Cog,
+                        include_name=["__tool__.py"],
+                        logger=self.logger,
+                        max_workers=self._import_workers(),
+                        prune_patterns=self.config.bot.tool_prune_patterns,
+                        manifest_path=manifest_path_for(self._cache_dirpath, tool_directory_path),
+                        tool_filter=tool_filter,
+                        module_cache=self._module_cache,
+                        executor=self._executor,
+                    ),
+                )
+        self._save_discovery_cache(cache)
+        return PreparedTools(classes=tuple(tools), cogs=tuple(cogs), skipped=tool_filter.skipped)
+
+    def _import_workers(self) -> int:
+        """importに使うスレッド数 (cProfileは有効にしたスレッドしか計測しないため、計測中は逐次importする)"""
+        if self._import_profile is not None:
+            return 1
+        return self.config.bot.tool_import_workers
+
+    async def _load_tools(self, prepared: PreparedTools) -> list[str]:
+        """importしたツールのCogを並行に生成・登録する
+
+        登録に失敗したツールやタイムアウトしたツールは隔離し、他のツールの登録は続ける。
+        """
+        tools = prepared.classes
+        start = time.perf_counter()
+        timeout = self.config.bot.tool_register_timeout
+        results = await asyncio.gather(*(self._register_tool(tool, timeout) for tool in tools))
+        self.startup_report = ToolStartupReport(
+            registrations=tuple(registration for registration, _ in results),
+            elapsed_seconds=time.perf_counter() - start,
+            skipped=prepared.skipped,
+        )
+        self.logger.info(self._format_startup_report(self.startup_report))
+
+        for tool, (_, cog) in zip(tools, results, strict=True):
+            if cog is not None and self.tool_reloader is not None and tool.module_path is not None:
+                self.tool_reloader.track(tool.module_path, cog)
+        return [registration.name for registration in self.startup_report.registered]
+
+    async def _register_tool(
+        self,
+        tool: "LoadedClass[type[Cog]]",
+        timeout_seconds: float,
+    ) -> tuple[ToolRegistration, Cog | None]:
+        """ツールのCogを生成・登録する (失敗しても例外は送出せず、結果に記録する)
+
+        `timeout_seconds` は生成と登録を合わせた時間に対して適用する。
+        """
+        name = tool.class_type.__name__
+        start = time.perf_counter()
+        constructed = start
+        cog: Cog | None = None
+        error: str | None = None
+        try:
+            cog = tool.class_type(agent=self)
+            constructed = time.perf_counter()
+            # Cogの生成は同期処理のため中断できない。生成にかかった時間を、登録を待つ時間から差し引く
+            remaining = timeout_seconds - (constructed - start)
+            if remaining <= 0:
+                raise TimeoutError  # noqa: TRY301
+            await asyncio.wait_for(self.bot.add_cog(cog), timeout=remaining)
+        except TimeoutError:
+            error = f"timed out after {timeout_seconds:.1f}s"
+            msg = f"failed to load extension : {tool.name} ({error})"
+            self.logger.exception(msg)
+            if cog is not None and self.bot.get_cog(cog.qualified_name) is cog:
+                await self.bot.remove_cog(cog.qualified_name)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            msg = f"failed to load extension : {tool.name}\n{traceback.format_exc()}"
+            self.logger.exception(msg)
+        if error is not None and constructed == start:
+            constructed = time.perf_counter()
+        finished = time.perf_counter()
+        self.timeline.record(f"add_cog {name}", start, finished)
+        registration = ToolRegistration(
+            name=name,
+            module_path=tool.module_path,
+            construct_seconds=constructed - start,
+            register_seconds=finished - constructed,
+            error=error,
+        )
+        return registration, cog if error is None else None
+
+    @staticmethod
+    def _format_startup_report(report: ToolStartupReport) -> str:
+        msg = f"registered {len(report.registered)}/{len(report.registrations)} tools"
+        msg += f" in {report.elapsed_seconds * 1000:.1f} ms"
+        lines = [msg]
+        for registration in sorted(report.registrations, key=lambda r: r.total_seconds, reverse=True):
+            status = "ok" if registration.succeeded else f"quarantined ({registration.error})"
+            lines.append(
+                f"  {registration.name}: construct {registration.construct_seconds * 1000:.1f} ms,"
+                f" register {registration.register_seconds * 1000:.1f} ms, {status}",
+            )
+        lines.extend(f"  {skipped.name}: skipped ({skipped.reason})" for skipped in report.skipped)
+        return "\n".join(lines)
+
+    async def _register_lazy_tools(self, lazy_tools: LazyToolLoader, prepared: PreparedTools) -> list[str]:
+        """静的解析で見つけたツールを、スタブとして登録する (モジュールは初回の呼び出し時にimportされる)
+
+        ツールのバンドルは、ファイル単位で遅延させられないため起動時に読み込む。
+        """
+        results = await asyncio.gather(
+            *(self._register_tool(tool, self.config.bot.tool_register_timeout) for tool in prepared.classes),
+        )
+        registered = [registration.name for registration, _ in results if registration.succeeded]
+        registered.extend(await lazy_tools.register(list(prepared.cogs)))
+        return registered
+
+    def _create_tool_filter(self, cache: StaticDiscoveryCache) -> ToolFilter:
+        """設定ファイルの `[Discord.Tool]` の inclusions と exclusions から、ツールの包含・除外の規則を作る"""
+        return ToolFilter(
+            inclusions=self.config.bot.tool_inclusion,
+            exclusions=self.config.bot.tool_exclusion,
+            cache=cache,
+            logger=self.logger,
+        )
+
+    @staticmethod
+    def _format_timeline(timeline: StartupTimeline) -> str:
+        lines = ["startup timeline:", timeline.format()]
+        # importが接続 (`run` から `ready` まで) に隠れた時間と、`ready` がimportを待った時間
+        overlap = timeline.overlap(("run", "ready"), ("tool import started", "tool import finished"))
+        ready = timeline.seconds("ready")
+        finished = timeline.seconds("tool import finished")
+        if overlap is not None:
+            lines.append(f"  tool import overlapped the connection for {overlap * 1000:.1f} ms")
+        if ready is not None and finished is not None:
+            lines.append(f"  ready waited {max(0.0, finished - ready) * 1000:.1f} ms for the tool import")
+        return "\n".join(lines)
+
+    def _save_discovery_cache(self, cache: StaticDiscoveryCache) -> None:
+        try:
+            cache.save()
+        except OSError:
+            self.logger.exception("Failed to write discovery cache")
+
     async def run(self) -> None:
         """BOTを起動する
 
@@ -142,4 +586,69 @@ class Agent:
         Returns:
             None
         """
-        await self.bot.start(self.config.bot.discord_token)
+        self.timeline.mark("run")
+        # ツールのimportをゲートウェイへの接続と並行に進め、初回の `on_ready` で登録する
+        self.start_preparing_tools()
+        try:
+            settings = self.config.bot.gateway_settings
+            if settings.needs_tools:
+                # インテントはIDENTIFYで送るため、ツールの要件が分かるまで接続を待つ (ログインはimportと並行に行う)
+                await self.bot.login(self.config.bot.discord_token)
+                with self.timeline.phase("gateway profile"):
+                    requirements = await self._wait_gateway_requirements()
+                self._apply_gateway_profile(settings, requirements)
+                await self.bot.connect()
+            else:
+                self._apply_gateway_profile(settings, BASE_REQUIREMENTS)
+                await self.bot.start(self.config.bot.discord_token)
+        finally:
+            self._discard_prepared_tools()
+            self.config.stop_watching()
+            # 遅れて書き込む予定の設定ファイルを、終了前に書き込む
+            await asyncio.to_thread(flush_pending_writes)
+            if self.tool_reloader is not None:
+                self.tool_reloader.stop()
+            if self.lazy_tools is not None:
+                stats = self.lazy_tools.stats()
+                msg = f"lazy tools: {len(stats.never_loaded)}/{stats.total} never loaded {list(stats.never_loaded)}"
+                self.logger.info(msg)
+            registry_stats = self.config.registry.stats()
+            msg = f"config registry: {registry_stats.hits} hits, {registry_stats.misses} misses"
+            msg += f" ({registry_stats.invalidations} invalidated, {registry_stats.evictions} evicted)"
+            self.logger.info(msg)
+            channel_stats = self.cached_channels.channel_cache_stats()
+            msg = f"channel cache: {channel_stats.hits} hits, {channel_stats.misses} misses"
+            msg += f" ({channel_stats.evictions} evicted)"
+            self.logger.info(msg)
+            # `close` を経ずに終わった場合 (接続の失敗など)
+            await self._close_log_pipeline()
+
+    async def _wait_gateway_requirements(self) -> GatewayRequirements:
+        """ツールの準備の完了を待ち、ツールが必要とするインテントとキャッシュを求める
+
+        準備に失敗した場合は、BOT自体が必要とするものだけで接続する (失敗は `on_ready` で改めて報告される)。
+        """
+        task = self.start_preparing_tools()
+        await asyncio.wait([task])
+        if task.cancelled() or task.exception() is not None:
+            msg = "Tool import failed, connecting with the base gateway profile"
+            self.logger.warning(msg)
+            return BASE_REQUIREMENTS
+        return tool_requirements(task.result())
+
+    def _apply_gateway_profile(self, settings: GatewaySettings, requirements: GatewayRequirements) -> None:
+        """設定とツールの要件から決めたインテントとキャッシュを、接続前のBotに反映する"""
+        self.gateway_profile = resolve_gateway_profile(settings, requirements)
+        apply_gateway_profile(self.bot, self.gateway_profile)
+        self.logger.info(self.gateway_profile.format())
+
+    def _discard_prepared_tools(self) -> None:
+        """登録されずに終わったツールの準備を片付ける (ログインの失敗などで `on_ready` が来なかった場合)"""
+        task = self._prepared_tools
+        if task is None or self._started or self._starting:
+            return
+        if not task.done():
+            task.cancel()
+        elif not task.cancelled() and task.exception() is not None:
+            msg = "Tool import failed before the bot became ready"
+            self.logger.error(msg, exc_info=task.exception())
@@ -1,21 +1,48 @@
+import asyncio
 import logging
+import time
 from typing import Any
 
-from discord import Thread
+from discord import Guild, RawThreadDeleteEvent, Thread
 from discord.abc import GuildChannel
 from discord.channel import TextChannel
+from discord.errors import DiscordException, Forbidden, NotFound
 from discord.ext.commands import Bot
 
 from concord.infrastructure.config.from_files import ConfigArgs
+from concord.infrastructure.discord.channel_cache import DEFAULT_NEGATIVE_TTL, ChannelCache
+from concord.infrastructure.discord.channel_index import ChannelNameIndex
+from concord.model.channel_cache import ChannelCacheStats
+from concord.model.channel_prewarm import ChannelCheck, ChannelPrewarmReport
+from concord.model.config_snapshot import ConfigChange
+
+DEFAULT_PREWARM_CONCURRENCY = 8
+
+
+def _can_send(channel: Any) -> bool:  # noqa: ANN401
+    """BOTがチャンネルにメッセージを送信できるかどうか"""
+    guild = getattr(channel, "guild", None)
+    me = getattr(guild, "me", None)
+    if me is None or not hasattr(channel, "send"):
+        return False
+    permissions = channel.permissions_for(me)
+    if isinstance(channel, Thread):
+        return bool(permissions.send_messages_in_threads)
+    return bool(permissions.send_messages)
 
 
 class CachedChannels:
     """インスタンスをキャッシュするチャンネル
 
+    スレッドはIDでの取得 (`get_textchannel_or_thread_from_id` など) だけに対応し、
+    チャンネル名の索引には含めない (チャンネル名での取得はGuildChannelだけを返す)。
+
     Args:
         bot (Bot): Bot
         config (ConfigArgs): Config
         logger (logging.Logger): Logger
+        channel_cache_ttl (float | None): チャンネルのインスタンスを使う秒数 (Noneの場合はイベントで捨てるまで)
+        channel_negative_ttl (float): REST APIで見つからない・権限が無い結果を使う秒数
 
     Attributes:
         bot (Bot): Bot
@@ -26,16 +53,24 @@ class CachedChannels:
         log_channel (TextChannel | Thread): Log Channel
     """
 
-    def __init__(self, *, bot: Bot, config: ConfigArgs, logger: logging.Logger) -> None:
+    def __init__(
+        self,
+        *,
+        bot: Bot,
+        config: ConfigArgs,
+        logger: logging.Logger,
+        channel_cache_ttl: float | None = None,
+        channel_negative_ttl: float = DEFAULT_NEGATIVE_TTL,
+    ) -> None:
         self.bot = bot
         self._logger = logger
         self._channel_name2id = config.bot.get_channel_to_id_mapping()
         self._channel_id2name = config.bot.get_id_to_channel_mapping()
-        self._cached_channel_from_id: dict[int, TextChannel | Thread] = {}
+        self._channel_cache = ChannelCache(ttl=channel_cache_ttl, negative_ttl=channel_negative_ttl)
+        self._fetching: dict[int, asyncio.Task[Any]] = {}
         self._log_channel_id = config.bot.get_default_channel_id(name="log_channel")
         self._dev_channel_id = config.bot.get_default_channel_id(name="dev_channel")
-        self._dev_channel: TextChannel | Thread | None = None
-        self._log_channel: TextChannel | Thread | None = None
+        self._channel_index = ChannelNameIndex()
 
     @property
     def channel_name2id(self) -> dict[str, int]:
@@ -59,11 +94,7 @@ class CachedChannels:
 
     @property
     def dev_channel(self) -> TextChannel | Thread:
-        if self._dev_channel is None:
-            self._dev_channel = self.get_textchannel_or_thread_from_id(
-                _id=self._dev_channel_id,
-            )
-        return self._dev_channel
+        return self.get_textchannel_or_thread_from_id(_id=self._dev_channel_id)
 
     @dev_channel.setter
     def dev_channel(self, value: Any) -> None:  # noqa: ARG002, ANN401
@@ -73,11 +104,7 @@ class CachedChannels:
 
     @property
     def log_channel(self) -> TextChannel | Thread:
-        if self._log_channel is None:
-            self._log_channel = self.get_textchannel_or_thread_from_id(
-                _id=self._log_channel_id,
-            )
-        return self._log_channel
+        return self.get_textchannel_or_thread_from_id(_id=self._log_channel_id)
 
     @log_channel.setter
     def log_channel(self, value: Any) -> None:  # noqa: ARG002, ANN401
@@ -85,6 +112,89 @@ class CachedChannels:
         self._logger.error(msg)
         raise NameError(msg)
 
+    def channel_cache_stats(self) -> ChannelCacheStats:
+        """チャンネルのインスタンスのキャッシュの統計を返す"""
+        return self._channel_cache.stats()
+
+    def register_listeners(self) -> None:
+        """チャンネル名の索引とインスタンスのキャッシュを更新するイベントリスナーを、Botに登録する
+
+        接続のたびに (`on_ready`) 索引を作り直してキャッシュを捨て、その間はチャンネルとサーバーの増減・更新、
+        スレッドの作成・更新・削除で差分だけを反映する。
+        スレッドの削除は、Botのキャッシュに無いスレッドでも届く `on_raw_thread_delete` で扱う。
+        """
+        self.bot.add_listener(self.on_ready, "on_ready")
+        self.bot.add_listener(self.on_guild_channel_create, "on_guild_channel_create")
+        self.bot.add_listener(self.on_guild_channel_delete, "on_guild_channel_delete")
+        self.bot.add_listener(self.on_guild_channel_update, "on_guild_channel_update")
+        self.bot.add_listener(self.on_thread_create, "on_thread_create")
+        self.bot.add_listener(self.on_thread_update, "on_thread_update")
+        self.bot.add_listener(self.on_raw_thread_delete, "on_raw_thread_delete")
+        self.bot.add_listener(self.on_guild_join, "on_guild_join")
+        self.bot.add_listener(self.on_guild_remove, "on_guild_remove")
+
+    async def on_ready(self) -> None:
+        # 再接続でセッションを張り直した場合、Botのキャッシュのインスタンスは作り直されている
+        self._channel_cache.clear()
+        await self.rebuild_channel_index()
+
+    async def rebuild_channel_index(self) -> None:
+        """全てのサーバーのチャンネルから、チャンネル名の索引を作り直す"""
+        self._channel_index.rebuild(self.bot.get_all_channels())
+        msg = f"Built channel name index: {len(self._channel_index)} channels"
+        self._logger.debug(msg)
+
+    async def on_guild_channel_create(self, channel: GuildChannel) -> None:
+        self._channel_index.add(channel)
+
+    async def on_guild_channel_delete(self, channel: GuildChannel) -> None:
+        self._channel_index.discard(channel.id)
+        self._channel_cache.invalidate(channel.id)
+
+    async def on_guild_channel_update(self, before: GuildChannel, after: GuildChannel) -> None:  # noqa: ARG002
+        self._channel_index.add(after)
+        self._channel_cache.invalidate(after.id)
+
+    async def on_thread_create(self, thread: Thread) -> None:
+        # 作られる前や参加する前に、見つからない・権限が無いと記録したスレッドも取得できるようになる
+        self._channel_cache.discard_failure(thread.id)
+        self._channel_cache.invalidate(thread.id)
+
+    async def on_thread_update(self, before: Thread, after: Thread) -> None:  # noqa: ARG002
+        self._channel_cache.discard_failure(after.id)
+        if after.archived:
+            self._channel_cache.invalidate(after.id)
+
+    async def on_raw_thread_delete(self, payload: RawThreadDeleteEvent) -> None:
+        self._channel_cache.invalidate(payload.thread_id)
+        self._channel_cache.discard_failure(payload.thread_id)
+
+    async def on_guild_join(self, guild: Guild) -> None:
+        # 参加したサーバーのチャンネルは、見つからない・権限が無いと記録したものでも取得できる
+        self._channel_cache.clear_failures()
+        self._channel_index.add_guild(guild)
+
+    async def on_guild_remove(self, guild: Guild) -> None:
+        self._channel_index.discard_guild(guild)
+        self._channel_cache.invalidate_guild(guild.id)
+
+    def on_config_change(self, change: ConfigChange) -> None:
+        """設定ファイルの再読み込みで変更された対応関係とデフォルトチャンネルだけを差し替える
+
+        Args:
+            change (ConfigChange): 設定値の変更
+        """
+        bot = change.current.bot
+        if change.touches("bot.channels"):
+            self._channel_name2id = dict(bot.channels)
+            self._channel_id2name = dict(bot.channel_names)
+            msg = f"Updated channel mapping: {sorted(self._channel_name2id)}"
+            self._logger.info(msg)
+        if change.touches("bot.dev_channel_id"):
+            self._dev_channel_id = bot.dev_channel_id
+        if change.touches("bot.log_channel_id"):
+            self._log_channel_id = bot.log_channel_id
+
     def get_textchannel_or_thread_from_id(
         self,
         *,
@@ -98,23 +208,174 @@ class CachedChannels:
         Returns:
             GuildChannel: Channel
         """
+        channel_from_key = self._get_channel(_id)
+        if channel_from_key is None:
+            msg = f"[Error] No match channel from ChannelId: {_id}"
+            self._logger.error(msg)
+            raise KeyError(msg)
+        if not isinstance(channel_from_key, (TextChannel, Thread)):
+            msg = f"[Error] No TextChannel or Thread from ChannelId: {_id}"
+            self._logger.error(msg)
+            raise KeyError(msg)
+        return channel_from_key
+
+    def _get_channel(self, _id: int) -> Any | None:  # noqa: ANN401
+        """キャッシュかBotのキャッシュから、チャンネルのインスタンスを取得する"""
         # return cached channel if exists
-        if _id in self._cached_channel_from_id:
-            return self._cached_channel_from_id[_id]
+        channel = self._channel_cache.get(_id)
+        if channel is not None:
+            return channel
 
         # get channel from discord api
-        channel_from_key = self.bot.get_channel(_id)
-        if channel_from_key is None:
-            msg = f"[Error] No match channel from ChannelId: {_id}"
+        channel = self.bot.get_channel(_id)
+        if channel is not None:
+            self._channel_cache.put(_id, channel)
+        return channel
+
+    async def _fetch_channel(self, _id: int) -> Any:  # noqa: ANN401
+        """キャッシュとBotのキャッシュに無いチャンネルを、REST APIで取得する
+
+        同じIDの取得が並行した場合は、1回の通信の結果を共有する。
+        見つからない・権限が無い場合は、その結果を短い間だけ保持し、REST APIを呼ばずにエラーにする。
+        """
+        channel = self._get_channel(_id)
+        if channel is not None:
+            return channel
+        reason = self._channel_cache.get_failure(_id)
+        if reason is not None:
+            msg = f"[Error] {reason} from ChannelId: {_id}"
             self._logger.error(msg)
             raise KeyError(msg)
+        task = self._fetching.get(_id)
+        if task is None:
+            task = asyncio.create_task(self._fetch_channel_from_api(_id))
+            self._fetching[_id] = task
+            task.add_done_callback(lambda _: self._fetching.pop(_id, None))
+        # 待っている1つの呼び出しが取り消されても、他の呼び出しのための通信は続ける
+        return await asyncio.shield(task)
+
+    async def _fetch_channel_from_api(self, _id: int) -> Any:  # noqa: ANN401
+        self._channel_cache.record_fetch()
+        try:
+            channel = await self.bot.fetch_channel(_id)
+        except NotFound:
+            reason = "No match channel"
+        except Forbidden:
+            reason = "No access to channel"
+        else:
+            self._channel_cache.put(_id, channel)
+            return channel
+        self._channel_cache.put_failure(_id, reason)
+        msg = f"[Error] {reason} from ChannelId: {_id}"
+        self._logger.error(msg)
+        raise KeyError(msg)
+
+    async def fetch_textchannel_or_thread_from_id(
+        self,
+        *,
+        _id: int,
+    ) -> TextChannel | Thread:
+        """idからサーバー内のTextChannelかThreadを取得する (Botのキャッシュに無い場合はREST APIで取得する)
+
+        アーカイブされたスレッドや、接続直後でまだBotのキャッシュに無いチャンネルも取得できる。
+
+        Args:
+            _id (int): ChannelId
+
+        Returns:
+            TextChannel | Thread: Channel
+        """
+        channel_from_key = await self._fetch_channel(_id)
         if not isinstance(channel_from_key, (TextChannel, Thread)):
             msg = f"[Error] No TextChannel or Thread from ChannelId: {_id}"
             self._logger.error(msg)
             raise KeyError(msg)
-        self._cached_channel_from_id[_id] = channel_from_key
         return channel_from_key
 
+    async def fetch_channel_from_key(
+        self,
+        *,
+        key: str,
+    ) -> GuildChannel:
+        """keyからサーバー内のGuildChannelを取得する (Botのキャッシュに無い場合はREST APIで取得する)
+
+        Args:
+            key (str): 設定ファイルで定義されたチャンネルのキー
+
+        Returns:
+            GuildChannel: Channel
+        """
+        if key in self._channel_name2id:
+            return await self.fetch_channel_from_id_or_name(_id=self._channel_name2id[key])
+        msg = f"No match: {key}"
+        self._logger.error(msg)
+        raise KeyError(msg)
+
+    async def fetch_channel_from_id_or_name(
+        self,
+        *,
+        _id: int | None = None,
+        channel_name: str | None = None,
+    ) -> GuildChannel:
+        """idかチャンネル名のどちらかからサーバー内のGuildChannelを取得する
+
+        idの場合は、Botのキャッシュに無ければREST APIで取得する。
+        チャンネル名の場合は、REST APIに名前での検索が無いため `get_channel_from_id_or_name` と同じになる。
+
+        Args:
+            _id (int): ChannelId
+            channel_name (str): ChannelName
+
+        Returns:
+            GuildChannel: Channel
+        """
+        if _id is None:
+            return self.get_channel_from_id_or_name(channel_name=channel_name)
+        channel_from_key = await self._fetch_channel(_id)
+        if not isinstance(channel_from_key, GuildChannel):
+            msg = f"Not channel in this server: {_id}"
+            self._logger.error(msg)
+            raise KeyError(msg)
+        return channel_from_key
+
+    async def prewarm(self, *, concurrency: int = DEFAULT_PREWARM_CONCURRENCY) -> ChannelPrewarmReport:
+        """デフォルトチャンネルと `[Discord.Channel]` の全てのチャンネルを並行に取得し、送信できるかを確認する
+
+        接続後に1度呼ぶことで、設定ファイルの誤りや権限の不足を、ツールが初めてチャンネルを使うまで待たずに見つけ、
+        取得したチャンネルをキャッシュしておく。Botのキャッシュに無いチャンネルはREST APIで取得する。
+
+        Args:
+            concurrency (int): 同時にREST APIで取得するチャンネルの数の上限
+
+        Returns:
+            ChannelPrewarmReport: チャンネルごとの結果
+        """
+        targets = {"dev_channel": self._dev_channel_id, "log_channel": self._log_channel_id}
+        for key, _id in self._channel_name2id.items():
+            targets.setdefault(key, _id)
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def check(key: str, _id: int) -> ChannelCheck:
+            started_at = time.perf_counter()
+            async with semaphore:
+                try:
+                    if key in {"dev_channel", "log_channel"}:
+                        channel: Any = await self.fetch_textchannel_or_thread_from_id(_id=_id)
+                    else:
+                        channel = await self.fetch_channel_from_id_or_name(_id=_id)
+                except (KeyError, DiscordException) as e:
+                    error = e.args[0] if isinstance(e, KeyError) and e.args else str(e)
+                    return ChannelCheck(key, _id, time.perf_counter() - started_at, error=error)
+            return ChannelCheck(key, _id, time.perf_counter() - started_at, can_send=_can_send(channel))
+
+        started_at = time.perf_counter()
+        checks = await asyncio.gather(*(check(key, _id) for key, _id in targets.items()))
+        report = ChannelPrewarmReport(checks=tuple(checks), elapsed_seconds=time.perf_counter() - started_at)
+        for failed in report.failed:
+            msg = f"Channel {failed.key} ({failed.channel_id}): {failed.status}"
+            self._logger.warning(msg)
+        return report
+
     def get_channel_from_key(
         self,
         *,
@@ -163,7 +424,7 @@ class CachedChannels:
 
         # id is not None
         if _id is not None:
-            channel_from_key = self.bot.get_channel(_id)
+            channel_from_key = self._get_channel(_id)
             if channel_from_key is None:
                 msg = f"No match: {_id}"
                 self._logger.error(msg)
@@ -176,7 +437,11 @@ class CachedChannels:
 
         # channel_name is not None
         if channel_name is not None:
-            results = [channel for channel in self.bot.get_all_channels() if channel.name == channel_name]
+            if self._channel_index.built:
+                results = self._channel_index.lookup(channel_name)
+            else:
+                # 索引が作られる前 (初回の接続前) は、全てのチャンネルを走査する
+                results = [channel for channel in self.bot.get_all_channels() if channel.name == channel_name]
             if len(results) > 1:
                 msg = f"Too many match: {len(results)} channels has the name."
                 self._logger.error(msg)
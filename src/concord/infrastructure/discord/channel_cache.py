@@ -0,0 +1,150 @@
+import time
+from collections.abc import Callable
+from typing import Any
+
+from concord.model.channel_cache import ChannelCacheStats
+
+DEFAULT_NEGATIVE_TTL = 30.0
+
+
+class ChannelCache:
+    """チャンネルIDからチャンネルのインスタンスへのキャッシュ
+
+    インスタンスは、チャンネルの削除・更新、スレッドのアーカイブ・削除、サーバーからの退出のイベントで捨てる。
+    有効期限 (ttl) を指定した場合は、期限を過ぎたインスタンスも捨てる。
+    REST APIで見つからなかった・権限が無かったチャンネルは、短い有効期限 (negative_ttl) の間だけその結果を保持する。
+
+    Notes:
+        discord.pyのチャンネルのクラスは弱参照を作れない (`__slots__` に `__weakref__` が無い) ため、強参照で保持し、
+        Botのキャッシュから消えたチャンネルはイベントで捨てる
+
+    Args:
+        ttl (float | None): インスタンスを使う秒数 (Noneの場合は、イベントで捨てられるまで使い続ける)
+        negative_ttl (float): 見つからない・権限が無い結果を使う秒数
+        clock (Callable[[], float]): 現在時刻 (秒) を返す関数
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl: float | None = None,
+        negative_ttl: float = DEFAULT_NEGATIVE_TTL,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if ttl is not None and ttl <= 0:
+            msg = f"Invalid channel cache ttl: {ttl}"
+            raise ValueError(msg)
+        if negative_ttl < 0:
+            msg = f"Invalid channel cache negative_ttl: {negative_ttl}"
+            raise ValueError(msg)
+        self._ttl = ttl
+        self._negative_ttl = negative_ttl
+        self._clock = clock
+        self._entries: dict[int, tuple[Any, float]] = {}
+        self._failures: dict[int, tuple[str, float]] = {}
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._fetches = 0
+        self._negative_hits = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, channel_id: int) -> Any | None:  # noqa: ANN401
+        """キャッシュしたインスタンスを返す
+
+        Args:
+            channel_id (int): ChannelId
+
+        Returns:
+            Any | None: チャンネルのインスタンス (無いか、有効期限を過ぎた場合はNone)
+        """
+        entry = self._entries.get(channel_id)
+        if entry is not None and self._ttl is not None and self._clock() - entry[1] > self._ttl:
+            del self._entries[channel_id]
+            self._evictions += 1
+            entry = None
+        if entry is None:
+            self._misses += 1
+            return None
+        self._hits += 1
+        return entry[0]
+
+    def put(self, channel_id: int, channel: Any) -> None:  # noqa: ANN401
+        """インスタンスをキャッシュする"""
+        self._entries[channel_id] = (channel, self._clock())
+
+    def record_fetch(self) -> None:
+        """REST APIでの取得を数える"""
+        self._fetches += 1
+
+    def put_failure(self, channel_id: int, reason: str) -> None:
+        """REST APIで見つからなかった・権限が無かった結果を保持する"""
+        if self._negative_ttl > 0:
+            self._failures[channel_id] = (reason, self._clock() + self._negative_ttl)
+
+    def get_failure(self, channel_id: int) -> str | None:
+        """有効期限内の、見つからなかった・権限が無かった理由を返す
+
+        Args:
+            channel_id (int): ChannelId
+
+        Returns:
+            str | None: 理由 (無いか、有効期限を過ぎた場合はNone)
+        """
+        failure = self._failures.get(channel_id)
+        if failure is None:
+            return None
+        if self._clock() >= failure[1]:
+            del self._failures[channel_id]
+            return None
+        self._negative_hits += 1
+        return failure[0]
+
+    def discard_failure(self, channel_id: int) -> None:
+        """チャンネルの、見つからなかった・権限が無かった結果を捨てる (スレッドが作られた・参加した場合)"""
+        self._failures.pop(channel_id, None)
+
+    def clear_failures(self) -> None:
+        """見つからなかった・権限が無かった結果を全て捨てる (参加するサーバーや権限が変わった場合)"""
+        self._failures.clear()
+
+    def invalidate(self, channel_id: int) -> None:
+        """チャンネルと、その子のスレッドのインスタンスを捨てる"""
+        dropped = [
+            _id
+            for _id, (channel, _) in self._entries.items()
+            if _id == channel_id or getattr(channel, "parent_id", None) == channel_id
+        ]
+        for _id in dropped:
+            del self._entries[_id]
+        self._evictions += len(dropped)
+
+    def invalidate_guild(self, guild_id: int) -> None:
+        """サーバーの全てのチャンネルのインスタンスを捨てる"""
+        dropped = [
+            _id
+            for _id, (channel, _) in self._entries.items()
+            if getattr(getattr(channel, "guild", None), "id", None) == guild_id
+        ]
+        for _id in dropped:
+            del self._entries[_id]
+        self._evictions += len(dropped)
+
+    def clear(self) -> None:
+        """全てのインスタンスを捨てる (再接続でBotのキャッシュが作り直された場合)"""
+        self._evictions += len(self._entries)
+        self._entries.clear()
+        self._failures.clear()
+
+    def stats(self) -> ChannelCacheStats:
+        """キャッシュの統計を返す"""
+        return ChannelCacheStats(
+            hits=self._hits,
+            misses=self._misses,
+            evictions=self._evictions,
+            size=len(self._entries),
+            fetches=self._fetches,
+            negative_hits=self._negative_hits,
+        )
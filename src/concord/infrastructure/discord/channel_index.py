@@ -0,0 +1,76 @@
+from collections.abc import Iterable
+
+from discord import Guild
+from discord.abc import GuildChannel
+
+
+class ChannelNameIndex:
+    """チャンネル名からサーバー内のGuildChannelを引く索引
+
+    `Bot.get_all_channels()` を毎回走査する代わりに、接続時に1度だけ作り、
+    チャンネルやサーバーの増減・名前の変更のイベントで差分だけを更新する。
+    同じ名前のチャンネルが複数ある場合も全て保持する (曖昧さの判定は呼び出し側で行う)。
+    """
+
+    def __init__(self) -> None:
+        self._channels_by_name: dict[str, dict[int, GuildChannel]] = {}
+        self._name_by_id: dict[int, str] = {}
+        self._built = False
+
+    @property
+    def built(self) -> bool:
+        """索引が作られているかどうか (作られる前は、呼び出し側で走査する)"""
+        return self._built
+
+    def __len__(self) -> int:
+        return len(self._name_by_id)
+
+    def rebuild(self, channels: Iterable[GuildChannel]) -> None:
+        """全てのチャンネルから索引を作り直す
+
+        Args:
+            channels (Iterable[GuildChannel]): BOTが参加している全てのサーバーのチャンネル
+        """
+        self._channels_by_name.clear()
+        self._name_by_id.clear()
+        for channel in channels:
+            self.add(channel)
+        self._built = True
+
+    def add(self, channel: GuildChannel) -> None:
+        """チャンネルを追加する (同じIDのチャンネルがある場合は、名前の変更として置き換える)"""
+        self.discard(channel.id)
+        self._channels_by_name.setdefault(channel.name, {})[channel.id] = channel
+        self._name_by_id[channel.id] = channel.name
+
+    def discard(self, channel_id: int) -> None:
+        """チャンネルを削除する (無い場合は何もしない)"""
+        name = self._name_by_id.pop(channel_id, None)
+        if name is None:
+            return
+        channels = self._channels_by_name[name]
+        del channels[channel_id]
+        if not channels:
+            del self._channels_by_name[name]
+
+    def add_guild(self, guild: Guild) -> None:
+        """サーバーの全てのチャンネルを追加する"""
+        for channel in guild.channels:
+            self.add(channel)
+
+    def discard_guild(self, guild: Guild) -> None:
+        """サーバーの全てのチャンネルを削除する"""
+        for channel in guild.channels:
+            self.discard(channel.id)
+
+    def lookup(self, name: str) -> list[GuildChannel]:
+        """名前が一致するチャンネルを返す
+
+        Args:
+            name (str): チャンネル名
+
+        Returns:
+            list[GuildChannel]: 名前が一致するチャンネル (無い場合は空)
+        """
+        channels = self._channels_by_name.get(name)
+        return [] if channels is None else list(channels.values())
@@ -1,6 +1,14 @@
+import copy
+import functools
 import importlib
 import importlib.util
 import inspect
+import os
+import re
+import threading
+import zipimport
+from collections.abc import Callable, Sequence
+from concurrent.futures import Executor, ThreadPoolExecutor
 from logging import Logger
 from pathlib import Path
 from typing import TypeVar, cast
@@ -8,11 +16,82 @@ from typing import TypeVar, cast
 from pyresults import Err, Ok, Result
 
 from concord.exception.import_module import ImportModuleError
+from concord.infrastructure.discord.tool_bundle import read_tool_bundle_manifest
+from concord.infrastructure.discord.tool_filter import ToolFilter
+from concord.infrastructure.discord.tool_manifest import find_tool_files
 from concord.model.import_class import LoadedClass
 
 TypeOfAny = TypeVar("TypeOfAny", bound=type)
 
 
+class ToolModuleCache:
+    """importしたツールのモジュールを、同じプロセスの複数のBOTで共有する
+
+    ファイルの (mtime, サイズ, inode) と基底クラスごとに、importの結果 (見つかったクラス) を保持する。
+    同じファイルを複数のスレッドから同時にimportしようとした場合は、1度だけ実行して結果を共有する。
+    失敗した結果は保持しない (次回にimportし直す)。
+
+    Notes:
+        モジュールのグローバル変数もBOT間で共有される (Cogのインスタンスは、BOTごとに生成される)
+    """
+
+    def __init__(self) -> None:
+        self._entries: dict[tuple[Path, tuple[int, int, int], type | None], list[tuple[str, type]]] = {}
+        self._key_locks: dict[tuple[Path, tuple[int, int, int], type | None], threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        return self._misses
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_or_import(
+        self,
+        module_path: Path,
+        stamp_path: Path,
+        base_class: TypeOfAny | None,
+        load: Callable[[], Result[list[tuple[str, TypeOfAny]], str]],
+    ) -> Result[list[tuple[str, TypeOfAny]], str]:
+        """importの結果を共有する (まだ無い場合は load でimportする)
+
+        Args:
+            module_path (Path): モジュールのファイル
+            stamp_path (Path): 更新を判定するファイル (バンドル内のファイルの場合はバンドル)
+            base_class (TypeOfAny | None): 基底クラス
+            load (Callable[[], Result[list[tuple[str, TypeOfAny]], str]]): importする関数
+
+        Returns:
+            Result[list[tuple[str, TypeOfAny]], str]: importの結果
+        """
+        try:
+            stat = stamp_path.stat()
+        except OSError:
+            return load()
+        key = (module_path, (stat.st_mtime_ns, stat.st_size, stat.st_ino), base_class)
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            with self._lock:
+                cached = self._entries.get(key)
+                if cached is not None:
+                    self._hits += 1
+                    return Ok(cast("list[tuple[str, TypeOfAny]]", list(cached)))
+                self._misses += 1
+            result = load()
+            if result.is_ok():
+                with self._lock:
+                    self._entries[key] = list(result.unwrap())
+            return result
+
+
 def _process_class(
     obj: object,
     base_class: TypeOfAny | None,
@@ -33,13 +112,19 @@ def _import_module(
     module_path: Path,
     base_class: TypeOfAny | None = None,
     logger: Logger | None = None,
+    module_name: str | None = None,
+    importer: zipimport.zipimporter | None = None,
 ) -> Result[list[tuple[str, TypeOfAny]], str]:
     if logger is not None:
         msg = f"Import: {module_path}"
         logger.info(msg)
     try:
-        module_name = f"_dyn_mod_{module_path.name}_{module_path.stat().st_ino}"
-        spec = importlib.util.spec_from_file_location(module_name, str(module_path))
+        if module_name is None:
+            module_name = f"_dyn_mod_{module_path.name}_{module_path.stat().st_ino}"
+        if importer is not None:
+            spec = importer.find_spec(module_name)
+        else:
+            spec = importlib.util.spec_from_file_location(module_name, str(module_path))
         if spec is None or spec.loader is None:
             msg = f"Failed to import {module_path}"
             return Err(msg)
@@ -62,11 +147,79 @@ def _import_module(
         return Err(msg)
 
 
+def import_classes_from_file(
+    file_path: Path,
+    base_class: TypeOfAny | None = None,
+    logger: Logger | None = None,
+    *,
+    module_name: str | None = None,
+) -> list[LoadedClass[TypeOfAny]]:
+    """1つのファイルに含まれるクラスを動的にインポートする
+
+    Args:
+        file_path (Path): インポート対象のファイルパス
+        base_class (TypeOfAny | None): 特定の基底クラスのインスタンスのみを取得する場合に指定
+        logger (Logger | None): ファイルやクラスをロードするログを出力するロガー
+        module_name (str | None): モジュール名 (Noneの場合はファイル名とinode番号から決める)
+
+    Returns:
+        インポートされたクラスのリスト
+
+    Raises:
+        ImportModuleError: インポートに失敗した場合
+    """
+    result = _import_module(file_path, base_class, logger, module_name)
+    if result.is_err():
+        raise ImportModuleError(result.unwrap_err())
+    return [LoadedClass[TypeOfAny](name, cls, file_path) for name, cls in result.unwrap()]
+
+
+def _import_modules(
+    file_paths: list[Path],
+    base_class: TypeOfAny | None,
+    logger: Logger | None,
+    max_workers: int | None,
+    *,
+    module_cache: ToolModuleCache | None = None,
+    executor: Executor | None = None,
+) -> list[Result[list[tuple[str, TypeOfAny]], str]]:
+    """モジュールをインポートし、file_pathsと同じ順序で結果を返す
+
+    max_workersが2以上 (またはNone) の場合は、ソースの読み込み・コンパイル・実行をスレッドプールで並列に行う
+    (executorを指定した場合は、スレッドプールを作らずにそれを使う)
+    """
+
+    def load(file_path: Path) -> Result[list[tuple[str, TypeOfAny]], str]:
+        if module_cache is None:
+            return _import_module(file_path, base_class, logger)
+        return module_cache.get_or_import(
+            file_path,
+            file_path,
+            base_class,
+            lambda: _import_module(file_path, base_class, logger),
+        )
+
+    if max_workers is not None and max_workers <= 1:
+        return [load(file_path) for file_path in file_paths]
+    if executor is not None:
+        return list(executor.map(load, file_paths))
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="concord-import") as pool:
+        # executor.map は入力順に結果を返すため、並列でも順序は決定的になる
+        return list(pool.map(load, file_paths))
+
+
 def import_classes_from_directory(
     directory_path: str,
     include_name: list[str] | None = None,
     base_class: TypeOfAny | None = None,
     logger: Logger | None = None,
+    *,
+    max_workers: int | None = 1,
+    prune_patterns: Sequence[str] | None = None,
+    manifest_path: Path | None = None,
+    tool_filter: ToolFilter | None = None,
+    module_cache: ToolModuleCache | None = None,
+    executor: Executor | None = None,
 ) -> list[LoadedClass[TypeOfAny]]:
     """指定されたディレクトリ内から、include_name に指定されたクラス名の
     ファイルに含まれるクラスを動的にインポートする
@@ -76,9 +229,19 @@ def import_classes_from_directory(
         include_name (list[str] | None): インポート対象のファイル名のリスト (Noneの場合は全てのファイルが対象)
         base_class (TypeOfAny | None): 特定の基底クラスのインスタンスのみを取得する場合に指定
         logger (Logger | None): ファイルやクラスをロードするログを出力するロガー
+        max_workers (int | None): インポートに使うスレッド数 (1以下で逐次実行、Noneでスレッドプールの既定値)
+        prune_patterns (Sequence[str] | None): 探索しないディレクトリ名のパターン (Noneの場合は既定値)
+        manifest_path (Path | None): 探索結果を保存するマニフェストのパス (Noneの場合は毎回全て走査する)
+        tool_filter (ToolFilter | None): ツールの包含・除外の規則 (読み込まないと分かったファイルは実行しない)
+        module_cache (ToolModuleCache | None): 複数のBOTで共有するimportの結果 (Noneの場合は毎回importする)
+        executor (Executor | None): 並列のインポートに使うスレッドプール (Noneの場合は呼び出しごとに作る)
 
     Returns:
         インポートされたクラスのリスト (クラス名, クラスオブジェクト) のタプル
+        (ファイルパス順に並ぶため、並列実行時も順序は変わらない)
+
+    Raises:
+        ImportModuleError: インポートに失敗したファイルがある場合 (失敗した全ファイルのエラーを含む)
     """
     classes: list[LoadedClass[TypeOfAny]] = []
     directory = Path(directory_path)
@@ -89,18 +252,116 @@ def import_classes_from_directory(
         raise FileNotFoundError(msg)
     directory = directory.resolve()
 
-    for file_path in directory.glob("**/*.py"):
-        if include_name and file_path.name not in include_name:
-            continue
+    file_paths = find_tool_files(
+        directory,
+        include_name=include_name,
+        prune_patterns=prune_patterns,
+        manifest_path=manifest_path,
+        logger=logger,
+    )
+    if tool_filter is not None:
+        file_paths = tool_filter.select_files(directory, file_paths)
+    results = _import_modules(
+        file_paths,
+        base_class,
+        logger,
+        max_workers,
+        module_cache=module_cache,
+        executor=executor,
+    )
+
+    errors = [result.unwrap_err() for result in results if result.is_err()]
+    if len(errors) > 0:
+        raise ImportModuleError("\n".join(errors))
+
+    for file_path, result in zip(file_paths, results, strict=True):
+        loaded = [LoadedClass[TypeOfAny](name, cls, file_path) for name, cls in result.unwrap()]
+        if tool_filter is not None:
+            loaded = tool_filter.select_classes(directory, file_path, loaded)
+        classes.extend(loaded)
+
+    return classes
+
+
+def _directory_importer(bundle_importer: zipimport.zipimporter, directory: str) -> zipimport.zipimporter:
+    """バンドルの `zipimporter` から、ディレクトリの中のモジュールを探す `zipimporter` を作る
+
+    探す場所 (`prefix`) だけを変えるため、アーカイブの確認や目次の読み込みをやり直さない。
+    """
+    importer = copy.copy(bundle_importer)
+    importer.prefix = "" if directory == "." else f"{directory.replace('/', os.sep)}{os.sep}"
+    return importer
+
+
+def import_classes_from_bundle(
+    bundle_path: Path,
+    base_class: TypeOfAny | None = None,
+    logger: Logger | None = None,
+    *,
+    tool_filter: ToolFilter | None = None,
+    module_cache: ToolModuleCache | None = None,
+) -> list[LoadedClass[TypeOfAny]]:
+    """ツールのバンドル (zipファイル) に含まれるクラスを、zipimportで動的にインポートする
+
+    ツールファイルの一覧はバンドルのマニフェストから読むため、ディレクトリの走査は行わない。
+    バイトコードを含むバンドルでは、ソースのコンパイルも省かれる
+    (コンパイルしたPythonとバージョンが異なる場合は、zipimportがソースからコンパイルし直す)。
+
+    Args:
+        bundle_path (Path): バンドルのパス
+        base_class (TypeOfAny | None): 特定の基底クラスのインスタンスのみを取得する場合に指定
+        logger (Logger | None): ファイルやクラスをロードするログを出力するロガー
+        tool_filter (ToolFilter | None): ツールの包含・除外の規則
+        module_cache (ToolModuleCache | None): 複数のBOTで共有するimportの結果 (Noneの場合は毎回importする)
 
-        result = _import_module(file_path, base_class, logger)
-        if result.is_err():
-            raise ImportModuleError(result.unwrap_err())
+    Returns:
+        インポートされたクラスのリスト (マニフェストのパス順)
 
-        module_classes: list[LoadedClass[TypeOfAny]] = []
-        for name, cls in result.unwrap():
-            module_classes.append(LoadedClass[TypeOfAny](name, cls))
+    Raises:
+        ImportModuleError: バンドルが読めない場合や、インポートに失敗したファイルがある場合
+    """
+    bundle_path = bundle_path.resolve()
+    manifest = read_tool_bundle_manifest(bundle_path)
+    if logger is not None and manifest.magic != importlib.util.MAGIC_NUMBER.hex():
+        msg = f"Bytecode in {bundle_path} was compiled by another Python version, compiling from source"
+        logger.warning(msg)
+
+    file_paths = [bundle_path / tool.path for tool in manifest.tools]
+    if tool_filter is not None:
+        file_paths = tool_filter.select_files(bundle_path, file_paths)
+    results: list[Result[list[tuple[str, TypeOfAny]], str]] = []
+    # アーカイブの確認と目次の読み込みは、バンドルごとに1回だけ行う
+    bundle_importer = zipimport.zipimporter(str(bundle_path))
+    importers: dict[str, zipimport.zipimporter] = {}
+    for file_path in file_paths:
+        # zipimport はモジュール名の最後の要素をファイル名として探すため、親の部分でツールを区別する
+        parent = file_path.parent.relative_to(bundle_path).as_posix()
+        package = re.sub(r"\W", "_", parent)
+        module_name = f"_dyn_mod_{package}.{file_path.stem}"
+        importer = importers.get(parent)
+        if importer is None:
+            importer = _directory_importer(bundle_importer, parent)
+            importers[parent] = importer
+        if module_cache is None:
+            results.append(_import_module(file_path, base_class, logger, module_name, importer))
+        else:
+            results.append(
+                module_cache.get_or_import(
+                    file_path,
+                    bundle_path,
+                    base_class,
+                    functools.partial(_import_module, file_path, base_class, logger, module_name, importer),
+                ),
+            )
 
-        classes.extend(module_classes)
+    errors = [result.unwrap_err() for result in results if result.is_err()]
+    if len(errors) > 0:
+        raise ImportModuleError("\n".join(errors))
 
+    classes: list[LoadedClass[TypeOfAny]] = []
+    for file_path, result in zip(file_paths, results, strict=True):
+        loaded = [LoadedClass[TypeOfAny](name, cls, file_path) for name, cls in result.unwrap()]
+        if tool_filter is not None:
+            loaded = tool_filter.select_classes(bundle_path, file_path, loaded)
+        classes.extend(loaded)
     return classes
@@ -0,0 +1,230 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from collections.abc import Callable, Iterable
+from logging import Logger
+from pathlib import Path
+from typing import Literal, Protocol
+
+WATCHER_BACKENDS = Literal["auto", "inotify", "polling"]
+
+# <sys/inotify.h>
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_NONBLOCK = 0o0004000
+_IN_CLOEXEC = 0o2000000
+_INOTIFY_EVENT = struct.Struct("iIII")
+_READ_SIZE = 64 * 1024
+
+
+class _Backend(Protocol):
+    name: str
+
+    def poll(self, timeout: float) -> set[Path]: ...
+
+    def close(self) -> None: ...
+
+
+class _InotifyBackend:
+    """inotifyで、監視対象のファイルを含むディレクトリへの書き込み完了とリネームを待つ
+
+    エディタは一時ファイルへ書き込んでからリネームすることが多いため、
+    ファイルではなくディレクトリを監視し、イベントのファイル名で絞り込む。
+    """
+
+    name = "inotify"
+
+    def __init__(self, file_paths: set[Path]) -> None:
+        libc_name = ctypes.util.find_library("c")
+        if not sys.platform.startswith("linux") or libc_name is None:
+            msg = "inotify is not available on this platform"
+            raise OSError(msg)
+        libc = ctypes.CDLL(libc_name, use_errno=True)
+        fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        self._fd: int = fd
+        self._file_paths = file_paths
+        self._directories: dict[int, Path] = {}
+        try:
+            for directory in sorted({file_path.parent for file_path in file_paths}):
+                # バンドル (zipファイル) 内のツールのように、実在しないディレクトリは監視しない
+                if directory.is_dir():
+                    self._directories[self._add_watch(libc, directory)] = directory
+        except OSError:
+            os.close(fd)
+            raise
+
+    def _add_watch(self, libc: ctypes.CDLL, directory: Path) -> int:
+        wd: int = libc.inotify_add_watch(self._fd, os.fsencode(directory), _IN_CLOSE_WRITE | _IN_MOVED_TO)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno), str(directory))
+        return wd
+
+    def poll(self, timeout: float) -> set[Path]:
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if len(readable) == 0:
+            return set()
+        try:
+            data = os.read(self._fd, _READ_SIZE)
+        except BlockingIOError:
+            return set()
+
+        changed: set[Path] = set()
+        offset = 0
+        while offset + _INOTIFY_EVENT.size <= len(data):
+            wd, _, _, length = _INOTIFY_EVENT.unpack_from(data, offset)
+            offset += _INOTIFY_EVENT.size
+            name = data[offset : offset + length].rstrip(b"\0")
+            offset += length
+            directory = self._directories.get(wd)
+            if directory is None or len(name) == 0:
+                continue
+            path = directory / os.fsdecode(name)
+            if path in self._file_paths:
+                changed.add(path)
+        return changed
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+class _PollingBackend:
+    """ファイルの (mtime, サイズ, inode) を定期的に比較する"""
+
+    name = "polling"
+
+    def __init__(self, file_paths: set[Path], stop_event: threading.Event) -> None:
+        self._stop_event = stop_event
+        self._snapshots = {file_path: self._snapshot(file_path) for file_path in file_paths}
+
+    @staticmethod
+    def _snapshot(file_path: Path) -> tuple[int, int, int] | None:
+        try:
+            stat = file_path.stat()
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+    def poll(self, timeout: float) -> set[Path]:
+        self._stop_event.wait(timeout)
+        changed: set[Path] = set()
+        for file_path, previous in self._snapshots.items():
+            current = self._snapshot(file_path)
+            if current is None or current == previous:
+                # 削除中 (リネーム前) のファイルは、再び現れたときに変更として扱う
+                continue
+            self._snapshots[file_path] = current
+            changed.add(file_path)
+        return changed
+
+    def close(self) -> None:
+        pass
+
+
+class FileWatcher:
+    """ファイルの変更を監視し、変更されたファイルをコールバックに渡す
+
+    バックグラウンドのスレッドで監視する。Linuxではinotifyを使い、使えない場合はポーリングに切り替える。
+    短い間隔で続けて起きた変更 (エディタの保存など) は、debounce秒だけ静かになってからまとめて通知する。
+
+    Args:
+        file_paths (Iterable[Path]): 監視するファイル
+        callback (Callable[[list[Path], float], None]): 変更されたファイルと、最初に変更を検知した時刻
+            (`time.perf_counter()`) を受け取る関数 (監視スレッドから呼ばれる)
+        logger (Logger): Logger
+        backend (WATCHER_BACKENDS): 監視の方法 ("auto" はinotifyを試してからポーリング)
+        poll_interval (float): ポーリングの間隔 (秒)
+        debounce (float): 変更をまとめて通知するまでの待ち時間 (秒)
+    """
+
+    def __init__(
+        self,
+        *,
+        file_paths: Iterable[Path],
+        callback: Callable[[list[Path], float], None],
+        logger: Logger,
+        backend: WATCHER_BACKENDS = "auto",
+        poll_interval: float = 1.0,
+        debounce: float = 0.2,
+    ) -> None:
+        self._file_paths = {file_path.resolve() for file_path in file_paths}
+        self._callback = callback
+        self._logger = logger
+        self._requested_backend = backend
+        self._poll_interval = poll_interval
+        self._debounce = debounce
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._backend: _Backend | None = None
+
+    @property
+    def backend(self) -> str | None:
+        """使用中の監視の方法 (開始前はNone)"""
+        return None if self._backend is None else self._backend.name
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _create_backend(self) -> _Backend:
+        if self._requested_backend != "polling":
+            try:
+                return _InotifyBackend(self._file_paths)
+            except OSError:
+                if self._requested_backend == "inotify":
+                    raise
+                msg = "inotify is unavailable, falling back to polling"
+                self._logger.warning(msg)
+        return _PollingBackend(self._file_paths, self._stop_event)
+
+    def start(self) -> None:
+        """監視を開始する"""
+        if self.is_running:
+            return
+        self._stop_event.clear()
+        self._backend = self._create_backend()
+        self._thread = threading.Thread(target=self._run, name="concord-file-watcher", daemon=True)
+        self._thread.start()
+        msg = f"Watching {len(self._file_paths)} files with {self._backend.name}"
+        self._logger.info(msg)
+
+    def stop(self) -> None:
+        """監視を停止し、監視スレッドの終了を待つ"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._backend is not None:
+            self._backend.close()
+            self._backend = None
+
+    def _run(self) -> None:
+        if self._backend is None:
+            return
+        pending: dict[Path, float] = {}
+        last_event_at = 0.0
+        while not self._stop_event.is_set():
+            timeout = self._debounce if len(pending) > 0 else self._poll_interval
+            changed = self._backend.poll(timeout)
+            now = time.perf_counter()
+            for file_path in changed:
+                pending.setdefault(file_path, now)
+                last_event_at = now
+            if len(pending) == 0 or now - last_event_at < self._debounce:
+                continue
+            detected_at = min(pending.values())
+            file_paths = sorted(pending)
+            pending.clear()
+            try:
+                self._callback(file_paths, detected_at)
+            except Exception:
+                msg = f"Failed to handle changes of {file_paths}"
+                self._logger.exception(msg)
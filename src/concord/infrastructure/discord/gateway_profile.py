@@ -0,0 +1,244 @@
+from collections import deque
+from collections.abc import Iterable
+from typing import Any
+
+from discord import Intents, MemberCacheFlags
+from discord.ext.commands import Bot, Cog
+
+from concord.model.discovered_tool import DiscoveredCog
+from concord.model.gateway_profile import GatewayProfile, GatewayRequirements, GatewaySettings
+from concord.model.startup import PreparedTools
+
+DEFAULT_MAX_MESSAGES = 1000
+
+# BOT自体 (チャンネルのキャッシュ・索引) が必要とするもの
+BASE_REQUIREMENTS = GatewayRequirements(intents=("guilds",))
+
+# プレフィックスで呼び出すコマンド (ハイブリッドコマンドを含む) が必要とするもの
+COMMAND_REQUIREMENTS = GatewayRequirements(intents=("guild_messages", "dm_messages", "message_content"))
+
+_MESSAGES = ("guild_messages", "dm_messages")
+_REACTIONS = ("guild_reactions", "dm_reactions")
+
+# イベントリスナーが必要とするもの
+# (メッセージのキャッシュを使うイベントは、キャッシュが無いと呼ばれないため `max_messages` も必要とする)
+EVENT_REQUIREMENTS: dict[str, GatewayRequirements] = {
+    "on_message": COMMAND_REQUIREMENTS,
+    "on_message_edit": GatewayRequirements(intents=_MESSAGES, max_messages=DEFAULT_MAX_MESSAGES),
+    "on_message_delete": GatewayRequirements(intents=_MESSAGES, max_messages=DEFAULT_MAX_MESSAGES),
+    "on_bulk_message_delete": GatewayRequirements(intents=_MESSAGES, max_messages=DEFAULT_MAX_MESSAGES),
+    "on_raw_message_edit": GatewayRequirements(intents=_MESSAGES),
+    "on_raw_message_delete": GatewayRequirements(intents=_MESSAGES),
+    "on_raw_bulk_message_delete": GatewayRequirements(intents=_MESSAGES),
+    "on_reaction_add": GatewayRequirements(intents=_REACTIONS, max_messages=DEFAULT_MAX_MESSAGES),
+    "on_reaction_remove": GatewayRequirements(intents=_REACTIONS, max_messages=DEFAULT_MAX_MESSAGES),
+    "on_reaction_clear": GatewayRequirements(intents=_REACTIONS, max_messages=DEFAULT_MAX_MESSAGES),
+    "on_reaction_clear_emoji": GatewayRequirements(intents=_REACTIONS, max_messages=DEFAULT_MAX_MESSAGES),
+    "on_raw_reaction_add": GatewayRequirements(intents=_REACTIONS),
+    "on_raw_reaction_remove": GatewayRequirements(intents=_REACTIONS),
+    "on_raw_reaction_clear": GatewayRequirements(intents=_REACTIONS),
+    "on_raw_reaction_clear_emoji": GatewayRequirements(intents=_REACTIONS),
+    "on_typing": GatewayRequirements(intents=("guild_typing", "dm_typing")),
+    "on_raw_typing": GatewayRequirements(intents=("guild_typing", "dm_typing")),
+    "on_poll_vote_add": GatewayRequirements(intents=("guild_polls", "dm_polls")),
+    "on_poll_vote_remove": GatewayRequirements(intents=("guild_polls", "dm_polls")),
+    "on_member_join": GatewayRequirements(intents=("members",)),
+    "on_member_remove": GatewayRequirements(intents=("members",)),
+    "on_raw_member_remove": GatewayRequirements(intents=("members",)),
+    "on_member_update": GatewayRequirements(intents=("members",), member_cache=("joined",)),
+    "on_user_update": GatewayRequirements(intents=("members",), member_cache=("joined",)),
+    "on_presence_update": GatewayRequirements(intents=("members", "presences"), member_cache=("joined",)),
+    "on_member_ban": GatewayRequirements(intents=("moderation",)),
+    "on_member_unban": GatewayRequirements(intents=("moderation",)),
+    "on_audit_log_entry_create": GatewayRequirements(intents=("moderation",)),
+    "on_voice_state_update": GatewayRequirements(intents=("voice_states",), member_cache=("voice",)),
+    "on_guild_emojis_update": GatewayRequirements(intents=("expressions",)),
+    "on_guild_stickers_update": GatewayRequirements(intents=("expressions",)),
+    "on_invite_create": GatewayRequirements(intents=("invites",)),
+    "on_invite_delete": GatewayRequirements(intents=("invites",)),
+    "on_webhooks_update": GatewayRequirements(intents=("webhooks",)),
+    "on_integration_create": GatewayRequirements(intents=("integrations",)),
+    "on_integration_update": GatewayRequirements(intents=("integrations",)),
+    "on_guild_integrations_update": GatewayRequirements(intents=("integrations",)),
+    "on_raw_integration_delete": GatewayRequirements(intents=("integrations",)),
+    "on_scheduled_event_create": GatewayRequirements(intents=("guild_scheduled_events",)),
+    "on_scheduled_event_delete": GatewayRequirements(intents=("guild_scheduled_events",)),
+    "on_scheduled_event_update": GatewayRequirements(intents=("guild_scheduled_events",)),
+    "on_scheduled_event_user_add": GatewayRequirements(intents=("guild_scheduled_events",)),
+    "on_scheduled_event_user_remove": GatewayRequirements(intents=("guild_scheduled_events",)),
+    "on_automod_rule_create": GatewayRequirements(intents=("auto_moderation_configuration",)),
+    "on_automod_rule_update": GatewayRequirements(intents=("auto_moderation_configuration",)),
+    "on_automod_rule_delete": GatewayRequirements(intents=("auto_moderation_configuration",)),
+    "on_automod_action": GatewayRequirements(intents=("auto_moderation_execution",)),
+}
+
+
+def _merge_all(requirements: Iterable[GatewayRequirements]) -> GatewayRequirements:
+    merged = GatewayRequirements()
+    for requirement in requirements:
+        merged = merged.merge(requirement)
+    return merged
+
+
+def requirements_from_events(events: Iterable[str], *, has_commands: bool) -> GatewayRequirements:
+    """イベントリスナーとコマンドの有無から、必要なインテントとキャッシュを推定する
+
+    Args:
+        events (Iterable[str]): イベント名 (例: `on_message`)
+        has_commands (bool): プレフィックスで呼び出すコマンドがあるかどうか
+
+    Returns:
+        GatewayRequirements: 推定した要件 (表に無いイベントは、guildsのインテントで足りるものとする)
+    """
+    requirements = [EVENT_REQUIREMENTS[event] for event in events if event in EVENT_REQUIREMENTS]
+    if has_commands:
+        requirements.append(COMMAND_REQUIREMENTS)
+    return _merge_all(requirements)
+
+
+def requirements_from_cog_class(cog_class: type[Cog]) -> GatewayRequirements:
+    """importしたCogのクラスから、必要なインテントとキャッシュを求める
+
+    クラス属性 `gateway_requirements` の宣言と、イベントリスナー・コマンドからの推定を合わせる。
+
+    Args:
+        cog_class (type[Cog]): Cogのクラス
+
+    Returns:
+        GatewayRequirements: 要件
+    """
+    events = [event for event, _ in getattr(cog_class, "__cog_listeners__", [])]
+    has_commands = len(getattr(cog_class, "__cog_commands__", [])) != 0
+    inferred = requirements_from_events(events, has_commands=has_commands)
+    declared = getattr(cog_class, "gateway_requirements", None)
+    if isinstance(declared, GatewayRequirements):
+        return inferred.merge(declared)
+    return inferred
+
+
+def requirements_from_discovered(cog: DiscoveredCog) -> GatewayRequirements:
+    """静的解析で見つけたCogから、必要なインテントとキャッシュを推定する (遅延読み込みの場合)
+
+    モジュールを実行しないため、`gateway_requirements` の宣言は読めない (宣言が必要な場合は設定ファイルで指定する)。
+    """
+    return requirements_from_events(
+        (listener.event for listener in cog.listeners),
+        has_commands=len(cog.commands) != 0,
+    )
+
+
+def tool_requirements(prepared: PreparedTools) -> GatewayRequirements:
+    """準備したツール全体と、BOT自体が必要とするインテントとキャッシュを求める"""
+    requirements = [BASE_REQUIREMENTS]
+    requirements.extend(requirements_from_cog_class(loaded.class_type) for loaded in prepared.classes)
+    requirements.extend(requirements_from_discovered(cog) for cog in prepared.cogs)
+    return _merge_all(requirements)
+
+
+def _enabled(flags: Intents | MemberCacheFlags) -> tuple[str, ...]:
+    return tuple(name for name, value in flags if value)
+
+
+def _build_flags(flag_type: type[Any], names: Iterable[str], option: str) -> Any:  # noqa: ANN401
+    flags = flag_type.none()
+    for name in names:
+        if name not in flag_type.VALID_FLAGS:
+            msg = f"Invalid value of option '{option}' in the section 'Discord.Gateway': {name}"
+            raise ValueError(msg)
+        setattr(flags, name, True)
+    return flags
+
+
+def _resolve_intents(settings: GatewaySettings, requirements: GatewayRequirements) -> Intents:
+    names = list(settings.intents)
+    if "all" in names:
+        return Intents.all()
+    intents = Intents.default() if "default" in names else Intents.none()
+    if "auto" in names:
+        intents.value |= _build_flags(Intents, requirements.intents, "gateway_requirements").value
+    explicit = [name for name in names if name not in {"auto", "default"}]
+    intents.value |= _build_flags(Intents, explicit, "intents").value
+    return intents
+
+
+def _resolve_member_cache(
+    settings: GatewaySettings,
+    requirements: GatewayRequirements,
+    intents: Intents,
+) -> MemberCacheFlags:
+    names = list(settings.member_cache)
+    if "all" in names:
+        # インテントが無いキャッシュは使えないため、インテントから作る
+        return MemberCacheFlags.from_intents(intents)
+    if "none" in names:
+        return MemberCacheFlags.none()
+    flags: MemberCacheFlags = _build_flags(
+        MemberCacheFlags,
+        [name for name in names if name != "auto"],
+        "member_cache",
+    )
+    if "auto" in names:
+        flags.value |= _build_flags(MemberCacheFlags, requirements.member_cache, "gateway_requirements").value
+    return flags
+
+
+def resolve_gateway_profile(settings: GatewaySettings, requirements: GatewayRequirements) -> GatewayProfile:
+    """設定とツールの要件から、ゲートウェイに接続するときの設定を決める
+
+    Args:
+        settings (GatewaySettings): `[Discord.Gateway]` の設定値
+        requirements (GatewayRequirements): ツールの要件 (`auto` の項目に使う)
+
+    Returns:
+        GatewayProfile: 接続するときの設定
+
+    Raises:
+        ValueError: 名前が誤っている場合や、インテントが無いのにキャッシュや全メンバーの取得を有効にした場合
+    """
+    intents = _resolve_intents(settings, requirements)
+    member_cache = _resolve_member_cache(settings, requirements, intents)
+    if member_cache.joined and not intents.members:
+        msg = "member_cache 'joined' requires the 'members' intent in the section 'Discord.Gateway'"
+        raise ValueError(msg)
+    if member_cache.voice and not intents.voice_states:
+        msg = "member_cache 'voice' requires the 'voice_states' intent in the section 'Discord.Gateway'"
+        raise ValueError(msg)
+    chunk_guilds_at_startup = settings.chunk_guilds_at_startup
+    if chunk_guilds_at_startup is None:
+        chunk_guilds_at_startup = requirements.chunk_guilds_at_startup
+    if chunk_guilds_at_startup and not intents.members:
+        msg = "chunk_guilds_at_startup requires the 'members' intent in the section 'Discord.Gateway'"
+        raise ValueError(msg)
+    max_messages = settings.max_messages if settings.max_messages is not None else requirements.max_messages
+    return GatewayProfile(
+        intents=_enabled(intents),
+        member_cache=_enabled(member_cache),
+        chunk_guilds_at_startup=chunk_guilds_at_startup,
+        max_messages=max_messages if max_messages > 0 else None,
+    )
+
+
+def apply_gateway_profile(bot: Bot, profile: GatewayProfile) -> None:
+    """ゲートウェイに接続する前のBotに、インテントとキャッシュの設定を反映する
+
+    Botはツールのimportより前に作るため、`discord.ConnectionState` の生成時に決まる値を接続前に置き換える。
+    接続 (IDENTIFY) の後に呼んでも、インテントは変わらない。
+
+    Args:
+        bot (Bot): まだゲートウェイに接続していないBot
+        profile (GatewayProfile): 接続するときの設定
+    """
+    state = bot._connection  # noqa: SLF001
+    intents = _build_flags(Intents, profile.intents, "intents")
+    member_cache = _build_flags(MemberCacheFlags, profile.member_cache, "member_cache")
+    state._intents = intents  # noqa: SLF001
+    state._chunk_guilds = profile.chunk_guilds_at_startup  # noqa: SLF001
+    state.member_cache_flags = member_cache
+    # メンバーをキャッシュしない場合、ユーザーもキャッシュしない (`ConnectionState.__init__` と同じ判定)
+    if not intents.members or member_cache._empty:  # noqa: SLF001
+        state.store_user = state.store_user_no_intents  # type: ignore[method-assign]
+    else:
+        vars(state).pop("store_user", None)
+    state.raw_presence_flag = not intents.members and intents.presences
+    state.max_messages = profile.max_messages
+    state._messages = None if profile.max_messages is None else deque(maxlen=profile.max_messages)  # noqa: SLF001
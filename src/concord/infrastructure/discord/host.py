@@ -0,0 +1,141 @@
+import asyncio
+import logging
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+import aiohttp
+
+from concord.cli.arguments import on_launch_host
+from concord.infrastructure.discord.agent import Agent
+from concord.infrastructure.discord.dynamic_import import ToolModuleCache
+from concord.infrastructure.discord.memory import current_rss_bytes
+from concord.infrastructure.logging.logger_factory import get_logger
+from concord.model.argument import Args
+from concord.model.host import BotMemory
+
+HOST_LOGGER_NAME = "concord-host"
+
+
+class SharedConnector(aiohttp.TCPConnector):
+    """複数のBOTで共有する、HTTPのコネクタ
+
+    discord.pyはBOTの終了時にセッションを閉じ、セッションはコネクタを閉じるため、
+    1つのBOTの終了で他のBOTの通信が切れないよう、`close_shared` を呼ぶまでは閉じない。
+    """
+
+    async def close(self, *args: Any, **kwargs: Any) -> None:  # noqa: ANN401
+        pass
+
+    async def close_shared(self) -> None:
+        """全てのBOTの終了後に、コネクタを閉じる"""
+        await super().close()
+
+
+class AgentHost:
+    """1つのプロセス・イベントループで、複数のBOTを動かす
+
+    BOTごとに `Agent` (`Bot`・Cog・チャンネル・設定・ロガー) を生成し、以下は全てのBOTで共有する。
+
+    - ツールのモジュール (同じファイルは1度だけimportする)
+    - スレッドプール (イベントループの既定のスレッドプールと、ツールの並列のimport)
+    - DiscordとのHTTPのコネクタ
+    - Discordへのログの送信 (ログのキューはプロセスで1つ)
+
+    ツールのimportはBOTの順に1つずつ行い、BOTごとのメモリの増加量を測る。ゲートウェイへの接続は全てのBOTで並行に行う。
+    1つのBOTが失敗しても、他のBOTは動き続ける。
+
+    Args:
+        bots (Sequence[Args] | None): BOTごとの起動時の引数 (Noneの場合はコマンドラインから読む)
+        utils_dirpath (Path | None): configs・logs・cachesを置くディレクトリ (全てのBOTで共通)
+        max_workers (int | None): 共有するスレッドプールのスレッド数 (Noneの場合は既定値)
+    """
+
+    def __init__(
+        self,
+        bots: Sequence[Args] | None = None,
+        utils_dirpath: Path | None = None,
+        *,
+        max_workers: int | None = None,
+    ) -> None:
+        self._bots = list(bots) if bots is not None else on_launch_host()
+        self._utils_dirpath = utils_dirpath
+        self._max_workers = max_workers
+        self.logger = get_logger(
+            name=HOST_LOGGER_NAME,
+            level=logging.DEBUG if any(bot.is_debug for bot in self._bots) else logging.INFO,
+            log_dir=utils_dirpath / "logs" if utils_dirpath is not None else None,
+            flight_recorder=max((bot.flight_recorder for bot in self._bots), default=0),
+        )
+        self.module_cache = ToolModuleCache()
+        self.agents: list[Agent] = []
+        self._construct_bytes: dict[str, int] = {}
+
+    def memory(self) -> tuple[BotMemory, ...]:
+        """BOTごとのメモリの増加量 (生成した順)"""
+        return tuple(
+            BotMemory(
+                bot_name=agent.bot_name,
+                construct_bytes=self._construct_bytes[agent.bot_name],
+                import_bytes=agent.import_memory_bytes,
+            )
+            for agent in self.agents
+        )
+
+    def create_agents(
+        self,
+        *,
+        executor: ThreadPoolExecutor | None = None,
+        connector: aiohttp.BaseConnector | None = None,
+    ) -> list[Agent]:
+        """BOTごとの `Agent` を、共有する資源を渡して順に生成する"""
+        for bot in self._bots:
+            rss_before = current_rss_bytes()
+            agent = Agent(
+                self._utils_dirpath,
+                args=bot,
+                module_cache=self.module_cache,
+                executor=executor,
+                connector=connector,
+            )
+            self._construct_bytes[bot.bot_name] = current_rss_bytes() - rss_before
+            self.agents.append(agent)
+        return self.agents
+
+    async def run(self) -> None:
+        """全てのBOTを起動し、全てのBOTが終了するまで待つ"""
+        loop = asyncio.get_running_loop()
+        executor = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="concord-host")
+        loop.set_default_executor(executor)
+        connector = SharedConnector(limit=0)
+        try:
+            agents = self.create_agents(executor=executor, connector=connector)
+            # importはBOTの順に1つずつ行う (同じツールは2つ目以降のBOTでキャッシュから読まれる)
+            previous: asyncio.Task[Any] | None = None
+            for agent in agents:
+                previous = agent.start_preparing_tools(after=previous)
+            if previous is not None:
+                previous.add_done_callback(lambda _: self.logger.info(self.format_memory()))
+            await asyncio.gather(*(self._run_agent(agent) for agent in agents))
+        finally:
+            await connector.close_shared()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _run_agent(self, agent: Agent) -> None:
+        try:
+            await agent.run()
+        except Exception:
+            msg = f"Bot {agent.bot_name} stopped with an error, other bots keep running"
+            self.logger.exception(msg)
+
+    def format_memory(self) -> str:
+        """BOTごとのメモリの増加量を、ログに出力できる文字列にする"""
+        lines = [f"memory per bot (rss now {current_rss_bytes() / 2**20:.1f} MiB):"]
+        for memory in self.memory():
+            imported = "-" if memory.import_bytes is None else f"{memory.import_bytes / 2**20:.1f} MiB"
+            lines.append(
+                f"  {memory.bot_name}: construct {memory.construct_bytes / 2**20:.1f} MiB, import {imported}",
+            )
+        lines.append(f"  tool modules: {len(self.module_cache)} cached, {self.module_cache.hits} reused")
+        return "\n".join(lines)
@@ -0,0 +1,191 @@
+import asyncio
+import time
+from collections import deque
+from collections.abc import Callable, Sequence
+from logging import Logger
+from pathlib import Path
+
+from discord.ext.commands import Bot, Cog
+
+from concord.exception.import_module import ImportModuleError
+from concord.infrastructure.discord.dynamic_import import import_classes_from_file
+from concord.infrastructure.discord.file_watcher import WATCHER_BACKENDS, FileWatcher
+from concord.infrastructure.discord.tool_filter import ToolFilter
+from concord.model.hot_reload import ToolReload
+from concord.model.import_class import LoadedClass
+
+
+class ToolReloader:
+    """変更されたツールのファイルだけを再importし、Cogを差し替える
+
+    `track` で登録したファイルを監視し、変更されたファイルを新しいモジュール名でimportし直す。
+    古いCogを `remove_cog` で外してから新しいCogを `add_cog` で登録するため、BOTの再起動
+    (ゲートウェイへの再接続・全ツールの再import) は起きない。
+    importや登録に失敗した場合は、変更前のCogを登録し直す。
+    起動時と同じ包含・除外の規則を渡した場合は、変更後のファイルにも適用する
+    (除外されたCogは登録せず、全てのCogが除外されたファイルはimportしない)。
+
+    Args:
+        bot (Bot): Bot
+        cog_factory (Callable[[type[Cog]], Cog]): Cogのクラスからインスタンスを生成する関数
+        logger (Logger): Logger
+        tool_filter (ToolFilter | None): ツールの包含・除外の規則
+        tool_roots (Sequence[Path]): 規則のパスの基準になる、ツールのルートディレクトリ
+        backend (WATCHER_BACKENDS): ファイルの監視の方法
+        poll_interval (float): ポーリングの間隔 (秒)
+        debounce (float): 変更をまとめて扱うまでの待ち時間 (秒)
+        history_size (int): 保持するリロードの記録の数
+    """
+
+    def __init__(
+        self,
+        *,
+        bot: Bot,
+        cog_factory: Callable[[type[Cog]], Cog],
+        logger: Logger,
+        tool_filter: ToolFilter | None = None,
+        tool_roots: Sequence[Path] = (),
+        backend: WATCHER_BACKENDS = "auto",
+        poll_interval: float = 1.0,
+        debounce: float = 0.2,
+        history_size: int = 50,
+    ) -> None:
+        self._bot = bot
+        self._cog_factory = cog_factory
+        self._logger = logger
+        self._tool_filter = tool_filter
+        self._tool_roots = tuple(root.resolve() for root in tool_roots)
+        self._backend: WATCHER_BACKENDS = backend
+        self._poll_interval = poll_interval
+        self._debounce = debounce
+        self._cogs: dict[Path, list[Cog]] = {}
+        self._generations: dict[Path, int] = {}
+        self._history: deque[ToolReload] = deque(maxlen=history_size)
+        self._lock = asyncio.Lock()
+        self._watcher: FileWatcher | None = None
+
+    @property
+    def history(self) -> tuple[ToolReload, ...]:
+        """直近のリロードの記録 (古い順)"""
+        return tuple(self._history)
+
+    @property
+    def is_watching(self) -> bool:
+        return self._watcher is not None and self._watcher.is_running
+
+    def track(self, module_path: Path, cog: Cog) -> None:
+        """ファイルから読み込んだCogを、リロードの対象として登録する
+
+        Args:
+            module_path (Path): Cogを定義しているファイル
+            cog (Cog): 登録済みのCog
+        """
+        self._cogs.setdefault(module_path.resolve(), []).append(cog)
+
+    def start(self) -> None:
+        """ファイルの監視を開始する (イベントループの中から呼ぶ)"""
+        if self.is_watching:
+            return
+        loop = asyncio.get_running_loop()
+
+        def on_change(file_paths: list[Path], detected_at: float) -> None:
+            for file_path in file_paths:
+                asyncio.run_coroutine_threadsafe(self.reload(file_path, detected_at=detected_at), loop)
+
+        self._watcher = FileWatcher(
+            file_paths=self._cogs,
+            callback=on_change,
+            logger=self._logger,
+            backend=self._backend,
+            poll_interval=self._poll_interval,
+            debounce=self._debounce,
+        )
+        self._watcher.start()
+
+    def stop(self) -> None:
+        """ファイルの監視を停止する"""
+        if self._watcher is not None:
+            self._watcher.stop()
+            self._watcher = None
+
+    async def reload(self, module_path: Path, *, detected_at: float | None = None) -> ToolReload:
+        """ファイルを再importし、Cogを差し替える
+
+        Args:
+            module_path (Path): 変更されたファイル
+            detected_at (float | None): 変更を検知した時刻 (`time.perf_counter()`、Noneの場合は呼び出した時刻)
+
+        Returns:
+            ToolReload: リロードの記録
+        """
+        if detected_at is None:
+            detected_at = time.perf_counter()
+        module_path = await asyncio.to_thread(module_path.resolve)
+        async with self._lock:
+            start = time.perf_counter()
+            generation = self._generations.get(module_path, 0) + 1
+            try:
+                loaded_classes = await asyncio.to_thread(self._import, module_path, generation)
+            except (OSError, ImportModuleError) as e:
+                return self._record(module_path, start, detected_at, error=str(e))
+            import_seconds = time.perf_counter() - start
+            self._generations[module_path] = generation
+
+            old_cogs = self._cogs.get(module_path, [])
+            for cog in old_cogs:
+                await self._bot.remove_cog(cog.qualified_name)
+            new_cogs: list[Cog] = []
+            try:
+                for loaded in loaded_classes:
+                    cog = self._cog_factory(loaded.class_type)
+                    await self._bot.add_cog(cog)
+                    new_cogs.append(cog)
+            except Exception as e:
+                msg = f"failed to load extension : {module_path}"
+                self._logger.exception(msg)
+                for cog in new_cogs:
+                    await self._bot.remove_cog(cog.qualified_name)
+                for cog in old_cogs:
+                    await self._bot.add_cog(cog)
+                return self._record(module_path, start, detected_at, error=str(e), import_seconds=import_seconds)
+
+            self._cogs[module_path] = new_cogs
+            return self._record(module_path, start, detected_at, import_seconds=import_seconds)
+
+    def _import(self, module_path: Path, generation: int) -> list[LoadedClass[type[Cog]]]:
+        # 以前のバージョンのクラスと区別できるよう、リロードのたびに新しいモジュール名でimportする
+        module_name = f"_dyn_mod_{module_path.name}_{module_path.stat().st_ino}_r{generation}"
+        root = next((root for root in self._tool_roots if module_path.is_relative_to(root)), None)
+        if self._tool_filter is None or root is None:
+            return import_classes_from_file(module_path, Cog, self._logger, module_name=module_name)
+        if len(self._tool_filter.select_files(root, [module_path])) == 0:
+            return []
+        loaded_classes = import_classes_from_file(module_path, Cog, self._logger, module_name=module_name)
+        return self._tool_filter.select_classes(root, module_path, loaded_classes)
+
+    def _record(
+        self,
+        module_path: Path,
+        start: float,
+        detected_at: float,
+        *,
+        error: str | None = None,
+        import_seconds: float | None = None,
+    ) -> ToolReload:
+        reload = ToolReload(
+            module_path=module_path,
+            cog_names=tuple(cog.qualified_name for cog in self._cogs.get(module_path, [])),
+            import_seconds=time.perf_counter() - start if import_seconds is None else import_seconds,
+            latency_seconds=time.perf_counter() - detected_at,
+            error=error,
+        )
+        self._history.append(reload)
+        if reload.succeeded:
+            msg = f"Reloaded {list(reload.cog_names)} from {module_path}"
+            msg += f" (import {reload.import_seconds * 1000:.1f} ms,"
+            msg += f" live after {reload.latency_seconds * 1000:.1f} ms)"
+            self._logger.info(msg)
+        else:
+            msg = f"Failed to reload {module_path}, keeping the previous version: {error}"
+            self._logger.error(msg)
+        return reload
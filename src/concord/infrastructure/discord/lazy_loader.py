@@ -0,0 +1,229 @@
+import asyncio
+import inspect
+import time
+from collections.abc import Callable, Coroutine
+from logging import Logger
+from pathlib import Path
+from typing import Any, cast
+
+from discord.ext.commands import Bot, Cog, Command, CommandRegistrationError, Context
+
+from concord.infrastructure.discord.dynamic_import import import_classes_from_file
+from concord.model.discovered_tool import DiscoveredCog
+from concord.model.lazy_tool import LazyToolStats
+
+ListenerStub = Callable[..., Coroutine[Any, Any, None]]
+
+
+async def _cog_already_loaded() -> None:
+    """`cog_load` を済ませたCogの、`add_cog` から呼ばれる `cog_load` の代わり"""
+
+
+async def _await_if_needed(result: object) -> None:
+    """`cog_load` や `cog_unload` は同期関数でもよいため、コルーチンの場合だけ待つ"""
+    if inspect.isawaitable(result):
+        await result
+
+
+class LazyToolLoader:
+    """ツールを初回の呼び出し時に読み込むローダー
+
+    静的解析で見つけたCogのコマンドとイベントリスナーの代わりに軽量なスタブを登録しておき、
+    スタブが最初に呼ばれたときにモジュールをimportしてCogを生成・登録する。
+    同じファイルへの同時の呼び出しは、1回の読み込みを待ち合わせる。
+
+    以下のCogを含むファイルは、スタブでは起動できないため登録時に読み込む。
+
+    - `tasks.loop` のバックグラウンドタスクを持つ
+    - コマンドもイベントリスナーも持たない
+    - `app_commands` のコマンドを持つ (スラッシュコマンドは引数の定義が必要なため)
+
+    Args:
+        bot (Bot): Bot
+        cog_factory (Callable[[type[Cog]], Cog]): Cogのクラスからインスタンスを生成する関数
+        logger (Logger): Logger
+    """
+
+    def __init__(
+        self,
+        *,
+        bot: Bot,
+        cog_factory: Callable[[type[Cog]], Cog],
+        logger: Logger,
+    ) -> None:
+        self._bot = bot
+        self._cog_factory = cog_factory
+        self._logger = logger
+        self._discovered: dict[Path, list[DiscoveredCog]] = {}
+        self._eager: set[Path] = set()
+        self._loaded: dict[Path, list[Cog]] = {}
+        self._loading: dict[Path, asyncio.Task[list[Cog]]] = {}
+        self._load_seconds: dict[Path, float] = {}
+        self._stub_commands: dict[Path, list[str]] = {}
+        self._stub_listeners: dict[Path, list[tuple[str, ListenerStub]]] = {}
+
+    @staticmethod
+    def needs_eager_load(cog: DiscoveredCog) -> bool:
+        """スタブでは起動できず、登録時に読み込む必要があるかどうか"""
+        if len(cog.tasks) > 0:
+            return True
+        if len(cog.commands) == 0 and len(cog.listeners) == 0:
+            return True
+        return any(command.decorator.startswith("app_commands.") for command in cog.commands)
+
+    async def register(self, cogs: list[DiscoveredCog]) -> list[str]:
+        """静的解析で見つけたCogを登録する
+
+        Args:
+            cogs (list[DiscoveredCog]): 静的解析で見つけたCog
+
+        Returns:
+            list[str]: 登録したCogの名前 (登録時の読み込みに失敗したファイルのCogは含まない)
+        """
+        for cog in cogs:
+            self._discovered.setdefault(cog.module_path, []).append(cog)
+        failed: set[Path] = set()
+        for module_path in dict.fromkeys(cog.module_path for cog in cogs):
+            if any(self.needs_eager_load(cog) for cog in self._discovered[module_path]):
+                self._eager.add(module_path)
+                try:
+                    await self.ensure_loaded(module_path)
+                except Exception:
+                    msg = f"failed to load extension : {module_path}"
+                    self._logger.exception(msg)
+                    failed.add(module_path)
+            else:
+                self._register_stubs(module_path)
+        return [cog.name for cog in cogs if cog.module_path not in failed]
+
+    def is_loaded(self, module_path: Path) -> bool:
+        return module_path in self._loaded
+
+    async def ensure_loaded(self, module_path: Path) -> list[Cog]:
+        """ファイルに含まれるCogを読み込む (読み込み済みの場合はそのまま返す)
+
+        Args:
+            module_path (Path): ツールのファイル
+
+        Returns:
+            list[Cog]: 登録されたCog
+        """
+        if module_path in self._loaded:
+            return self._loaded[module_path]
+        task = self._loading.get(module_path)
+        if task is None:
+            task = asyncio.create_task(self._load(module_path))
+            self._loading[module_path] = task
+        try:
+            # 呼び出し元がキャンセルされても、待ち合わせている他の呼び出しの読み込みは続ける
+            return await asyncio.shield(task)
+        finally:
+            if task.done():
+                self._loading.pop(module_path, None)
+
+    async def _load(self, module_path: Path) -> list[Cog]:
+        start = time.perf_counter()
+        loaded_classes = await asyncio.to_thread(import_classes_from_file, module_path, Cog, self._logger)
+        names = {cog.name for cog in self._discovered[module_path]}
+        classes = [loaded.class_type for loaded in loaded_classes if loaded.class_type.__name__ in names]
+
+        # `add_cog` がイベントループに制御を返すのは `cog_load` を待つ間だけのため、スタブを残したまま先に済ませる
+        # (スタブを外してから本物のCogを登録し終えるまでに届いたイベントやコマンドが、どちらにも渡らないことを防ぐ)
+        prepared: list[Cog] = []
+        cogs: list[Cog] = []
+        stubs_removed = False
+        try:
+            for cls in classes:
+                cog = self._cog_factory(cls)
+                await _await_if_needed(cog.cog_load())
+                cog.cog_load = _cog_already_loaded  # type: ignore[method-assign]
+                prepared.append(cog)
+            self._remove_stubs(module_path)
+            stubs_removed = True
+            for cog in prepared:
+                await self._bot.add_cog(cog)
+                cogs.append(cog)
+        except Exception:
+            msg = f"failed to load extension lazily : {module_path}"
+            self._logger.exception(msg)
+            for cog in cogs:
+                await self._bot.remove_cog(cog.qualified_name)
+            # 登録に失敗したCog自体は `add_cog` が片付けるため、まだ渡していないCogだけを片付ける
+            for cog in prepared[len(cogs) + 1 :] if stubs_removed else prepared:
+                await _await_if_needed(cog.cog_unload())
+            if stubs_removed:
+                self._register_stubs(module_path)
+            raise
+
+        self._loaded[module_path] = cogs
+        self._load_seconds[module_path] = time.perf_counter() - start
+        msg = f"load extension lazily : {[cog.qualified_name for cog in cogs]}"
+        msg += f" ({self._load_seconds[module_path]:.3f}s)"
+        self._logger.info(msg)
+        return cogs
+
+    def _register_stubs(self, module_path: Path) -> None:
+        """最上位のコマンド (別名を含む) と、イベントごとに1つのリスナーのスタブを登録する
+
+        グループのサブコマンドは、グループのスタブから本物のコマンドで処理し直すため登録しない。
+        リスナーのスタブは、ファイル内の同じイベントの本物のリスナーを全て呼ぶため、イベントごとに1つだけ登録する。
+        """
+        command_names: list[str] = []
+        listeners: list[tuple[str, ListenerStub]] = []
+        for cog in self._discovered[module_path]:
+            for command in cog.commands:
+                if command.parent is not None:
+                    continue
+                try:
+                    self._bot.add_command(self._make_command_stub(module_path, command.name, command.aliases))
+                    command_names.append(command.name)
+                except CommandRegistrationError:
+                    msg = f"Command {command.name} of {cog.name} is already registered"
+                    self._logger.exception(msg)
+        events = dict.fromkeys(listener.event for cog in self._discovered[module_path] for listener in cog.listeners)
+        for event in events:
+            stub = self._make_listener_stub(module_path, event)
+            self._bot.add_listener(stub, event)
+            listeners.append((event, stub))
+        self._stub_commands[module_path] = command_names
+        self._stub_listeners[module_path] = listeners
+
+    def _remove_stubs(self, module_path: Path) -> None:
+        for name in self._stub_commands.pop(module_path, []):
+            self._bot.remove_command(name)
+        for event, stub in self._stub_listeners.pop(module_path, []):
+            self._bot.remove_listener(stub, event)
+
+    def _make_command_stub(self, module_path: Path, name: str, aliases: tuple[str, ...]) -> Command[Any, ..., Any]:
+        async def stub(ctx: Context[Bot]) -> None:
+            await self.ensure_loaded(module_path)
+            # 読み込んだ本物のコマンドで、同じメッセージを処理し直す
+            context = await self._bot.get_context(ctx.message)
+            await self._bot.invoke(context)
+
+        return Command(cast("Callable[..., Coroutine[Any, Any, None]]", stub), name=name, aliases=list(aliases))
+
+    def _make_listener_stub(self, module_path: Path, event: str) -> ListenerStub:
+        async def stub(*args: Any, **kwargs: Any) -> None:  # noqa: ANN401
+            cogs = await self.ensure_loaded(module_path)
+            # このイベントの配信時点では本物のリスナーは未登録のため、ここで渡す
+            for cog in cogs:
+                for name, listener in cog.get_listeners():
+                    if name == event:
+                        await listener(*args, **kwargs)
+
+        return stub
+
+    def stats(self) -> LazyToolStats:
+        """遅延読み込みの統計を返す"""
+
+        def names(module_paths: list[Path]) -> tuple[str, ...]:
+            return tuple(cog.name for module_path in module_paths for cog in self._discovered[module_path])
+
+        lazy = [module_path for module_path in self._discovered if module_path not in self._eager]
+        return LazyToolStats(
+            eager=names([module_path for module_path in self._discovered if module_path in self._eager]),
+            loaded=names([module_path for module_path in lazy if module_path in self._loaded]),
+            never_loaded=names([module_path for module_path in lazy if module_path not in self._loaded]),
+            load_seconds={module_path.as_posix(): seconds for module_path, seconds in self._load_seconds.items()},
+        )
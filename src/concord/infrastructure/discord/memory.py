@@ -0,0 +1,25 @@
+import os
+import sys
+from pathlib import Path
+
+if sys.platform != "win32":
+    import resource
+
+_STATM = Path("/proc/self/statm")
+
+
+def current_rss_bytes() -> int:
+    """プロセスの現在の常駐メモリ (RSS) のバイト数
+
+    Linuxでは `/proc/self/statm` から読む。読めない場合は最大の常駐メモリ (`ru_maxrss`) で代用し、
+    それも取れない場合は0を返す。
+    """
+    try:
+        resident_pages = int(_STATM.read_text(encoding="ascii").split()[1])
+    except (OSError, IndexError, ValueError):
+        if sys.platform == "win32":
+            return 0
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # macOSはバイト、Linuxなどはキロバイトで返す
+        return max_rss if sys.platform == "darwin" else max_rss * 1024
+    return resident_pages * os.sysconf("SC_PAGE_SIZE")
@@ -1,12 +1,65 @@
 import logging
+import time
+from collections import deque
+from datetime import UTC, datetime
 
 from discord.ext.commands import Cog
 
+from concord.model.connection import RECONNECT_KINDS, Reconnect
+
 
 class OnConnecting(Cog):
-    def __init__(self, *, logger: logging.Logger) -> None:
+    """ゲートウェイとの接続・切断を記録する
+
+    2回目以降の `on_ready` (セッションの張り直し) と `on_resumed` (セッションの再開) を再接続として数え、
+    切断からの所要時間を記録する。
+
+    Args:
+        logger (logging.Logger): Logger
+        history_size (int): 保持する再接続の記録の数
+    """
+
+    def __init__(self, *, logger: logging.Logger, history_size: int = 100) -> None:
         self._logger = logger
+        self._ready_count = 0
+        self._reconnect_count = 0
+        self._disconnected_at: float | None = None
+        self._reconnects: deque[Reconnect] = deque(maxlen=history_size)
+
+    @property
+    def reconnect_count(self) -> int:
+        """起動してからの再接続の回数"""
+        return self._reconnect_count
+
+    @property
+    def reconnects(self) -> tuple[Reconnect, ...]:
+        """直近の再接続の記録 (古い順)"""
+        return tuple(self._reconnects)
 
     @Cog.listener()
     async def on_connect(self) -> None:
         self._logger.info("Connecting to Discord")
+
+    @Cog.listener()
+    async def on_disconnect(self) -> None:
+        if self._disconnected_at is None:
+            self._disconnected_at = time.perf_counter()
+        self._logger.info("Disconnected from Discord")
+
+    @Cog.listener()
+    async def on_resumed(self) -> None:
+        self._record(kind="resume")
+
+    @Cog.listener()
+    async def on_ready(self) -> None:
+        self._ready_count += 1
+        if self._ready_count > 1:
+            self._record(kind="identify")
+
+    def _record(self, *, kind: RECONNECT_KINDS) -> None:
+        seconds = 0.0 if self._disconnected_at is None else time.perf_counter() - self._disconnected_at
+        self._disconnected_at = None
+        self._reconnect_count += 1
+        self._reconnects.append(Reconnect(kind=kind, seconds=seconds, completed_at=datetime.now(UTC)))
+        msg = f"Reconnected to Discord ({kind}, #{self._reconnect_count}, {seconds:.3f}s)"
+        self._logger.info(msg)
@@ -0,0 +1,175 @@
+import cProfile
+import json
+import pstats
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any
+
+from concord.model.startup import TimelineEvent
+
+PROFILE_TOP_FUNCTIONS = 30
+
+
+class StartupTimeline:
+    """起動中の出来事と処理の区間の時刻を記録する
+
+    複数のスレッドから記録できる。時刻は `time.perf_counter()` による、生成時からの秒数で記録する。
+    記録した内容は、JSONとChromeのトレース形式 (`chrome://tracing` や Perfetto で表示できる) で書き出せる。
+    """
+
+    def __init__(self) -> None:
+        self._origin = time.perf_counter()
+        self._events: list[TimelineEvent] = []
+        self._lock = threading.Lock()
+
+    @property
+    def events(self) -> tuple[TimelineEvent, ...]:
+        """記録した出来事 (時刻順)"""
+        with self._lock:
+            return tuple(sorted(self._events, key=lambda event: event.seconds))
+
+    @property
+    def total_seconds(self) -> float:
+        """起点から、最後に終わった出来事までの秒数"""
+        return max((event.end_seconds for event in self.events), default=0.0)
+
+    def mark(self, name: str) -> float:
+        """出来事を記録する
+
+        Args:
+            name (str): 出来事の名前
+
+        Returns:
+            float: 起点からの秒数
+        """
+        return self.record(name, time.perf_counter()).seconds
+
+    def record(self, name: str, started_at: float, finished_at: float | None = None) -> TimelineEvent:
+        """`time.perf_counter()` で測った時刻で、出来事か区間を記録する
+
+        Args:
+            name (str): 出来事の名前
+            started_at (float): 開始時刻
+            finished_at (float | None): 終了時刻 (Noneの場合は時点の出来事)
+
+        Returns:
+            TimelineEvent: 記録した出来事
+        """
+        event = TimelineEvent(
+            name=name,
+            seconds=started_at - self._origin,
+            thread=threading.current_thread().name,
+            duration=0.0 if finished_at is None else max(0.0, finished_at - started_at),
+        )
+        with self._lock:
+            self._events.append(event)
+        return event
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """with文の中の処理を、区間として記録する (例外で抜けた場合も記録する)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, start, time.perf_counter())
+
+    def seconds(self, name: str) -> float | None:
+        """最初に記録された同名の出来事の時刻 (記録が無い場合はNone)"""
+        return next((event.seconds for event in self.events if event.name == name), None)
+
+    def overlap(self, first: tuple[str, str], second: tuple[str, str]) -> float | None:
+        """2つの区間 (開始と終了の出来事の名前) が重なっていた秒数 (どちらかの記録が無い場合はNone)"""
+        times = [self.seconds(name) for name in (*first, *second)]
+        if any(seconds is None for seconds in times):
+            return None
+        first_start, first_end, second_start, second_end = (float(seconds or 0.0) for seconds in times)
+        return max(0.0, min(first_end, second_end) - max(first_start, second_start))
+
+    def format(self) -> str:
+        """タイムラインを、ログに出力できる文字列にする"""
+        lines: list[str] = []
+        for event in self.events:
+            duration = f" ({event.duration * 1000:.1f} ms)" if event.duration > 0 else ""
+            lines.append(f"  +{event.seconds:8.3f}s  {event.name}{duration} [{event.thread}]")
+        return "\n".join(lines)
+
+    def summary(self, limit: int = 5) -> str:
+        """合計時間と、時間のかかった区間の上位を短くまとめる (devチャンネルへの投稿用)"""
+        phases = sorted((event for event in self.events if event.duration > 0), key=lambda e: e.duration, reverse=True)
+        lines = [f"Startup: {self.total_seconds * 1000:.0f} ms"]
+        lines.extend(f"- {event.name}: {event.duration * 1000:.0f} ms" for event in phases[:limit])
+        return "\n".join(lines)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "total_seconds": self.total_seconds,
+            "events": [asdict(event) for event in self.events],
+        }
+
+    def to_chrome_trace(self) -> dict[str, Any]:
+        """Chromeのトレース形式 (Trace Event Format) に変換する"""
+        thread_ids: dict[str, int] = {}
+        trace_events: list[dict[str, Any]] = []
+        for event in self.events:
+            tid = thread_ids.setdefault(event.thread, len(thread_ids) + 1)
+            trace_event: dict[str, Any] = {
+                "name": event.name,
+                "ts": event.seconds * 1_000_000,
+                "pid": 1,
+                "tid": tid,
+            }
+            if event.duration > 0:
+                trace_event.update(ph="X", dur=event.duration * 1_000_000)
+            else:
+                trace_event.update(ph="i", s="t")
+            trace_events.append(trace_event)
+        trace_events.extend(
+            {"name": "thread_name", "ph": "M", "pid": 1, "tid": tid, "args": {"name": thread}}
+            for thread, tid in thread_ids.items()
+        )
+        return {"traceEvents": trace_events, "displayTimeUnit": "ms"}
+
+    def write(self, directory: Path, stem: str, *, profile: cProfile.Profile | None = None) -> list[Path]:
+        """タイムラインをJSONとChromeのトレース形式で書き出す
+
+        Args:
+            directory (Path): 書き出すディレクトリ
+            stem (str): ファイル名の先頭 (`{stem}.startup.json` などになる)
+            profile (cProfile.Profile | None): 併せて書き出すプロファイル (`{stem}.startup.prof`)
+
+        Returns:
+            list[Path]: 書き出したファイル
+        """
+        directory.mkdir(parents=True, exist_ok=True)
+        report = self.to_dict()
+        written: list[Path] = []
+        if profile is not None:
+            profile_path = directory / f"{stem}.startup.prof"
+            profile.dump_stats(profile_path)
+            report["profile"] = {"path": profile_path.as_posix(), "functions": _top_functions(profile)}
+            written.append(profile_path)
+        json_path = directory / f"{stem}.startup.json"
+        json_path.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+        trace_path = directory / f"{stem}.startup.trace.json"
+        trace_path.write_text(json.dumps(self.to_chrome_trace()), encoding="utf-8")
+        return [json_path, trace_path, *written]
+
+
+def _top_functions(profile: cProfile.Profile, limit: int = PROFILE_TOP_FUNCTIONS) -> list[dict[str, Any]]:
+    """累積時間の長い関数の上位"""
+    stats: dict[tuple[str, int, str], tuple[int, int, float, float, Any]] = pstats.Stats(profile).stats  # type: ignore[attr-defined]
+    ranked = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)
+    return [
+        {
+            "function": f"{file}:{line}({name})",
+            "calls": calls,
+            "total_seconds": total,
+            "cumulative_seconds": cumulative,
+        }
+        for (file, line, name), (_, calls, total, cumulative, _) in ranked[:limit]
+    ]
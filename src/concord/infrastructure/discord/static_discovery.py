@@ -0,0 +1,321 @@
+import ast
+import dataclasses
+import hashlib
+import json
+import os
+from collections.abc import Sequence
+from logging import Logger
+from pathlib import Path
+from typing import Any
+
+from pyresults import Err, Ok, Result
+
+from concord.exception.import_module import ImportModuleError
+from concord.infrastructure.discord.tool_manifest import find_tool_files
+from concord.model.discovered_tool import DiscoveredCog, DiscoveredCommand, DiscoveredListener
+
+COG_BASE_NAMES = frozenset({"Cog", "GroupCog"})
+COMMAND_DECORATOR_NAMES = frozenset({"command", "hybrid_command", "group", "hybrid_group"})
+GROUP_DECORATOR_NAMES = frozenset({"group", "hybrid_group"})
+LISTENER_DECORATOR_NAME = "listener"
+TASK_DECORATOR_NAME = "loop"
+CACHE_VERSION = 3
+
+
+def _dotted_name(node: ast.expr) -> str | None:
+    """`commands.Cog` のような名前参照を文字列にする (それ以外の式はNone)"""
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        parent = _dotted_name(node.value)
+        return f"{parent}.{node.attr}" if parent is not None else None
+    return None
+
+
+def _str_argument(call: ast.Call, keyword: str, *, position: int | None = None) -> str | None:
+    for kw in call.keywords:
+        if kw.arg == keyword and isinstance(kw.value, ast.Constant) and isinstance(kw.value.value, str):
+            return kw.value.value
+    if position is not None and len(call.args) > position:
+        arg = call.args[position]
+        if isinstance(arg, ast.Constant) and isinstance(arg.value, str):
+            return arg.value
+    return None
+
+
+def _str_list_argument(call: ast.Call, keyword: str) -> tuple[str, ...]:
+    for kw in call.keywords:
+        if kw.arg == keyword and isinstance(kw.value, (ast.List, ast.Tuple, ast.Set)):
+            return tuple(
+                element.value
+                for element in kw.value.elts
+                if isinstance(element, ast.Constant) and isinstance(element.value, str)
+            )
+    return ()
+
+
+def _parse_function(
+    function: ast.FunctionDef | ast.AsyncFunctionDef,
+) -> tuple[list[DiscoveredCommand], list[DiscoveredListener], bool]:
+    commands: list[DiscoveredCommand] = []
+    listeners: list[DiscoveredListener] = []
+    is_task = False
+    for decorator in function.decorator_list:
+        call = decorator if isinstance(decorator, ast.Call) else None
+        name = _dotted_name(call.func if call is not None else decorator)
+        if name is None:
+            continue
+        last = name.rsplit(".", 1)[-1]
+        if last in COMMAND_DECORATOR_NAMES:
+            command_name = _str_argument(call, "name") if call is not None else None
+            commands.append(
+                DiscoveredCommand(
+                    name=command_name or function.name,
+                    function_name=function.name,
+                    decorator=name,
+                    aliases=_str_list_argument(call, "aliases") if call is not None else (),
+                ),
+            )
+        elif last == LISTENER_DECORATOR_NAME:
+            event = _str_argument(call, "name", position=0) if call is not None else None
+            listeners.append(DiscoveredListener(event=event or function.name, function_name=function.name))
+        elif last == TASK_DECORATOR_NAME:
+            is_task = True
+    return commands, listeners, is_task
+
+
+def _parse_cogs(module_path: Path, source: bytes) -> Result[list[DiscoveredCog], str]:
+    """ソースコードを構文解析し、Cogを継承したクラスを探す
+
+    同じファイル内でCogを継承したクラスを、さらに継承したクラスも対象とする
+    """
+    try:
+        tree = ast.parse(source, filename=module_path.as_posix())
+    except (SyntaxError, ValueError) as e:
+        return Err(f"Error parsing {module_path}: {e}")
+
+    cog_names: set[str] = set()
+    cogs: list[DiscoveredCog] = []
+    for node in tree.body:
+        if not isinstance(node, ast.ClassDef):
+            continue
+        base_names = [name for name in (_dotted_name(base) for base in node.bases) if name is not None]
+        if not any(name.rsplit(".", 1)[-1] in COG_BASE_NAMES or name in cog_names for name in base_names):
+            continue
+        cog_names.add(node.name)
+        commands: list[DiscoveredCommand] = []
+        listeners: list[DiscoveredListener] = []
+        tasks: list[str] = []
+        for item in node.body:
+            if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                item_commands, item_listeners, is_task = _parse_function(item)
+                commands.extend(item_commands)
+                listeners.extend(item_listeners)
+                if is_task:
+                    tasks.append(item.name)
+        # `@group.command()` のように、同じクラスのグループのメソッド名で始まるデコレータはサブコマンド
+        groups = {
+            command.function_name
+            for command in commands
+            if command.decorator.rsplit(".", 1)[-1] in GROUP_DECORATOR_NAMES
+        }
+        commands = [
+            dataclasses.replace(command, parent=parent)
+            if (parent := command.decorator.rpartition(".")[0]) in groups
+            else command
+            for command in commands
+        ]
+        cogs.append(
+            DiscoveredCog(
+                name=node.name,
+                module_path=module_path,
+                lineno=node.lineno,
+                commands=tuple(commands),
+                listeners=tuple(listeners),
+                tasks=tuple(tasks),
+            ),
+        )
+    return Ok(cogs)
+
+
+class StaticDiscoveryCache:
+    """ファイル内容のハッシュをキーとして、静的解析の結果を保存するキャッシュ
+
+    Args:
+        path (Path | None): キャッシュファイルのパス (Noneの場合はメモリ上のみ)
+        logger (Logger | None): ロガー
+    """
+
+    def __init__(self, path: Path | None = None, logger: Logger | None = None) -> None:
+        self._path = path
+        self._logger = logger
+        self._entries: dict[str, list[dict[str, Any]]] = {}
+        self._touched: set[str] = set()
+        self._is_dirty = False
+        self.hits = 0
+        self.misses = 0
+        if path is not None:
+            self._load(path)
+
+    def _load(self, path: Path) -> None:
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError):
+            if self._logger is not None:
+                msg = f"Ignore broken discovery cache: {path}"
+                self._logger.warning(msg)
+            return
+        if isinstance(data, dict) and data.get("version") == CACHE_VERSION and isinstance(data.get("entries"), dict):
+            self._entries = data["entries"]
+
+    def get(self, digest: str, module_path: Path) -> list[DiscoveredCog] | None:
+        entry = self._entries.get(digest)
+        if entry is None:
+            self.misses += 1
+            return None
+        try:
+            cogs = [
+                DiscoveredCog(
+                    name=str(cog["name"]),
+                    module_path=module_path,
+                    lineno=int(cog["lineno"]),
+                    commands=tuple(
+                        DiscoveredCommand(
+                            name=str(name),
+                            function_name=str(function_name),
+                            decorator=str(decorator),
+                            aliases=tuple(str(alias) for alias in aliases),
+                            parent=None if parent is None else str(parent),
+                        )
+                        for name, function_name, decorator, aliases, parent in cog["commands"]
+                    ),
+                    listeners=tuple(DiscoveredListener(*listener) for listener in cog["listeners"]),
+                    tasks=tuple(str(task) for task in cog["tasks"]),
+                )
+                for cog in entry
+            ]
+        except (KeyError, TypeError, ValueError):
+            self.misses += 1
+            return None
+        self._touched.add(digest)
+        self.hits += 1
+        return cogs
+
+    def put(self, digest: str, cogs: list[DiscoveredCog]) -> None:
+        self._entries[digest] = [
+            {
+                "name": cog.name,
+                "lineno": cog.lineno,
+                "commands": [[c.name, c.function_name, c.decorator, list(c.aliases), c.parent] for c in cog.commands],
+                "listeners": [[listener.event, listener.function_name] for listener in cog.listeners],
+                "tasks": list(cog.tasks),
+            }
+            for cog in cogs
+        ]
+        self._touched.add(digest)
+        self._is_dirty = True
+
+    def save(self) -> None:
+        """変更があればキャッシュファイルに書き込む (一時ファイルに書いてから置き換える)"""
+        if self._path is None or not (self._is_dirty or self._touched != self._entries.keys()):
+            return
+        self._entries = {digest: entry for digest, entry in self._entries.items() if digest in self._touched}
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._path.with_name(f"{self._path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(
+            json.dumps({"version": CACHE_VERSION, "entries": self._entries}, separators=(",", ":")),
+            encoding="utf-8",
+        )
+        tmp_path.replace(self._path)
+        self._is_dirty = False
+
+
+def discover_cogs(
+    file_paths: Sequence[Path],
+    cache: StaticDiscoveryCache | None = None,
+    logger: Logger | None = None,
+) -> list[DiscoveredCog]:
+    """ファイルを実行せずに、Cogを継承したクラスとそのコマンド・イベントリスナーを列挙する
+
+    Args:
+        file_paths (Sequence[Path]): 解析するファイル
+        cache (StaticDiscoveryCache | None): 解析結果のキャッシュ (ファイルへの書き込みは呼び出し側で `save()` する)
+        logger (Logger | None): ロガー
+
+    Returns:
+        list[DiscoveredCog]: 見つかったCog (ファイル順、ファイル内では定義順)
+
+    Raises:
+        ImportModuleError: 読み込みや構文解析に失敗したファイルがある場合
+    """
+    cache = cache if cache is not None else StaticDiscoveryCache(logger=logger)
+    cogs: list[DiscoveredCog] = []
+    errors: list[str] = []
+    for file_path in file_paths:
+        try:
+            source = file_path.read_bytes()
+        except OSError as e:
+            errors.append(f"Error reading {file_path}: {e}")
+            continue
+        digest = hashlib.sha256(source).hexdigest()
+        cached = cache.get(digest, file_path)
+        if cached is not None:
+            cogs.extend(cached)
+            continue
+        result = _parse_cogs(file_path, source)
+        if result.is_err():
+            errors.append(result.unwrap_err())
+            continue
+        cache.put(digest, result.unwrap())
+        cogs.extend(result.unwrap())
+
+    if logger is not None:
+        msg = f"Discovered {len(cogs)} cogs in {len(file_paths)} files (cache hits: {cache.hits})"
+        logger.debug(msg)
+    if len(errors) > 0:
+        if logger is not None:
+            logger.error("\n".join(errors))
+        raise ImportModuleError("\n".join(errors))
+    return cogs
+
+
+def discover_cogs_from_directory(
+    directory_path: str,
+    include_name: list[str] | None = None,
+    logger: Logger | None = None,
+    *,
+    prune_patterns: Sequence[str] | None = None,
+    manifest_path: Path | None = None,
+    cache: StaticDiscoveryCache | None = None,
+) -> list[DiscoveredCog]:
+    """指定されたディレクトリ内から、include_name に指定されたファイルに含まれるCogを静的に列挙する
+
+    `import_classes_from_directory` と同じ規則でファイルを探すが、モジュールは実行しない
+
+    Args:
+        directory_path (str): 対象のディレクトリパス
+        include_name (list[str] | None): 対象のファイル名のリスト (Noneの場合は全ての `.py`)
+        logger (Logger | None): ロガー
+        prune_patterns (Sequence[str] | None): 探索しないディレクトリ名のパターン (Noneの場合は既定値)
+        manifest_path (Path | None): 探索結果を保存するマニフェストのパス
+        cache (StaticDiscoveryCache | None): 解析結果のキャッシュ
+
+    Returns:
+        list[DiscoveredCog]: 見つかったCog
+    """
+    directory = Path(directory_path)
+    if not directory.is_dir():
+        msg = f"Directory {directory_path} does not exist"
+        if logger is not None:
+            logger.error(msg)
+        raise FileNotFoundError(msg)
+    file_paths = find_tool_files(
+        directory.resolve(),
+        include_name=include_name,
+        prune_patterns=prune_patterns,
+        manifest_path=manifest_path,
+        logger=logger,
+    )
+    return discover_cogs(file_paths, cache=cache, logger=logger)
@@ -0,0 +1,128 @@
+import hashlib
+import importlib.util
+import json
+import marshal
+import zipfile
+from collections.abc import Sequence
+from logging import Logger
+from pathlib import Path
+
+from concord.exception.import_module import ImportModuleError
+from concord.infrastructure.discord.tool_manifest import find_tool_files
+from concord.model.tool_bundle import BundledTool, ToolBundleManifest
+
+BUNDLE_SUFFIX = ".zip"
+BUNDLE_MANIFEST_NAME = "concord_bundle.json"
+BUNDLE_VERSION = 1
+# PEP 552 のハッシュベースのpycで、ソースとの照合をしないもの (zip内のソースの更新時刻に依存しない)
+_UNCHECKED_HASH_PYC_FLAGS = 0b01
+
+
+def is_tool_bundle(path: Path) -> bool:
+    """ツールのバンドル (zipファイル) かどうか"""
+    return path.suffix == BUNDLE_SUFFIX and path.is_file()
+
+
+def _hash_based_pyc(source: bytes, filename: str) -> bytes:
+    code = compile(source, filename, "exec", dont_inherit=True)
+    return (
+        importlib.util.MAGIC_NUMBER
+        + _UNCHECKED_HASH_PYC_FLAGS.to_bytes(4, "little")
+        + importlib.util.source_hash(source)
+        + marshal.dumps(code)
+    )
+
+
+def build_tool_bundle(
+    directory: Path,
+    bundle_path: Path,
+    include_name: list[str] | None = None,
+    logger: Logger | None = None,
+    *,
+    prune_patterns: Sequence[str] | None = None,
+    compile_bytecode: bool = False,
+) -> ToolBundleManifest:
+    """ツールディレクトリから、ツールファイルをまとめたバンドル (zipファイル) を作る
+
+    バンドルにはツールのルートからの相対パスでソースを格納し、マニフェストを `concord_bundle.json` に書く。
+    `compile_bytecode` を指定した場合は、同じ場所に `.pyc` も格納し、読み込み時のコンパイルを省く。
+
+    Args:
+        directory (Path): ツールのルートディレクトリ
+        bundle_path (Path): 作成するバンドルのパス (`.zip`)
+        include_name (list[str] | None): 対象のファイル名のリスト (Noneの場合は全ての `.py`)
+        logger (Logger | None): ロガー
+        prune_patterns (Sequence[str] | None): 探索しないディレクトリ名のパターン (Noneの場合は既定値)
+        compile_bytecode (bool): バイトコードも格納するかどうか (読み込むPythonと同じバージョンで作る必要がある)
+
+    Returns:
+        ToolBundleManifest: 作成したバンドルのマニフェスト
+    """
+    root = directory.resolve()
+    file_paths = find_tool_files(root, include_name=include_name, prune_patterns=prune_patterns, logger=logger)
+    tools: list[BundledTool] = []
+    tmp_path = bundle_path.with_name(f"{bundle_path.name}.tmp")
+    with zipfile.ZipFile(tmp_path, "w", compression=zipfile.ZIP_DEFLATED) as bundle:
+        for file_path in file_paths:
+            relative_path = file_path.relative_to(root).as_posix()
+            source = file_path.read_bytes()
+            bundle.writestr(relative_path, source)
+            if compile_bytecode:
+                pyc = _hash_based_pyc(source, f"{bundle_path.name}/{relative_path}")
+                bundle.writestr(f"{relative_path.removesuffix('.py')}.pyc", pyc)
+            tools.append(
+                BundledTool(
+                    path=relative_path,
+                    sha256=hashlib.sha256(source).hexdigest(),
+                    bytecode=compile_bytecode,
+                ),
+            )
+        manifest = ToolBundleManifest(
+            version=BUNDLE_VERSION,
+            magic=importlib.util.MAGIC_NUMBER.hex(),
+            tools=tuple(tools),
+        )
+        bundle.writestr(
+            BUNDLE_MANIFEST_NAME,
+            json.dumps(
+                {
+                    "version": manifest.version,
+                    "magic": manifest.magic,
+                    "tools": [{"path": t.path, "sha256": t.sha256, "bytecode": t.bytecode} for t in manifest.tools],
+                },
+                indent=2,
+            ),
+        )
+    tmp_path.replace(bundle_path)
+    if logger is not None:
+        msg = f"Built tool bundle {bundle_path} ({len(tools)} tools, bytecode: {compile_bytecode})"
+        logger.info(msg)
+    return manifest
+
+
+def read_tool_bundle_manifest(bundle_path: Path) -> ToolBundleManifest:
+    """バンドルのマニフェストを読み込む
+
+    Args:
+        bundle_path (Path): バンドルのパス
+
+    Returns:
+        ToolBundleManifest: マニフェスト
+
+    Raises:
+        ImportModuleError: バンドルやマニフェストが読めない、または形式のバージョンが異なる場合
+    """
+    try:
+        with zipfile.ZipFile(bundle_path) as bundle:
+            data = json.loads(bundle.read(BUNDLE_MANIFEST_NAME))
+    except (OSError, KeyError, zipfile.BadZipFile, json.JSONDecodeError) as e:
+        msg = f"Invalid tool bundle {bundle_path}: {e}"
+        raise ImportModuleError(msg) from e
+    if data.get("version") != BUNDLE_VERSION:
+        msg = f"Unsupported tool bundle version {data.get('version')} in {bundle_path}"
+        raise ImportModuleError(msg)
+    return ToolBundleManifest(
+        version=data["version"],
+        magic=data["magic"],
+        tools=tuple(BundledTool(path=t["path"], sha256=t["sha256"], bytecode=t["bytecode"]) for t in data["tools"]),
+    )
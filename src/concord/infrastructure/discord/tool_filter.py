@@ -0,0 +1,190 @@
+import fnmatch
+from collections.abc import Sequence
+from logging import Logger
+from pathlib import Path
+from typing import TypeVar
+
+from concord.exception.import_module import ImportModuleError
+from concord.infrastructure.discord.static_discovery import StaticDiscoveryCache, discover_cogs
+from concord.model.discovered_tool import DiscoveredCog
+from concord.model.import_class import LoadedClass
+from concord.model.tool_registration import SkippedTool
+
+TypeOfAny = TypeVar("TypeOfAny", bound=type)
+
+
+def _is_path_pattern(pattern: str) -> bool:
+    """`/` を含むか `.py` で終わるパターンはパス、それ以外はクラス名のパターンとして扱う"""
+    return "/" in pattern or pattern.endswith(".py")
+
+
+def _normalize_path_pattern(pattern: str) -> str:
+    # `legacy/` のようにディレクトリを指定した場合は、その下の全てのファイルに一致させる
+    return f"{pattern}*" if pattern.endswith("/") else pattern
+
+
+class ToolFilter:
+    """ツールの包含・除外の規則
+
+    パターンはglob形式で、`/` を含むか `.py` で終わるものはツールのルートからの相対パス、
+    それ以外はCogのクラス名と照合する。除外は包含より優先される。
+    包含のパターンを指定した場合は、いずれかに一致するツールだけを読み込む。
+
+    ファイルに含まれるCogは、モジュールを実行せずに静的解析で調べる。
+    全てのCogが読み込まれないファイルは、importしない。
+
+    Args:
+        inclusions (Sequence[str] | None): 包含のパターン (Noneの場合は全てのツールが対象)
+        exclusions (Sequence[str]): 除外のパターン
+        cache (StaticDiscoveryCache | None): 静的解析の結果のキャッシュ
+        logger (Logger | None): ロガー
+    """
+
+    def __init__(
+        self,
+        *,
+        inclusions: Sequence[str] | None = None,
+        exclusions: Sequence[str] = (),
+        cache: StaticDiscoveryCache | None = None,
+        logger: Logger | None = None,
+    ) -> None:
+        inclusions = inclusions if inclusions is not None else []
+        self._include_classes = [pattern for pattern in inclusions if not _is_path_pattern(pattern)]
+        self._include_paths = [_normalize_path_pattern(p) for p in inclusions if _is_path_pattern(p)]
+        self._exclude_classes = [pattern for pattern in exclusions if not _is_path_pattern(pattern)]
+        self._exclude_paths = [_normalize_path_pattern(p) for p in exclusions if _is_path_pattern(p)]
+        self._cache = cache if cache is not None else StaticDiscoveryCache(logger=logger)
+        self._logger = logger
+        self._skipped: list[SkippedTool] = []
+
+    @property
+    def is_empty(self) -> bool:
+        """規則が1つもないかどうか"""
+        patterns = [*self._include_classes, *self._include_paths, *self._exclude_classes, *self._exclude_paths]
+        return len(patterns) == 0
+
+    @property
+    def skipped(self) -> tuple[SkippedTool, ...]:
+        """これまでに読み込まなかったツール"""
+        return tuple(self._skipped)
+
+    def _path_reason(self, relative_path: str) -> str | None:
+        """パスの規則だけで読み込まないと決まる場合は、その理由を返す"""
+        for pattern in self._exclude_paths:
+            if fnmatch.fnmatchcase(relative_path, pattern):
+                return f"excluded by {pattern!r}"
+        # クラス名の包含パターンがある場合は、クラス名が分かるまで判断しない
+        if (
+            len(self._include_paths) > 0
+            and len(self._include_classes) == 0
+            and not any(fnmatch.fnmatchcase(relative_path, pattern) for pattern in self._include_paths)
+        ):
+            return "not matched by inclusions"
+        return None
+
+    def _reason(self, class_name: str, relative_path: str) -> str | None:
+        """クラスを読み込まない場合は、その理由を返す"""
+        for pattern in self._exclude_classes:
+            if fnmatch.fnmatchcase(class_name, pattern):
+                return f"excluded by {pattern!r}"
+        for pattern in self._exclude_paths:
+            if fnmatch.fnmatchcase(relative_path, pattern):
+                return f"excluded by {pattern!r}"
+        if len(self._include_classes) + len(self._include_paths) == 0:
+            return None
+        if any(fnmatch.fnmatchcase(class_name, pattern) for pattern in self._include_classes):
+            return None
+        if any(fnmatch.fnmatchcase(relative_path, pattern) for pattern in self._include_paths):
+            return None
+        return "not matched by inclusions"
+
+    def _skip(self, name: str, module_path: Path, reason: str, *, executed: bool = False) -> None:
+        self._skipped.append(SkippedTool(name=name, module_path=module_path, reason=reason, executed=executed))
+        if self._logger is not None:
+            msg = f"Skip tool {name} ({module_path}): {reason}"
+            self._logger.info(msg)
+
+    def select_files(self, root: Path, file_paths: Sequence[Path]) -> list[Path]:
+        """importするファイルを選ぶ (全てのCogが読み込まれないファイルを取り除く)
+
+        Args:
+            root (Path): ツールのルートディレクトリ
+            file_paths (Sequence[Path]): 候補のファイル
+
+        Returns:
+            list[Path]: importするファイル
+        """
+        if self.is_empty:
+            return list(file_paths)
+        selected: list[Path] = []
+        for file_path in file_paths:
+            relative_path = file_path.relative_to(root).as_posix()
+            path_reason = self._path_reason(relative_path)
+            try:
+                cogs = discover_cogs([file_path], cache=self._cache)
+            except ImportModuleError:
+                # 構文エラーなどは、importしたときのエラーとして報告する
+                cogs = []
+            if len(cogs) == 0:
+                # Cogが見つからない (静的解析では分からない) 場合はパスの規則だけで判断する
+                if path_reason is not None:
+                    self._skip(relative_path, file_path, path_reason)
+                else:
+                    selected.append(file_path)
+                continue
+            reasons = [self._reason(cog.name, relative_path) for cog in cogs]
+            if all(reason is not None for reason in reasons):
+                for cog, reason in zip(cogs, reasons, strict=True):
+                    self._skip(cog.name, file_path, str(reason))
+            else:
+                selected.append(file_path)
+        return selected
+
+    def select_classes(
+        self,
+        root: Path,
+        file_path: Path,
+        classes: Sequence[LoadedClass[TypeOfAny]],
+    ) -> list[LoadedClass[TypeOfAny]]:
+        """importしたファイルのクラスから、読み込むものを選ぶ
+
+        Args:
+            root (Path): ツールのルートディレクトリ
+            file_path (Path): importしたファイル
+            classes (Sequence[LoadedClass[TypeOfAny]]): importしたクラス
+
+        Returns:
+            list[LoadedClass[TypeOfAny]]: 読み込むクラス
+        """
+        if self.is_empty:
+            return list(classes)
+        relative_path = file_path.relative_to(root).as_posix()
+        selected: list[LoadedClass[TypeOfAny]] = []
+        for loaded in classes:
+            reason = self._reason(loaded.class_type.__name__, relative_path)
+            if reason is None:
+                selected.append(loaded)
+            else:
+                self._skip(loaded.class_type.__name__, file_path, reason, executed=True)
+        return selected
+
+    def select_cogs(self, root: Path, cogs: Sequence[DiscoveredCog]) -> list[DiscoveredCog]:
+        """静的解析で見つけたCogから、読み込むものを選ぶ
+
+        Args:
+            root (Path): ツールのルートディレクトリ
+            cogs (Sequence[DiscoveredCog]): 静的解析で見つけたCog
+
+        Returns:
+            list[DiscoveredCog]: 読み込むCog
+        """
+        if self.is_empty:
+            return list(cogs)
+        selected: list[DiscoveredCog] = []
+        for cog in cogs:
+            reason = self._reason(cog.name, cog.module_path.relative_to(root).as_posix())
+            if reason is None:
+                selected.append(cog)
+            else:
+                self._skip(cog.name, cog.module_path, reason)
+        return selected
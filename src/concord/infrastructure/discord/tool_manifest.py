@@ -0,0 +1,227 @@
+import hashlib
+import json
+import os
+from collections.abc import Sequence
+from fnmatch import fnmatchcase
+from logging import Logger
+from pathlib import Path
+
+from concord.model.tool_manifest import ManifestDirectory, ManifestFile
+
+DEFAULT_CACHE_DIR = Path(__file__).parent.parent.parent.parent / "caches"
+DEFAULT_PRUNE_PATTERNS: tuple[str, ...] = (".*", "__pycache__", "venv", "node_modules", "site-packages")
+MANIFEST_VERSION = 1
+
+
+def manifest_path_for(cache_dir: Path, root: Path) -> Path:
+    """ツールのルートディレクトリに対応するマニフェストファイルのパスを返す
+
+    Args:
+        cache_dir (Path): マニフェストを置くディレクトリ
+        root (Path): ツールのルートディレクトリ
+
+    Returns:
+        Path: マニフェストファイルのパス
+    """
+    digest = hashlib.sha1(root.resolve().as_posix().encode("utf-8"), usedforsecurity=False).hexdigest()
+    return cache_dir / f"tools.{digest[:12]}.json"
+
+
+class ToolManifest:
+    """ツールファイルの探索結果をディスクに保存するインデックス
+
+    ディレクトリごとの更新時刻と直下のエントリ、ツールファイルごとの (更新時刻, サイズ, inode) を保持する。
+    ディレクトリの更新時刻が変わっていなければ、直下のエントリは前回の探索結果を再利用できる。
+
+    Args:
+        root (Path): ツールのルートディレクトリ
+        include_name (Sequence[str] | None): 対象とするファイル名 (Noneの場合は全ての `.py`)
+        prune_patterns (Sequence[str]): 探索しないディレクトリ名のパターン (fnmatch形式)
+    """
+
+    def __init__(
+        self,
+        *,
+        root: Path,
+        include_name: Sequence[str] | None,
+        prune_patterns: Sequence[str],
+    ) -> None:
+        self.root = root
+        self.include_name = sorted(include_name) if include_name else None
+        self.prune_patterns = list(prune_patterns)
+        self.directories: dict[str, ManifestDirectory] = {}
+        self.files: dict[str, ManifestFile] = {}
+
+    def _header(self) -> dict[str, object]:
+        return {
+            "version": MANIFEST_VERSION,
+            "root": self.root.as_posix(),
+            "include_name": self.include_name,
+            "prune_patterns": self.prune_patterns,
+        }
+
+    @classmethod
+    def load(
+        cls,
+        path: Path,
+        *,
+        root: Path,
+        include_name: Sequence[str] | None,
+        prune_patterns: Sequence[str],
+        logger: Logger | None = None,
+    ) -> "ToolManifest":
+        """マニフェストを読み込む
+
+        ファイルが無い・壊れている・探索条件が異なる場合は、空のマニフェストを返す
+        """
+        manifest = cls(root=root, include_name=include_name, prune_patterns=prune_patterns)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return manifest
+        except (OSError, ValueError):
+            if logger is not None:
+                msg = f"Ignore broken tool manifest: {path}"
+                logger.warning(msg)
+            return manifest
+        if not isinstance(data, dict) or data.get("header") != manifest._header():
+            return manifest
+        try:
+            manifest.directories = {
+                key: ManifestDirectory(value[0], tuple(value[1]), tuple(value[2]))
+                for key, value in data["directories"].items()
+            }
+            manifest.files = {key: ManifestFile(*value) for key, value in data["files"].items()}
+        except (KeyError, TypeError, ValueError, AttributeError):
+            if logger is not None:
+                msg = f"Ignore broken tool manifest: {path}"
+                logger.warning(msg)
+            manifest.directories = {}
+            manifest.files = {}
+        return manifest
+
+    def save(self, path: Path) -> None:
+        """マニフェストを書き込む (一時ファイルに書いてから置き換える)"""
+        data = {
+            "header": self._header(),
+            "directories": {
+                key: [value.mtime_ns, list(value.subdirs), list(value.files)]
+                for key, value in self.directories.items()
+            },
+            "files": {key: [value.mtime_ns, value.size, value.ino] for key, value in self.files.items()},
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(data, separators=(",", ":")), encoding="utf-8")
+        tmp_path.replace(path)
+
+
+def _is_pruned(name: str, prune_patterns: Sequence[str]) -> bool:
+    return any(fnmatchcase(name, pattern) for pattern in prune_patterns)
+
+
+def _is_target(name: str, include_name: Sequence[str] | None) -> bool:
+    if include_name:
+        return name in include_name
+    return name.endswith(".py")
+
+
+def _scan_directory(
+    directory: str,
+    include_name: Sequence[str] | None,
+    prune_patterns: Sequence[str],
+) -> tuple[tuple[str, ...], tuple[str, ...]]:
+    subdirs: list[str] = []
+    files: list[str] = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if not _is_pruned(entry.name, prune_patterns):
+                    subdirs.append(entry.name)
+            elif entry.is_file() and _is_target(entry.name, include_name):
+                files.append(entry.name)
+    return tuple(sorted(subdirs)), tuple(sorted(files))
+
+
+def _walk(
+    directory: str,
+    previous: ToolManifest,
+    current: ToolManifest,
+    found: list[Path],
+) -> None:
+    try:
+        mtime_ns = os.stat(directory).st_mtime_ns  # noqa: PTH116
+    except OSError:
+        return
+    cached = previous.directories.get(directory)
+    if cached is not None and cached.mtime_ns == mtime_ns:
+        subdirs, files = cached.subdirs, cached.files
+    else:
+        try:
+            subdirs, files = _scan_directory(directory, current.include_name, current.prune_patterns)
+        except OSError:
+            return
+    current.directories[directory] = ManifestDirectory(mtime_ns, subdirs, files)
+
+    for name in files:
+        file_path = os.path.join(directory, name)  # noqa: PTH118
+        try:
+            stat = os.stat(file_path)  # noqa: PTH116
+        except OSError:
+            continue
+        current.files[file_path] = ManifestFile(stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        found.append(Path(file_path))
+    for name in subdirs:
+        _walk(os.path.join(directory, name), previous, current, found)  # noqa: PTH118
+
+
+def find_tool_files(
+    root: Path,
+    include_name: Sequence[str] | None = None,
+    prune_patterns: Sequence[str] | None = None,
+    manifest_path: Path | None = None,
+    logger: Logger | None = None,
+) -> list[Path]:
+    """ツールのルートディレクトリからツールファイルを探す
+
+    `os.scandir` でディレクトリを辿り、prune_patterns に一致するディレクトリの中には入らない。
+    manifest_path を指定した場合は前回の探索結果を読み込み、更新時刻が変わっていないディレクトリは
+    再走査せずに前回のエントリを使う。探索後にマニフェストを書き戻す。
+
+    Args:
+        root (Path): ツールのルートディレクトリ
+        include_name (Sequence[str] | None): 対象とするファイル名 (Noneの場合は全ての `.py`)
+        prune_patterns (Sequence[str] | None): 探索しないディレクトリ名のパターン (Noneの場合は既定値)
+        manifest_path (Path | None): マニフェストファイルのパス (Noneの場合はマニフェストを使わない)
+        logger (Logger | None): ロガー
+
+    Returns:
+        list[Path]: ツールファイルのパス (パス順)
+    """
+    prune_patterns = DEFAULT_PRUNE_PATTERNS if prune_patterns is None else prune_patterns
+    current = ToolManifest(root=root, include_name=include_name, prune_patterns=prune_patterns)
+    if manifest_path is not None:
+        previous = ToolManifest.load(
+            manifest_path,
+            root=root,
+            include_name=include_name,
+            prune_patterns=prune_patterns,
+            logger=logger,
+        )
+    else:
+        previous = ToolManifest(root=root, include_name=include_name, prune_patterns=prune_patterns)
+
+    found: list[Path] = []
+    _walk(root.as_posix(), previous, current, found)
+
+    if manifest_path is not None:
+        try:
+            current.save(manifest_path)
+        except OSError:
+            if logger is not None:
+                msg = f"Failed to write tool manifest: {manifest_path}"
+                logger.warning(msg)
+    if logger is not None:
+        msg = f"Found {len(found)} tool files in {root} ({len(current.directories)} directories)"
+        logger.debug(msg)
+    return sorted(found, key=str)
@@ -0,0 +1,114 @@
+import logging
+from collections import deque
+
+DEFAULT_TRIGGER_LEVEL = logging.ERROR
+DEFAULT_BUFFER_BELOW = logging.INFO
+REPLAYED_ATTRIBUTE = "flight_recorder_replayed"
+
+
+class FlightRecorderHandler(logging.Handler):
+    """直近のログをメモリに残し、ERROR以上のログが出たときにまとめて書き出すハンドラー
+
+    `buffer_below` 未満のログ (通常はDEBUG) は整形せずに (`LogRecord` のまま) 上限のあるリングバッファに残し、
+    古いものから捨てる (それ以上のログは、普段から書き込まれるため残さない)。
+    ERROR以上のログが出た場合は、残したログとそのログを書き出し先のハンドラーで整形して書き込み、バッファを空にする。
+    整形は書き出すログにだけ行うため、書き出さずに捨てたログは整形されない。
+
+    `add_target` で追加したハンドラーはロガーにも登録されているため、自身のレベルで受け取らなかったログだけを渡し、
+    きっかけになったログは渡さない (同じログが2回届かないようにする)。
+    書き出すログには `flight_recorder_replayed` 属性を付けるため、追加したハンドラーはこれを見て待たずに送れる。
+
+    Notes:
+        整形を書き出すときまで遅らせるため、ログの引数 (`args`) は書き出す時点の内容で展開される。
+
+    Args:
+        capacity (int): 残すログの数の上限
+        target (logging.Handler): 書き出し先のハンドラー (ロガーには登録しない)
+        trigger_level (int): 書き出すきっかけになるログレベル
+        buffer_below (int): このログレベル未満のログだけを残す
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        target: logging.Handler,
+        trigger_level: int = DEFAULT_TRIGGER_LEVEL,
+        buffer_below: int = DEFAULT_BUFFER_BELOW,
+    ) -> None:
+        if capacity <= 0:
+            msg = f"capacity must be positive: {capacity}"
+            raise ValueError(msg)
+        super().__init__()
+        self.capacity = capacity
+        self.trigger_level = trigger_level
+        self.buffer_below = min(buffer_below, trigger_level)
+        self.dumps = 0
+        self._buffer: deque[logging.LogRecord] = deque(maxlen=capacity)
+        self._targets: list[logging.Handler] = [target]
+
+    def add_target(self, handler: logging.Handler) -> None:
+        """書き出し先のハンドラーを追加する (ロガーにも登録している、ログチャンネルなど)"""
+        self.acquire()
+        try:
+            if handler not in self._targets:
+                self._targets.append(handler)
+        finally:
+            self.release()
+
+    def remove_target(self, handler: logging.Handler) -> None:
+        """追加した書き出し先のハンドラーを外す"""
+        self.acquire()
+        try:
+            if handler in self._targets[1:]:
+                self._targets.remove(handler)
+        finally:
+            self.release()
+
+    @property
+    def pending(self) -> int:
+        """バッファに残っているログの数"""
+        return len(self._buffer)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if record.levelno < self.trigger_level:
+            if record.levelno < self.buffer_below:
+                self._buffer.append(record)
+            return
+        records = [*self._buffer]
+        self._buffer.clear()
+        self.dumps += 1
+        for replayed in records:
+            setattr(replayed, REPLAYED_ATTRIBUTE, True)
+        first, *added = self._targets
+        # 最初の書き出し先 (ファイル) には、ログレベルによらず残したログを全て書き込む
+        self._dump(first, [*records, record])
+        for target in added:
+            self._dump(target, [replayed for replayed in records if replayed.levelno < target.level])
+
+    @staticmethod
+    def _dump(target: logging.Handler, records: list[logging.LogRecord]) -> None:
+        if len(records) == 0:
+            return
+        target.acquire()
+        try:
+            for record in records:
+                try:
+                    target.emit(record)
+                except Exception:  # noqa: BLE001
+                    target.handleError(record)
+        finally:
+            target.release()
+
+    def flush(self) -> None:
+        self.acquire()
+        try:
+            for target in self._targets:
+                target.flush()
+        finally:
+            self.release()
+
+    def close(self) -> None:
+        # 最初の書き出し先 (ファイル) だけを閉じる (追加したハンドラーは、追加した側が閉じる)
+        self._targets[0].close()
+        self._buffer.clear()
+        super().close()
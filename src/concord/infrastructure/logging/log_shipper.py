@@ -0,0 +1,121 @@
+import io
+from collections.abc import Iterable, Sequence
+
+from discord import File
+from discord.channel import TextChannel
+from discord.errors import Forbidden, HTTPException, NotFound
+from discord.threads import Thread
+from pyresults import Err, Ok, Result
+
+from concord.model.log_shipping import LogShipperStats
+
+MESSAGE_LIMIT = 2000
+CODE_BLOCK_PREFIX = "```bash\n"
+CODE_BLOCK_SUFFIX = "\n```"
+ATTACHMENT_FILENAME = "logs.txt"
+DEFAULT_LINGER = 1.0
+DEFAULT_MAX_BATCH_CHARS = 20_000
+DEFAULT_ATTACHMENT_AFTER = 3
+
+
+def _escape(entry: str) -> str:
+    # ログの中の ``` でコードブロックが閉じないようにする
+    return entry.replace("```", "`\u200b``")
+
+
+def pack_log_entries(entries: Iterable[str], limit: int = MESSAGE_LIMIT) -> list[str]:
+    """ログを、文字数の上限に収まるできるだけ少ないメッセージ (コードブロック) にまとめる
+
+    ログの順序は保ち、1つのメッセージに収まらないログだけを分割する。
+
+    Args:
+        entries (Iterable[str]): 整形済みのログ
+        limit (int): メッセージ1つの文字数の上限
+
+    Returns:
+        list[str]: メッセージの本文
+    """
+    body_limit = limit - len(CODE_BLOCK_PREFIX) - len(CODE_BLOCK_SUFFIX)
+    bodies: list[list[str]] = []
+    lines: list[str] = []
+    size = 0
+    for entry in entries:
+        escaped = _escape(entry)
+        pieces = [escaped[i : i + body_limit] for i in range(0, len(escaped), body_limit)] or [""]
+        for piece in pieces:
+            added = len(piece) + (1 if lines else 0)
+            if lines and size + added > body_limit:
+                bodies.append(lines)
+                lines = []
+                size = 0
+                added = len(piece)
+            lines.append(piece)
+            size += added
+    if lines:
+        bodies.append(lines)
+    return [CODE_BLOCK_PREFIX + "\n".join(body) + CODE_BLOCK_SUFFIX for body in bodies]
+
+
+class LogShipper:
+    """まとめたログを、できるだけ少ないメッセージでログチャンネルに送信する
+
+    メッセージは順に送信し、レート制限 (レスポンスの `X-RateLimit-*` ヘッダーと429) は
+    discord.pyのHTTPクライアントに従う。
+    制限で送信を待っている間に溜まったログは、次にまとめて送信される。
+
+    Args:
+        message_limit (int): メッセージ1つの文字数の上限
+        attachment_after (int): これより多くのメッセージが必要な場合は、1つの添付ファイルで送信する
+    """
+
+    def __init__(
+        self,
+        *,
+        message_limit: int = MESSAGE_LIMIT,
+        attachment_after: int = DEFAULT_ATTACHMENT_AFTER,
+    ) -> None:
+        self._message_limit = message_limit
+        self._attachment_after = attachment_after
+        self._records = 0
+        self._batches = 0
+        self._messages = 0
+        self._attachments = 0
+
+    async def ship(self, entries: Sequence[str], channel: TextChannel | Thread) -> Result[None, str]:
+        """ログをまとめて送信する
+
+        Args:
+            entries (Sequence[str]): 整形済みのログ
+            channel (TextChannel | Thread): ログチャンネル
+
+        Returns:
+            Result[None, str]: 送信に失敗した場合はエラーの内容
+        """
+        messages = pack_log_entries(entries, self._message_limit)
+        try:
+            if len(messages) > self._attachment_after:
+                text = "\n".join(entries)
+                await channel.send(
+                    content=f"{len(entries)} log records ({len(text)} chars)",
+                    file=File(io.BytesIO(text.encode("utf-8")), filename=ATTACHMENT_FILENAME),
+                )
+                self._messages += 1
+                self._attachments += 1
+            else:
+                for message in messages:
+                    await channel.send(content=message)
+                    self._messages += 1
+        except (HTTPException, Forbidden, NotFound, ValueError, TypeError) as e:
+            return Err(f"{e!s}")
+        self._records += len(entries)
+        self._batches += 1
+        return Ok(None)
+
+    def stats(self) -> LogShipperStats:
+        """送信の統計を返す"""
+        return LogShipperStats(
+            records=self._records,
+            batches=self._batches,
+            messages=self._messages,
+            attachments=self._attachments,
+        )
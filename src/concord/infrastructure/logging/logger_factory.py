@@ -1,8 +1,15 @@
+import atexit
+import copy
 import logging
-from logging import FileHandler, Formatter, Logger, getLogger
-from logging.handlers import TimedRotatingFileHandler
+import queue
+import threading
+from dataclasses import dataclass
+from logging import FileHandler, Formatter, Handler, Logger, getLogger
+from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler
 from pathlib import Path
 
+from concord.infrastructure.logging.flight_recorder import FlightRecorderHandler
+
 BACKGROUND_LOG_LEVEL = logging.INFO
 BACKGROUND_LOG_FORMATTER = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 DEBUG_LOG_FORMATTER = (
@@ -13,9 +20,8 @@ DEBUG_LOG_FORMATTER = (
 DEFAULT_LOG_DIR = Path(__file__).parent.parent.parent.parent / "logs"
 
 
-def get_background_log(name: str, log_dir: Path) -> Logger:
-    logger = getLogger(name)
-    logger.setLevel(BACKGROUND_LOG_LEVEL)
+def create_background_handler(name: str, log_dir: Path) -> TimedRotatingFileHandler:
+    """ログを `{name}.background.log` に書き込み、1週間ごとにローテートするハンドラーを作る"""
     handler = TimedRotatingFileHandler(
         (log_dir / f"{name}.background.log").as_posix(),
         when="midnight",
@@ -25,29 +31,183 @@ def get_background_log(name: str, log_dir: Path) -> Logger:
     )
     formatter = Formatter(BACKGROUND_LOG_FORMATTER)
     handler.setFormatter(formatter)
+    return handler
+
+
+def create_debug_handler(name: str, log_dir: Path) -> FileHandler:
+    """ログを呼び出し元の位置と共に `{name}.log` に書き込むハンドラーを作る"""
+    handler = FileHandler((log_dir / f"{name}.log").as_posix(), encoding="utf-8")
+    formatter = Formatter(DEBUG_LOG_FORMATTER)
+    handler.setFormatter(formatter)
+    return handler
+
+
+def _add_handler_once(logger: Logger, handler: FileHandler) -> None:
+    """同じファイルに書き込むハンドラーが無い場合だけ追加する (2回呼んでも同じログが重複しない)"""
+    for existing in logger.handlers:
+        if isinstance(existing, FileHandler) and existing.baseFilename == handler.baseFilename:
+            handler.close()
+            return
     logger.addHandler(handler)
+
+
+def get_background_log(name: str, log_dir: Path) -> Logger:
+    logger = getLogger(name)
+    logger.setLevel(BACKGROUND_LOG_LEVEL)
+    _add_handler_once(logger, create_background_handler(name, log_dir))
     return logger
 
 
 def my_logger(name: str, level: int, log_dir: Path) -> Logger:
     logger = getLogger(name)
     logger.setLevel(level)
-    handler = FileHandler((log_dir / f"{name}.log").as_posix(), encoding="utf-8")
-    formatter = Formatter(DEBUG_LOG_FORMATTER)
-    handler.setFormatter(formatter)
-    logger.addHandler(handler)
+    _add_handler_once(logger, create_debug_handler(name, log_dir))
     return logger
 
 
+class _DeferredQueueHandler(QueueHandler):
+    """ファイルへの書き込みを `QueueListener` のスレッドに任せる `QueueHandler`
+
+    `QueueHandler.prepare` は例外を `%(message)s` に含めてしまうため、
+    メッセージの展開と例外の文字列化だけを行い、整形は書き込み先のハンドラーに任せる。
+    `lazy_below` より低いレベルのログは、書き込まれるか分からないため展開もせずにそのまま渡す。
+    """
+
+    def __init__(self, log_queue: "queue.SimpleQueue[logging.LogRecord]", lazy_below: int = logging.NOTSET) -> None:
+        super().__init__(log_queue)
+        self.lazy_below = lazy_below
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.levelno < self.lazy_below:
+            return record
+        # 引数のオブジェクトが後から変わっても、呼び出した時点の内容を書き込む
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info is not None:
+            if record.exc_text is None:
+                record.exc_text = Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+@dataclass
+class _QueuedLogging:
+    """`get_logger` でロガーに登録したキューとファイルのハンドラー"""
+
+    log_dir: Path
+    debug: bool
+    flight_recorder: int
+    queue_handler: QueueHandler
+    listener: QueueListener
+    recorder: FlightRecorderHandler | None
+
+
+_queued_logging: dict[str, _QueuedLogging] = {}
+_queued_logging_lock = threading.Lock()
+
+
+def stop_log_listeners() -> None:
+    """`get_logger` で始めた全てのスレッドを、キューに残ったログを書き込んでから止める
+
+    プロセスの終了時に自動で呼ばれる。
+    """
+    with _queued_logging_lock:
+        for name, queued in list(_queued_logging.items()):
+            _stop_queued_logging(name, queued)
+        _queued_logging.clear()
+
+
+def _stop_queued_logging(name: str, queued: _QueuedLogging) -> None:
+    getLogger(name).removeHandler(queued.queue_handler)
+    queued.listener.stop()
+    for handler in queued.listener.handlers:
+        handler.close()
+
+
+atexit.register(stop_log_listeners)
+
+
 def get_logger(
     name: str,
     level: int = logging.INFO,
     log_dir: Path | None = None,
+    *,
+    flight_recorder: int = 0,
 ) -> logging.Logger:
+    """ファイルに書き込むロガーを取得する
+
+    ログは `QueueHandler` でキューに積むだけで、ファイルへの書き込みとローテートは
+    `QueueListener` のスレッドで行う (イベントループのスレッドでディスクの入出力を待たない)。
+    同じ名前で2回以上呼んでも、ハンドラーは重複しない。
+
+    Args:
+        name (str): ロガーの名前
+        level (int): ログレベル (INFOより低い場合は、呼び出し元の位置と共に `{name}.log` にも書き込む)
+        log_dir (Path | None): ログを書き込むディレクトリ
+        flight_recorder (int): INFO以上の場合に、直近のINFO未満のログ (DEBUG) をメモリに残す数
+            (ERROR以上のログが出たときに `{name}.log` に書き出す。0の場合は残さない)
+
+    Returns:
+        logging.Logger: ロガー
+    """
     log_dir = log_dir or DEFAULT_LOG_DIR
     if not log_dir.exists():
         log_dir.mkdir(parents=True, exist_ok=True)
-    logger = get_background_log(name, log_dir)
-    if level < BACKGROUND_LOG_LEVEL:
-        logger = my_logger(name, level, log_dir)
+    debug = level < BACKGROUND_LOG_LEVEL
+    if debug:
+        # 全てのDEBUGのログを書き込むため、残す必要はない
+        flight_recorder = 0
+    logger = getLogger(name)
+    if debug:
+        logger.setLevel(level)
+    elif flight_recorder > 0:
+        # DEBUGのログもキューに積み、リスナーのスレッドでメモリに残す
+        logger.setLevel(logging.DEBUG)
+    else:
+        logger.setLevel(BACKGROUND_LOG_LEVEL)
+    with _queued_logging_lock:
+        queued = _queued_logging.get(name)
+        if queued is not None:
+            if (queued.log_dir, queued.debug, queued.flight_recorder) == (log_dir, debug, flight_recorder):
+                return logger
+            _stop_queued_logging(name, queued)
+        background = create_background_handler(name, log_dir)
+        handlers: list[Handler] = [background]
+        recorder: FlightRecorderHandler | None = None
+        if debug:
+            handlers.append(create_debug_handler(name, log_dir))
+        elif flight_recorder > 0:
+            # DEBUGのログはメモリに残すだけにし、書き出すまで整形しない
+            # (`{name}.background.log` にはこれまで通りINFO以上だけを書き込む)
+            background.setLevel(BACKGROUND_LOG_LEVEL)
+            recorder = FlightRecorderHandler(
+                flight_recorder,
+                create_debug_handler(name, log_dir),
+                buffer_below=BACKGROUND_LOG_LEVEL,
+            )
+            handlers.append(recorder)
+        log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+        queue_handler = _DeferredQueueHandler(
+            log_queue,
+            lazy_below=BACKGROUND_LOG_LEVEL if recorder is not None else logging.NOTSET,
+        )
+        listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        listener.start()
+        logger.addHandler(queue_handler)
+        _queued_logging[name] = _QueuedLogging(
+            log_dir=log_dir,
+            debug=debug,
+            flight_recorder=flight_recorder,
+            queue_handler=queue_handler,
+            listener=listener,
+            recorder=recorder,
+        )
     return logger
+
+
+def get_flight_recorder(name: str) -> FlightRecorderHandler | None:
+    """`get_logger` でロガーに登録した `FlightRecorderHandler` を取得する (登録していない場合はNone)"""
+    with _queued_logging_lock:
+        queued = _queued_logging.get(name)
+        return None if queued is None else queued.recorder
@@ -1,55 +1,264 @@
 import asyncio
+import concurrent.futures
+import contextlib
 import logging
-import queue
-import threading
+import sys
+from collections import deque
 
 from discord.channel import TextChannel
-from discord.errors import Forbidden, HTTPException, NotFound
 from discord.threads import Thread
-from pyresults import Err, Ok, Result
+from pyresults import Err
 
 from concord.exception.send_log import DiscordSendLogError
+from concord.infrastructure.logging.flight_recorder import REPLAYED_ATTRIBUTE
+from concord.infrastructure.logging.log_shipper import (
+    DEFAULT_LINGER,
+    DEFAULT_MAX_BATCH_CHARS,
+    LogShipper,
+)
+from concord.model.log_shipping import LOG_OVERFLOW_POLICIES, LogPipelineStats
 
 FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s (module: %(module)s, func: %(funcName)s)"
+DEFAULT_QUEUE_SIZE = 1000
+DEFAULT_BLOCK_TIMEOUT = 5.0
+DEFAULT_DRAIN_TIMEOUT = 10.0
 
-log_queue: queue.Queue[tuple[str, TextChannel | Thread]] = queue.Queue()
 
+class LogPipeline:
+    """ログチャンネルへのログの送信を、BOTのイベントループのタスクとして行う
 
-class DiscordLogHandler(logging.Handler):
-    def __init__(self, log_channel: TextChannel | Thread) -> None:
-        super().__init__(level=logging.INFO)
+    ログはどのスレッドからでも `submit` で積める (イベントループへは `call_soon_threadsafe` で渡す)。
+    キューの大きさには上限があり、一杯の場合は `overflow` に従う。
+
+    - `drop_oldest`: 一番古いログを捨てる (既定値)
+    - `drop_debug`: DEBUGのログを先に捨てる (DEBUGのログが無い場合は、一番古いログを捨てる)
+    - `block`: 積んだスレッドを、キューが空くまで (`block_timeout` 秒まで) 待たせる
+      (イベントループのスレッドでは待てないため、一番古いログを捨てる)
+
+    Args:
+        log_channel (TextChannel | Thread): ログチャンネル
+        maxsize (int): キューに置けるログの数の上限
+        overflow (LOG_OVERFLOW_POLICIES): キューが一杯の場合の扱い
+        linger (float): 最初のログから、次のログを待ってまとめる秒数
+        max_batch_chars (int): まとめる文字数の上限 (超えた時点で送信する)
+        block_timeout (float): `block` の場合に、キューが空くのを待つ秒数
+        shipper (LogShipper | None): 送信に使う `LogShipper`
+    """
+
+    def __init__(
+        self,
+        log_channel: TextChannel | Thread,
+        *,
+        maxsize: int = DEFAULT_QUEUE_SIZE,
+        overflow: LOG_OVERFLOW_POLICIES = "drop_oldest",
+        linger: float = DEFAULT_LINGER,
+        max_batch_chars: int = DEFAULT_MAX_BATCH_CHARS,
+        block_timeout: float = DEFAULT_BLOCK_TIMEOUT,
+        shipper: LogShipper | None = None,
+    ) -> None:
+        if maxsize <= 0:
+            msg = f"maxsize must be positive: {maxsize}"
+            raise ValueError(msg)
         self.log_channel = log_channel
-        self.setFormatter(
-            logging.Formatter(
-                FORMAT,
-            ),
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self.linger = linger
+        self.max_batch_chars = max_batch_chars
+        self.block_timeout = block_timeout
+        self.shipper = shipper or LogShipper()
+        self.last_error: str | None = None
+        # (整形済みのログ, ログレベル) をイベントループのスレッドだけで読み書きする
+        self._buffer: deque[tuple[str, int]] = deque()
+        self._chars = 0
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._task: asyncio.Task[None] | None = None
+        self._closing = False
+        self._ready = asyncio.Event()
+        self._full = asyncio.Event()
+        self._space = asyncio.Event()
+        self._shipped = 0
+        self._failed = 0
+        self._dropped_overflow = 0
+        self._dropped_debug = 0
+        self._dropped_timeout = 0
+        self._dropped_closed = 0
+
+    def start(self) -> None:
+        """実行中のイベントループで、送信のタスクを始める"""
+        if self._task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._task = self._loop.create_task(self._run(), name="log pipeline")
+
+    def submit(self, entry: str, levelno: int = logging.INFO, *, block: bool = True) -> None:
+        """ログを積む (どのスレッドからでも呼べる)
+
+        Args:
+            entry (str): 整形済みのログ
+            levelno (int): ログレベル
+            block (bool): Falseの場合は、`overflow` が "block" でも空きを待たない (一杯なら古いログを捨てる)
+        """
+        loop = self._loop
+        if loop is None or self._closing:
+            self._dropped_closed += 1
+            return
+        item = (entry, levelno)
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._put_nowait(item)
+            return
+        try:
+            if self.overflow == "block" and block:
+                future = asyncio.run_coroutine_threadsafe(self._put(item), loop)
+                try:
+                    future.result(timeout=self.block_timeout)
+                except concurrent.futures.TimeoutError:
+                    future.cancel()
+                    self._dropped_timeout += 1
+            else:
+                loop.call_soon_threadsafe(self._put_nowait, item)
+        except RuntimeError:
+            # イベントループが既に閉じている
+            self._dropped_closed += 1
+
+    async def close(self, drain_timeout: float = DEFAULT_DRAIN_TIMEOUT) -> None:
+        """新しいログを受け付けるのをやめ、キューに残ったログを送りきってからタスクを終える
+
+        Args:
+            drain_timeout (float): 送りきるのを待つ秒数 (過ぎた場合は残りを捨てる)
+        """
+        if self._closing:
+            return
+        self._closing = True
+        # 他のスレッドから `call_soon_threadsafe` で渡され、まだ積まれていないログを先に積む
+        await asyncio.sleep(0)
+        self._ready.set()
+        self._full.set()
+        self._space.set()
+        if self._task is None:
+            self._dropped_closed += len(self._buffer)
+            self._buffer.clear()
+            return
+        with contextlib.suppress(TimeoutError):
+            await asyncio.wait_for(asyncio.shield(self._task), drain_timeout)
+        if not self._task.done():
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+        self._dropped_closed += len(self._buffer)
+        self._buffer.clear()
+        self._chars = 0
+
+    def stats(self) -> LogPipelineStats:
+        """キューの統計を返す"""
+        return LogPipelineStats(
+            shipped=self._shipped,
+            pending=len(self._buffer),
+            failed=self._failed,
+            dropped_overflow=self._dropped_overflow,
+            dropped_debug=self._dropped_debug,
+            dropped_timeout=self._dropped_timeout,
+            dropped_closed=self._dropped_closed,
         )
 
-    def emit(self, record: logging.LogRecord) -> None:
-        log_entry = self.format(record)
-        log_queue.put((log_entry, self.log_channel))
+    def _put_nowait(self, item: tuple[str, int]) -> None:
+        if self._task is None or self._task.done():
+            # 送信のタスクが終わった後に届いたログ
+            self._dropped_closed += 1
+            return
+        if len(self._buffer) >= self.maxsize and not self._make_room(item):
+            return
+        self._append(item)
+
+    async def _put(self, item: tuple[str, int]) -> None:
+        while len(self._buffer) >= self.maxsize and not self._closing:
+            self._space.clear()
+            await self._space.wait()
+        self._put_nowait(item)
 
+    def _make_room(self, item: tuple[str, int]) -> bool:
+        """キューが一杯のとき、ログを1つ捨てる (`item` 自体を捨てた場合はFalse)"""
+        if self.overflow == "drop_debug":
+            if item[1] < logging.INFO:
+                self._dropped_debug += 1
+                return False
+            for index, (entry, levelno) in enumerate(self._buffer):
+                if levelno < logging.INFO:
+                    del self._buffer[index]
+                    self._chars -= len(entry)
+                    self._dropped_debug += 1
+                    return True
+        entry, _ = self._buffer.popleft()
+        self._chars -= len(entry)
+        self._dropped_overflow += 1
+        return True
 
-class AsyncDispatcher:
-    def __init__(self) -> None:
-        self.loop = asyncio.new_event_loop()
-        self.thread = threading.Thread(target=self.start_loop)
-        self.thread.start()
+    def _append(self, item: tuple[str, int]) -> None:
+        self._buffer.append(item)
+        self._chars += len(item[0])
+        self._ready.set()
+        if self._chars >= self.max_batch_chars:
+            self._full.set()
 
-    def start_loop(self) -> None:
-        asyncio.set_event_loop(self.loop)
-        self.loop.run_until_complete(self.worker())
+    def _take_batch(self) -> list[str]:
+        batch: list[str] = []
+        size = 0
+        while self._buffer and size < self.max_batch_chars:
+            entry, _ = self._buffer.popleft()
+            self._chars -= len(entry)
+            size += len(entry)
+            batch.append(entry)
+        if self._chars < self.max_batch_chars and not self._closing:
+            self._full.clear()
+        self._space.set()
+        return batch
 
-    async def worker(self) -> None:
+    async def _run(self) -> None:
         while True:
-            log_entry, channel = await self.loop.run_in_executor(None, log_queue.get)
-            result = await self.send_log(log_entry, channel)
+            await self._ready.wait()
+            if not self._buffer:
+                if self._closing:
+                    return
+                self._ready.clear()
+                continue
+            if not self._closing:
+                # 1件ずつ送るとレート制限ですぐに遅れるため、少し待ってからまとめて送る
+                with contextlib.suppress(TimeoutError):
+                    await asyncio.wait_for(self._full.wait(), self.linger)
+            batch = self._take_batch()
+            try:
+                result = await self.shipper.ship(batch, self.log_channel)
+            except Exception as e:  # noqa: BLE001
+                # 接続の切断やタイムアウトなど、想定外の例外でもタスクを終わらせずに続ける
+                result = Err(f"{type(e).__name__}: {e!s}")
             if result.is_err():
-                raise DiscordSendLogError(result.unwrap_err())
+                # ログの送信の失敗をログに出すと繰り返すため、標準エラー出力に書いて続ける
+                self._failed += len(batch)
+                error = result.unwrap_err()
+                self.last_error = error
+                sys.stderr.write(f"{DiscordSendLogError(error)!r}\n")
+            else:
+                self._shipped += len(batch)
 
-    async def send_log(self, log_entry: str, channel: TextChannel | Thread) -> Result[None, str]:
+
+class DiscordLogHandler(logging.Handler):
+    def __init__(self, pipeline: LogPipeline, level: int = logging.INFO) -> None:
+        super().__init__(level=level)
+        self.pipeline = pipeline
+        self.setFormatter(
+            logging.Formatter(
+                FORMAT,
+            ),
+        )
+
+    def emit(self, record: logging.LogRecord) -> None:
         try:
-            await channel.send(content=f"```bash\n{log_entry}\n```")
-            return Ok(None)
-        except (HTTPException, Forbidden, NotFound, ValueError, TypeError) as e:
-            return Err(f"{e!s}")
+            log_entry = self.format(record)
+            # フライトレコーダーがまとめて書き出すログは、リスナーのスレッドを止めないよう待たずに積む
+            replayed = getattr(record, REPLAYED_ATTRIBUTE, False) is True
+            self.pipeline.submit(log_entry, record.levelno, block=not replayed)
+        except Exception:  # noqa: BLE001
+            self.handleError(record)
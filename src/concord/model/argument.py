@@ -7,3 +7,4 @@ class Args:
     bot_name: str
     tool_directory_paths: list[Path]
     is_debug: bool
+    flight_recorder: int = 0
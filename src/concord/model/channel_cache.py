@@ -0,0 +1,27 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class ChannelCacheStats:
+    """チャンネルのインスタンスのキャッシュの統計
+
+    Attributes:
+        hits (int): キャッシュしたインスタンスをそのまま返した回数
+        misses (int): Botのキャッシュから取得し直した回数 (初回と、捨てられた後)
+        evictions (int): 削除・更新・アーカイブのイベントか、有効期限によって捨てた回数
+        size (int): キャッシュしているチャンネルの数
+        fetches (int): Botのキャッシュに無く、REST APIで取得した回数
+        negative_hits (int): 見つからない・権限が無い結果を、REST APIを呼ばずに返した回数
+    """
+
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    fetches: int = 0
+    negative_hits: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        requests = self.hits + self.misses
+        return 0.0 if requests == 0 else self.hits / requests
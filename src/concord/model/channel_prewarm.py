@@ -0,0 +1,67 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class ChannelCheck:
+    """接続時に確認した、チャンネル1つ分の結果
+
+    Attributes:
+        key (str): 設定ファイルでのキー (`dev_channel`・`log_channel` か `[Discord.Channel]` のキー)
+        channel_id (int): ChannelId
+        seconds (float): 取得と確認にかかった秒数
+        can_send (bool): BOTがメッセージを送信できるかどうか
+        error (str | None): 取得できなかった場合のエラー
+    """
+
+    key: str
+    channel_id: int
+    seconds: float
+    can_send: bool = False
+    error: str | None = None
+
+    @property
+    def succeeded(self) -> bool:
+        return self.error is None and self.can_send
+
+    @property
+    def status(self) -> str:
+        if self.error is not None:
+            return f"error: {self.error}"
+        return "ok" if self.can_send else "no send permission"
+
+
+@dataclass(frozen=True)
+class ChannelPrewarmReport:
+    """接続時に全てのチャンネルを並行に取得・確認した結果
+
+    Attributes:
+        checks (tuple[ChannelCheck, ...]): チャンネルごとの結果 (デフォルトチャンネル、設定ファイルの順)
+        elapsed_seconds (float): 全てのチャンネルの確認にかかった秒数 (並行に確認するため、各チャンネルの合計より短い)
+    """
+
+    checks: tuple[ChannelCheck, ...]
+    elapsed_seconds: float
+
+    @property
+    def failed(self) -> tuple[ChannelCheck, ...]:
+        return tuple(check for check in self.checks if not check.succeeded)
+
+    def format(self, max_lines: int = 20) -> str:
+        """結果を、ログやdevチャンネルに出力できる文字列にする
+
+        Args:
+            max_lines (int): チャンネルごとの行数の上限 (超える場合は、問題のあったチャンネルだけを出力する)
+
+        Returns:
+            str: 結果
+        """
+        succeeded = len(self.checks) - len(self.failed)
+        lines = [f"Channels: {succeeded}/{len(self.checks)} ok in {self.elapsed_seconds * 1000:.1f} ms"]
+        checks = self.checks if len(self.checks) <= max_lines else self.failed
+        lines.extend(
+            f"  {check.key} ({check.channel_id}): {check.status}, {check.seconds * 1000:.1f} ms"
+            for check in checks[:max_lines]
+        )
+        if len(checks) > max_lines:
+            lines.append(f"  ... and {len(checks) - max_lines} more")
+        return "\n".join(lines)
@@ -1,8 +1,165 @@
+import atexit
+import contextlib
+import io
 import logging
+import os
+import stat
+import tempfile
+import threading
+import time
+import weakref
+from collections.abc import Callable
 from configparser import ConfigParser
 from pathlib import Path
 from typing import Literal
 
+_WRITERS: "weakref.WeakSet[ConfigWriteBehind]" = weakref.WeakSet()
+
+
+def atomic_write_text(path: Path, text: str) -> None:
+    """一時ファイルに書き込んでfsyncしてから置き換え、途中で止まっても壊れたファイルが残らないようにする
+
+    Args:
+        path (Path): 書き込むファイル
+        text (str): 内容
+    """
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    tmp_path = Path(tmp_name)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as fp:
+            fp.write(text)
+            fp.flush()
+            os.fsync(fp.fileno())
+        with contextlib.suppress(FileNotFoundError):
+            tmp_path.chmod(stat.S_IMODE(path.stat().st_mode))
+        tmp_path.replace(path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    # リネームをディレクトリのエントリとして確定させる (Windowsではディレクトリを開けない)
+    if hasattr(os, "O_DIRECTORY"):
+        with contextlib.suppress(OSError):
+            dir_fd = os.open(path.parent, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+
+
+class ConfigWriteBehind:
+    """設定ファイルへの書き込みをまとめ、ワーカースレッドで遅れて書き込む
+
+    `schedule` が呼ばれてから debounce 秒のあいだ新たな変更が無ければ、その時点の内容を1度だけ書き込む。
+
+    Args:
+        path (Path): 書き込むファイル
+        render (Callable[[], str]): 書き込む内容を返す関数 (ワーカースレッドから呼ばれる)
+        logger (logging.Logger): Logger
+        debounce (float): 最後の変更から書き込みまでの待ち時間 (秒)
+    """
+
+    def __init__(
+        self,
+        *,
+        path: Path,
+        render: Callable[[], str],
+        logger: logging.Logger,
+        debounce: float = 1.0,
+    ) -> None:
+        self._path = path
+        self._render = render
+        self._logger = logger
+        self._debounce = debounce
+        self._condition = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._dirty = False
+        self._closed = False
+        self._last_change = 0.0
+        self._flush_count = 0
+        self._thread: threading.Thread | None = None
+        _WRITERS.add(self)
+
+    @property
+    def pending(self) -> bool:
+        """まだ書き込んでいない (書き込み中を含む) 変更があるかどうか"""
+        return self._dirty or self._flush_lock.locked()
+
+    @property
+    def debounce(self) -> float:
+        """最後の変更から書き込みまでの待ち時間 (秒)"""
+        return self._debounce
+
+    @property
+    def flush_count(self) -> int:
+        """実際にファイルへ書き込んだ回数"""
+        return self._flush_count
+
+    def schedule(self) -> None:
+        """変更があったことを知らせ、debounce 秒後の書き込みを予約する"""
+        with self._condition:
+            if self._closed:
+                msg = f"Write-behind for {self._path.as_posix()} is already closed"
+                raise RuntimeError(msg)
+            self._dirty = True
+            self._last_change = time.monotonic()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="concord-config-writer", daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+    def flush(self) -> None:
+        """まだ書き込んでいない変更を、待たずに書き込む (呼び出したスレッドで書き込む)"""
+        with self._flush_lock:
+            with self._condition:
+                if not self._dirty:
+                    return
+                self._dirty = False
+            try:
+                atomic_write_text(self._path, self._render())
+            except Exception:
+                with self._condition:
+                    self._dirty = True
+                msg = f"Failed to write {self._path.as_posix()}, will retry on the next change"
+                self._logger.exception(msg)
+                return
+            self._flush_count += 1
+
+    def close(self) -> None:
+        """まだ書き込んでいない変更を書き込み、ワーカースレッドを止める"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+        _WRITERS.discard(self)
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._dirty and not self._closed:
+                    self._condition.wait()
+                if self._closed:
+                    return
+                # 変更が続いている間は待ち、debounce 秒静かになってから書き込む
+                # 待っている間に閉じられた場合も、ここで書き込んでから次の周回で止まる
+                while not self._closed:
+                    remaining = self._last_change + self._debounce - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+            self.flush()
+
+
+def flush_pending_writes() -> None:
+    """遅れて書き込む予定の設定ファイルを、全て書き込む (終了時に呼ぶ)"""
+    for writer in list(_WRITERS):
+        writer.flush()
+
+
+atexit.register(flush_pending_writes)
+
 
 class BaseConfigArgs:
     """設定ファイルの読み込みを行うクラス
@@ -25,6 +182,8 @@ class BaseConfigArgs:
         self._filepath = filepath
         self._config: ConfigParser | None = None
         self._logger = logger
+        self._lock = threading.RLock()
+        self._writer: ConfigWriteBehind | None = None
         if is_required:
             self._check_existence()
 
@@ -105,12 +264,70 @@ class BaseConfigArgs:
             >>> config = BaseConfigArgs(filepath=Path("test.ini"), logger=logging.getLogger())
             >>> config.set_value(section="test", option="test", value="test")
         """
-        if self.config.has_section(section):
-            self.config[section][option] = value
-        else:
-            msg = f"Section {section} was not found in {self.filepath.absolute().as_posix()}"
-            self._logger.error(msg)
-            raise KeyError(msg)
+        with self._lock:
+            if self.config.has_section(section):
+                self.config[section][option] = value
+            else:
+                msg = f"Section {section} was not found in {self.filepath.absolute().as_posix()}"
+                self._logger.error(msg)
+                raise KeyError(msg)
+        if self._writer is not None:
+            self._writer.schedule()
+
+    @property
+    def has_pending_writes(self) -> bool:
+        """`set_value` で変更し、まだファイルに書き込んでいない値があるかどうか"""
+        return self._writer is not None and self._writer.pending
+
+    def enable_write_behind(self, *, debounce: float = 1.0) -> None:
+        """`set_value` のたびに、変更をまとめて遅れて書き込むようにする
+
+        最後の `set_value` から debounce 秒後に、ワーカースレッドで一時ファイルへの書き込みと置き換えを行うため、
+        `set_value` を呼んだスレッド (イベントループなど) は書き込みを待たない。
+        まだ書き込んでいない変更は、`flush` か `close`、またはプロセスの終了時に書き込まれる。
+
+        Args:
+            debounce (float): 最後の変更から書き込みまでの待ち時間 (秒)
+        """
+        if self._writer is not None:
+            return
+        self._writer = ConfigWriteBehind(
+            path=self.filepath,
+            render=self._render,
+            logger=self._logger,
+            debounce=debounce,
+        )
+
+    def flush(self) -> None:
+        """遅れて書き込む予定の変更を、待たずに書き込む"""
+        if self._writer is not None:
+            self._writer.flush()
+
+    def close(self) -> None:
+        """遅れて書き込む予定の変更を書き込み、ワーカースレッドを止める"""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def hand_over_write_behind(self, other: "BaseConfigArgs") -> None:
+        """遅れて書き込む設定を、同じファイルを読み込み直した設定に引き継ぐ
+
+        まだ書き込んでいない変更を書き込んでから、`other` で同じ待ち時間の書き込みを有効にする。
+
+        Args:
+            other (BaseConfigArgs): 読み込み直した設定
+        """
+        if self._writer is None:
+            return
+        debounce = self._writer.debounce
+        self.close()
+        other.enable_write_behind(debounce=debounce)
+
+    def _render(self) -> str:
+        with self._lock:
+            buffer = io.StringIO()
+            self.config.write(buffer)
+            return buffer.getvalue()
 
     def write(self, mode: Literal["w", "a"] = "w") -> None:
         """設定ファイルを書き込む
@@ -127,8 +344,16 @@ class BaseConfigArgs:
             >>> config.write()
 
         Notes:
-            modeが"w"の場合は、ファイルを上書きする
-            modeが"a"の場合は、ファイルに追記する
+            modeが"w"の場合は、一時ファイルに書き込んでから置き換える (途中で止まっても元のファイルが残る)
+            modeが"a"の場合は、ファイルに追記する (同じセクションが重複するため、"w"を使うこと)
+            `enable_write_behind` の後は、modeが"w"でも書き込みを予約するだけで待たない
+            (書き込みは `flush` か `flush_pending_writes`、またはプロセスの終了時に強制できる)
         """
-        with self.filepath.open(mode, encoding="utf-8") as fp:
-            self.config.write(fp)
+        if mode == "a":
+            with self.filepath.open(mode, encoding="utf-8") as fp, self._lock:
+                self.config.write(fp)
+            return
+        if self._writer is not None:
+            self._writer.schedule()
+            return
+        atomic_write_text(self.filepath, self._render())
@@ -0,0 +1,25 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class ConfigRegistryStats:
+    """設定ファイルのキャッシュの統計
+
+    Attributes:
+        hits (int): 解析済みの設定をそのまま返した回数
+        misses (int): 設定ファイルを解析した回数 (初回と、ファイルが更新された場合)
+        invalidations (int): ファイルの更新によって、解析済みの設定を捨てた回数
+        evictions (int): 上限を超えたため、最も長く使われていない設定を捨てた回数
+        size (int): キャッシュしている設定ファイルの数
+    """
+
+    hits: int
+    misses: int
+    invalidations: int
+    evictions: int
+    size: int
+
+    @property
+    def hit_rate(self) -> float:
+        requests = self.hits + self.misses
+        return 0.0 if requests == 0 else self.hits / requests
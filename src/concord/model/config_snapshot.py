@@ -0,0 +1,163 @@
+from collections.abc import Mapping
+from dataclasses import dataclass, fields
+from typing import Literal
+
+from concord.model.gateway_profile import GatewaySettings
+from concord.model.log_shipping import LOG_OVERFLOW_POLICIES
+
+TOOL_LOADING_MODES = Literal["eager", "lazy"]
+
+
+@dataclass(frozen=True, slots=True)
+class ToolSettings:
+    """`[Discord.Tool]` の設定値
+
+    Attributes:
+        exclusions (tuple[str, ...]): 除外するツールのパターン
+        inclusions (tuple[str, ...] | None): 読み込むツールのパターン (Noneの場合は全て)
+        import_workers (int): インポートに使うスレッド数
+        prune_patterns (tuple[str, ...] | None): 探索しないディレクトリ名のパターン (Noneの場合は既定値)
+        loading_mode (TOOL_LOADING_MODES): ツールの読み込み方法
+        register_timeout (float): ツール1つのCogの生成と登録を待つ秒数
+        hot_reload (bool): 変更されたツールを読み込み直すかどうか
+        profile_import (bool): 起動時のimportをcProfileで計測するかどうか
+    """
+
+    exclusions: tuple[str, ...]
+    inclusions: tuple[str, ...] | None
+    import_workers: int
+    prune_patterns: tuple[str, ...] | None
+    loading_mode: TOOL_LOADING_MODES
+    register_timeout: float
+    hot_reload: bool
+    profile_import: bool
+
+
+@dataclass(frozen=True, slots=True)
+class ChannelCacheSettings:
+    """`[Discord.ChannelCache]` の設定値
+
+    Attributes:
+        ttl (float | None): キャッシュしたチャンネルのインスタンスを使う秒数 (Noneの場合は無期限)
+        negative_ttl (float): 見つからなかった・権限が無かったチャンネルの結果を使う秒数
+    """
+
+    ttl: float | None
+    negative_ttl: float
+
+
+@dataclass(frozen=True, slots=True)
+class LogSettings:
+    """`[Discord.Log]` の設定値
+
+    Attributes:
+        queue_size (int): ログチャンネルへ送るログを、キューに置ける数の上限
+        overflow (LOG_OVERFLOW_POLICIES): キューが一杯の場合の扱い
+        flight_recorder_to_channel (bool): フライトレコーダーのログを、ログチャンネルにも書き出すかどうか
+    """
+
+    queue_size: int
+    overflow: LOG_OVERFLOW_POLICIES
+    flight_recorder_to_channel: bool
+
+
+@dataclass(frozen=True, slots=True)
+class BotSettings:
+    """BOTの設定ファイル ({BOT}.ini) の設定値
+
+    Attributes:
+        name (str): BOTの名前
+        description (str): BOTの説明
+        discord_token (str): Discordのトークン
+        dev_channel_id (int): devチャンネルのID
+        log_channel_id (int): ログチャンネルのID
+        channels (Mapping[str, int]): チャンネル名からチャンネルIDへの対応
+        channel_names (Mapping[int, str]): チャンネルIDからチャンネル名への対応
+        tool (ToolSettings): ツールの設定値
+        config_hot_reload (bool): 変更された設定ファイルを読み込み直すかどうか
+        channel_cache (ChannelCacheSettings): チャンネルのキャッシュの設定値
+        log (LogSettings): ログチャンネルへのログの送信の設定値
+        gateway (GatewaySettings): ゲートウェイに接続するときの、インテントとキャッシュの設定値
+    """
+
+    name: str
+    description: str
+    discord_token: str
+    dev_channel_id: int
+    log_channel_id: int
+    channels: Mapping[str, int]
+    channel_names: Mapping[int, str]
+    tool: ToolSettings
+    config_hot_reload: bool
+    channel_cache: ChannelCacheSettings
+    log: LogSettings
+    gateway: GatewaySettings
+
+
+@dataclass(frozen=True, slots=True)
+class ConfigSnapshot:
+    """設定ファイルを1度だけ解析して作る、変更できない設定値
+
+    `ConfigParser` の検索や値の補間を毎回行わないため、ツールのコマンドやイベントの中から繰り返し参照できる。
+
+    Attributes:
+        bot (BotSettings): BOTの設定値
+        api_tokens (Mapping[str, Mapping[str, str]]): 開発者名とキーからAPIトークンへの対応
+    """
+
+    bot: BotSettings
+    api_tokens: Mapping[str, Mapping[str, str]]
+
+    def get_api_token(self, developer: str, key: str) -> str:
+        """APIトークンを取得する
+
+        Args:
+            developer (str): 開発者名
+            key (str): キー
+
+        Returns:
+            str: APIトークン
+        """
+        try:
+            return self.api_tokens[developer][key]
+        except KeyError:
+            msg = f"Not found: API token section={developer}, option={key}"
+            raise ValueError(msg) from None
+
+
+@dataclass(frozen=True, slots=True)
+class ConfigChange:
+    """設定ファイルの再読み込みによる、設定値の変更
+
+    Attributes:
+        previous (ConfigSnapshot): 変更前の設定値
+        current (ConfigSnapshot): 変更後の設定値
+        changed (frozenset[str]): 変更された設定値の名前
+            (`"bot.channels"` や `"bot.tool"` のようなBOTの設定値と、`"api_tokens.{開発者名}"`)
+    """
+
+    previous: ConfigSnapshot
+    current: ConfigSnapshot
+    changed: frozenset[str]
+
+    @classmethod
+    def between(cls, previous: ConfigSnapshot, current: ConfigSnapshot) -> "ConfigChange":
+        """2つの設定値を比べ、変更された設定値を求める"""
+        changed = {
+            f"bot.{field.name}"
+            for field in fields(BotSettings)
+            if getattr(previous.bot, field.name) != getattr(current.bot, field.name)
+        }
+        developers = previous.api_tokens.keys() | current.api_tokens.keys()
+        changed.update(
+            f"api_tokens.{developer}"
+            for developer in developers
+            if previous.api_tokens.get(developer) != current.api_tokens.get(developer)
+        )
+        return cls(previous=previous, current=current, changed=frozenset(changed))
+
+    def touches(self, *names: str) -> bool:
+        """指定した設定値のいずれかが変更されたかどうか (`"api_tokens"` は開発者を問わない)"""
+        return any(
+            name in self.changed or any(changed.startswith(f"{name}.") for changed in self.changed) for name in names
+        )
@@ -0,0 +1,20 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Literal
+
+RECONNECT_KINDS = Literal["resume", "identify"]
+
+
+@dataclass(frozen=True)
+class Reconnect:
+    """ゲートウェイへの再接続1回分の記録
+
+    Attributes:
+        kind (RECONNECT_KINDS): "resume" (セッションを再開した) または "identify" (新しいセッションを張り直した)
+        seconds (float): 切断から再接続の完了までの秒数 (切断を検知できなかった場合は0)
+        completed_at (datetime): 再接続が完了した時刻
+    """
+
+    kind: RECONNECT_KINDS
+    seconds: float
+    completed_at: datetime
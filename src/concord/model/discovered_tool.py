@@ -0,0 +1,55 @@
+from dataclasses import dataclass
+from pathlib import Path
+
+
+@dataclass(frozen=True)
+class DiscoveredCommand:
+    """静的解析で見つかったコマンド
+
+    Attributes:
+        name (str): コマンド名
+        function_name (str): コマンドを実装するメソッド名
+        decorator (str): コマンドを定義しているデコレータ名 (例: `hybrid_command`, `app_commands.command`)
+        aliases (tuple[str, ...]): コマンドの別名
+        parent (str | None): グループのサブコマンドの場合は、グループを実装するメソッド名 (最上位のコマンドはNone)
+    """
+
+    name: str
+    function_name: str
+    decorator: str
+    aliases: tuple[str, ...] = ()
+    parent: str | None = None
+
+
+@dataclass(frozen=True)
+class DiscoveredListener:
+    """静的解析で見つかったイベントリスナー
+
+    Attributes:
+        event (str): イベント名 (例: `on_message`)
+        function_name (str): リスナーを実装するメソッド名
+    """
+
+    event: str
+    function_name: str
+
+
+@dataclass(frozen=True)
+class DiscoveredCog:
+    """モジュールを実行せずに見つけたCogの定義
+
+    Attributes:
+        name (str): クラス名
+        module_path (Path): クラスが定義されているファイル
+        lineno (int): クラス定義の行番号
+        commands (tuple[DiscoveredCommand, ...]): コマンド
+        listeners (tuple[DiscoveredListener, ...]): イベントリスナー
+        tasks (tuple[str, ...]): `tasks.loop` で定義されたバックグラウンドタスクのメソッド名
+    """
+
+    name: str
+    module_path: Path
+    lineno: int
+    commands: tuple[DiscoveredCommand, ...]
+    listeners: tuple[DiscoveredListener, ...]
+    tasks: tuple[str, ...] = ()
@@ -0,0 +1,93 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class GatewayRequirements:
+    """ツールが必要とする、ゲートウェイのインテントとキャッシュ
+
+    ツールのCogのクラス属性 `gateway_requirements` に指定すると、BOTはツールが必要とするものだけを有効にして接続する。
+    イベントリスナーとコマンドから分かるもの (`on_member_join` にはmembersが必要、など) は指定しなくてもよい。
+
+    ```python
+    class Greeter(commands.Cog):
+        gateway_requirements = GatewayRequirements(intents=("members",), member_cache=("joined",))
+    ```
+
+    Attributes:
+        intents (tuple[str, ...]): インテントの名前 (`discord.Intents` の属性名)
+        member_cache (tuple[str, ...]): メンバーのキャッシュの名前 (`discord.MemberCacheFlags` の属性名)
+        chunk_guilds_at_startup (bool): 起動時に全てのメンバーを取得するかどうか
+        max_messages (int): キャッシュするメッセージの数 (0の場合はキャッシュしない)
+    """
+
+    intents: tuple[str, ...] = ()
+    member_cache: tuple[str, ...] = ()
+    chunk_guilds_at_startup: bool = False
+    max_messages: int = 0
+
+    def merge(self, other: "GatewayRequirements") -> "GatewayRequirements":
+        """2つの要件を両方満たす要件を返す"""
+        return GatewayRequirements(
+            intents=tuple(dict.fromkeys(self.intents + other.intents)),
+            member_cache=tuple(dict.fromkeys(self.member_cache + other.member_cache)),
+            chunk_guilds_at_startup=self.chunk_guilds_at_startup or other.chunk_guilds_at_startup,
+            max_messages=max(self.max_messages, other.max_messages),
+        )
+
+
+@dataclass(frozen=True)
+class GatewaySettings:
+    """`[Discord.Gateway]` の設定値
+
+    `auto` の項目は、読み込んだツールの要件から決める (ツールのimportを待ってからゲートウェイに接続する)。
+
+    Attributes:
+        intents (tuple[str, ...]): インテントの名前か `auto`・`all`・`default` (`auto` と名前は併記できる)
+        member_cache (tuple[str, ...]): メンバーのキャッシュの名前か `auto`・`all`・`none`
+        chunk_guilds_at_startup (bool | None): 起動時に全てのメンバーを取得するかどうか (Noneの場合は `auto`)
+        max_messages (int | None): キャッシュするメッセージの数 (0の場合はキャッシュしない、Noneの場合は `auto`)
+    """
+
+    intents: tuple[str, ...] = ("auto",)
+    member_cache: tuple[str, ...] = ("auto",)
+    chunk_guilds_at_startup: bool | None = None
+    max_messages: int | None = None
+
+    @property
+    def needs_tools(self) -> bool:
+        """ツールの要件を待つ必要があるかどうか"""
+        return (
+            "auto" in self.intents
+            or "auto" in self.member_cache
+            or self.chunk_guilds_at_startup is None
+            or self.max_messages is None
+        )
+
+
+@dataclass(frozen=True)
+class GatewayProfile:
+    """ゲートウェイに接続するときの、インテントとキャッシュの設定
+
+    Attributes:
+        intents (tuple[str, ...]): 有効にするインテントの名前
+        member_cache (tuple[str, ...]): 有効にするメンバーのキャッシュの名前
+        chunk_guilds_at_startup (bool): 起動時に全てのメンバーを取得するかどうか
+        max_messages (int | None): キャッシュするメッセージの数 (Noneの場合はキャッシュしない)
+    """
+
+    intents: tuple[str, ...]
+    member_cache: tuple[str, ...]
+    chunk_guilds_at_startup: bool
+    max_messages: int | None
+
+    def format(self) -> str:
+        """ログに出力できる文字列にする"""
+        return "\n".join(
+            [
+                "gateway profile:",
+                f"  intents: {', '.join(self.intents)}",
+                f"  member cache: {', '.join(self.member_cache) or 'none'}",
+                f"  chunk guilds at startup: {self.chunk_guilds_at_startup}",
+                f"  max messages: {self.max_messages}",
+            ],
+        )
@@ -0,0 +1,23 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class BotMemory:
+    """1つのプロセスで動かすBOTごとの、メモリの増加量
+
+    BOTを順に生成・ツールをimportしたときの、プロセスの常駐メモリ (RSS) の増加量で測る。
+    ツールのモジュールは共有されるため、同じツールを使うBOTでは2つ目以降のimportの増加量が小さくなる。
+
+    Attributes:
+        bot_name (str): BOTの名前
+        construct_bytes (int): `Agent` の生成 (設定・ロガー・`Bot`) による増加量
+        import_bytes (int | None): ツールのimportによる増加量 (まだimportしていない場合はNone)
+    """
+
+    bot_name: str
+    construct_bytes: int
+    import_bytes: int | None = None
+
+    @property
+    def total_bytes(self) -> int:
+        return self.construct_bytes + (self.import_bytes or 0)
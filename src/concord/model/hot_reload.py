@@ -0,0 +1,25 @@
+from dataclasses import dataclass
+from pathlib import Path
+
+
+@dataclass(frozen=True)
+class ToolReload:
+    """ツールのホットリロード1回分の記録
+
+    Attributes:
+        module_path (Path): 変更されたツールのファイル
+        cog_names (tuple[str, ...]): 差し替え後に登録されているCogの名前
+        import_seconds (float): 再importにかかった秒数
+        latency_seconds (float): 変更の検知から差し替えの完了までの秒数
+        error (str | None): 失敗した場合のエラー (失敗時は変更前のCogが残る)
+    """
+
+    module_path: Path
+    cog_names: tuple[str, ...]
+    import_seconds: float
+    latency_seconds: float
+    error: str | None = None
+
+    @property
+    def succeeded(self) -> bool:
+        return self.error is None
@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from pathlib import Path
 from typing import Generic, TypeVar
 
 TypeOfAny = TypeVar("TypeOfAny", bound=type)
@@ -8,3 +9,4 @@ TypeOfAny = TypeVar("TypeOfAny", bound=type)
 class LoadedClass(Generic[TypeOfAny]):
     name: str
     class_type: TypeOfAny
+    module_path: Path | None = None
@@ -0,0 +1,22 @@
+from dataclasses import dataclass, field
+
+
+@dataclass(frozen=True)
+class LazyToolStats:
+    """遅延読み込みされるツールの統計
+
+    Attributes:
+        eager (tuple[str, ...]): スタブを置けないため起動時に読み込んだCog
+        loaded (tuple[str, ...]): 初回の呼び出しで読み込まれたCog
+        never_loaded (tuple[str, ...]): 一度も読み込まれていないCog
+        load_seconds (dict[str, float]): ファイルごとの読み込み (import・生成・登録) にかかった秒数
+    """
+
+    eager: tuple[str, ...]
+    loaded: tuple[str, ...]
+    never_loaded: tuple[str, ...]
+    load_seconds: dict[str, float] = field(default_factory=dict)
+
+    @property
+    def total(self) -> int:
+        return len(self.eager) + len(self.loaded) + len(self.never_loaded)
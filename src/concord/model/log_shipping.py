@@ -0,0 +1,53 @@
+from dataclasses import dataclass
+from typing import Literal
+
+
+@dataclass(frozen=True)
+class LogShipperStats:
+    """ログチャンネルへの送信の統計
+
+    Attributes:
+        records (int): 送信したログの数
+        batches (int): まとめて送信した回数
+        messages (int): 送信したメッセージの数 (添付ファイルで送った場合も1つと数える)
+        attachments (int): 大きすぎるため、添付ファイルで送信した回数
+    """
+
+    records: int
+    batches: int
+    messages: int
+    attachments: int
+
+    @property
+    def records_per_message(self) -> float:
+        return 0.0 if self.messages == 0 else self.records / self.messages
+
+
+LOG_OVERFLOW_POLICIES = Literal["drop_oldest", "drop_debug", "block"]
+
+
+@dataclass(frozen=True)
+class LogPipelineStats:
+    """ログチャンネルへ送るログの、キューの統計
+
+    Attributes:
+        shipped (int): 送信したログの数
+        pending (int): キューに残っているログの数
+        failed (int): 送信に失敗して捨てたログの数
+        dropped_overflow (int): キューが一杯のため捨てた、古いログの数
+        dropped_debug (int): キューが一杯のため捨てた、DEBUGのログの数 (`drop_debug` の場合)
+        dropped_timeout (int): キューが空くのを待ちきれずに捨てたログの数 (`block` の場合)
+        dropped_closed (int): 開始前・終了後に出たか、終了時に送りきれずに捨てたログの数
+    """
+
+    shipped: int
+    pending: int
+    failed: int = 0
+    dropped_overflow: int = 0
+    dropped_debug: int = 0
+    dropped_timeout: int = 0
+    dropped_closed: int = 0
+
+    @property
+    def dropped(self) -> int:
+        return self.dropped_overflow + self.dropped_debug + self.dropped_timeout + self.dropped_closed
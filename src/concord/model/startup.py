@@ -0,0 +1,44 @@
+from dataclasses import dataclass
+
+from discord.ext.commands import Cog
+
+from concord.model.discovered_tool import DiscoveredCog
+from concord.model.import_class import LoadedClass
+from concord.model.tool_registration import SkippedTool
+
+
+@dataclass(frozen=True)
+class TimelineEvent:
+    """起動のタイムラインの出来事
+
+    Attributes:
+        name (str): 出来事の名前
+        seconds (float): タイムラインの起点からの秒数 (区間の場合は開始時刻)
+        thread (str): 出来事が起きたスレッドの名前
+        duration (float): 区間の秒数 (時点の出来事の場合は0)
+    """
+
+    name: str
+    seconds: float
+    thread: str
+    duration: float = 0.0
+
+    @property
+    def end_seconds(self) -> float:
+        return self.seconds + self.duration
+
+
+@dataclass(frozen=True)
+class PreparedTools:
+    """ゲートウェイへの接続と並行して、importまたは静的解析まで済ませたツール
+
+    Attributes:
+        classes (tuple[LoadedClass[type[Cog]], ...]): importしたCogのクラス
+            (遅延読み込みでは、ファイル単位で遅延できないバンドルのものだけ)
+        cogs (tuple[DiscoveredCog, ...]): 静的解析で見つけたCog (遅延読み込みの場合のみ)
+        skipped (tuple[SkippedTool, ...]): 包含・除外の規則によって読み込まなかったツール
+    """
+
+    classes: tuple[LoadedClass[type[Cog]], ...]
+    cogs: tuple[DiscoveredCog, ...] = ()
+    skipped: tuple[SkippedTool, ...] = ()
@@ -0,0 +1,31 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class BundledTool:
+    """バンドルに含まれるツールファイル
+
+    Attributes:
+        path (str): バンドル内のパス (ツールのルートからの相対パス、例: `echo/__tool__.py`)
+        sha256 (str): ソースコードのハッシュ値
+        bytecode (bool): コンパイル済みのバイトコード (`.pyc`) を含むかどうか
+    """
+
+    path: str
+    sha256: str
+    bytecode: bool
+
+
+@dataclass(frozen=True)
+class ToolBundleManifest:
+    """バンドルのマニフェスト
+
+    Attributes:
+        version (int): マニフェストの形式のバージョン
+        magic (str): バイトコードをコンパイルしたPythonのマジックナンバー (16進数)
+        tools (tuple[BundledTool, ...]): ツールファイル (パス順)
+    """
+
+    version: int
+    magic: str
+    tools: tuple[BundledTool, ...]
@@ -0,0 +1,31 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class ManifestDirectory:
+    """マニフェストに記録するディレクトリの情報
+
+    Attributes:
+        mtime_ns (int): ディレクトリの更新時刻 (直下のエントリが増減すると変わる)
+        subdirs (tuple[str, ...]): 枝刈りされずに残ったサブディレクトリ名
+        files (tuple[str, ...]): 直下にあるツールファイル名
+    """
+
+    mtime_ns: int
+    subdirs: tuple[str, ...]
+    files: tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class ManifestFile:
+    """マニフェストに記録するツールファイルの情報
+
+    Attributes:
+        mtime_ns (int): ファイルの更新時刻
+        size (int): ファイルサイズ
+        ino (int): inode番号
+    """
+
+    mtime_ns: int
+    size: int
+    ino: int
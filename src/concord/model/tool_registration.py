@@ -0,0 +1,69 @@
+from dataclasses import dataclass
+from pathlib import Path
+
+
+@dataclass(frozen=True)
+class ToolRegistration:
+    """ツール1つ分のCogの生成と登録の結果
+
+    Attributes:
+        name (str): Cogのクラス名
+        module_path (Path | None): Cogを定義しているファイル
+        construct_seconds (float): インスタンスの生成にかかった秒数
+        register_seconds (float): `add_cog` にかかった秒数
+        error (str | None): 失敗した場合のエラー (失敗したツールは隔離され、登録されない)
+    """
+
+    name: str
+    module_path: Path | None
+    construct_seconds: float
+    register_seconds: float
+    error: str | None = None
+
+    @property
+    def succeeded(self) -> bool:
+        return self.error is None
+
+    @property
+    def total_seconds(self) -> float:
+        return self.construct_seconds + self.register_seconds
+
+
+@dataclass(frozen=True)
+class SkippedTool:
+    """包含・除外の規則によって読み込まなかったツール
+
+    Attributes:
+        name (str): Cogのクラス名 (クラスが分からない場合はツールのルートからの相対パス)
+        module_path (Path): Cogを定義しているファイル
+        reason (str): 読み込まなかった理由
+        executed (bool): モジュールが実行されたかどうか (同じファイルの他のCogを読み込むために実行された場合はTrue)
+    """
+
+    name: str
+    module_path: Path
+    reason: str
+    executed: bool = False
+
+
+@dataclass(frozen=True)
+class ToolStartupReport:
+    """起動時のツールの登録結果
+
+    Attributes:
+        registrations (tuple[ToolRegistration, ...]): ツールごとの結果 (インポート順)
+        elapsed_seconds (float): 全ツールの登録にかかった秒数 (並行に登録するため、各ツールの合計より短くなる)
+        skipped (tuple[SkippedTool, ...]): 包含・除外の規則によって読み込まなかったツール
+    """
+
+    registrations: tuple[ToolRegistration, ...]
+    elapsed_seconds: float
+    skipped: tuple[SkippedTool, ...] = ()
+
+    @property
+    def registered(self) -> tuple[ToolRegistration, ...]:
+        return tuple(registration for registration in self.registrations if registration.succeeded)
+
+    @property
+    def quarantined(self) -> tuple[ToolRegistration, ...]:
+        return tuple(registration for registration in self.registrations if not registration.succeeded)
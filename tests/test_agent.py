@@ -2,7 +2,9 @@
 
 # mypy: ignore-errors
 
+import asyncio
 import logging
+import time
 from pathlib import Path
 from unittest import mock
 
@@ -11,7 +13,17 @@ from discord import Intents
 from discord.ext.commands import Cog
 
 from concord.infrastructure.discord.agent import Agent
+from concord.model.channel_prewarm import ChannelCheck, ChannelPrewarmReport
+from concord.model.gateway_profile import GatewaySettings
 from concord.model.import_class import LoadedClass
+from concord.model.log_shipping import LogPipelineStats
+
+EXPLICIT_GATEWAY_SETTINGS = GatewaySettings(
+    intents=("all",),
+    member_cache=("all",),
+    chunk_guilds_at_startup=True,
+    max_messages=1000,
+)
 
 
 class TestAgent:
@@ -34,6 +46,7 @@ class TestAgent:
         # Setup mocks
         mock_args = mock.Mock()
         mock_args.is_debug = False
+        mock_args.flight_recorder = 0
         mock_args.bot_name = "test_bot"
         mock_args.tool_directory_paths = [Path("/test/tools")]
         mock_on_launch.return_value = mock_args
@@ -59,7 +72,7 @@ class TestAgent:
 
         # Verify initialization
         mock_on_launch.assert_called_once()
-        mock_get_logger.assert_called_once_with(name="test_bot", level=logging.INFO, log_dir=None)
+        mock_get_logger.assert_called_once_with(name="test_bot", level=logging.INFO, log_dir=None, flight_recorder=0)
         mock_config_args.assert_called_once_with(bot_name="test_bot", logger=mock_logger, config_dir=None)
 
         # Verify Bot creation
@@ -74,6 +87,8 @@ class TestAgent:
             bot=mock_bot,
             config=mock_config,
             logger=mock_logger,
+            channel_cache_ttl=mock_config.bot.channel_cache_ttl,
+            channel_negative_ttl=mock_config.bot.channel_negative_ttl,
         )
 
         # Verify attributes
@@ -102,6 +117,7 @@ class TestAgent:
         """Test Agent initialization in debug mode."""
         mock_args = mock.Mock()
         mock_args.is_debug = True
+        mock_args.flight_recorder = 0
         mock_args.bot_name = "test_bot"
         mock_args.tool_directory_paths = [Path("/test/tools")]
         mock_on_launch.return_value = mock_args
@@ -124,7 +140,12 @@ class TestAgent:
 
         _ = Agent()  # type: ignore[reportPrivateUsage]
 
-        mock_get_logger.assert_called_once_with(name="test_bot", level=logging.DEBUG, log_dir=None)
+        mock_get_logger.assert_called_once_with(
+            name="test_bot",
+            level=logging.DEBUG,
+            log_dir=None,
+            flight_recorder=0,
+        )
 
     @pytest.mark.asyncio
     async def test_greetings_success(self) -> None:
@@ -184,22 +205,28 @@ class TestAgent:
             mock_logger.error.assert_called_once_with("User is None")
 
     @pytest.mark.asyncio
-    async def test_on_ready(self) -> None:
+    async def test_on_ready(self, tmp_path: Path) -> None:
         """Test on_ready method."""
         with (
             mock.patch("concord.infrastructure.discord.agent.on_launch"),
             mock.patch("concord.infrastructure.discord.agent.get_logger") as mock_get_logger,
-            mock.patch("concord.infrastructure.discord.agent.ConfigArgs"),
+            mock.patch("concord.infrastructure.discord.agent.ConfigArgs") as mock_config_args,
             mock.patch("concord.infrastructure.discord.agent.Bot") as mock_bot_class,
             mock.patch("concord.infrastructure.discord.agent.CachedChannels") as mock_cached_channels_class,
             mock.patch("concord.infrastructure.discord.agent.import_classes_from_directory") as mock_import,
             mock.patch("concord.infrastructure.discord.agent.OnConnecting") as mock_on_connecting,
             mock.patch("concord.infrastructure.discord.agent.OnReady") as mock_on_ready_class,
             mock.patch("concord.infrastructure.discord.agent.DiscordLogHandler") as mock_log_handler,
+            mock.patch("concord.infrastructure.discord.agent.LogPipeline") as mock_log_pipeline,
         ):
             # Setup mocks
             mock_logger = mock.Mock()
             mock_get_logger.return_value = mock_logger
+            mock_config_args.return_value.bot.tool_register_timeout = 30.0
+            mock_config_args.return_value.bot.tool_inclusion = None
+            mock_config_args.return_value.bot.tool_exclusion = []
+            mock_config_args.return_value.bot.log_queue_size = 100
+            mock_config_args.return_value.bot.log_overflow = "drop_debug"
 
             mock_bot = mock.Mock()
             mock_bot.add_cog = mock.AsyncMock()
@@ -214,6 +241,12 @@ class TestAgent:
             mock_cached_channels = mock.Mock()
             mock_cached_channels.dev_channel = mock_dev_channel
             mock_cached_channels.log_channel = mock_log_channel
+            mock_cached_channels.prewarm = mock.AsyncMock(
+                return_value=ChannelPrewarmReport(
+                    checks=(ChannelCheck("dev_channel", 1, 0.001, can_send=True),),
+                    elapsed_seconds=0.001,
+                ),
+            )
             mock_cached_channels_class.return_value = mock_cached_channels
 
             # Mock import_classes_from_directory to return some tools
@@ -241,11 +274,12 @@ class TestAgent:
             mock_handler = mock.Mock()
             mock_log_handler.return_value = mock_handler
 
-            agent = Agent()
+            agent = Agent(utils_dirpath=tmp_path)
             agent._tool_directory_paths = [Path("/test/tools")]  # noqa: SLF001 # type: ignore[reportPrivateUsage]
             agent.greetings = mock.AsyncMock(return_value="Test greeting message")
 
-            # Call on_ready
+            # Call setup_hook and on_ready
+            await agent.setup_hook()
             await agent.on_ready()
 
             # Verify cogs were added
@@ -259,13 +293,168 @@ class TestAgent:
             agent.greetings.assert_called_once()
             mock_logger.info.assert_called_with("Sent message to dev channel")
 
-            # Verify log handler was added
-            mock_log_handler.assert_called_once_with(mock_log_channel)
+            # Verify log handler was added, fed by a pipeline running on this loop
+            mock_log_pipeline.assert_called_once_with(mock_log_channel, maxsize=100, overflow="drop_debug")
+            mock_log_pipeline.return_value.start.assert_called_once()
+            mock_log_handler.assert_called_once_with(mock_log_pipeline.return_value)
             mock_logger.addHandler.assert_called_once_with(mock_handler)
 
             # Verify dev channel messages
-            assert mock_dev_channel.send.call_count == 2
+            assert mock_dev_channel.send.call_count == 4
             mock_dev_channel.send.assert_any_call("Good morning, Master.\nGood work today.")
+            report_message = "```\nChannels: 1/1 ok in 1.0 ms\n  dev_channel (1): ok, 1.0 ms\n```"
+            mock_dev_channel.send.assert_any_call(report_message)
+            mock_cached_channels.prewarm.assert_awaited_once()
+            assert "Startup:" in mock_dev_channel.send.call_args.args[0]
+
+            # Verify the startup report was written under the logs directory
+            bot_name = mock_get_logger.call_args.kwargs["name"]
+            assert (tmp_path / "logs" / f"{bot_name}.startup.json").exists()
+            assert (tmp_path / "logs" / f"{bot_name}.startup.trace.json").exists()
+            names = [event.name for event in agent.timeline.events]
+            assert "add_cog Tool1" in names
+            assert "dev channel messages" in names
+
+    @pytest.mark.asyncio
+    async def test_on_ready_after_reconnect_skips_startup(self) -> None:
+        """Test that on_ready fired again after a reconnect does not repeat the startup."""
+        with (
+            mock.patch("concord.infrastructure.discord.agent.on_launch"),
+            mock.patch("concord.infrastructure.discord.agent.get_logger") as mock_get_logger,
+            mock.patch("concord.infrastructure.discord.agent.ConfigArgs"),
+            mock.patch("concord.infrastructure.discord.agent.Bot"),
+            mock.patch("concord.infrastructure.discord.agent.CachedChannels"),
+        ):
+            mock_logger = mock.Mock()
+            mock_get_logger.return_value = mock_logger
+            agent = Agent()
+            agent._startup = mock.AsyncMock()  # noqa: SLF001 # type: ignore[reportPrivateUsage]
+
+            await agent.on_ready()
+            await agent.on_ready()
+            await agent.on_ready()
+
+            agent._startup.assert_called_once()  # noqa: SLF001 # type: ignore[reportPrivateUsage]
+
+    @pytest.mark.asyncio
+    async def test_on_ready_retries_failed_startup(self) -> None:
+        """Test that on_ready retries the startup when the previous attempt failed."""
+        with (
+            mock.patch("concord.infrastructure.discord.agent.on_launch"),
+            mock.patch("concord.infrastructure.discord.agent.get_logger") as mock_get_logger,
+            mock.patch("concord.infrastructure.discord.agent.ConfigArgs"),
+            mock.patch("concord.infrastructure.discord.agent.Bot"),
+            mock.patch("concord.infrastructure.discord.agent.CachedChannels"),
+        ):
+            mock_logger = mock.Mock()
+            mock_get_logger.return_value = mock_logger
+            agent = Agent()
+            agent._startup = mock.AsyncMock(side_effect=[OSError("network down"), None])  # noqa: SLF001 # type: ignore[reportPrivateUsage]
+
+            with pytest.raises(OSError, match="network down"):
+                await agent.on_ready()
+            await agent.on_ready()
+            await agent.on_ready()
+
+            assert agent._startup.call_count == 2  # noqa: SLF001 # type: ignore[reportPrivateUsage]
+
+    @pytest.mark.asyncio
+    async def test_on_ready_during_startup_is_skipped(self) -> None:
+        """Test that on_ready fired while the startup is running does not start it twice."""
+        with (
+            mock.patch("concord.infrastructure.discord.agent.on_launch"),
+            mock.patch("concord.infrastructure.discord.agent.get_logger") as mock_get_logger,
+            mock.patch("concord.infrastructure.discord.agent.ConfigArgs"),
+            mock.patch("concord.infrastructure.discord.agent.Bot"),
+            mock.patch("concord.infrastructure.discord.agent.CachedChannels"),
+        ):
+            mock_logger = mock.Mock()
+            mock_get_logger.return_value = mock_logger
+            agent = Agent()
+            release = asyncio.Event()
+
+            async def startup() -> None:
+                await release.wait()
+
+            agent._startup = mock.AsyncMock(side_effect=startup)  # noqa: SLF001 # type: ignore[reportPrivateUsage]
+
+            first = asyncio.create_task(agent.on_ready())
+            await asyncio.sleep(0)
+            await agent.on_ready()
+            release.set()
+            await first
+
+            agent._startup.assert_called_once()  # noqa: SLF001 # type: ignore[reportPrivateUsage]
+
+    @pytest.mark.asyncio
+    async def test_load_tools_quarantines_failed_tools(self) -> None:
+        """Test that broken and slow tools are quarantined while the others are registered."""
+        with (
+            mock.patch("concord.infrastructure.discord.agent.on_launch"),
+            mock.patch("concord.infrastructure.discord.agent.get_logger"),
+            mock.patch("concord.infrastructure.discord.agent.ConfigArgs") as mock_config_args,
+            mock.patch("concord.infrastructure.discord.agent.Bot") as mock_bot_class,
+            mock.patch("concord.infrastructure.discord.agent.CachedChannels"),
+            mock.patch("concord.infrastructure.discord.agent.import_classes_from_directory") as mock_import,
+        ):
+            mock_config_args.return_value.bot.tool_register_timeout = 0.05
+            mock_config_args.return_value.bot.tool_inclusion = None
+            mock_config_args.return_value.bot.tool_exclusion = []
+            good = LoadedClass[type[Cog]](name="Good", class_type=mock.Mock(__name__="Good"))
+            broken = LoadedClass[type[Cog]](
+                name="Broken",
+                class_type=mock.Mock(__name__="Broken", side_effect=RuntimeError("boom")),
+            )
+            slow = LoadedClass[type[Cog]](name="Slow", class_type=mock.Mock(__name__="Slow"))
+            mock_import.return_value = [slow, broken, good]
+
+            async def add_cog(cog: object) -> None:
+                if cog is slow.class_type.return_value:
+                    await asyncio.sleep(1)
+
+            mock_bot = mock.Mock()
+            mock_bot.add_cog = mock.AsyncMock(side_effect=add_cog)
+            mock_bot.get_cog.return_value = None
+            mock_bot_class.return_value = mock_bot
+
+            agent = Agent()
+            agent._tool_directory_paths = [Path("/test/tools")]  # noqa: SLF001 # type: ignore[reportPrivateUsage]
+
+            prepared = await agent._prepare_tools()  # noqa: SLF001 # type: ignore[reportPrivateUsage]
+            loaded = await agent._load_tools(prepared)  # noqa: SLF001 # type: ignore[reportPrivateUsage]
+
+            assert loaded == ["Good"]
+            report = agent.startup_report
+            assert report is not None
+            assert [registration.name for registration in report.registrations] == ["Slow", "Broken", "Good"]
+            assert [registration.name for registration in report.quarantined] == ["Slow", "Broken"]
+            assert "timed out" in str(report.quarantined[0].error)
+            assert "boom" in str(report.quarantined[1].error)
+            assert report.elapsed_seconds < 1
+
+    @pytest.mark.asyncio
+    async def test_register_timeout_includes_construction(self) -> None:
+        """Test that a tool whose constructor uses up the timeout is quarantined without being added."""
+        with (
+            mock.patch("concord.infrastructure.discord.agent.on_launch"),
+            mock.patch("concord.infrastructure.discord.agent.get_logger"),
+            mock.patch("concord.infrastructure.discord.agent.ConfigArgs"),
+            mock.patch("concord.infrastructure.discord.agent.Bot") as mock_bot_class,
+            mock.patch("concord.infrastructure.discord.agent.CachedChannels"),
+        ):
+            mock_bot = mock.Mock()
+            mock_bot.add_cog = mock.AsyncMock()
+            mock_bot_class.return_value = mock_bot
+            slow_constructor = mock.Mock(__name__="SlowInit", side_effect=lambda agent: time.sleep(0.05))  # noqa: ARG005
+            tool = LoadedClass[type[Cog]](name="SlowInit", class_type=slow_constructor)
+            agent = Agent()
+
+            registration, cog = await agent._register_tool(tool, 0.01)  # noqa: SLF001 # type: ignore[reportPrivateUsage]
+
+            assert cog is None
+            assert "timed out" in str(registration.error)
+            assert registration.construct_seconds >= 0.05
+            mock_bot.add_cog.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_run(self) -> None:
@@ -280,6 +469,7 @@ class TestAgent:
             # Setup mocks
             mock_config = mock.Mock()
             mock_config.bot.discord_token = "test_token"  # noqa: S105
+            mock_config.bot.gateway_settings = EXPLICIT_GATEWAY_SETTINGS
             mock_config_args.return_value = mock_config
 
             mock_bot = mock.Mock()
@@ -295,3 +485,118 @@ class TestAgent:
 
             # Verify bot.start was called with correct token
             mock_bot.start.assert_called_once_with("test_token")
+            assert agent.gateway_profile is not None
+            assert agent.gateway_profile.max_messages == 1000
+
+    @pytest.mark.asyncio
+    async def test_close_drains_log_pipeline(self) -> None:
+        """Test that close ships the queued log records before closing the bot."""
+        with (
+            mock.patch("concord.infrastructure.discord.agent.on_launch"),
+            mock.patch("concord.infrastructure.discord.agent.get_logger") as mock_get_logger,
+            mock.patch("concord.infrastructure.discord.agent.ConfigArgs"),
+            mock.patch("concord.infrastructure.discord.agent.Bot") as mock_bot_class,
+            mock.patch("concord.infrastructure.discord.agent.CachedChannels"),
+        ):
+            mock_logger = mock.Mock()
+            mock_get_logger.return_value = mock_logger
+            mock_bot = mock.Mock()
+            mock_bot.close = mock.AsyncMock()
+            mock_bot_class.return_value = mock_bot
+            bot_close = mock_bot.close
+            agent = Agent()
+            pipeline = mock.Mock()
+            pipeline.close = mock.AsyncMock(side_effect=bot_close.assert_not_awaited)
+            pipeline.stats.return_value = LogPipelineStats(shipped=3, pending=0, dropped_overflow=1)
+            agent.log_pipeline = pipeline
+            handler = mock.Mock()
+            agent._log_handler = handler  # noqa: SLF001 # type: ignore[reportPrivateUsage]
+
+            # discord.py calls `close` on shutdown, which is replaced by the agent
+            await mock_bot.close()
+
+            mock_logger.removeHandler.assert_called_once_with(handler)
+            pipeline.close.assert_awaited_once()
+            bot_close.assert_awaited_once()
+            assert agent.log_pipeline is None
+            mock_logger.info.assert_any_call(
+                "log pipeline: 3 shipped, 0 failed, 1 dropped (1 overflow, 0 debug, 0 timeout, 0 closed)",
+            )
+
+    @pytest.mark.asyncio
+    async def test_run_waits_for_tool_requirements(self) -> None:
+        """Test that run logs in, waits for the tools, and connects with the intents they need."""
+
+        class Greeter(Cog):
+            @Cog.listener()
+            async def on_member_join(self, member: object) -> None:
+                pass
+
+        with (
+            mock.patch("concord.infrastructure.discord.agent.on_launch"),
+            mock.patch("concord.infrastructure.discord.agent.get_logger"),
+            mock.patch("concord.infrastructure.discord.agent.ConfigArgs") as mock_config_args,
+            mock.patch("concord.infrastructure.discord.agent.Bot") as mock_bot_class,
+            mock.patch("concord.infrastructure.discord.agent.CachedChannels"),
+            mock.patch("concord.infrastructure.discord.agent.import_classes_from_directory") as mock_import,
+            mock.patch("concord.infrastructure.discord.agent.apply_gateway_profile") as mock_apply,
+        ):
+            mock_config_args.return_value.bot.discord_token = "test_token"  # noqa: S105
+            mock_config_args.return_value.bot.tool_inclusion = None
+            mock_config_args.return_value.bot.tool_exclusion = []
+            mock_config_args.return_value.bot.gateway_settings = GatewaySettings()
+            mock_import.return_value = [LoadedClass[type[Cog]](name="Greeter", class_type=Greeter)]
+            mock_bot = mock.Mock()
+            mock_bot.login = mock.AsyncMock()
+            mock_bot.connect = mock.AsyncMock(side_effect=mock_apply.assert_called_once)
+            mock_bot_class.return_value = mock_bot
+
+            agent = Agent()
+            agent._tool_directory_paths = [Path("/test/tools")]  # noqa: SLF001 # type: ignore[reportPrivateUsage]
+            await agent.run()
+
+            mock_bot.login.assert_awaited_once_with("test_token")
+            mock_bot.connect.assert_awaited_once()
+            mock_bot.start.assert_not_called()
+            profile = mock_apply.call_args.args[1]
+            assert profile is agent.gateway_profile
+            assert profile.intents == ("guilds", "members")
+            assert profile.member_cache == ()
+            assert profile.max_messages is None
+
+    @pytest.mark.asyncio
+    async def test_run_imports_tools_while_connecting(self) -> None:
+        """Test that run starts the tool import before the gateway connection finishes."""
+        with (
+            mock.patch("concord.infrastructure.discord.agent.on_launch"),
+            mock.patch("concord.infrastructure.discord.agent.get_logger"),
+            mock.patch("concord.infrastructure.discord.agent.ConfigArgs") as mock_config_args,
+            mock.patch("concord.infrastructure.discord.agent.Bot") as mock_bot_class,
+            mock.patch("concord.infrastructure.discord.agent.CachedChannels"),
+            mock.patch("concord.infrastructure.discord.agent.import_classes_from_directory") as mock_import,
+        ):
+            mock_config_args.return_value.bot.tool_inclusion = None
+            mock_config_args.return_value.bot.tool_exclusion = []
+            mock_config_args.return_value.bot.gateway_settings = EXPLICIT_GATEWAY_SETTINGS
+            tool = LoadedClass[type[Cog]](name="Tool1", class_type=mock.Mock(__name__="Tool1"))
+            mock_import.return_value = [tool]
+
+            agent = Agent()
+            agent._tool_directory_paths = [Path("/test/tools")]  # noqa: SLF001 # type: ignore[reportPrivateUsage]
+
+            async def start(_: str) -> None:
+                # The gateway is still connecting while the import runs in a worker thread
+                prepared = await agent._prepared_tools  # noqa: SLF001 # type: ignore[reportPrivateUsage]
+                assert prepared.classes == (tool,)
+
+            mock_bot = mock.Mock()
+            mock_bot.start = mock.AsyncMock(side_effect=start)
+            mock_bot_class.return_value = mock_bot
+            agent.bot = mock_bot
+
+            await agent.run()
+
+            mock_import.assert_called_once()
+            tool.class_type.assert_not_called()
+            marks = [event.name for event in agent.timeline.events if event.duration == 0]
+            assert marks == ["run", "tool import started", "tool import finished"]
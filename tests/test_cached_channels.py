@@ -1,5 +1,6 @@
 """Tests for CachedChannels class."""
 
+import asyncio
 import logging
 from unittest import mock
 
@@ -7,10 +8,15 @@ import pytest
 from discord import Thread
 from discord.abc import GuildChannel
 from discord.channel import TextChannel
+from discord.errors import Forbidden, HTTPException, NotFound
 from discord.ext.commands import Bot
 
 from concord.infrastructure.config.from_files import ConfigArgs
 from concord.infrastructure.discord.cached_channels import CachedChannels
+from concord.infrastructure.discord.channel_cache import ChannelCache
+from concord.model.channel_cache import ChannelCacheStats
+from concord.model.channel_prewarm import ChannelCheck, ChannelPrewarmReport
+from concord.model.config_snapshot import ConfigChange
 
 
 class TestCachedChannels:
@@ -45,8 +51,7 @@ class TestCachedChannels:
         assert cached_channels._logger == mock_logger  # noqa: SLF001 # type: ignore[reportPrivateUsage]
         assert cached_channels.channel_name2id == {"dev_channel": 123, "log_channel": 456}
         assert cached_channels.channel_id2name == {123: "dev_channel", 456: "log_channel"}
-        assert cached_channels._dev_channel is None  # noqa: SLF001 # type: ignore[reportPrivateUsage]
-        assert cached_channels._log_channel is None  # noqa: SLF001 # type: ignore[reportPrivateUsage]
+        mock_bot.get_channel.assert_not_called()
 
     def test_channel_name2id_property(self) -> None:
         """Test channel_name2id property getter."""
@@ -291,3 +296,311 @@ class TestCachedChannels:
             cached_channels.get_channel_from_key(key="nonexistent_key")
 
         mock_logger.error.assert_called_once_with("No match: nonexistent_key")
+
+    def test_on_config_change_updates_only_changed_values(self) -> None:
+        """Test that a config change swaps the mappings and resets a moved default channel."""
+        cached_channels, mock_bot, _ = self.create_cached_channels()
+        dev_channel = mock.Mock(spec=TextChannel)
+        mock_bot.get_channel.return_value = dev_channel
+        _ = cached_channels.dev_channel
+        _ = cached_channels.log_channel
+
+        bot = mock.Mock(
+            channels={"general": 789},
+            channel_names={789: "general"},
+            dev_channel_id=321,
+            log_channel_id=456,
+        )
+        change = mock.Mock(spec=ConfigChange, current=mock.Mock(bot=bot))
+        change.touches.side_effect = lambda name: name in {"bot.channels", "bot.dev_channel_id"}
+
+        cached_channels.on_config_change(change)
+
+        assert cached_channels.channel_name2id == {"general": 789}
+        assert cached_channels.channel_id2name == {789: "general"}
+        assert cached_channels._dev_channel_id == 321  # noqa: SLF001 # type: ignore[reportPrivateUsage]
+        mock_bot.get_channel.reset_mock()
+        assert cached_channels.log_channel is dev_channel
+        mock_bot.get_channel.assert_not_called()
+        _ = cached_channels.dev_channel
+        mock_bot.get_channel.assert_called_once_with(321)
+
+    def _make_channel(self, channel_id: int, name: str) -> mock.Mock:
+        channel = mock.Mock(spec=GuildChannel)
+        channel.id = channel_id
+        channel.name = name
+        return channel
+
+    def test_register_listeners(self) -> None:
+        """Test that the index listeners are registered under discord event names."""
+        cached_channels, mock_bot, _ = self.create_cached_channels()
+
+        cached_channels.register_listeners()
+
+        names = {call.args[1] for call in mock_bot.add_listener.call_args_list}
+        assert names == {
+            "on_ready",
+            "on_guild_channel_create",
+            "on_guild_channel_delete",
+            "on_guild_channel_update",
+            "on_thread_create",
+            "on_thread_update",
+            "on_raw_thread_delete",
+            "on_guild_join",
+            "on_guild_remove",
+        }
+
+    @pytest.mark.asyncio
+    async def test_get_channel_by_name_uses_index_after_ready(self) -> None:
+        """Test that lookups use the index once built, and keep detecting ambiguous names."""
+        cached_channels, mock_bot, _ = self.create_cached_channels()
+        general = self._make_channel(1, "general")
+        mock_bot.get_all_channels.return_value = [general, self._make_channel(2, "dup"), self._make_channel(3, "dup")]
+
+        await cached_channels.rebuild_channel_index()
+        mock_bot.get_all_channels.reset_mock()
+
+        assert cached_channels.get_channel_from_id_or_name(channel_name="general") is general
+        with pytest.raises(ValueError, match="Too many match: 2"):
+            cached_channels.get_channel_from_id_or_name(channel_name="dup")
+        mock_bot.get_all_channels.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_index_follows_channel_and_guild_events(self) -> None:
+        """Test that create, rename, delete, join and remove events update the index."""
+        cached_channels, mock_bot, _ = self.create_cached_channels()
+        mock_bot.get_all_channels.return_value = []
+        await cached_channels.rebuild_channel_index()
+
+        created = self._make_channel(1, "old")
+        await cached_channels.on_guild_channel_create(created)
+        assert cached_channels.get_channel_from_id_or_name(channel_name="old") is created
+
+        renamed = self._make_channel(1, "new")
+        await cached_channels.on_guild_channel_update(created, renamed)
+        assert cached_channels.get_channel_from_id_or_name(channel_name="new") is renamed
+        with pytest.raises(ValueError, match="No match: old"):
+            cached_channels.get_channel_from_id_or_name(channel_name="old")
+
+        await cached_channels.on_guild_channel_delete(renamed)
+        with pytest.raises(ValueError, match="No match: new"):
+            cached_channels.get_channel_from_id_or_name(channel_name="new")
+
+        guild = mock.Mock(channels=[self._make_channel(10, "lobby"), self._make_channel(11, "lobby")])
+        await cached_channels.on_guild_join(guild)
+        with pytest.raises(ValueError, match="Too many match: 2"):
+            cached_channels.get_channel_from_id_or_name(channel_name="lobby")
+        await cached_channels.on_guild_remove(guild)
+        with pytest.raises(ValueError, match="No match: lobby"):
+            cached_channels.get_channel_from_id_or_name(channel_name="lobby")
+
+    @pytest.mark.asyncio
+    async def test_deleted_dev_channel_is_resolved_again(self) -> None:
+        """Test that a deleted and recreated default channel is not served from the cache."""
+        cached_channels, mock_bot, _ = self.create_cached_channels()
+        old_channel = mock.Mock(spec=TextChannel, id=123)
+        new_channel = mock.Mock(spec=TextChannel, id=123)
+        mock_bot.get_channel.return_value = old_channel
+        assert cached_channels.dev_channel is old_channel
+
+        await cached_channels.on_guild_channel_delete(old_channel)
+        mock_bot.get_channel.return_value = new_channel
+
+        assert cached_channels.dev_channel is new_channel
+        assert cached_channels.channel_cache_stats().evictions == 1
+
+    @pytest.mark.asyncio
+    async def test_archived_and_deleted_threads_are_evicted(self) -> None:
+        """Test that thread archive and delete events evict cached threads."""
+        cached_channels, mock_bot, _ = self.create_cached_channels()
+        thread = mock.Mock(spec=Thread, id=777, parent_id=1, archived=False)
+        mock_bot.get_channel.return_value = thread
+        cached_channels.get_textchannel_or_thread_from_id(_id=777)
+
+        await cached_channels.on_thread_update(thread, thread)
+        assert cached_channels.channel_cache_stats().size == 1
+
+        archived = mock.Mock(spec=Thread, id=777, archived=True)
+        await cached_channels.on_thread_update(thread, archived)
+        assert cached_channels.channel_cache_stats().size == 0
+
+        cached_channels.get_textchannel_or_thread_from_id(_id=777)
+        await cached_channels.on_raw_thread_delete(mock.Mock(thread_id=777))
+        assert cached_channels.channel_cache_stats().size == 0
+
+    @pytest.mark.asyncio
+    async def test_created_thread_forgets_failure(self) -> None:
+        """Test that a thread created after a failed fetch can be fetched without waiting for the negative TTL."""
+        cached_channels, mock_bot, _ = self.create_cached_channels()
+        thread = mock.Mock(spec=Thread, id=777)
+        mock_bot.get_channel.return_value = None
+        mock_bot.fetch_channel = mock.AsyncMock(side_effect=[NotFound(mock.Mock(status=404), "missing"), thread])
+
+        with pytest.raises(KeyError):
+            await cached_channels.fetch_textchannel_or_thread_from_id(_id=777)
+        with pytest.raises(KeyError):
+            await cached_channels.fetch_textchannel_or_thread_from_id(_id=777)
+        assert mock_bot.fetch_channel.await_count == 1
+
+        await cached_channels.on_thread_create(thread)
+
+        assert await cached_channels.fetch_textchannel_or_thread_from_id(_id=777) is thread
+
+    @pytest.mark.asyncio
+    async def test_id_lookup_shares_the_cache_and_counts_hits(self) -> None:
+        """Test that id lookups use the same cache as the default channels."""
+        cached_channels, mock_bot, _ = self.create_cached_channels()
+        channel = mock.Mock(spec=TextChannel, id=123, guild=mock.Mock(id=9))
+        mock_bot.get_channel.return_value = channel
+
+        assert cached_channels.get_channel_from_id_or_name(_id=123) is channel
+        assert cached_channels.dev_channel is channel
+        mock_bot.get_channel.assert_called_once_with(123)
+
+        await cached_channels.on_guild_remove(mock.Mock(id=9, channels=[]))
+        stats = cached_channels.channel_cache_stats()
+        assert (stats.hits, stats.misses, stats.evictions, stats.size) == (1, 1, 1, 0)
+
+    @pytest.mark.asyncio
+    async def test_fetch_is_single_flight(self) -> None:
+        """Test that concurrent fetches of an uncached id share one REST request."""
+        cached_channels, mock_bot, _ = self.create_cached_channels()
+        thread = mock.Mock(spec=Thread, id=777)
+        release = asyncio.Event()
+
+        async def fetch_channel(_id: int) -> mock.Mock:
+            await release.wait()
+            return thread
+
+        mock_bot.get_channel.return_value = None
+        mock_bot.fetch_channel = mock.AsyncMock(side_effect=fetch_channel)
+
+        waiters = [
+            asyncio.create_task(cached_channels.fetch_textchannel_or_thread_from_id(_id=777)) for _ in range(50)
+        ]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*waiters)
+
+        assert all(result is thread for result in results)
+        mock_bot.fetch_channel.assert_awaited_once_with(777)
+        # 取得したチャンネルはキャッシュされ、以降はREST APIを呼ばない
+        assert await cached_channels.fetch_textchannel_or_thread_from_id(_id=777) is thread
+        assert cached_channels.channel_cache_stats().fetches == 1
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(("error", "reason"), [(NotFound, "No match channel"), (Forbidden, "No access")])
+    async def test_fetch_failures_are_cached(self, error: type[HTTPException], reason: str) -> None:
+        """Test that not found and forbidden results are not requested again within the negative ttl."""
+        cached_channels, mock_bot, _ = self.create_cached_channels()
+        mock_bot.get_channel.return_value = None
+        mock_bot.fetch_channel = mock.AsyncMock(side_effect=error(mock.Mock(status=404, reason="x"), "x"))
+
+        for _ in range(3):
+            with pytest.raises(KeyError, match=reason):
+                await cached_channels.fetch_channel_from_id_or_name(_id=999)
+
+        mock_bot.fetch_channel.assert_awaited_once_with(999)
+        assert cached_channels.channel_cache_stats().negative_hits == 2
+
+        await cached_channels.on_guild_join(mock.Mock(channels=[]))
+        with pytest.raises(KeyError, match=reason):
+            await cached_channels.fetch_channel_from_id_or_name(_id=999)
+        assert mock_bot.fetch_channel.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_fetch_prefers_bot_cache(self) -> None:
+        """Test that fetch does not call the REST API for channels in the bot cache."""
+        cached_channels, mock_bot, _ = self.create_cached_channels()
+        channel = mock.Mock(spec=TextChannel)
+        mock_bot.get_channel.return_value = channel
+        mock_bot.fetch_channel = mock.AsyncMock()
+
+        assert await cached_channels.fetch_channel_from_key(key="dev_channel") is channel
+        mock_bot.fetch_channel.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_prewarm_checks_every_channel(self) -> None:
+        """Test that prewarm resolves default and configured channels and reports problems."""
+        cached_channels, mock_bot, mock_logger = self.create_cached_channels(
+            channel_mappings={"general": 789, "typo": 999},
+        )
+
+        def make_sendable(spec: type, channel_id: int, *, allowed: bool) -> mock.Mock:
+            channel = mock.Mock(spec=spec, id=channel_id)
+            channel.permissions_for.return_value = mock.Mock(send_messages=allowed, send_messages_in_threads=allowed)
+            return channel
+
+        channels = {
+            123: make_sendable(TextChannel, 123, allowed=True),
+            456: make_sendable(Thread, 456, allowed=True),
+            789: make_sendable(TextChannel, 789, allowed=False),
+        }
+        mock_bot.get_channel.side_effect = channels.get
+        mock_bot.fetch_channel = mock.AsyncMock(side_effect=NotFound(mock.Mock(status=404, reason="x"), "x"))
+
+        report = await cached_channels.prewarm()
+
+        assert [(check.key, check.status) for check in report.checks] == [
+            ("dev_channel", "ok"),
+            ("log_channel", "ok"),
+            ("general", "no send permission"),
+            ("typo", "error: [Error] No match channel from ChannelId: 999"),
+        ]
+        assert [check.key for check in report.failed] == ["general", "typo"]
+        assert "Channels: 2/4 ok" in report.format()
+        assert mock_logger.warning.call_count == 2
+        assert cached_channels.channel_cache_stats().size == 3
+
+    def test_prewarm_report_format_truncates(self) -> None:
+        """Test that a long report lists only the failed channels."""
+        checks = tuple(ChannelCheck(f"c{i}", i, 0.0, can_send=i != 0) for i in range(30))
+        report = ChannelPrewarmReport(checks=checks, elapsed_seconds=0.0)
+
+        assert report.format().splitlines() == ["Channels: 29/30 ok in 0.0 ms", "  c0 (0): no send permission, 0.0 ms"]
+
+
+class TestChannelCache:
+    """Test the ChannelCache class."""
+
+    def test_ttl_expires_entries(self) -> None:
+        """Test that an entry older than the ttl is evicted on lookup."""
+        now = [0.0]
+        cache = ChannelCache(ttl=10.0, clock=lambda: now[0])
+        channel = mock.Mock()
+        cache.put(1, channel)
+
+        now[0] = 5.0
+        assert cache.get(1) is channel
+        now[0] = 11.0
+        assert cache.get(1) is None
+        assert cache.stats() == ChannelCacheStats(hits=1, misses=1, evictions=1, size=0)
+
+    def test_invalid_ttl(self) -> None:
+        """Test that a non-positive ttl is rejected."""
+        with pytest.raises(ValueError, match="ttl"):
+            ChannelCache(ttl=0)
+
+    def test_invalidate_drops_child_threads(self) -> None:
+        """Test that deleting a channel also drops its cached threads."""
+        cache = ChannelCache()
+        cache.put(1, mock.Mock(parent_id=None))
+        cache.put(2, mock.Mock(parent_id=1))
+        cache.put(3, mock.Mock(parent_id=99))
+
+        cache.invalidate(1)
+
+        assert len(cache) == 1
+        assert cache.get(3) is not None
+
+    def test_failures_expire(self) -> None:
+        """Test that negative entries are returned only until the negative ttl passes."""
+        now = [0.0]
+        cache = ChannelCache(negative_ttl=30.0, clock=lambda: now[0])
+        cache.put_failure(1, "No match channel")
+
+        now[0] = 29.0
+        assert cache.get_failure(1) == "No match channel"
+        now[0] = 30.0
+        assert cache.get_failure(1) is None
+        assert cache.stats().negative_hits == 1
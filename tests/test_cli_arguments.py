@@ -5,7 +5,7 @@ from unittest import mock
 
 import pytest
 
-from concord.cli.arguments import on_launch
+from concord.cli.arguments import on_launch, on_launch_host
 from concord.model.argument import Args
 
 
@@ -47,6 +47,7 @@ class TestOnLaunch:
         mock_args.bot_name = "test_bot"
         mock_args.tool_directory_paths = "/path/to/tools1 /path/to/tools2"
         mock_args.is_debug = True
+        mock_args.flight_recorder = 0
         mock_parser.parse_args.return_value = mock_args
 
         # Setup directory existence mocks
@@ -58,7 +59,7 @@ class TestOnLaunch:
 
         # Verify parser setup
         mock_parser_class.assert_called_once()
-        assert mock_parser.add_argument.call_count == 3
+        assert mock_parser.add_argument.call_count == 4
 
         # Verify add_argument calls
         call_args = [call[1] for call in mock_parser.add_argument.call_args_list]
@@ -103,6 +104,7 @@ class TestOnLaunch:
         mock_args.bot_name = "test_bot"
         mock_args.tool_directory_paths = "/single/path"
         mock_args.is_debug = False
+        mock_args.flight_recorder = 0
         mock_parser.parse_args.return_value = mock_args
 
         # Setup directory existence mocks
@@ -124,6 +126,7 @@ class TestOnLaunch:
         mock_args.bot_name = 123  # Invalid type
         mock_args.tool_directory_paths = "/path/to/tools"
         mock_args.is_debug = False
+        mock_args.flight_recorder = 0
         mock_parser.parse_args.return_value = mock_args
 
         with pytest.raises(TypeError) as exc_info:
@@ -141,6 +144,7 @@ class TestOnLaunch:
         mock_args.bot_name = "test_bot"
         mock_args.tool_directory_paths = 123  # Invalid type
         mock_args.is_debug = False
+        mock_args.flight_recorder = 0
         mock_parser.parse_args.return_value = mock_args
 
         with pytest.raises(TypeError) as exc_info:
@@ -165,6 +169,7 @@ class TestOnLaunch:
         mock_args.bot_name = "test_bot"
         mock_args.tool_directory_paths = "/path/to/tools"
         mock_args.is_debug = "not_a_bool"  # Invalid type
+        mock_args.flight_recorder = 0
         mock_parser.parse_args.return_value = mock_args
 
         # Setup directory existence mocks
@@ -193,6 +198,7 @@ class TestOnLaunch:
         mock_args.bot_name = "test_bot"
         mock_args.tool_directory_paths = ""
         mock_args.is_debug = False
+        mock_args.flight_recorder = 0
         mock_parser.parse_args.return_value = mock_args
 
         # Setup directory existence mocks
@@ -221,6 +227,7 @@ class TestOnLaunch:
         mock_args.bot_name = "test_bot"
         mock_args.tool_directory_paths = "  /path1   /path2  /path3  "
         mock_args.is_debug = False
+        mock_args.flight_recorder = 0
         mock_parser.parse_args.return_value = mock_args
 
         # Setup directory existence mocks
@@ -230,3 +237,39 @@ class TestOnLaunch:
         result = on_launch()
 
         assert set(result.tool_directory_paths) == {Path("/path1"), Path("/path2"), Path("/path3")}
+
+
+class TestOnLaunchHost:
+    """Test the on_launch_host function."""
+
+    def test_on_launch_host_shares_tool_directories(self, tmp_path: Path) -> None:
+        """Test that every bot gets the same tool directories and debug flag."""
+        argv = ["prog", "--bot-names", "bot_a", "bot_b", "--tool-directory-paths", tmp_path.as_posix(), "--is-debug"]
+        with mock.patch("sys.argv", argv):
+            result = on_launch_host()
+
+        assert [args.bot_name for args in result] == ["bot_a", "bot_b"]
+        assert all(args.tool_directory_paths == [tmp_path.resolve()] for args in result)
+        assert all(args.is_debug is True for args in result)
+        assert result[0].tool_directory_paths is not result[1].tool_directory_paths
+
+    def test_on_launch_host_flight_recorder(self) -> None:
+        """Test that the flight recorder size is shared by every bot and must not be negative."""
+        with mock.patch("sys.argv", ["prog", "--bot-names", "bot_a", "bot_b", "--flight-recorder", "500"]):
+            result = on_launch_host()
+
+        assert [args.flight_recorder for args in result] == [500, 500]
+
+        with (
+            mock.patch("sys.argv", ["prog", "--bot-names", "bot_a", "--flight-recorder", "-1"]),
+            pytest.raises(ValueError, match="flight_recorder"),
+        ):
+            on_launch_host()
+
+    def test_on_launch_host_duplicate_bot_names(self) -> None:
+        """Test that duplicated bot names are rejected."""
+        with (
+            mock.patch("sys.argv", ["prog", "--bot-names", "bot_a", "bot_a"]),
+            pytest.raises(ValueError, match="unique"),
+        ):
+            on_launch_host()
@@ -2,6 +2,9 @@
 
 # mypy: ignore-errors
 
+import asyncio
+import re
+import time
 from pathlib import Path
 from unittest import mock
 
@@ -13,8 +16,10 @@ from concord.infrastructure.config.from_files import (
     ConfigAPI,
     ConfigArgs,
     ConfigBOT,
+    ConfigRegistry,
 )
-from concord.model.config import BaseConfigArgs
+from concord.model.config import BaseConfigArgs, flush_pending_writes
+from concord.model.gateway_profile import GatewaySettings
 
 
 class TestBaseConfigArgs:
@@ -195,29 +200,83 @@ class TestBaseConfigArgs:
 
             mock_logger.error.assert_called_once()
 
-    def test_write(self) -> None:
-        """Test write operation."""
-        mock_path = mock.Mock()
-        mock_path.resolve.return_value = mock_path
-        mock_path.exists.return_value = True
-        mock_path.is_file.return_value = True
-        mock_path.suffix = ".ini"
-        mock_path.as_posix.return_value = "/test/config.ini"
+    def test_write(self, tmp_path: Path) -> None:
+        """Test that write replaces the file atomically and leaves no temp file."""
+        config_file = tmp_path / "state.ini"
+        config_file.write_text("[state]\ncount = 1\n")
+        config = BaseConfigArgs(config_file, mock.Mock())
 
-        mock_logger = mock.Mock()
+        config.set_value(section="state", option="count", value="2")
+        config.write()
 
-        with mock.patch("concord.model.config.ConfigParser") as mock_config_parser:
-            mock_parser = mock.Mock()
-            mock_config_parser.return_value = mock_parser
+        assert config_file.read_text() == "[state]\ncount = 2\n\n"
+        assert [path.name for path in tmp_path.iterdir()] == ["state.ini"]
 
-            mock_file = mock.mock_open()
-            mock_path.open.return_value = mock_file.return_value
+    def test_write_keeps_file_when_interrupted(self, tmp_path: Path) -> None:
+        """Test that a failed write leaves the previous contents in place."""
+        config_file = tmp_path / "state.ini"
+        config_file.write_text("[state]\ncount = 1\n")
+        config = BaseConfigArgs(config_file, mock.Mock())
+        config.set_value(section="state", option="count", value="2")
 
-            config = BaseConfigArgs(mock_path, mock_logger)
+        with (
+            mock.patch("concord.model.config.os.fsync", side_effect=OSError("disk full")),
+            pytest.raises(OSError, match="disk full"),
+        ):
+            config.write()
+
+        assert config_file.read_text() == "[state]\ncount = 1\n"
+        assert [path.name for path in tmp_path.iterdir()] == ["state.ini"]
+
+    def test_write_behind_coalesces_set_value(self, tmp_path: Path) -> None:
+        """Test that many set_value calls are flushed once, off the caller's thread."""
+        config_file = tmp_path / "state.ini"
+        config_file.write_text("[state]\ncount = 0\n")
+        config = BaseConfigArgs(config_file, mock.Mock())
+        config.enable_write_behind(debounce=0.05)
+
+        for count in range(1, 101):
+            config.set_value(section="state", option="count", value=str(count))
+        assert config_file.read_text() == "[state]\ncount = 0\n"
+
+        writer = config._writer  # noqa: SLF001 # type: ignore[reportPrivateUsage]
+        deadline = time.monotonic() + 5
+        while writer.pending and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        assert writer.flush_count == 1
+        assert "count = 100" in config_file.read_text()
+        config.close()
+
+    def test_write_behind_write_only_schedules(self, tmp_path: Path) -> None:
+        """Test that write does not write on the caller's thread once write-behind is enabled."""
+        config_file = tmp_path / "state.ini"
+        config_file.write_text("[state]\ncount = 0\n")
+        config = BaseConfigArgs(config_file, mock.Mock())
+        config.enable_write_behind(debounce=60)
+        config.set_value(section="state", option="count", value="3")
+
+        with mock.patch("concord.model.config.atomic_write_text") as mock_write:
             config.write()
 
-            mock_path.open.assert_called_once_with("w", encoding="utf-8")
-            mock_parser.write.assert_called_once()
+        mock_write.assert_not_called()
+        assert config.has_pending_writes is True
+        flush_pending_writes()
+        assert "count = 3" in config_file.read_text()
+        config.close()
+
+    def test_write_behind_flush_on_shutdown(self, tmp_path: Path) -> None:
+        """Test that pending changes are written by the shutdown hook without waiting for the debounce."""
+        config_file = tmp_path / "state.ini"
+        config_file.write_text("[state]\ncount = 0\n")
+        config = BaseConfigArgs(config_file, mock.Mock())
+        config.enable_write_behind(debounce=60)
+
+        config.set_value(section="state", option="count", value="7")
+        flush_pending_writes()
+
+        assert "count = 7" in config_file.read_text()
+        config.close()
 
 
 class TestConfigAPI:
@@ -324,6 +383,9 @@ class TestConfigBOT:
         with mock.patch("concord.infrastructure.config.from_files.BaseConfigArgs.__init__"):
             config = ConfigBOT(bot_name="testbot", logger=mock_logger)
             config._logger = mock_logger  # noqa: SLF001 # type: ignore[reportPrivateUsage]
+            parser = mock.Mock()
+            parser.has_option.return_value = True
+            config._config = parser  # noqa: SLF001 # type: ignore[reportPrivateUsage]
             config.get = mock.Mock(return_value="tool1,tool2 tool3")
 
             result = config.tool_exclusion
@@ -332,19 +394,192 @@ class TestConfigBOT:
             config.get.assert_called_once_with(section="Discord.Tool", option="exclusions")
             mock_logger.info.assert_called_once()
 
-    def test_tool_exclusion_property_key_error(self) -> None:
-        """Test tool_exclusion property with missing key."""
+    def test_tool_exclusion_property_missing_option(self) -> None:
+        """Test tool_exclusion property with missing option."""
         mock_logger = mock.Mock()
 
         with mock.patch("concord.infrastructure.config.from_files.BaseConfigArgs.__init__"):
             config = ConfigBOT(bot_name="testbot", logger=mock_logger)
             config._logger = mock_logger  # noqa: SLF001 # type: ignore[reportPrivateUsage]
-            config.get = mock.Mock(side_effect=KeyError("Not found"))
+            parser = mock.Mock()
+            parser.has_option.return_value = False
+            config._config = parser  # noqa: SLF001 # type: ignore[reportPrivateUsage]
+            config.get = mock.Mock()
 
             result = config.tool_exclusion
 
             assert result == []
-            mock_logger.exception.assert_called_once()
+            parser.has_option.assert_called_once_with("Discord.Tool", "exclusions")
+            config.get.assert_not_called()
+
+    def test_tool_exclusion_without_option_in_file(self, tmp_path: Path, sample_config_content: str) -> None:
+        """Test tool_exclusion returns an empty list for a real file without [Discord.Tool] exclusions."""
+        config_file = tmp_path / "test_bot.ini"
+        config_file.write_text(sample_config_content.replace("exclusions = tool1, tool2 tool3\n", ""))
+        config = ConfigBOT(bot_name="test_bot", logger=mock.Mock(), filepath=config_file)
+
+        assert config.tool_exclusion == []
+        assert config.tool_inclusion is None
+
+    def test_tool_exclusion_with_inline_comment(self, tmp_path: Path, sample_config_content: str) -> None:
+        """Test the README line with a trailing comment is split without the comment or brackets."""
+        config_file = tmp_path / "test_bot.ini"
+        config_file.write_text(
+            sample_config_content.replace(
+                "exclusions = tool1, tool2 tool3",
+                "exclusions = [ToolName1, ToolName2]  # 除外するツール(詳細は以下)",
+            )
+            + "inclusions = Debug[0-9], admin/*  # 読み込むツール\n",
+        )
+        config = ConfigBOT(bot_name="test_bot", logger=mock.Mock(), filepath=config_file)
+
+        assert config.tool_exclusion == ["ToolName1", "ToolName2"]
+        assert config.tool_inclusion == ["Debug[0-9]", "admin/*"]
+
+    def test_value_with_hash_is_kept(self, tmp_path: Path, sample_config_content: str) -> None:
+        """Test that only the list options strip ' # ...', and other values keep their '#'."""
+        config_file = tmp_path / "test_bot.ini"
+        config_file.write_text(
+            sample_config_content.replace("A test Discord bot", "Bot #1 for https://example.com/#top").replace(
+                "test_token_123",
+                "abc #def",
+            ),
+        )
+        config = ConfigBOT(bot_name="test_bot", logger=mock.Mock(), filepath=config_file)
+
+        assert config.description == "Bot #1 for https://example.com/#top"
+        assert config.discord_token == "abc #def"  # noqa: S105
+
+    def test_tool_exclusion_keeps_glob_patterns(self, tmp_path: Path, sample_config_content: str) -> None:
+        """Test tool_exclusion and tool_inclusion keep glob characters and path separators."""
+        config_file = tmp_path / "test_bot.ini"
+        config_file.write_text(
+            sample_config_content.replace("exclusions = tool1, tool2 tool3", "exclusions = [Debug*, legacy/]")
+            + "inclusions = [Echo, tools/*.py]\n",
+        )
+        config = ConfigBOT(bot_name="test_bot", logger=mock.Mock(), filepath=config_file)
+
+        assert config.tool_exclusion == ["Debug*", "legacy/"]
+        assert config.tool_inclusion == ["Echo", "tools/*.py"]
+
+    def test_tool_import_workers_default(self, mock_config_file: Path) -> None:
+        """Test tool_import_workers falls back to serial import when not configured."""
+        config = ConfigBOT(bot_name="test_bot", logger=mock.Mock(), filepath=mock_config_file)
+
+        assert config.tool_import_workers == 1
+
+    def test_tool_import_workers_configured(self, tmp_path: Path, sample_config_content: str) -> None:
+        """Test tool_import_workers reads the [Discord.Tool] import_workers option."""
+        config_file = tmp_path / "test_bot.ini"
+        config_file.write_text(sample_config_content + "import_workers = 8\n")
+        config = ConfigBOT(bot_name="test_bot", logger=mock.Mock(), filepath=config_file)
+
+        assert config.tool_import_workers == 8
+
+    def test_tool_loading_mode_default(self, mock_config_file: Path) -> None:
+        """Test tool_loading_mode loads every tool at startup when not configured."""
+        config = ConfigBOT(bot_name="test_bot", logger=mock.Mock(), filepath=mock_config_file)
+
+        assert config.tool_loading_mode == "eager"
+
+    def test_tool_register_timeout_default(self, mock_config_file: Path) -> None:
+        """Test tool_register_timeout falls back to 30 seconds when not configured."""
+        config = ConfigBOT(bot_name="test_bot", logger=mock.Mock(), filepath=mock_config_file)
+
+        assert config.tool_register_timeout == 30.0
+
+    def test_tool_hot_reload_configured(self, tmp_path: Path, sample_config_content: str) -> None:
+        """Test tool_hot_reload reads the [Discord.Tool] hot_reload option."""
+        config_file = tmp_path / "test_bot.ini"
+        config_file.write_text(sample_config_content + "hot_reload = true\n")
+        config = ConfigBOT(bot_name="test_bot", logger=mock.Mock(), filepath=config_file)
+
+        assert config.tool_hot_reload is True
+
+    def test_tool_profile_import(self, tmp_path: Path, sample_config_content: str, mock_config_file: Path) -> None:
+        """Test tool_profile_import is off by default and reads the profile_import option."""
+        config = ConfigBOT(bot_name="test_bot", logger=mock.Mock(), filepath=mock_config_file)
+        assert config.tool_profile_import is False
+
+        config_file = tmp_path / "profiled.ini"
+        config_file.write_text(sample_config_content + "profile_import = yes\n")
+        config = ConfigBOT(bot_name="test_bot", logger=mock.Mock(), filepath=config_file)
+        assert config.tool_profile_import is True
+
+    def test_channel_cache_ttl(self, tmp_path: Path, sample_config_content: str, mock_config_file: Path) -> None:
+        """Test channel_cache_ttl is unset by default and reads the [Discord.ChannelCache] ttl option."""
+        config = ConfigBOT(bot_name="test_bot", logger=mock.Mock(), filepath=mock_config_file)
+        assert config.channel_cache_ttl is None
+
+        config_file = tmp_path / "ttl.ini"
+        config_file.write_text(sample_config_content + "\n[Discord.ChannelCache]\nttl = 300\n")
+        config = ConfigBOT(bot_name="test_bot", logger=mock.Mock(), filepath=config_file)
+        assert config.channel_cache_ttl == 300.0
+        assert config.channel_negative_ttl == 30.0
+
+    def test_gateway_settings(self, tmp_path: Path, sample_config_content: str, mock_config_file: Path) -> None:
+        """Test gateway_settings defaults to auto and reads the [Discord.Gateway] section."""
+        config = ConfigBOT(bot_name="test_bot", logger=mock.Mock(), filepath=mock_config_file)
+        assert config.gateway_settings == GatewaySettings()
+        assert config.gateway_settings.needs_tools is True
+
+        config_file = tmp_path / "gateway.ini"
+        config_file.write_text(
+            sample_config_content
+            + "\n[Discord.Gateway]\nintents = [auto, Members]\nmember_cache = none\n"
+            + "chunk_guilds_at_startup = no\nmax_messages = 200\n",
+        )
+        config = ConfigBOT(bot_name="test_bot", logger=mock.Mock(), filepath=config_file)
+        assert config.gateway_settings == GatewaySettings(
+            intents=("auto", "members"),
+            member_cache=("none",),
+            chunk_guilds_at_startup=False,
+            max_messages=200,
+        )
+
+    def test_gateway_settings_invalid_max_messages(self, tmp_path: Path, sample_config_content: str) -> None:
+        """Test gateway_settings rejects a negative max_messages."""
+        config_file = tmp_path / "gateway.ini"
+        config_file.write_text(sample_config_content + "\n[Discord.Gateway]\nmax_messages = -1\n")
+        config = ConfigBOT(bot_name="test_bot", logger=mock.Mock(), filepath=config_file)
+
+        with pytest.raises(ValueError, match="max_messages"):
+            _ = config.gateway_settings
+
+    def test_log_queue(self, tmp_path: Path, sample_config_content: str, mock_config_file: Path) -> None:
+        """Test the log queue options default to 1000 / drop_oldest and read the [Discord.Log] section."""
+        config = ConfigBOT(bot_name="test_bot", logger=mock.Mock(), filepath=mock_config_file)
+        assert config.log_queue_size == 1000
+        assert config.log_overflow == "drop_oldest"
+        assert config.log_flight_recorder_to_channel is False
+
+        config_file = tmp_path / "log.ini"
+        config_file.write_text(
+            sample_config_content
+            + "\n[Discord.Log]\nqueue_size = 50\noverflow = Drop_Debug\nflight_recorder_to_channel = yes\n",
+        )
+        config = ConfigBOT(bot_name="test_bot", logger=mock.Mock(), filepath=config_file)
+        assert config.log_queue_size == 50
+        assert config.log_overflow == "drop_debug"
+        assert config.log_flight_recorder_to_channel is True
+
+    def test_log_overflow_invalid(self, tmp_path: Path, sample_config_content: str) -> None:
+        """Test log_overflow rejects unknown policies."""
+        config_file = tmp_path / "log.ini"
+        config_file.write_text(sample_config_content + "\n[Discord.Log]\noverflow = drop_newest\n")
+        config = ConfigBOT(bot_name="test_bot", logger=mock.Mock(), filepath=config_file)
+
+        with pytest.raises(ValueError, match="drop_newest"):
+            _ = config.log_overflow
+
+    def test_tool_loading_mode_invalid(self, tmp_path: Path, sample_config_content: str) -> None:
+        """Test tool_loading_mode rejects unknown modes."""
+        config_file = tmp_path / "test_bot.ini"
+        config_file.write_text(sample_config_content + "loading = sometimes\n")
+        config = ConfigBOT(bot_name="test_bot", logger=mock.Mock(), filepath=config_file)
+
+        with pytest.raises(ValueError, match="sometimes"):
+            _ = config.tool_loading_mode
 
     def test_get_default_channel_id_success(self) -> None:
         """Test get_default_channel_id with valid channel."""
@@ -432,6 +667,222 @@ class TestConfigBOT:
 class TestConfigArgs:
     """Test the ConfigArgs class."""
 
+    def test_snapshot(self, tmp_path: Path, sample_config_content: str, mock_api_config_content: str) -> None:
+        """Test that the snapshot is parsed once into immutable, typed values."""
+        (tmp_path / "test_bot.ini").write_text(sample_config_content)
+        (tmp_path / "API.ini").write_text(mock_api_config_content)
+        mock_logger = mock.Mock()
+        config = ConfigArgs(bot_name="test_bot", logger=mock_logger, config_dir=tmp_path)
+
+        snapshot = config.snapshot
+
+        assert snapshot is config.snapshot
+        assert snapshot.bot.name == "test_bot"
+        assert snapshot.bot.discord_token == "test_token_123"  # noqa: S105
+        assert snapshot.bot.dev_channel_id == 123456789
+        assert snapshot.bot.channels == {"general": 111111111, "announcements": 222222222}
+        assert snapshot.bot.channel_names[222222222] == "announcements"
+        assert snapshot.bot.tool.exclusions == ("tool1", "tool2", "tool3")
+        assert snapshot.bot.tool.loading_mode == "eager"
+        assert snapshot.get_api_token("OpenAI", "api_key") == "test_api_key_123"
+        with pytest.raises(ValueError, match="section=OpenAI, option=missing"):
+            snapshot.get_api_token("OpenAI", "missing")
+        with pytest.raises(AttributeError):
+            snapshot.bot.name = "changed"
+        with pytest.raises(TypeError):
+            snapshot.bot.channels["general"] = 0  # type: ignore[index]
+
+        # The exclusions are logged once, when the snapshot is built
+        excluded_logs = [call for call in mock_logger.info.call_args_list if "Excluded tools" in call.args[0]]
+        assert len(excluded_logs) == 1
+
+    def test_reload_swaps_snapshot_and_notifies(
+        self,
+        tmp_path: Path,
+        sample_config_content: str,
+        mock_api_config_content: str,
+    ) -> None:
+        """Test that reload swaps in a new snapshot and tells subscribers what changed."""
+        (tmp_path / "test_bot.ini").write_text(sample_config_content)
+        (tmp_path / "API.ini").write_text(mock_api_config_content)
+        config = ConfigArgs(bot_name="test_bot", logger=mock.Mock(), config_dir=tmp_path)
+        previous = config.snapshot
+        changes = []
+        unsubscribe = config.subscribe(changes.append)
+
+        assert config.reload() is None
+        (tmp_path / "test_bot.ini").write_text(sample_config_content.replace("222222222", "333333333"))
+        (tmp_path / "API.ini").write_text(mock_api_config_content.replace("test_api_key_123", "rotated"))
+        change = config.reload()
+
+        assert change is not None
+        assert change.changed == {"bot.channels", "bot.channel_names", "api_tokens.OpenAI"}
+        assert change.touches("api_tokens")
+        assert not change.touches("bot.tool")
+        assert changes == [change]
+        assert config.snapshot is change.current
+        assert config.snapshot.bot.channels["announcements"] == 333333333
+        assert config.snapshot.get_api_token("OpenAI", "api_key") == "rotated"
+        assert config.bot.get_channel_to_id_mapping()["announcements"] == 333333333
+        assert previous.bot.channels["announcements"] == 222222222
+
+        unsubscribe()
+        (tmp_path / "test_bot.ini").write_text(sample_config_content)
+        assert config.reload() is not None
+        assert len(changes) == 1
+
+    def test_readme_example(self, tmp_path: Path, mock_api_config_content: str) -> None:
+        """Test that the complete config example in the README, with its comments, can be parsed."""
+        readme = (Path(__file__).parent.parent / "README.md").read_text(encoding="utf-8")
+        example = readme.split("の完全版", 1)[1].split("```ini\n", 1)[1].split("```", 1)[0]
+        example = re.sub(r"YOUR_DEV_CHANNEL_ID|YOUR_LOG_CHANNEL_ID|CHANNEL_ID_\d", "123456789", example)
+        (tmp_path / "mybot.ini").write_text(example, encoding="utf-8")
+        (tmp_path / "API.ini").write_text(mock_api_config_content)
+        config = ConfigArgs(bot_name="mybot", logger=mock.Mock(), config_dir=tmp_path)
+
+        snapshot = config.snapshot
+
+        assert snapshot.bot.tool.exclusions == ("ToolName1", "ToolName2")
+        assert snapshot.bot.tool.inclusions == ("Echo*", "admin/*")
+        assert snapshot.bot.tool.import_workers == 8
+        assert snapshot.bot.tool.loading_mode == "lazy"
+        assert snapshot.bot.tool.hot_reload is True
+        assert snapshot.bot.tool.register_timeout == 30
+        assert snapshot.bot.tool.profile_import is True
+        assert snapshot.bot.config_hot_reload is True
+        assert snapshot.bot.channel_cache.ttl == 300
+        assert snapshot.bot.channel_cache.negative_ttl == 30
+        assert snapshot.bot.log.queue_size == 1000
+        assert snapshot.bot.log.overflow == "drop_oldest"
+        assert snapshot.bot.log.flight_recorder_to_channel is True
+        assert snapshot.bot.gateway == GatewaySettings()
+
+    def test_settings_cover_every_option(self, tmp_path: Path, sample_config_content: str) -> None:
+        """Test that every option of ConfigBOT is part of the snapshot, so reload sees every change."""
+        (tmp_path / "test_bot.ini").write_text(sample_config_content)
+        config = ConfigArgs(bot_name="test_bot", logger=mock.Mock(), config_dir=tmp_path)
+        snapshot_paths = {
+            "name": "name",
+            "description": "description",
+            "discord_token": "discord_token",
+            "tool_exclusion": "tool.exclusions",
+            "tool_inclusion": "tool.inclusions",
+            "tool_import_workers": "tool.import_workers",
+            "tool_prune_patterns": "tool.prune_patterns",
+            "tool_loading_mode": "tool.loading_mode",
+            "tool_register_timeout": "tool.register_timeout",
+            "tool_hot_reload": "tool.hot_reload",
+            "tool_profile_import": "tool.profile_import",
+            "config_hot_reload": "config_hot_reload",
+            "channel_cache_ttl": "channel_cache.ttl",
+            "channel_negative_ttl": "channel_cache.negative_ttl",
+            "log_queue_size": "log.queue_size",
+            "log_overflow": "log.overflow",
+            "log_flight_recorder_to_channel": "log.flight_recorder_to_channel",
+            "gateway_settings": "gateway",
+        }
+        # The section name of the channel list is set by the code, not read from the file
+        options = {name for name, value in vars(ConfigBOT).items() if isinstance(value, property)}
+
+        assert options - {"channel_list_section_name"} == snapshot_paths.keys()
+        settings = config.snapshot.bot
+        for option, path in snapshot_paths.items():
+            value = settings
+            for attribute in path.split("."):
+                value = getattr(value, attribute)
+            expected = getattr(config.bot, option)
+            assert value == (tuple(expected) if isinstance(expected, list) else expected), option
+
+    def test_reload_notifies_log_and_gateway_changes(self, tmp_path: Path, sample_config_content: str) -> None:
+        """Test that options added outside [Discord.Tool] are compared on reload."""
+        (tmp_path / "test_bot.ini").write_text(sample_config_content)
+        config = ConfigArgs(bot_name="test_bot", logger=mock.Mock(), config_dir=tmp_path)
+        _ = config.snapshot
+
+        (tmp_path / "test_bot.ini").write_text(
+            sample_config_content + "\n[Discord.Log]\noverflow = block\n\n[Discord.Gateway]\nintents = default\n",
+        )
+        change = config.reload()
+
+        assert change is not None
+        assert change.changed == {"bot.log", "bot.gateway"}
+        assert config.snapshot.bot.log.overflow == "block"
+        assert config.snapshot.bot.gateway.intents == ("default",)
+
+    def test_reload_keeps_pending_writes(self, tmp_path: Path, sample_config_content: str) -> None:
+        """Test that reload writes pending set_value changes first and keeps write-behind enabled."""
+        config_file = tmp_path / "test_bot.ini"
+        config_file.write_text(sample_config_content)
+        config = ConfigArgs(bot_name="test_bot", logger=mock.Mock(), config_dir=tmp_path)
+        _ = config.snapshot
+        config.bot.enable_write_behind(debounce=60)
+        config.bot.set_value(section="Discord.Bot", option="description", value="changed at runtime")
+
+        change = config.reload()
+
+        assert change is not None
+        assert change.changed == {"bot.description"}
+        assert "changed at runtime" in config_file.read_text()
+        assert config.bot.description == "changed at runtime"
+
+        config.bot.set_value(section="Discord.Bot", option="description", value="changed again")
+        assert config.bot.has_pending_writes is True
+        config.bot.close()
+        assert "changed again" in config_file.read_text()
+
+    def test_snapshot_and_reload_with_minimal_file(self, tmp_path: Path, sample_config_content: str) -> None:
+        """Test that a file without a [Discord.Tool] section can be parsed and reloaded."""
+        minimal = sample_config_content.partition("[Discord.Tool]")[0]
+        (tmp_path / "test_bot.ini").write_text(minimal)
+        config = ConfigArgs(bot_name="test_bot", logger=mock.Mock(), config_dir=tmp_path)
+
+        snapshot = config.snapshot
+
+        assert snapshot.bot.tool.exclusions == ()
+        assert snapshot.bot.tool.inclusions is None
+        assert snapshot.bot.tool.loading_mode == "eager"
+
+        (tmp_path / "test_bot.ini").write_text(minimal.replace("test_bot\n", "renamed_bot\n", 1))
+        change = config.reload()
+
+        assert change is not None
+        assert change.changed == {"bot.name"}
+        assert config.snapshot.bot.tool.exclusions == ()
+
+    def test_reload_keeps_previous_snapshot_on_error(self, tmp_path: Path, sample_config_content: str) -> None:
+        """Test that a broken config file does not replace the current values."""
+        (tmp_path / "test_bot.ini").write_text(sample_config_content)
+        mock_logger = mock.Mock()
+        config = ConfigArgs(bot_name="test_bot", logger=mock_logger, config_dir=tmp_path)
+        previous = config.snapshot
+
+        (tmp_path / "test_bot.ini").write_text(sample_config_content + "loading = sometimes\n")
+
+        assert config.reload() is None
+        assert config.snapshot is previous
+        mock_logger.exception.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_start_watching_notifies_on_the_event_loop(self, tmp_path: Path, sample_config_content: str) -> None:
+        """Test that a file change is parsed off the loop and delivered on the loop."""
+        (tmp_path / "test_bot.ini").write_text(sample_config_content)
+        config = ConfigArgs(bot_name="test_bot", logger=mock.Mock(), config_dir=tmp_path)
+        loop = asyncio.get_running_loop()
+        received: asyncio.Future[tuple[object, asyncio.AbstractEventLoop]] = loop.create_future()
+        config.subscribe(lambda change: received.set_result((change, asyncio.get_running_loop())))
+
+        config.start_watching(backend="polling", poll_interval=0.01, debounce=0.01)
+        try:
+            await asyncio.sleep(0.05)
+            (tmp_path / "test_bot.ini").write_text(sample_config_content.replace("test_bot\n", "renamed_bot\n", 1))
+            change, running_loop = await asyncio.wait_for(received, timeout=5)
+        finally:
+            config.stop_watching()
+
+        assert running_loop is loop
+        assert change.changed == {"bot.name"}
+        assert config.snapshot.bot.name == "renamed_bot"
+
     @mock.patch("concord.infrastructure.config.from_files.ConfigBOT")
     @mock.patch("concord.infrastructure.config.from_files.ConfigAPI")
     def test_init(self, mock_config_api: mock.Mock, mock_config_bot: mock.Mock) -> None:
@@ -451,6 +902,44 @@ class TestConfigArgs:
         mock_config_api.assert_called_once_with(logger=mock_logger, filepath=None)
         mock_config_bot.assert_called_once_with(bot_name="testbot", logger=mock_logger, filepath=None)
 
+    def test_load_config_from_uses_config_dir_and_cache(self, tmp_path: Path) -> None:
+        """Test that load_config_from reads the agent's config dir and reuses parsed configs."""
+        tool_file = tmp_path / "tool.ini"
+        tool_file.write_text("[tool]\nkey = first\n")
+        with (
+            mock.patch("concord.infrastructure.config.from_files.ConfigBOT"),
+            mock.patch("concord.infrastructure.config.from_files.ConfigAPI"),
+        ):
+            config = ConfigArgs(bot_name="testbot", logger=mock.Mock(), config_dir=tmp_path)
+
+        first = config.load_config_from(file_stem="tool")
+        assert first.filepath == tool_file.resolve()
+        assert first.get(section="tool", option="key") == "first"
+        assert config.load_config_from(file_stem="tool") is first
+
+        tool_file.write_text("[tool]\nkey = second, longer\n")
+        second = config.load_config_from(file_stem="tool")
+        assert second is not first
+        assert second.get(section="tool", option="key") == "second, longer"
+
+        stats = config.registry.stats()
+        assert (stats.hits, stats.misses, stats.invalidations, stats.size) == (1, 2, 1, 1)
+
+    def test_registry_evicts_least_recently_used(self, tmp_path: Path) -> None:
+        """Test that the registry drops the least recently used config beyond its size."""
+        for name in ("a", "b", "c"):
+            (tmp_path / f"{name}.ini").write_text(f"[{name}]\n")
+        registry = ConfigRegistry(config_dir=tmp_path, logger=mock.Mock(), max_entries=2)
+
+        a = registry.get("a")
+        registry.get("b")
+        assert registry.get("a") is a
+        registry.get("c")
+
+        assert registry.get("a") is a
+        assert registry.stats().evictions == 1
+        assert registry.stats().misses == 3
+
     @mock.patch("concord.infrastructure.config.from_files.BaseConfigArgs")
     def test_load_config_from(self, mock_base_config: mock.Mock) -> None:
         """Test load_config_from method."""
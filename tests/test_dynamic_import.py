@@ -2,19 +2,23 @@
 
 # mypy: ignore-errors
 
+import zipimport
 from pathlib import Path
 from typing import TYPE_CHECKING
 from unittest import mock
 
-from pyresults import Ok
+import pytest
+from pyresults import Err, Ok
 
-# import pytest
-# from src.concord.src.core.exceptions.import_module import ImportModuleError
+from concord.exception.import_module import ImportModuleError
 from concord.infrastructure.discord.dynamic_import import (
+    ToolModuleCache,
     _import_module,  # type: ignore[reportPrivateUsage]
     _process_class,  # type: ignore[reportPrivateUsage]
+    import_classes_from_bundle,
     import_classes_from_directory,
 )
+from concord.infrastructure.discord.tool_bundle import build_tool_bundle
 
 if TYPE_CHECKING:
     from discord.ext.commands import Cog
@@ -211,12 +215,14 @@ class TestImportModule:
 class TestImportClassesFromDirectory:
     """Test the import_classes_from_directory function."""
 
+    @mock.patch("concord.infrastructure.discord.dynamic_import.find_tool_files")
     @mock.patch("concord.infrastructure.discord.dynamic_import.Path")
     @mock.patch("concord.infrastructure.discord.dynamic_import._import_module")
     def test_import_classes_from_directory_success(
         self,
         mock_import_module: mock.Mock,
         mock_path: mock.Mock,
+        mock_find_tool_files: mock.Mock,
     ) -> None:
         """Test successful directory import."""
         # Setup mocks
@@ -233,7 +239,7 @@ class TestImportClassesFromDirectory:
         mock_directory.is_dir.return_value = True
         mock_directory.exists.return_value = True
         mock_directory.resolve.return_value = mock_directory
-        mock_directory.glob.return_value = [mock_file1, mock_file2]
+        mock_find_tool_files.return_value = [mock_file1, mock_file2]
 
         mock_path.return_value = mock_directory
 
@@ -254,12 +260,14 @@ class TestImportClassesFromDirectory:
         assert len(result) == 2  # type: ignore[reportUnknownVariableType]
         assert all(loaded_class.class_type == MockChildClass for loaded_class in result)  # type: ignore[reportUnknownVariableType]
 
+    @mock.patch("concord.infrastructure.discord.dynamic_import.find_tool_files")
     @mock.patch("concord.infrastructure.discord.dynamic_import.Path")
     @mock.patch("concord.infrastructure.discord.dynamic_import._import_module")
     def test_import_classes_with_include_name_filter(
         self,
         mock_import_module: mock.Mock,
         mock_path: mock.Mock,
+        mock_find_tool_files: mock.Mock,
     ) -> None:
         """Test directory import with include_name filter."""
         mock_file1 = mock.Mock()
@@ -275,7 +283,10 @@ class TestImportClassesFromDirectory:
         mock_directory.is_dir.return_value = True
         mock_directory.exists.return_value = True
         mock_directory.resolve.return_value = mock_directory
-        mock_directory.glob.return_value = [mock_file1, mock_file2]
+        # ファイル名での絞り込みは find_tool_files が行う
+        mock_find_tool_files.side_effect = lambda _, include_name, **__: [
+            f for f in [mock_file1, mock_file2] if f.name in include_name
+        ]
 
         mock_path.return_value = mock_directory
 
@@ -290,6 +301,7 @@ class TestImportClassesFromDirectory:
 
         assert len(result) == 1  # type: ignore[reportUnknownVariableType]
         assert mock_import_module.call_count == 1
+        assert mock_find_tool_files.call_args.kwargs["include_name"] == ["included.py"]
 
     # @mock.patch("src.concord.src.core.utils.dynamic_import.Path")
     # @mock.patch("src.concord.src.core.utils.dynamic_import._import_module")
@@ -317,15 +329,16 @@ class TestImportClassesFromDirectory:
     #
     #     assert "Import failed" in str(exc_info.value)
 
+    @mock.patch("concord.infrastructure.discord.dynamic_import.find_tool_files")
     @mock.patch("concord.infrastructure.discord.dynamic_import.Path")
-    def test_import_classes_empty_directory(self, mock_path: mock.Mock) -> None:
+    def test_import_classes_empty_directory(self, mock_path: mock.Mock, mock_find_tool_files: mock.Mock) -> None:
         """Test directory import with empty directory."""
         mock_directory = mock.Mock()
         mock_directory.name = "empty_dir"
         mock_directory.is_dir.return_value = True
         mock_directory.exists.return_value = True
         mock_directory.resolve.return_value = mock_directory
-        mock_directory.glob.return_value = []
+        mock_find_tool_files.return_value = []
 
         mock_path.return_value = mock_directory
 
@@ -333,12 +346,14 @@ class TestImportClassesFromDirectory:
 
         assert result == []
 
+    @mock.patch("concord.infrastructure.discord.dynamic_import.find_tool_files")
     @mock.patch("concord.infrastructure.discord.dynamic_import.Path")
     @mock.patch("concord.infrastructure.discord.dynamic_import._import_module")
     def test_import_classes_no_base_class(
         self,
         mock_import_module: mock.Mock,
         mock_path: mock.Mock,
+        mock_find_tool_files: mock.Mock,
     ) -> None:
         """Test directory import without base class filter."""
         mock_file = mock.Mock()
@@ -350,7 +365,7 @@ class TestImportClassesFromDirectory:
         mock_directory.is_dir.return_value = True
         mock_directory.exists.return_value = True
         mock_directory.resolve.return_value = mock_directory
-        mock_directory.glob.return_value = [mock_file]
+        mock_find_tool_files.return_value = [mock_file]
 
         mock_path.return_value = mock_directory
         mock_import_module.return_value = Ok(
@@ -368,3 +383,158 @@ class TestImportClassesFromDirectory:
         )  # type: ignore[reportPrivateUsage]
 
         assert len(result) == 2  # type: ignore[reportPrivateUsage]
+
+
+class TestImportClassesInParallel:
+    """Test the parallel mode of import_classes_from_directory."""
+
+    def _write_tools(self, root: Path, count: int) -> None:
+        for i in range(count):
+            tool_dir = root / f"tool{i:02d}"
+            tool_dir.mkdir()
+            (tool_dir / "__tool__.py").write_text(f"class Tool{i:02d}:\n    pass\n")
+            (tool_dir / "helper.py").write_text("VALUE = 1\n")
+
+    def test_parallel_matches_serial_order(self, tmp_path: Path) -> None:
+        """Test that parallel import returns the same classes in the same order as serial import."""
+        self._write_tools(tmp_path, 12)
+
+        serial = import_classes_from_directory(tmp_path.as_posix(), ["__tool__.py"], None, None, max_workers=1)
+        parallel = import_classes_from_directory(tmp_path.as_posix(), ["__tool__.py"], None, None, max_workers=4)
+
+        assert [c.class_type.__name__ for c in serial] == [f"Tool{i:02d}" for i in range(12)]
+        assert [c.class_type.__name__ for c in parallel] == [c.class_type.__name__ for c in serial]
+
+    @mock.patch("concord.infrastructure.discord.dynamic_import.find_tool_files")
+    @mock.patch("concord.infrastructure.discord.dynamic_import.Path")
+    @mock.patch("concord.infrastructure.discord.dynamic_import._import_module")
+    def test_parallel_reports_every_failed_file(
+        self,
+        mock_import_module: mock.Mock,
+        mock_path: mock.Mock,
+        mock_find_tool_files: mock.Mock,
+    ) -> None:
+        """Test that errors of all failed files are reported together."""
+        mock_files = []
+        for name in ["a.py", "b.py", "c.py"]:
+            mock_file = mock.Mock()
+            mock_file.name = name
+            mock_files.append(mock_file)
+
+        mock_directory = mock.Mock()
+        mock_directory.is_dir.return_value = True
+        mock_directory.exists.return_value = True
+        mock_directory.resolve.return_value = mock_directory
+        mock_find_tool_files.return_value = mock_files
+        mock_path.return_value = mock_directory
+
+        mock_import_module.side_effect = lambda path, *_: (
+            Ok([("b", MockChildClass)]) if path.name == "b.py" else Err(f"Error importing {path.name}")
+        )
+
+        with pytest.raises(ImportModuleError) as exc_info:
+            import_classes_from_directory("/test/path", None, MockBaseClass, None, max_workers=3)  # type: ignore[reportArgumentType]
+
+        assert "Error importing a.py" in str(exc_info.value)
+        assert "Error importing c.py" in str(exc_info.value)
+        assert mock_import_module.call_count == 3
+
+
+class TestImportClassesFromBundle:
+    """Test the import_classes_from_bundle function."""
+
+    @pytest.mark.parametrize("compile_bytecode", [False, True])
+    def test_bundle_matches_directory(self, tmp_path: Path, compile_bytecode: bool) -> None:  # noqa: FBT001
+        """Test that a bundle yields the same classes, in the same order, as its source directory."""
+        root = tmp_path / "tools"
+        for i in range(3):
+            tool_dir = root / f"tool{i}"
+            tool_dir.mkdir(parents=True)
+            (tool_dir / "__tool__.py").write_text(f"class Tool{i}:\n    pass\n")
+        bundle_path = tmp_path / "tools.zip"
+        build_tool_bundle(root, bundle_path, ["__tool__.py"], compile_bytecode=compile_bytecode)
+
+        from_directory = import_classes_from_directory(root.as_posix(), ["__tool__.py"])
+        from_bundle = import_classes_from_bundle(bundle_path)
+
+        assert [tool.class_type.__name__ for tool in from_bundle] == [
+            tool.class_type.__name__ for tool in from_directory
+        ]
+        assert from_bundle[0].module_path == bundle_path.resolve() / "tool0" / "__tool__.py"
+
+    def test_bundle_opens_archive_once(self, tmp_path: Path) -> None:
+        """Test that one zipimporter is built per bundle and reused for every tool directory."""
+        root = tmp_path / "tools"
+        for relative in ("echo", "ping", "admin/kick"):
+            tool_dir = root / relative
+            tool_dir.mkdir(parents=True)
+            name = relative.replace("/", "_").title()
+            (tool_dir / "__tool__.py").write_text(f"class {name}:\n    pass\n")
+        bundle_path = tmp_path / "tools.zip"
+        build_tool_bundle(root, bundle_path, ["__tool__.py"], compile_bytecode=True)
+
+        with mock.patch(
+            "concord.infrastructure.discord.dynamic_import.zipimport.zipimporter",
+            wraps=zipimport.zipimporter,
+        ) as mock_zipimporter:
+            from_bundle = import_classes_from_bundle(bundle_path)
+
+        mock_zipimporter.assert_called_once_with(str(bundle_path.resolve()))
+        assert sorted(tool.class_type.__name__ for tool in from_bundle) == ["Admin_Kick", "Echo", "Ping"]
+
+    def test_bundle_reports_every_failed_file(self, tmp_path: Path) -> None:
+        """Test that import errors inside a bundle are aggregated like directory imports."""
+        root = tmp_path / "tools"
+        for name, source in [("good", "class Good:\n    pass\n"), ("bad", "raise RuntimeError('boom')\n")]:
+            (root / name).mkdir(parents=True)
+            (root / name / "__tool__.py").write_text(source)
+        bundle_path = tmp_path / "tools.zip"
+        build_tool_bundle(root, bundle_path, ["__tool__.py"])
+
+        with pytest.raises(ImportModuleError, match="boom"):
+            import_classes_from_bundle(bundle_path)
+
+
+class TestToolModuleCache:
+    """Test sharing imported tool modules between bots."""
+
+    def _write_tool(self, root: Path) -> Path:
+        tool_dir = root / "tool"
+        tool_dir.mkdir(parents=True)
+        tool_path = tool_dir / "__tool__.py"
+        tool_path.write_text("class Tool:\n    pass\n")
+        return tool_path
+
+    def test_second_bot_reuses_module(self, tmp_path: Path) -> None:
+        """Test that importing the same directory twice reuses the first class objects."""
+        self._write_tool(tmp_path)
+        cache = ToolModuleCache()
+
+        first = import_classes_from_directory(tmp_path.as_posix(), ["__tool__.py"], module_cache=cache)
+        second = import_classes_from_directory(tmp_path.as_posix(), ["__tool__.py"], module_cache=cache)
+
+        assert first[0].class_type is second[0].class_type
+        assert (cache.misses, cache.hits, len(cache)) == (1, 1, 1)
+
+    def test_changed_file_is_imported_again(self, tmp_path: Path) -> None:
+        """Test that a modified file is not served from the cache."""
+        tool_path = self._write_tool(tmp_path)
+        cache = ToolModuleCache()
+
+        first = import_classes_from_directory(tmp_path.as_posix(), ["__tool__.py"], module_cache=cache)
+        tool_path.write_text("class Tool:\n    VALUE = 1\n")
+        second = import_classes_from_directory(tmp_path.as_posix(), ["__tool__.py"], module_cache=cache)
+
+        assert first[0].class_type is not second[0].class_type
+        assert cache.misses == 2
+
+    def test_failed_import_is_not_cached(self, tmp_path: Path) -> None:
+        """Test that errors are returned but never stored."""
+        cache = ToolModuleCache()
+        load = mock.Mock(return_value=Err("boom"))
+
+        for _ in range(2):
+            assert cache.get_or_import(tmp_path, tmp_path, None, load).is_err()
+
+        assert load.call_count == 2
+        assert len(cache) == 0
@@ -0,0 +1,91 @@
+"""Tests for the file watcher used by hot reload."""
+
+import sys
+import threading
+import time
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from concord.infrastructure.discord.file_watcher import FileWatcher
+
+
+def wait_for_changes(
+    tool_path: Path,
+    backend: str,
+    *,
+    replace: bool = False,
+) -> tuple[list[list[Path]], str | None]:
+    """Start a watcher, modify tool_path and return the reported batches."""
+    batches: list[list[Path]] = []
+    reported = threading.Event()
+
+    def callback(file_paths: list[Path], detected_at: float) -> None:
+        assert detected_at <= time.perf_counter()
+        batches.append(file_paths)
+        reported.set()
+
+    watcher = FileWatcher(
+        file_paths=[tool_path],
+        callback=callback,
+        logger=mock.Mock(),
+        backend=backend,  # type: ignore[arg-type]
+        poll_interval=0.05,
+        debounce=0.05,
+    )
+    watcher.start()
+    try:
+        time.sleep(0.1)
+        if replace:
+            tmp_path = tool_path.with_suffix(".tmp")
+            tmp_path.write_text("VALUE = 2\n", encoding="utf-8")
+            tmp_path.replace(tool_path)
+        else:
+            tool_path.write_text("VALUE = 20\n", encoding="utf-8")
+        reported.wait(timeout=5)
+        return batches, watcher.backend
+    finally:
+        watcher.stop()
+
+
+class TestFileWatcher:
+    """Test the FileWatcher class."""
+
+    def test_polling_detects_write(self, tmp_path: Path) -> None:
+        """Test that the polling backend reports a modified file once."""
+        tool_path = tmp_path / "__tool__.py"
+        tool_path.write_text("VALUE = 1\n", encoding="utf-8")
+
+        batches, backend = wait_for_changes(tool_path, "polling")
+
+        assert backend == "polling"
+        assert batches == [[tool_path.resolve()]]
+
+    @pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is only available on Linux")
+    @pytest.mark.parametrize("replace", [False, True])
+    def test_inotify_detects_write_and_rename(self, tmp_path: Path, replace: bool) -> None:  # noqa: FBT001
+        """Test that the inotify backend reports in-place writes and atomic replaces."""
+        tool_path = tmp_path / "__tool__.py"
+        tool_path.write_text("VALUE = 1\n", encoding="utf-8")
+
+        batches, backend = wait_for_changes(tool_path, "inotify", replace=replace)
+
+        assert backend == "inotify"
+        assert batches == [[tool_path.resolve()]]
+
+    def test_unwatched_files_are_ignored(self, tmp_path: Path) -> None:
+        """Test that changes to other files in the same directory are not reported."""
+        tool_path = tmp_path / "__tool__.py"
+        tool_path.write_text("VALUE = 1\n", encoding="utf-8")
+        callback = mock.Mock()
+        watcher = FileWatcher(file_paths=[tool_path], callback=callback, logger=mock.Mock(), poll_interval=0.05)
+        watcher.start()
+        try:
+            (tmp_path / "helper.py").write_text("VALUE = 1\n", encoding="utf-8")
+            time.sleep(0.3)
+        finally:
+            watcher.stop()
+
+        callback.assert_not_called()
+        assert watcher.is_running is False
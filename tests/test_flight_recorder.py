@@ -0,0 +1,93 @@
+"""Tests for the flight recorder log handler."""
+
+# mypy: ignore-errors
+
+import logging
+from unittest import mock
+
+import pytest
+
+from concord.infrastructure.logging.flight_recorder import REPLAYED_ATTRIBUTE, FlightRecorderHandler
+
+
+class _ListHandler(logging.Handler):
+    def __init__(self, level: int = logging.NOTSET) -> None:
+        super().__init__(level=level)
+        self.lines: list[str] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.lines.append(self.format(record))
+
+
+def _record(level: int, msg: str, *args: object) -> logging.LogRecord:
+    return logging.LogRecord("bot", level, __file__, 1, msg, args, None)
+
+
+class TestFlightRecorderHandler:
+    """Test the FlightRecorderHandler class."""
+
+    def test_keeps_last_records_until_error(self) -> None:
+        """Test that only the last records are kept and dumped with the error, then cleared."""
+        target = _ListHandler()
+        recorder = FlightRecorderHandler(3, target)
+
+        for index in range(5):
+            recorder.handle(_record(logging.DEBUG, "step %d", index))
+        assert target.lines == []
+        assert recorder.pending == 3
+
+        recorder.handle(_record(logging.ERROR, "boom"))
+
+        assert target.lines == ["step 2", "step 3", "step 4", "boom"]
+        assert recorder.pending == 0
+        assert recorder.dumps == 1
+
+    def test_formats_only_dumped_records(self) -> None:
+        """Test that records dropped from the ring buffer are never formatted."""
+        argument = mock.Mock()
+        argument.__str__ = mock.Mock(return_value="value")
+        recorder = FlightRecorderHandler(1, _ListHandler())
+
+        recorder.handle(_record(logging.DEBUG, "dropped %s", argument))
+        recorder.handle(_record(logging.DEBUG, "kept"))
+        assert argument.__str__.call_count == 0
+
+        recorder.handle(_record(logging.CRITICAL, "boom"))
+        assert argument.__str__.call_count == 0
+
+    def test_dumps_to_added_target_only_what_it_filtered_out(self) -> None:
+        """Test that an added target, like the log channel handler, only receives the records below its level."""
+        file_target = _ListHandler()
+        channel_target = _ListHandler(level=logging.INFO)
+        recorder = FlightRecorderHandler(10, file_target)
+        recorder.add_target(channel_target)
+        recorder.add_target(channel_target)
+
+        recorder.handle(_record(logging.DEBUG, "context"))
+        recorder.handle(_record(logging.ERROR, "boom"))
+        recorder.remove_target(channel_target)
+        recorder.handle(_record(logging.ERROR, "again"))
+
+        # The channel handler is on the logger too, so it already received "boom" itself
+        assert channel_target.lines == ["context"]
+        assert file_target.lines == ["context", "boom", "again"]
+
+    def test_buffers_only_below_buffer_level(self) -> None:
+        """Test that records which are written anyway are not kept, and replayed records are marked."""
+        target = _ListHandler()
+        recorder = FlightRecorderHandler(10, target)
+        debug = _record(logging.DEBUG, "trace")
+
+        recorder.handle(debug)
+        recorder.handle(_record(logging.INFO, "served"))
+        recorder.handle(_record(logging.WARNING, "slow"))
+        assert recorder.pending == 1
+
+        recorder.handle(_record(logging.ERROR, "boom"))
+        assert target.lines == ["trace", "boom"]
+        assert getattr(debug, REPLAYED_ATTRIBUTE) is True
+
+    def test_invalid_capacity(self) -> None:
+        """Test that a recorder without room is rejected."""
+        with pytest.raises(ValueError, match="capacity"):
+            FlightRecorderHandler(0, _ListHandler())
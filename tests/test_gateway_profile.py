@@ -0,0 +1,169 @@
+"""Tests for the gateway profile (intents and caches) resolution."""
+
+# mypy: ignore-errors
+
+from pathlib import Path
+
+import pytest
+from discord import Intents
+from discord.ext import commands
+
+from concord.infrastructure.discord.gateway_profile import (
+    BASE_REQUIREMENTS,
+    apply_gateway_profile,
+    requirements_from_cog_class,
+    requirements_from_discovered,
+    resolve_gateway_profile,
+    tool_requirements,
+)
+from concord.model.discovered_tool import DiscoveredCog, DiscoveredCommand, DiscoveredListener
+from concord.model.gateway_profile import GatewayProfile, GatewayRequirements, GatewaySettings
+from concord.model.import_class import LoadedClass
+from concord.model.startup import PreparedTools
+
+
+class Greeter(commands.Cog):
+    """Cog that welcomes members and declares the member cache it needs."""
+
+    gateway_requirements = GatewayRequirements(member_cache=("joined",))
+
+    @commands.Cog.listener()
+    async def on_member_join(self, member: object) -> None:
+        pass
+
+
+class Editor(commands.Cog):
+    """Cog with a prefix command and a listener that needs the message cache."""
+
+    @commands.hybrid_command()
+    async def hello(self, ctx: commands.Context) -> None:
+        pass
+
+    @commands.Cog.listener()
+    async def on_message_edit(self, before: object, after: object) -> None:
+        pass
+
+
+class Quiet(commands.Cog):
+    """Cog that only listens to events covered by the guilds intent."""
+
+    @commands.Cog.listener()
+    async def on_guild_join(self, guild: object) -> None:
+        pass
+
+
+class TestRequirements:
+    """Test inferring requirements from tools."""
+
+    def test_from_cog_class(self) -> None:
+        """Test that listeners, commands and the declaration are combined."""
+        assert requirements_from_cog_class(Greeter) == GatewayRequirements(
+            intents=("members",),
+            member_cache=("joined",),
+        )
+        requirements = requirements_from_cog_class(Editor)
+        assert set(requirements.intents) == {"guild_messages", "dm_messages", "message_content"}
+        assert requirements.max_messages == 1000
+        assert requirements_from_cog_class(Quiet) == GatewayRequirements()
+
+    def test_from_discovered(self) -> None:
+        """Test that statically discovered cogs are inferred from their listeners and commands."""
+        cog = DiscoveredCog(
+            name="Lazy",
+            module_path=Path("/test/tools/lazy.py"),
+            lineno=1,
+            commands=(DiscoveredCommand(name="ping", function_name="ping", decorator="commands.command"),),
+            listeners=(DiscoveredListener(event="on_voice_state_update", function_name="moved"),),
+        )
+        requirements = requirements_from_discovered(cog)
+        assert "voice_states" in requirements.intents
+        assert "message_content" in requirements.intents
+        assert requirements.member_cache == ("voice",)
+
+    def test_tool_requirements_includes_base(self) -> None:
+        """Test that the bot's own requirements are always included."""
+        prepared = PreparedTools(classes=(LoadedClass(name="Greeter", class_type=Greeter),))
+        requirements = tool_requirements(prepared)
+        assert requirements.intents == ("guilds", "members")
+        assert tool_requirements(PreparedTools(classes=())) == BASE_REQUIREMENTS
+
+
+class TestResolveGatewayProfile:
+    """Test resolving the profile from settings and requirements."""
+
+    def test_auto_uses_requirements(self) -> None:
+        """Test that auto enables only what the tools need."""
+        requirements = BASE_REQUIREMENTS.merge(requirements_from_cog_class(Greeter))
+        profile = resolve_gateway_profile(GatewaySettings(), requirements)
+        assert profile == GatewayProfile(
+            intents=("guilds", "members"),
+            member_cache=("joined",),
+            chunk_guilds_at_startup=False,
+            max_messages=None,
+        )
+
+    def test_overrides(self) -> None:
+        """Test that explicit settings replace or extend the inferred values."""
+        settings = GatewaySettings(
+            intents=("auto", "presences", "members"),
+            member_cache=("all",),
+            chunk_guilds_at_startup=True,
+            max_messages=50,
+        )
+        profile = resolve_gateway_profile(settings, BASE_REQUIREMENTS)
+        assert profile.intents == ("guilds", "members", "presences")
+        assert profile.member_cache == ("joined",)
+        assert profile.chunk_guilds_at_startup is True
+        assert profile.max_messages == 50
+
+        profile = resolve_gateway_profile(GatewaySettings(intents=("all",), max_messages=0), BASE_REQUIREMENTS)
+        assert profile.intents == tuple(name for name, _ in Intents.all())
+        assert profile.max_messages is None
+
+    @pytest.mark.parametrize(
+        ("settings", "match"),
+        [
+            (GatewaySettings(intents=("guilds", "membrs")), "membrs"),
+            (GatewaySettings(intents=("guilds",), member_cache=("joined",)), "members"),
+            (GatewaySettings(intents=("guilds",), member_cache=("voice",)), "voice_states"),
+            (GatewaySettings(intents=("guilds",), chunk_guilds_at_startup=True), "members"),
+        ],
+    )
+    def test_invalid(self, settings: GatewaySettings, match: str) -> None:
+        """Test that unknown names and unusable combinations are rejected."""
+        with pytest.raises(ValueError, match=match):
+            resolve_gateway_profile(settings, BASE_REQUIREMENTS)
+
+
+class TestApplyGatewayProfile:
+    """Test applying a profile to a bot that has not connected yet."""
+
+    def test_apply(self) -> None:
+        """Test that the connection state is rebuilt with the profile."""
+        bot = commands.Bot(command_prefix="/", intents=Intents.all())
+        state = bot._connection  # noqa: SLF001
+
+        apply_gateway_profile(
+            bot,
+            GatewayProfile(intents=("guilds",), member_cache=(), chunk_guilds_at_startup=False, max_messages=None),
+        )
+        assert bot.intents == Intents(guilds=True)
+        assert state.member_cache_flags.value == 0
+        assert state._chunk_guilds is False  # noqa: SLF001
+        assert state._messages is None  # noqa: SLF001
+        assert state.store_user == state.store_user_no_intents
+
+        apply_gateway_profile(
+            bot,
+            GatewayProfile(
+                intents=("guilds", "members"),
+                member_cache=("joined",),
+                chunk_guilds_at_startup=True,
+                max_messages=10,
+            ),
+        )
+        assert bot.intents == Intents(guilds=True, members=True)
+        assert state.member_cache_flags.joined is True
+        assert state._chunk_guilds is True  # noqa: SLF001
+        assert state._messages.maxlen == 10  # noqa: SLF001
+        assert state.store_user != state.store_user_no_intents
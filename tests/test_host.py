@@ -0,0 +1,116 @@
+"""Tests for AgentHost class."""
+
+# mypy: ignore-errors
+
+import asyncio
+from collections.abc import Iterator
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from concord.infrastructure.discord.host import AgentHost, SharedConnector
+from concord.model.argument import Args
+from concord.model.host import BotMemory
+
+
+def _make_agent(args: Args, **kwargs: object) -> mock.Mock:
+    agent = mock.Mock()
+    agent.bot_name = args.bot_name
+    agent.import_memory_bytes = 2048
+    agent.kwargs = kwargs
+    agent.run = mock.AsyncMock()
+
+    def start_preparing_tools(*, after: asyncio.Task | None = None) -> asyncio.Task:
+        async def prepare() -> None:
+            if after is not None:
+                await after
+
+        return asyncio.get_running_loop().create_task(prepare())
+
+    agent.start_preparing_tools = mock.Mock(side_effect=start_preparing_tools)
+    return agent
+
+
+@pytest.fixture
+def mock_agent_class() -> Iterator[mock.Mock]:
+    with mock.patch("concord.infrastructure.discord.host.Agent") as agent_class:
+        agent_class.side_effect = lambda _, args, **kwargs: _make_agent(args, **kwargs)
+        yield agent_class
+
+
+@pytest.fixture
+def bots() -> list[Args]:
+    return [Args(bot_name=name, tool_directory_paths=[Path("/test/tools")], is_debug=False) for name in ("a", "b")]
+
+
+class TestBotMemory:
+    """Test the BotMemory dataclass."""
+
+    def test_total_bytes(self) -> None:
+        """Test that total_bytes adds the import only once it is measured."""
+        assert BotMemory(bot_name="a", construct_bytes=10).total_bytes == 10
+        assert BotMemory(bot_name="a", construct_bytes=10, import_bytes=5).total_bytes == 15
+
+
+class TestAgentHost:
+    """Test the AgentHost class."""
+
+    @mock.patch("concord.infrastructure.discord.host.get_logger", mock.Mock())
+    @mock.patch("concord.infrastructure.discord.host.current_rss_bytes", mock.Mock(side_effect=[0, 100, 100, 150]))
+    def test_create_agents_shares_resources(self, mock_agent_class: mock.Mock, bots: list[Args]) -> None:
+        """Test that every agent gets the same module cache, executor and connector."""
+        host = AgentHost(bots, Path("/test/utils"))
+        executor = mock.Mock()
+        connector = mock.Mock()
+
+        agents = host.create_agents(executor=executor, connector=connector)
+
+        assert [agent.bot_name for agent in agents] == ["a", "b"]
+        assert mock_agent_class.call_count == 2
+        for agent in agents:
+            assert agent.kwargs["module_cache"] is host.module_cache
+            assert agent.kwargs["executor"] is executor
+            assert agent.kwargs["connector"] is connector
+        assert host.memory() == (
+            BotMemory(bot_name="a", construct_bytes=100, import_bytes=2048),
+            BotMemory(bot_name="b", construct_bytes=50, import_bytes=2048),
+        )
+
+    @pytest.mark.asyncio
+    @pytest.mark.usefixtures("mock_agent_class")
+    @mock.patch("concord.infrastructure.discord.host.current_rss_bytes", mock.Mock(return_value=0))
+    @mock.patch("concord.infrastructure.discord.host.get_logger")
+    async def test_run_chains_imports_and_survives_failure(self, mock_get_logger: mock.Mock, bots: list[Args]) -> None:
+        """Test that imports are chained in order and one failing bot does not stop the others."""
+        host = AgentHost(bots)
+
+        with mock.patch.object(SharedConnector, "close_shared", new_callable=mock.AsyncMock) as mock_close_shared:
+            original_create_agents = host.create_agents
+
+            def create_agents(**kwargs: object) -> list[mock.Mock]:
+                agents = original_create_agents(**kwargs)
+                agents[0].run.side_effect = RuntimeError("boom")
+                return agents
+
+            with mock.patch.object(host, "create_agents", side_effect=create_agents):
+                await host.run()
+
+        first, second = host.agents
+        first.start_preparing_tools.assert_called_once_with(after=None)
+        assert second.start_preparing_tools.call_args.kwargs["after"] is not None
+        first.run.assert_awaited_once()
+        second.run.assert_awaited_once()
+        mock_get_logger.return_value.exception.assert_called_once()
+        mock_close_shared.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_shared_connector_survives_close(self) -> None:
+        """Test that close() from one bot does not close the shared connector."""
+        connector = SharedConnector()
+
+        await connector.close()
+        assert connector.closed is False
+
+        await connector.close_shared()
+        assert connector.closed is True
@@ -0,0 +1,143 @@
+"""Tests for hot reload of tool files."""
+
+from pathlib import Path
+from unittest import mock
+
+import pytest
+from discord.ext.commands import Bot
+
+from concord.infrastructure.discord.hot_reload import ToolReloader
+from concord.infrastructure.discord.tool_filter import ToolFilter
+
+TOOL_SOURCE = """
+from discord.ext.commands import Cog
+
+
+class Echo(Cog):
+    VERSION = {version}
+
+    def __init__(self, agent):
+        self.agent = agent
+"""
+
+
+def create_reloader(
+    tool_filter: ToolFilter | None = None,
+    tool_roots: tuple[Path, ...] = (),
+) -> tuple[ToolReloader, mock.Mock]:
+    """Create a ToolReloader with a mocked bot."""
+    mock_bot = mock.Mock(spec=Bot)
+    mock_bot.add_cog = mock.AsyncMock()
+    mock_bot.remove_cog = mock.AsyncMock()
+    reloader = ToolReloader(
+        bot=mock_bot,
+        cog_factory=lambda cog_class: cog_class(agent="agent"),
+        logger=mock.Mock(),
+        tool_filter=tool_filter,
+        tool_roots=tool_roots,
+    )
+    return reloader, mock_bot
+
+
+class TestToolReloader:
+    """Test the ToolReloader class."""
+
+    @pytest.mark.asyncio
+    async def test_reload_swaps_cog(self, tmp_path: Path) -> None:
+        """Test that a changed file replaces the tracked cog with the new version."""
+        tool_path = tmp_path / "__tool__.py"
+        tool_path.write_text(TOOL_SOURCE.format(version=1), encoding="utf-8")
+        reloader, mock_bot = create_reloader()
+        old_cog = mock.Mock(qualified_name="Echo")
+        reloader.track(tool_path, old_cog)
+
+        tool_path.write_text(TOOL_SOURCE.format(version=2), encoding="utf-8")
+        reload = await reloader.reload(tool_path)
+
+        assert reload.succeeded
+        assert reload.cog_names == ("Echo",)
+        assert reload.latency_seconds >= reload.import_seconds
+        mock_bot.remove_cog.assert_called_once_with("Echo")
+        new_cog = mock_bot.add_cog.call_args.args[0]
+        assert new_cog.VERSION == 2
+        assert type(new_cog).__module__.endswith("_r1")
+        assert reloader.history == (reload,)
+
+    @pytest.mark.asyncio
+    async def test_each_reload_uses_a_fresh_module_name(self, tmp_path: Path) -> None:
+        """Test that repeated reloads import the file under a new module name."""
+        tool_path = tmp_path / "__tool__.py"
+        tool_path.write_text(TOOL_SOURCE.format(version=1), encoding="utf-8")
+        reloader, mock_bot = create_reloader()
+
+        await reloader.reload(tool_path)
+        await reloader.reload(tool_path)
+
+        modules = [type(call.args[0]).__module__ for call in mock_bot.add_cog.call_args_list]
+        assert len(set(modules)) == 2
+
+    @pytest.mark.asyncio
+    async def test_broken_file_keeps_previous_cog(self, tmp_path: Path) -> None:
+        """Test that a file that fails to import leaves the running cog untouched."""
+        tool_path = tmp_path / "__tool__.py"
+        tool_path.write_text("class Broken(:\n", encoding="utf-8")
+        reloader, mock_bot = create_reloader()
+        old_cog = mock.Mock(qualified_name="Echo")
+        reloader.track(tool_path, old_cog)
+
+        reload = await reloader.reload(tool_path)
+
+        assert not reload.succeeded
+        assert reload.cog_names == ("Echo",)
+        mock_bot.remove_cog.assert_not_called()
+        mock_bot.add_cog.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_failed_registration_restores_previous_cog(self, tmp_path: Path) -> None:
+        """Test that the previous cog is registered again when add_cog fails."""
+        tool_path = tmp_path / "__tool__.py"
+        tool_path.write_text(TOOL_SOURCE.format(version=2), encoding="utf-8")
+        reloader, mock_bot = create_reloader()
+        old_cog = mock.Mock(qualified_name="Echo")
+        reloader.track(tool_path, old_cog)
+        mock_bot.add_cog.side_effect = [RuntimeError("duplicate command"), None]
+
+        reload = await reloader.reload(tool_path)
+
+        assert not reload.succeeded
+        mock_bot.add_cog.assert_called_with(old_cog)
+
+    @pytest.mark.asyncio
+    async def test_reload_applies_tool_filter(self, tmp_path: Path) -> None:
+        """Test that a cog excluded at startup is not loaded when its file is reloaded."""
+        tool_path = tmp_path / "echo" / "__tool__.py"
+        tool_path.parent.mkdir()
+        tool_path.write_text(
+            TOOL_SOURCE.format(version=2) + "\n\nclass Debug(Cog):\n    def __init__(self, agent):\n        pass\n",
+            encoding="utf-8",
+        )
+        reloader, mock_bot = create_reloader(ToolFilter(exclusions=["Debug*"]), (tmp_path,))
+        reloader.track(tool_path, mock.Mock(qualified_name="Echo"))
+
+        reload = await reloader.reload(tool_path)
+
+        assert reload.succeeded
+        assert reload.cog_names == ("Echo",)
+        assert [type(call.args[0]).__name__ for call in mock_bot.add_cog.call_args_list] == ["Echo"]
+
+    @pytest.mark.asyncio
+    async def test_reload_skips_excluded_file(self, tmp_path: Path) -> None:
+        """Test that a file whose cogs are all excluded is not imported on reload."""
+        tool_path = tmp_path / "legacy" / "__tool__.py"
+        tool_path.parent.mkdir()
+        tool_path.write_text(TOOL_SOURCE.format(version=2), encoding="utf-8")
+        reloader, mock_bot = create_reloader(ToolFilter(exclusions=["legacy/"]), (tmp_path,))
+        reloader.track(tool_path, mock.Mock(qualified_name="Echo"))
+
+        with mock.patch("concord.infrastructure.discord.hot_reload.import_classes_from_file") as mock_import:
+            reload = await reloader.reload(tool_path)
+
+        mock_import.assert_not_called()
+        assert reload.cog_names == ()
+        mock_bot.remove_cog.assert_called_once_with("Echo")
+        mock_bot.add_cog.assert_not_called()
@@ -0,0 +1,281 @@
+"""Tests for lazy tool loading."""
+
+import asyncio
+import logging
+from pathlib import Path
+from unittest import mock
+
+import pytest
+from discord.ext.commands import Bot, Cog
+
+from concord.infrastructure.discord.lazy_loader import LazyToolLoader
+from concord.model.discovered_tool import DiscoveredCog, DiscoveredCommand, DiscoveredListener
+from concord.model.import_class import LoadedClass
+
+TOOL_PATH = Path("/tools/echo/__tool__.py")
+
+
+class EchoTool(Cog):
+    """Cog that records the messages it receives."""
+
+    def __init__(self, agent: object) -> None:
+        self.agent = agent
+        self.messages: list[str] = []
+
+    @Cog.listener()
+    async def on_message(self, message: str) -> None:
+        self.messages.append(message)
+
+
+def discovered(
+    *,
+    name: str = "EchoTool",
+    module_path: Path = TOOL_PATH,
+    commands: tuple[DiscoveredCommand, ...] = (DiscoveredCommand("echo", "echo", "hybrid_command"),),
+    listeners: tuple[DiscoveredListener, ...] = (DiscoveredListener("on_message", "on_message"),),
+    tasks: tuple[str, ...] = (),
+) -> DiscoveredCog:
+    """Build a DiscoveredCog for tests."""
+    return DiscoveredCog(
+        name=name,
+        module_path=module_path,
+        lineno=1,
+        commands=commands,
+        listeners=listeners,
+        tasks=tasks,
+    )
+
+
+def create_loader() -> tuple[LazyToolLoader, mock.Mock]:
+    """Create a LazyToolLoader with a mocked bot."""
+    mock_bot = mock.Mock(spec=Bot)
+    mock_bot.add_cog = mock.AsyncMock()
+    mock_bot.remove_cog = mock.AsyncMock()
+    loader = LazyToolLoader(
+        bot=mock_bot,
+        cog_factory=lambda cog_class: cog_class(agent="agent"),
+        logger=mock.Mock(spec=logging.Logger),
+    )
+    return loader, mock_bot
+
+
+class TestNeedsEagerLoad:
+    """Test the needs_eager_load rule."""
+
+    def test_plain_cog_is_lazy(self) -> None:
+        """Test that a cog with commands and listeners can be loaded lazily."""
+        assert LazyToolLoader.needs_eager_load(discovered()) is False
+
+    def test_cog_with_task_is_eager(self) -> None:
+        """Test that a cog with a background task is loaded eagerly."""
+        assert LazyToolLoader.needs_eager_load(discovered(tasks=("heartbeat",))) is True
+
+    def test_cog_without_entry_points_is_eager(self) -> None:
+        """Test that a cog without commands and listeners is loaded eagerly."""
+        assert LazyToolLoader.needs_eager_load(discovered(commands=(), listeners=())) is True
+
+    def test_cog_with_app_command_is_eager(self) -> None:
+        """Test that a cog with a slash command is loaded eagerly."""
+        cog = discovered(commands=(DiscoveredCommand("ping", "ping", "app_commands.command"),))
+
+        assert LazyToolLoader.needs_eager_load(cog) is True
+
+
+class TestLazyToolLoader:
+    """Test the LazyToolLoader class."""
+
+    @pytest.mark.asyncio
+    async def test_register_adds_stubs_without_importing(self) -> None:
+        """Test that registering only adds stub commands and listeners."""
+        loader, mock_bot = create_loader()
+
+        with mock.patch("concord.infrastructure.discord.lazy_loader.import_classes_from_file") as mock_import:
+            names = await loader.register([discovered()])
+
+        assert names == ["EchoTool"]
+        mock_import.assert_not_called()
+        mock_bot.add_command.assert_called_once()
+        assert mock_bot.add_command.call_args.args[0].name == "echo"
+        mock_bot.add_listener.assert_called_once()
+        assert mock_bot.add_listener.call_args.args[1] == "on_message"
+        assert loader.stats().never_loaded == ("EchoTool",)
+
+    @pytest.mark.asyncio
+    async def test_concurrent_first_calls_share_one_load(self) -> None:
+        """Test that concurrent first calls wait on a single import."""
+        loader, mock_bot = create_loader()
+        with mock.patch(
+            "concord.infrastructure.discord.lazy_loader.import_classes_from_file",
+            return_value=[LoadedClass[type[Cog]](name="echo", class_type=EchoTool)],
+        ) as mock_import:
+            await loader.register([discovered()])
+            results = await asyncio.gather(*(loader.ensure_loaded(TOOL_PATH) for _ in range(5)))
+
+        mock_import.assert_called_once()
+        mock_bot.add_cog.assert_called_once()
+        assert all(result == results[0] for result in results)
+        mock_bot.remove_command.assert_called_once_with("echo")
+        mock_bot.remove_listener.assert_called_once()
+        stats = loader.stats()
+        assert stats.loaded == ("EchoTool",)
+        assert stats.never_loaded == ()
+
+    @pytest.mark.asyncio
+    async def test_listener_stub_replays_the_first_event(self) -> None:
+        """Test that the event which triggered the load reaches the real listener."""
+        loader, mock_bot = create_loader()
+        with mock.patch(
+            "concord.infrastructure.discord.lazy_loader.import_classes_from_file",
+            return_value=[LoadedClass[type[Cog]](name="echo", class_type=EchoTool)],
+        ):
+            await loader.register([discovered()])
+            stub = mock_bot.add_listener.call_args.args[0]
+            await stub("hello")
+
+        (cog,) = await loader.ensure_loaded(TOOL_PATH)
+        assert isinstance(cog, EchoTool)
+        assert cog.messages == ["hello"]
+
+    @pytest.mark.asyncio
+    async def test_stubs_stay_until_the_real_cog_is_ready(self) -> None:
+        """Test that the stubs keep receiving calls while an async cog_load is running."""
+        loader, mock_bot = create_loader()
+        release = asyncio.Event()
+        loading = asyncio.Event()
+
+        class SlowEchoTool(EchoTool):
+            async def cog_load(self) -> None:
+                loading.set()
+                await release.wait()
+
+        with mock.patch(
+            "concord.infrastructure.discord.lazy_loader.import_classes_from_file",
+            return_value=[LoadedClass[type[Cog]](name="echo", class_type=SlowEchoTool)],
+        ):
+            await loader.register([discovered(name="SlowEchoTool")])
+            task = asyncio.create_task(loader.ensure_loaded(TOOL_PATH))
+            await loading.wait()
+
+            mock_bot.remove_command.assert_not_called()
+            mock_bot.remove_listener.assert_not_called()
+            mock_bot.add_cog.assert_not_called()
+            release.set()
+            (cog,) = await task
+
+        mock_bot.remove_command.assert_called_once_with("echo")
+        mock_bot.add_cog.assert_awaited_once_with(cog)
+        # add_cog must not wait for cog_load again once the stubs are gone
+        await cog.cog_load()
+
+    @pytest.mark.asyncio
+    async def test_failed_cog_load_keeps_stubs(self) -> None:
+        """Test that a failing cog_load leaves the stubs registered once."""
+        loader, mock_bot = create_loader()
+
+        class BrokenEchoTool(EchoTool):
+            async def cog_load(self) -> None:
+                msg = "broken"
+                raise RuntimeError(msg)
+
+        with mock.patch(
+            "concord.infrastructure.discord.lazy_loader.import_classes_from_file",
+            return_value=[LoadedClass[type[Cog]](name="echo", class_type=BrokenEchoTool)],
+        ):
+            await loader.register([discovered(name="BrokenEchoTool")])
+            with pytest.raises(RuntimeError, match="broken"):
+                await loader.ensure_loaded(TOOL_PATH)
+
+        mock_bot.remove_command.assert_not_called()
+        mock_bot.add_command.assert_called_once()
+        mock_bot.add_cog.assert_not_called()
+        assert loader.is_loaded(TOOL_PATH) is False
+
+    @pytest.mark.asyncio
+    async def test_failed_import_keeps_stubs(self) -> None:
+        """Test that a failed import leaves the stubs in place so the load can be retried."""
+        loader, mock_bot = create_loader()
+        with mock.patch(
+            "concord.infrastructure.discord.lazy_loader.import_classes_from_file",
+            side_effect=RuntimeError("broken"),
+        ):
+            await loader.register([discovered()])
+            with pytest.raises(RuntimeError):
+                await loader.ensure_loaded(TOOL_PATH)
+
+        mock_bot.remove_command.assert_not_called()
+        assert loader.is_loaded(TOOL_PATH) is False
+
+    @pytest.mark.asyncio
+    async def test_eager_tools_are_loaded_on_register(self) -> None:
+        """Test that tools which cannot be stubbed are loaded immediately."""
+        loader, mock_bot = create_loader()
+        with mock.patch(
+            "concord.infrastructure.discord.lazy_loader.import_classes_from_file",
+            return_value=[LoadedClass[type[Cog]](name="echo", class_type=EchoTool)],
+        ):
+            await loader.register([discovered(tasks=("heartbeat",))])
+
+        mock_bot.add_command.assert_not_called()
+        mock_bot.add_cog.assert_called_once()
+        assert loader.stats().eager == ("EchoTool",)
+
+    @pytest.mark.asyncio
+    async def test_failed_eager_load_is_not_reported_as_registered(self) -> None:
+        """Test that a tool whose eager load failed is left out of the registered names."""
+        loader, _ = create_loader()
+        other = discovered(name="OtherTool", module_path=Path("/tools/other/__tool__.py"))
+        with mock.patch(
+            "concord.infrastructure.discord.lazy_loader.import_classes_from_file",
+            side_effect=RuntimeError("broken"),
+        ):
+            names = await loader.register([discovered(tasks=("heartbeat",)), other])
+
+        assert names == ["OtherTool"]
+
+    @pytest.mark.asyncio
+    async def test_one_listener_stub_per_event(self) -> None:
+        """Test that listeners for the same event share one stub, so the real listeners run once."""
+        loader, mock_bot = create_loader()
+        cogs = [
+            discovered(
+                commands=(),
+                listeners=(
+                    DiscoveredListener("on_message", "on_message"),
+                    DiscoveredListener("on_message", "log_message"),
+                    DiscoveredListener("on_member_join", "greet"),
+                ),
+            ),
+            discovered(name="OtherTool", commands=(), listeners=(DiscoveredListener("on_message", "on_message"),)),
+        ]
+        with mock.patch(
+            "concord.infrastructure.discord.lazy_loader.import_classes_from_file",
+            return_value=[LoadedClass[type[Cog]](name="echo", class_type=EchoTool)],
+        ):
+            await loader.register(cogs)
+            events = [call.args[1] for call in mock_bot.add_listener.call_args_list]
+            stub = mock_bot.add_listener.call_args_list[0].args[0]
+            await stub("hello")
+
+        assert events == ["on_message", "on_member_join"]
+        (cog,) = await loader.ensure_loaded(TOOL_PATH)
+        assert isinstance(cog, EchoTool)
+        assert cog.messages == ["hello"]
+
+    @pytest.mark.asyncio
+    async def test_stubs_only_top_level_commands_with_aliases(self) -> None:
+        """Test that subcommands are not stubbed and aliases of top-level commands are."""
+        loader, mock_bot = create_loader()
+        cog = discovered(
+            commands=(
+                DiscoveredCommand("echo", "echo", "hybrid_group", aliases=("e",)),
+                DiscoveredCommand("loud", "loud", "echo.command", aliases=("l",), parent="echo"),
+            ),
+        )
+
+        with mock.patch("concord.infrastructure.discord.lazy_loader.import_classes_from_file"):
+            await loader.register([cog])
+
+        mock_bot.add_command.assert_called_once()
+        stub = mock_bot.add_command.call_args.args[0]
+        assert stub.name == "echo"
+        assert stub.aliases == ["e"]
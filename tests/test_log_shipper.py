@@ -0,0 +1,96 @@
+"""Tests for batched log shipping to the Discord log channel."""
+
+# mypy: ignore-errors
+
+from unittest import mock
+
+import pytest
+from discord.errors import HTTPException
+
+from concord.infrastructure.logging.log_shipper import (
+    ATTACHMENT_FILENAME,
+    CODE_BLOCK_PREFIX,
+    CODE_BLOCK_SUFFIX,
+    LogShipper,
+    pack_log_entries,
+)
+from concord.model.log_shipping import LogShipperStats
+
+
+def _body(message: str) -> str:
+    assert message.startswith(CODE_BLOCK_PREFIX)
+    assert message.endswith(CODE_BLOCK_SUFFIX)
+    return message[len(CODE_BLOCK_PREFIX) : -len(CODE_BLOCK_SUFFIX)]
+
+
+class TestPackLogEntries:
+    """Test packing log records into messages."""
+
+    def test_packs_records_into_few_messages(self) -> None:
+        """Test that records are joined in order without exceeding the limit."""
+        entries = [f"record {index:03d} " + "x" * 40 for index in range(100)]
+
+        messages = pack_log_entries(entries, limit=500)
+
+        assert all(len(message) <= 500 for message in messages)
+        assert [line for message in messages for line in _body(message).split("\n")] == entries
+        # 9 records of 51 characters (and 8 newlines) fit in the 488 characters inside a code block
+        assert len(messages) == 12
+
+    def test_splits_long_record(self) -> None:
+        """Test that a record longer than one message is split across messages."""
+        messages = pack_log_entries(["short", "y" * 1200, "tail"], limit=500)
+
+        assert all(len(message) <= 500 for message in messages)
+        assert "".join(_body(message) for message in messages).replace("\n", "") == "short" + "y" * 1200 + "tail"
+
+    def test_escapes_code_fence(self) -> None:
+        """Test that a code fence in a record does not close the code block."""
+        (message,) = pack_log_entries(["before ``` after"])
+
+        assert "```" not in _body(message)
+
+
+class TestLogShipper:
+    """Test the LogShipper class."""
+
+    @pytest.mark.asyncio
+    async def test_ship_messages(self) -> None:
+        """Test that a small batch is sent as code block messages."""
+        channel = mock.Mock()
+        channel.send = mock.AsyncMock()
+        shipper = LogShipper(message_limit=100)
+
+        result = await shipper.ship(["a" * 50, "b" * 50, "c"], channel)
+
+        assert result.is_ok()
+        assert channel.send.await_count == 2
+        assert shipper.stats() == LogShipperStats(records=3, batches=1, messages=2, attachments=0)
+
+    @pytest.mark.asyncio
+    async def test_ship_attachment(self) -> None:
+        """Test that a batch needing too many messages is sent as one attachment."""
+        channel = mock.Mock()
+        channel.send = mock.AsyncMock()
+        shipper = LogShipper(message_limit=100, attachment_after=3)
+
+        result = await shipper.ship([f"{index}" * 80 for index in range(10)], channel)
+
+        assert result.is_ok()
+        channel.send.assert_awaited_once()
+        assert channel.send.call_args.kwargs["file"].filename == ATTACHMENT_FILENAME
+        assert shipper.stats().attachments == 1
+        assert shipper.stats().records_per_message == 10
+
+    @pytest.mark.asyncio
+    async def test_ship_error(self) -> None:
+        """Test that a failed send is returned as an error."""
+        channel = mock.Mock()
+        channel.send = mock.AsyncMock(side_effect=HTTPException(mock.Mock(status=500, reason="boom"), "boom"))
+        shipper = LogShipper()
+
+        result = await shipper.ship(["record"], channel)
+
+        assert result.is_err()
+        assert "boom" in result.unwrap_err()
+        assert shipper.stats().records == 0
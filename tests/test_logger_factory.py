@@ -3,6 +3,7 @@
 import logging
 import shutil
 import tempfile
+from logging.handlers import QueueHandler
 from pathlib import Path
 from unittest import mock
 
@@ -12,8 +13,10 @@ from concord.infrastructure.logging.logger_factory import (
     DEBUG_LOG_FORMATTER,
     DEFAULT_LOG_DIR,
     get_background_log,
+    get_flight_recorder,
     get_logger,
     my_logger,
+    stop_log_listeners,
 )
 
 
@@ -40,6 +43,7 @@ class TestLoggerFactory:
         """Test get_background_log function."""
         # Setup mocks
         mock_logger = mock.Mock()
+        mock_logger.handlers = []
         mock_get_logger.return_value = mock_logger
 
         mock_handler = mock.Mock()
@@ -88,6 +92,7 @@ class TestLoggerFactory:
         """Test my_logger function."""
         # Setup mocks
         mock_logger = mock.Mock()
+        mock_logger.handlers = []
         mock_get_logger.return_value = mock_logger
 
         mock_handler = mock.Mock()
@@ -119,88 +124,130 @@ class TestLoggerFactory:
 
         assert result == mock_logger
 
-    @mock.patch("concord.infrastructure.logging.logger_factory.get_background_log")
-    @mock.patch("concord.infrastructure.logging.logger_factory.my_logger")
-    def test_get_logger_background_level(
-        self,
-        mock_my_logger_func: mock.Mock,
-        mock_get_background_log: mock.Mock,
-    ) -> None:
-        """Test get_logger function with background log level."""
-        mock_logger = mock.Mock()
-        mock_get_background_log.return_value = mock_logger
-
-        log_dir = self.temp_dir / "logs"
-
-        # Test with level equal to BACKGROUND_LOG_LEVEL
-        result = get_logger("test_logger", BACKGROUND_LOG_LEVEL, log_dir)
-
-        mock_get_background_log.assert_called_once_with("test_logger", log_dir)
-        mock_my_logger_func.assert_not_called()
-        assert result == mock_logger
-
-    @mock.patch("concord.infrastructure.logging.logger_factory.get_background_log")
-    @mock.patch("concord.infrastructure.logging.logger_factory.my_logger")
-    def test_get_logger_higher_level(
-        self,
-        mock_my_logger_func: mock.Mock,
-        mock_get_background_log: mock.Mock,
-    ) -> None:
-        """Test get_logger function with level higher than background."""
-        mock_background_logger = mock.Mock()
-        mock_get_background_log.return_value = mock_background_logger
-
-        mock_debug_logger = mock.Mock()
-        mock_my_logger_func.return_value = mock_debug_logger
-
-        log_dir = self.temp_dir / "logs"
-        debug_level = logging.DEBUG
-
-        # Test with level higher than BACKGROUND_LOG_LEVEL
-        result = get_logger("test_logger", debug_level, log_dir)
-
-        mock_get_background_log.assert_called_once_with("test_logger", log_dir)
-        mock_my_logger_func.assert_called_once_with("test_logger", debug_level, log_dir)
-        assert result == mock_debug_logger
-
-    @mock.patch("concord.infrastructure.logging.logger_factory.get_background_log")
-    @mock.patch("concord.infrastructure.logging.logger_factory.my_logger")
-    def test_get_logger_default_parameters(
-        self,
-        mock_my_logger_func: mock.Mock,
-        mock_get_background_log: mock.Mock,
-    ) -> None:
+    def test_my_logger_is_idempotent(self) -> None:
+        """Test that calling my_logger twice does not stack a second handler for the same file."""
+        name = "test_my_logger_twice"
+        try:
+            logger = my_logger(name, logging.DEBUG, self.temp_dir)
+            my_logger(name, logging.DEBUG, self.temp_dir)
+
+            assert len(logger.handlers) == 1
+        finally:
+            for handler in list(logger.handlers):
+                logger.removeHandler(handler)
+                handler.close()
+
+    def test_get_logger_background_level(self) -> None:
+        """Test that get_logger writes through one queue handler to the background log."""
+        name = "test_get_logger_background"
+        logger = get_logger(name, BACKGROUND_LOG_LEVEL, self.temp_dir)
+        try:
+            assert logger.level == BACKGROUND_LOG_LEVEL
+            assert len(logger.handlers) == 1
+            assert isinstance(logger.handlers[0], QueueHandler)
+
+            logger.info("hello %s", "world")
+            logger.debug("hidden")
+        finally:
+            stop_log_listeners()
+
+        assert logger.handlers == []
+        background = (self.temp_dir / f"{name}.background.log").read_text(encoding="utf-8")
+        assert f"{name} - INFO - hello world" in background
+        assert "hidden" not in background
+        assert not (self.temp_dir / f"{name}.log").exists()
+
+    def test_get_logger_debug_level(self) -> None:
+        """Test that a level below INFO also writes the debug log with the caller position."""
+        name = "test_get_logger_debug"
+        logger = get_logger(name, logging.DEBUG, self.temp_dir)
+        try:
+            logger.debug("details")
+            try:
+                msg = "boom"
+                raise ValueError(msg)  # noqa: TRY301
+            except ValueError:
+                logger.exception("failed")
+        finally:
+            stop_log_listeners()
+
+        debug_log = (self.temp_dir / f"{name}.log").read_text(encoding="utf-8")
+        assert "DEBUG - details [test_logger_factory.py:" in debug_log
+        # The traceback follows the formatted line, as with a file handler on the logger
+        assert "ERROR - failed [test_logger_factory.py:" in debug_log
+        assert "(module: test_logger_factory, func: test_get_logger_debug_level)\nTraceback" in debug_log
+        assert "ValueError: boom" in debug_log
+
+    def test_get_logger_is_idempotent(self) -> None:
+        """Test that calling get_logger again keeps a single queue handler and listener."""
+        name = "test_get_logger_twice"
+        try:
+            logger = get_logger(name, logging.INFO, self.temp_dir)
+            handler = logger.handlers[0]
+            assert get_logger(name, logging.INFO, self.temp_dir) is logger
+            assert logger.handlers == [handler]
+
+            # Changing the level to debug replaces the handler instead of adding one
+            get_logger(name, logging.DEBUG, self.temp_dir)
+            assert len(logger.handlers) == 1
+            assert logger.handlers[0] is not handler
+            logger.debug("after")
+        finally:
+            stop_log_listeners()
+
+        assert "after" in (self.temp_dir / f"{name}.log").read_text(encoding="utf-8")
+
+    def test_get_logger_flight_recorder(self) -> None:
+        """Test that DEBUG records are kept in memory and written only when an error is logged."""
+        name = "test_get_logger_flight"
+        logger = get_logger(name, logging.INFO, self.temp_dir, flight_recorder=2)
+        recorder = get_flight_recorder(name)
+        try:
+            assert recorder is not None
+            assert logger.level == logging.DEBUG
+            for index in range(3):
+                logger.debug("step %d", index)
+            logger.info("served")
+            logger.error("failed")
+            logger.debug("after")
+        finally:
+            stop_log_listeners()
+
+        assert get_flight_recorder(name) is None
+        background = (self.temp_dir / f"{name}.background.log").read_text(encoding="utf-8")
+        assert "step" not in background
+        assert "served" in background
+        assert "failed" in background
+        debug_log = (self.temp_dir / f"{name}.log").read_text(encoding="utf-8")
+        lines = [line.split(" - ", 3)[3].split(" [")[0] for line in debug_log.splitlines()]
+        # Only the last 2 DEBUG records before the error are kept (INFO is already in the background log)
+        assert lines == ["step 1", "step 2", "failed"]
+        assert recorder.dumps == 1
+
+    def test_get_logger_flight_recorder_ignored_in_debug(self) -> None:
+        """Test that the flight recorder is not used when every DEBUG record is written anyway."""
+        try:
+            get_logger("test_get_logger_flight_debug", logging.DEBUG, self.temp_dir, flight_recorder=10)
+            assert get_flight_recorder("test_get_logger_flight_debug") is None
+        finally:
+            stop_log_listeners()
+
+    def test_get_logger_default_parameters(self) -> None:
         """Test get_logger function with default parameters."""
-        mock_logger = mock.Mock()
-        mock_get_background_log.return_value = mock_logger
-
-        # Test with default parameters
-        result = get_logger("test_logger")
-
-        mock_get_background_log.assert_called_once_with("test_logger", DEFAULT_LOG_DIR)
-        mock_my_logger_func.assert_not_called()
-        assert result == mock_logger
-
-    @mock.patch("concord.infrastructure.logging.logger_factory.get_background_log")
-    @mock.patch("concord.infrastructure.logging.logger_factory.my_logger")
-    def test_get_logger_lower_level(
-        self,
-        mock_my_logger_func: mock.Mock,
-        mock_get_background_log: mock.Mock,
-    ) -> None:
-        """Test get_logger function with level lower than background."""
-        mock_logger = mock.Mock()
-        mock_get_background_log.return_value = mock_logger
-
-        log_dir = self.temp_dir / "logs"
-
-        # Test with level lower than BACKGROUND_LOG_LEVEL (which is INFO)
-        debug_level = logging.DEBUG
-
-        _ = get_logger("test_logger", debug_level, log_dir)
-
-        mock_get_background_log.assert_called_once_with("test_logger", log_dir)
-        mock_my_logger_func.assert_called_once_with("test_logger", debug_level, log_dir)
+        with (
+            mock.patch("concord.infrastructure.logging.logger_factory.create_background_handler") as mock_create,
+            mock.patch("concord.infrastructure.logging.logger_factory.QueueListener") as mock_listener_class,
+        ):
+            mock_create.return_value = mock.Mock()
+            try:
+                logger = get_logger("test_get_logger_default")
+            finally:
+                stop_log_listeners()
+
+        mock_create.assert_called_once_with("test_get_logger_default", DEFAULT_LOG_DIR)
+        mock_listener_class.return_value.start.assert_called_once()
+        mock_listener_class.return_value.stop.assert_called_once()
+        assert logger.level == logging.INFO
 
     def test_constants(self) -> None:
         """Test that constants are properly defined."""
@@ -0,0 +1,264 @@
+"""Tests for the in-loop log pipeline feeding the Discord log channel."""
+
+# mypy: ignore-errors
+
+import asyncio
+import logging
+import threading
+from unittest import mock
+
+import aiohttp
+import pytest
+from discord.errors import HTTPException
+
+from concord.infrastructure.logging.flight_recorder import FlightRecorderHandler
+from concord.infrastructure.logging.log_shipper import LogShipper
+from concord.infrastructure.logging.logger_notifier import DiscordLogHandler, LogPipeline
+
+
+def _channel() -> mock.Mock:
+    channel = mock.Mock()
+    channel.send = mock.AsyncMock()
+    return channel
+
+
+def _sent(channel: mock.Mock) -> str:
+    return "".join(call.kwargs["content"] for call in channel.send.call_args_list)
+
+
+class TestLogPipeline:
+    """Test the LogPipeline class."""
+
+    @pytest.mark.asyncio
+    async def test_ships_batch_on_the_running_loop(self) -> None:
+        """Test that records submitted on the loop are shipped together after the linger time."""
+        channel = _channel()
+        pipeline = LogPipeline(channel, linger=0.05)
+        pipeline.start()
+
+        for index in range(5):
+            pipeline.submit(f"record {index}")
+        await asyncio.sleep(0.2)
+
+        channel.send.assert_awaited_once()
+        assert all(f"record {index}" in _sent(channel) for index in range(5))
+        assert pipeline.stats().shipped == 5
+        await pipeline.close()
+
+    @pytest.mark.asyncio
+    async def test_submit_from_other_thread(self) -> None:
+        """Test that records from another thread are handed to the loop without blocking it."""
+        channel = _channel()
+        pipeline = LogPipeline(channel, linger=0)
+        pipeline.start()
+
+        thread = threading.Thread(target=lambda: [pipeline.submit(f"thread {index}") for index in range(3)])
+        thread.start()
+        await asyncio.to_thread(thread.join)
+        await pipeline.close()
+
+        assert [f"thread {index}" in _sent(channel) for index in range(3)] == [True] * 3
+        assert pipeline.stats().shipped == 3
+        assert pipeline.stats().pending == 0
+
+    @pytest.mark.asyncio
+    async def test_drop_oldest(self) -> None:
+        """Test that the oldest records are dropped and counted when the queue is full."""
+        channel = _channel()
+        pipeline = LogPipeline(channel, maxsize=3, linger=10)
+        pipeline.start()
+
+        for index in range(5):
+            pipeline.submit(f"record {index}")
+        await pipeline.close()
+
+        assert "record 0" not in _sent(channel)
+        assert "record 1" not in _sent(channel)
+        assert "record 4" in _sent(channel)
+        stats = pipeline.stats()
+        assert (stats.shipped, stats.dropped_overflow, stats.dropped) == (3, 2, 2)
+
+    @pytest.mark.asyncio
+    async def test_drop_debug(self) -> None:
+        """Test that DEBUG records are dropped before other records when the queue is full."""
+        channel = _channel()
+        pipeline = LogPipeline(channel, maxsize=2, overflow="drop_debug", linger=10)
+        pipeline.start()
+
+        pipeline.submit("debug 0", logging.DEBUG)
+        pipeline.submit("info 0", logging.INFO)
+        pipeline.submit("info 1", logging.INFO)
+        pipeline.submit("debug 1", logging.DEBUG)
+        pipeline.submit("error 0", logging.ERROR)
+        await pipeline.close()
+
+        assert "debug" not in _sent(channel)
+        assert "info 0" not in _sent(channel)
+        stats = pipeline.stats()
+        assert (stats.shipped, stats.dropped_debug, stats.dropped_overflow) == (2, 2, 1)
+
+    @pytest.mark.asyncio
+    async def test_block_waits_for_space(self) -> None:
+        """Test that the block policy makes other threads wait instead of dropping records."""
+        channel = _channel()
+        pipeline = LogPipeline(channel, maxsize=1, overflow="block", linger=0)
+        pipeline.start()
+
+        def produce() -> None:
+            for index in range(5):
+                pipeline.submit(f"record {index}")
+
+        await asyncio.to_thread(produce)
+        await pipeline.close()
+
+        assert pipeline.stats().shipped == 5
+        assert pipeline.stats().dropped == 0
+
+    @pytest.mark.asyncio
+    async def test_block_timeout(self) -> None:
+        """Test that a thread gives up waiting after the block timeout and the record is counted."""
+        channel = _channel()
+        pipeline = LogPipeline(channel, maxsize=1, overflow="block", linger=10, block_timeout=0.05)
+        pipeline.start()
+        pipeline.submit("first")
+
+        await asyncio.to_thread(pipeline.submit, "second")
+        await pipeline.close()
+
+        assert pipeline.stats().dropped_timeout == 1
+        assert pipeline.stats().shipped == 1
+
+    @pytest.mark.asyncio
+    async def test_submit_without_block(self) -> None:
+        """Test that block=False does not wait for space even with the block policy."""
+        channel = _channel()
+        pipeline = LogPipeline(channel, maxsize=1, overflow="block", linger=10, block_timeout=5)
+        pipeline.start()
+        pipeline.submit("first")
+
+        await asyncio.wait_for(asyncio.to_thread(pipeline.submit, "second", block=False), 1)
+        await pipeline.close()
+
+        stats = pipeline.stats()
+        assert (stats.dropped_timeout, stats.dropped_overflow, stats.shipped) == (0, 1, 1)
+
+    @pytest.mark.asyncio
+    async def test_close_drains_and_rejects_new_records(self) -> None:
+        """Test that close ships the queued records without waiting for the linger time."""
+        channel = _channel()
+        pipeline = LogPipeline(channel, linger=60)
+        pipeline.start()
+        pipeline.submit("queued")
+
+        await asyncio.wait_for(pipeline.close(), 1)
+        pipeline.submit("late")
+
+        assert "queued" in _sent(channel)
+        assert (pipeline.stats().shipped, pipeline.stats().dropped_closed) == (1, 1)
+
+    @pytest.mark.asyncio
+    async def test_close_timeout_drops_remaining(self) -> None:
+        """Test that records which cannot be sent before the drain timeout are dropped."""
+
+        async def stalled_send(**_: object) -> None:
+            await asyncio.sleep(10)
+
+        channel = _channel()
+        channel.send = mock.AsyncMock(side_effect=stalled_send)
+        pipeline = LogPipeline(channel, max_batch_chars=1, linger=0)
+        pipeline.start()
+        pipeline.submit("first")
+        pipeline.submit("second")
+
+        await pipeline.close(drain_timeout=0.05)
+
+        stats = pipeline.stats()
+        assert (stats.shipped, stats.pending, stats.dropped_closed) == (0, 0, 1)
+
+    @pytest.mark.asyncio
+    async def test_send_failure_keeps_running(self) -> None:
+        """Test that a failed send is counted and later records are still shipped."""
+        channel = _channel()
+        channel.send = mock.AsyncMock(side_effect=[HTTPException(mock.Mock(status=500, reason="boom"), "boom"), None])
+        pipeline = LogPipeline(channel, linger=0, shipper=LogShipper())
+        pipeline.start()
+
+        pipeline.submit("lost")
+        await asyncio.sleep(0.05)
+        pipeline.submit("kept")
+        await pipeline.close()
+
+        assert (pipeline.stats().failed, pipeline.stats().shipped) == (1, 1)
+        assert "boom" in pipeline.last_error
+
+    @pytest.mark.asyncio
+    async def test_unexpected_send_error_keeps_running(self) -> None:
+        """Test that a connection error does not end the pipeline task."""
+        channel = _channel()
+        channel.send = mock.AsyncMock(side_effect=[aiohttp.ClientError("connection reset"), None])
+        pipeline = LogPipeline(channel, linger=0, shipper=LogShipper())
+        pipeline.start()
+
+        pipeline.submit("lost")
+        await asyncio.sleep(0.05)
+        pipeline.submit("kept")
+        await pipeline.close()
+
+        stats = pipeline.stats()
+        assert (stats.failed, stats.shipped, stats.dropped_closed) == (1, 1, 0)
+        assert "connection reset" in pipeline.last_error
+        assert "kept" in channel.send.call_args.kwargs["content"]
+
+    def test_submit_before_start(self) -> None:
+        """Test that records before start are counted as dropped."""
+        pipeline = LogPipeline(_channel())
+
+        pipeline.submit("early")
+
+        assert pipeline.stats().dropped_closed == 1
+
+    def test_invalid_maxsize(self) -> None:
+        """Test that a queue without room is rejected."""
+        with pytest.raises(ValueError, match="maxsize"):
+            LogPipeline(_channel(), maxsize=0)
+
+
+class TestDiscordLogHandler:
+    """Test the DiscordLogHandler class."""
+
+    def test_emit_submits_formatted_record(self) -> None:
+        """Test that emit hands the formatted record and its level to the pipeline."""
+        pipeline = mock.Mock()
+        handler = DiscordLogHandler(pipeline)
+        record = logging.LogRecord("bot", logging.WARNING, __file__, 1, "hello", None, None)
+
+        handler.emit(record)
+
+        entry, levelno = pipeline.submit.call_args.args
+        assert "bot - WARNING - hello" in entry
+        assert levelno == logging.WARNING
+
+    def test_flight_recorder_replay_is_not_duplicated(self) -> None:
+        """Test that the channel receives each record once when it is also a flight recorder target."""
+        pipeline = mock.Mock()
+        handler = DiscordLogHandler(pipeline)
+        recorder = FlightRecorderHandler(10, logging.NullHandler())
+        recorder.add_target(handler)
+        logger = logging.getLogger("test_flight_recorder_replay")
+        logger.setLevel(logging.DEBUG)
+        logger.propagate = False
+        logger.addHandler(handler)
+        logger.addHandler(recorder)
+        try:
+            logger.debug("trace")
+            logger.info("served")
+            logger.error("boom")
+        finally:
+            logger.removeHandler(handler)
+            logger.removeHandler(recorder)
+
+        submitted = [
+            (next(message for message in ("trace", "served", "boom") if message in call.args[0]), call.kwargs["block"])
+            for call in pipeline.submit.call_args_list
+        ]
+        assert sorted(submitted) == [("boom", True), ("served", True), ("trace", False)]
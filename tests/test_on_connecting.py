@@ -0,0 +1,50 @@
+"""Tests for the OnConnecting cog."""
+
+from unittest import mock
+
+import pytest
+
+from concord.infrastructure.discord.on_connecting import OnConnecting
+
+
+class TestOnConnecting:
+    """Test the OnConnecting class."""
+
+    @pytest.mark.asyncio
+    async def test_first_ready_is_not_a_reconnect(self) -> None:
+        """Test that the initial on_ready is not counted as a reconnect."""
+        cog = OnConnecting(logger=mock.Mock())
+
+        await cog.on_connect()
+        await cog.on_ready()
+
+        assert cog.reconnect_count == 0
+        assert cog.reconnects == ()
+
+    @pytest.mark.asyncio
+    async def test_resume_and_identify_are_counted(self) -> None:
+        """Test that resumed sessions and new sessions after a disconnect are recorded."""
+        cog = OnConnecting(logger=mock.Mock())
+        await cog.on_ready()
+
+        await cog.on_disconnect()
+        await cog.on_resumed()
+        await cog.on_disconnect()
+        await cog.on_disconnect()
+        await cog.on_ready()
+
+        assert cog.reconnect_count == 2
+        assert [reconnect.kind for reconnect in cog.reconnects] == ["resume", "identify"]
+        assert all(reconnect.seconds >= 0 for reconnect in cog.reconnects)
+
+    @pytest.mark.asyncio
+    async def test_history_is_bounded(self) -> None:
+        """Test that only the latest reconnects are kept while the counter keeps counting."""
+        cog = OnConnecting(logger=mock.Mock(), history_size=2)
+
+        for _ in range(5):
+            await cog.on_disconnect()
+            await cog.on_resumed()
+
+        assert cog.reconnect_count == 5
+        assert len(cog.reconnects) == 2
@@ -0,0 +1,93 @@
+"""Tests for StartupTimeline class."""
+
+import cProfile
+import json
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from concord.infrastructure.discord.startup_timeline import StartupTimeline
+
+
+class TestStartupTimeline:
+    """Test the StartupTimeline class."""
+
+    def test_mark_records_events_in_order(self) -> None:
+        """Test that marks are returned in time order with their thread names."""
+        timeline = StartupTimeline()
+        timeline.mark("run")
+        thread = threading.Thread(target=timeline.mark, args=("tool import started",), name="worker")
+        thread.start()
+        thread.join()
+        timeline.mark("ready")
+
+        events = timeline.events
+        assert [event.name for event in events] == ["run", "tool import started", "ready"]
+        assert events[1].thread == "worker"
+        assert events[0].seconds <= events[1].seconds <= events[2].seconds
+
+    def test_seconds_of_missing_event_is_none(self) -> None:
+        """Test that an event that was never marked has no time."""
+        timeline = StartupTimeline()
+        timeline.mark("run")
+
+        assert timeline.seconds("run") is not None
+        assert timeline.seconds("ready") is None
+
+    def test_overlap(self) -> None:
+        """Test the overlap of two spans."""
+        timeline = StartupTimeline()
+        for name in ("run", "tool import started", "tool import finished", "ready"):
+            timeline.mark(name)
+
+        overlap = timeline.overlap(("run", "ready"), ("tool import started", "tool import finished"))
+        import_seconds = float(timeline.seconds("tool import finished") or 0) - float(
+            timeline.seconds("tool import started") or 0,
+        )
+        assert overlap == pytest.approx(import_seconds)
+        assert timeline.overlap(("run", "ready"), ("tool import started", "tools attached")) is None
+
+    def test_disjoint_spans_do_not_overlap(self) -> None:
+        """Test that spans one after another have no overlap."""
+        timeline = StartupTimeline()
+        for name in ("a start", "a end", "b start", "b end"):
+            timeline.mark(name)
+
+        assert timeline.overlap(("a start", "a end"), ("b start", "b end")) == 0.0
+
+    def test_phase_records_duration(self) -> None:
+        """Test that a phase is recorded as a span even when it raises."""
+        timeline = StartupTimeline()
+        with timeline.phase("config"):
+            time.sleep(0.01)
+        with pytest.raises(RuntimeError), timeline.phase("broken"):
+            raise RuntimeError
+
+        config, broken = timeline.events
+        assert config.name == "config"
+        assert config.duration >= 0.01
+        assert broken.name == "broken"
+        assert timeline.total_seconds == pytest.approx(broken.end_seconds)
+        assert "config" in timeline.summary()
+
+    def test_write_json_and_chrome_trace(self, tmp_path: Path) -> None:
+        """Test that the timeline and the profile are written under the directory."""
+        timeline = StartupTimeline()
+        timeline.mark("run")
+        profile = cProfile.Profile()
+        with timeline.phase("tool import"):
+            profile.enable()
+            sorted(range(100))
+            profile.disable()
+
+        written = timeline.write(tmp_path / "logs", "bot", profile=profile)
+
+        assert {path.name for path in written} == {"bot.startup.json", "bot.startup.trace.json", "bot.startup.prof"}
+        report = json.loads((tmp_path / "logs" / "bot.startup.json").read_text(encoding="utf-8"))
+        assert [event["name"] for event in report["events"]] == ["run", "tool import"]
+        assert len(report["profile"]["functions"]) > 0
+        trace = json.loads((tmp_path / "logs" / "bot.startup.trace.json").read_text(encoding="utf-8"))
+        phases = {event["name"]: event["ph"] for event in trace["traceEvents"]}
+        assert phases == {"run": "i", "tool import": "X", "thread_name": "M"}
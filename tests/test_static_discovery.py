@@ -0,0 +1,169 @@
+"""Tests for static (AST-based) Cog discovery."""
+
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from concord.exception.import_module import ImportModuleError
+from concord.infrastructure.discord.static_discovery import (
+    StaticDiscoveryCache,
+    discover_cogs,
+    discover_cogs_from_directory,
+)
+from concord.model.discovered_tool import DiscoveredCommand, DiscoveredListener
+
+TOOL_SOURCE = """
+import heavy_dependency_that_is_not_installed
+from discord.ext import commands, tasks
+from discord.ext.commands import Cog, hybrid_command
+
+
+class Echo(Cog):
+    @tasks.loop(seconds=10)
+    async def heartbeat(self):
+        pass
+
+    @hybrid_command(name="echo")
+    async def echo_command(self, ctx):
+        pass
+
+    @echo_command.error
+    async def echo_error(self, ctx, error):
+        raise error
+
+    @Cog.listener()
+    async def on_message(self, message):
+        pass
+
+    @commands.Cog.listener("on_member_join")
+    async def greet(self, member):
+        pass
+
+
+class LoudEcho(Echo):
+    @commands.command()
+    async def shout(self, ctx):
+        pass
+
+
+class Helper:
+    pass
+"""
+
+
+def write_tool(root: Path, name: str, source: str = TOOL_SOURCE) -> Path:
+    """Write a __tool__.py file under root/name."""
+    tool_path = root / name / "__tool__.py"
+    tool_path.parent.mkdir(parents=True)
+    tool_path.write_text(source, encoding="utf-8")
+    return tool_path
+
+
+class TestDiscoverCogs:
+    """Test the discover_cogs function."""
+
+    def test_discover_cogs_without_importing(self, tmp_path: Path) -> None:
+        """Test that cogs, commands and listeners are found without executing the module."""
+        tool_path = write_tool(tmp_path, "echo")
+
+        cogs = discover_cogs([tool_path])
+
+        assert [cog.name for cog in cogs] == ["Echo", "LoudEcho"]
+        echo = cogs[0]
+        assert echo.module_path == tool_path
+        assert echo.commands == (DiscoveredCommand("echo", "echo_command", "hybrid_command"),)
+        assert echo.listeners == (
+            DiscoveredListener("on_message", "on_message"),
+            DiscoveredListener("on_member_join", "greet"),
+        )
+        assert echo.tasks == ("heartbeat",)
+        assert cogs[1].commands == (DiscoveredCommand("shout", "shout", "commands.command"),)
+
+    def test_discover_subcommands_and_aliases(self, tmp_path: Path) -> None:
+        """Test that group subcommands are marked with their parent and aliases are kept through the cache."""
+        tool_path = write_tool(
+            tmp_path,
+            "group",
+            """
+from discord.ext import commands
+
+
+class Admin(commands.Cog):
+    @commands.hybrid_group(name="admin", aliases=["a"])
+    async def admin(self, ctx):
+        pass
+
+    @admin.command(name="kick", aliases=("k", "boot"))
+    async def kick(self, ctx):
+        pass
+""",
+        )
+        cache_path = tmp_path / "cache.json"
+        cache = StaticDiscoveryCache(cache_path)
+
+        (cog,) = discover_cogs([tool_path], cache=cache)
+        cache.save()
+        (cached,) = discover_cogs([tool_path], cache=StaticDiscoveryCache(cache_path))
+
+        assert cog.commands == (
+            DiscoveredCommand("admin", "admin", "commands.hybrid_group", aliases=("a",)),
+            DiscoveredCommand("kick", "kick", "admin.command", aliases=("k", "boot"), parent="admin"),
+        )
+        assert cached == cog
+
+    def test_discover_cogs_reports_syntax_errors(self, tmp_path: Path) -> None:
+        """Test that files which cannot be parsed are reported."""
+        broken = write_tool(tmp_path, "broken", "class Broken(Cog:\n")
+        valid = write_tool(tmp_path, "echo")
+
+        with pytest.raises(ImportModuleError) as exc_info:
+            discover_cogs([broken, valid])
+
+        assert str(broken) in str(exc_info.value)
+
+    def test_cache_is_keyed_by_content_hash(self, tmp_path: Path) -> None:
+        """Test that unchanged files are served from the cache file on the next run."""
+        tool_path = write_tool(tmp_path, "echo")
+        cache_path = tmp_path / "cache.json"
+        first_cache = StaticDiscoveryCache(cache_path)
+        first = discover_cogs([tool_path], cache=first_cache)
+        first_cache.save()
+
+        second_cache = StaticDiscoveryCache(cache_path)
+        with mock.patch("concord.infrastructure.discord.static_discovery._parse_cogs") as mock_parse:
+            second = discover_cogs([tool_path], cache=second_cache)
+
+        mock_parse.assert_not_called()
+        assert second == first
+        assert second_cache.hits == 1
+
+    def test_changed_file_is_parsed_again(self, tmp_path: Path) -> None:
+        """Test that a change of content misses the cache."""
+        tool_path = write_tool(tmp_path, "echo")
+        cache = StaticDiscoveryCache()
+        discover_cogs([tool_path], cache=cache)
+
+        tool_path.write_text("from discord.ext.commands import Cog\n\nclass Other(Cog):\n    pass\n", encoding="utf-8")
+        cogs = discover_cogs([tool_path], cache=cache)
+
+        assert [cog.name for cog in cogs] == ["Other"]
+        assert cache.misses == 2
+
+
+class TestDiscoverCogsFromDirectory:
+    """Test the discover_cogs_from_directory function."""
+
+    def test_discover_from_directory(self, tmp_path: Path) -> None:
+        """Test that only the included files are analysed."""
+        write_tool(tmp_path, "echo")
+        (tmp_path / "echo" / "helper.py").write_text("class Hidden(Cog):\n    pass\n", encoding="utf-8")
+
+        cogs = discover_cogs_from_directory(tmp_path.as_posix(), include_name=["__tool__.py"])
+
+        assert [cog.name for cog in cogs] == ["Echo", "LoudEcho"]
+
+    def test_discover_from_missing_directory(self, tmp_path: Path) -> None:
+        """Test that a missing directory raises FileNotFoundError."""
+        with pytest.raises(FileNotFoundError):
+            discover_cogs_from_directory((tmp_path / "missing").as_posix())
@@ -0,0 +1,74 @@
+"""Tests for tool bundles."""
+
+import importlib.util
+import json
+import zipfile
+import zipimport
+from pathlib import Path
+
+import pytest
+
+from concord.exception.import_module import ImportModuleError
+from concord.infrastructure.discord.tool_bundle import (
+    BUNDLE_MANIFEST_NAME,
+    build_tool_bundle,
+    is_tool_bundle,
+    read_tool_bundle_manifest,
+)
+
+
+def write_tools(root: Path) -> None:
+    """Write two tools and a helper module under root."""
+    for name in ("echo", "ping"):
+        tool_dir = root / name
+        tool_dir.mkdir(parents=True)
+        (tool_dir / "__tool__.py").write_text(f"class {name.title()}:\n    pass\n", encoding="utf-8")
+        (tool_dir / "helper.py").write_text("VALUE = 1\n", encoding="utf-8")
+
+
+class TestBuildToolBundle:
+    """Test the build_tool_bundle function."""
+
+    def test_bundle_contains_tools_and_manifest(self, tmp_path: Path) -> None:
+        """Test that only the tool files and the manifest are archived."""
+        write_tools(tmp_path / "tools")
+        bundle_path = tmp_path / "tools.zip"
+
+        manifest = build_tool_bundle(tmp_path / "tools", bundle_path, ["__tool__.py"])
+
+        assert is_tool_bundle(bundle_path)
+        assert [tool.path for tool in manifest.tools] == ["echo/__tool__.py", "ping/__tool__.py"]
+        with zipfile.ZipFile(bundle_path) as bundle:
+            assert sorted(bundle.namelist()) == [BUNDLE_MANIFEST_NAME, "echo/__tool__.py", "ping/__tool__.py"]
+        assert read_tool_bundle_manifest(bundle_path) == manifest
+
+    def test_bytecode_is_loaded_by_zipimport(self, tmp_path: Path) -> None:
+        """Test that precompiled bytecode is used by zipimport instead of the source."""
+        write_tools(tmp_path / "tools")
+        bundle_path = tmp_path / "tools.zip"
+        build_tool_bundle(tmp_path / "tools", bundle_path, ["__tool__.py"], compile_bytecode=True)
+
+        importer = zipimport.zipimporter(str(bundle_path / "echo"))
+        spec = importer.find_spec("_dyn_mod_echo.__tool__")
+        assert spec is not None
+        assert spec.loader is not None
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+
+        assert module.Echo.__name__ == "Echo"
+        assert module.Echo.__module__ == "_dyn_mod_echo.__tool__"
+        assert importer.get_filename("_dyn_mod_echo.__tool__").endswith("__tool__.pyc")
+
+    def test_invalid_bundles_are_rejected(self, tmp_path: Path) -> None:
+        """Test that archives without a supported manifest raise ImportModuleError."""
+        not_a_bundle = tmp_path / "plain.zip"
+        with zipfile.ZipFile(not_a_bundle, "w") as bundle:
+            bundle.writestr("echo/__tool__.py", "")
+        old_bundle = tmp_path / "old.zip"
+        with zipfile.ZipFile(old_bundle, "w") as bundle:
+            bundle.writestr(BUNDLE_MANIFEST_NAME, json.dumps({"version": 0}))
+
+        with pytest.raises(ImportModuleError):
+            read_tool_bundle_manifest(not_a_bundle)
+        with pytest.raises(ImportModuleError, match="version"):
+            read_tool_bundle_manifest(old_bundle)
@@ -0,0 +1,93 @@
+"""Tests for tool inclusion and exclusion rules."""
+
+from pathlib import Path
+from unittest import mock
+
+from discord.ext.commands import Cog
+
+from concord.infrastructure.discord.dynamic_import import import_classes_from_directory
+from concord.infrastructure.discord.tool_filter import ToolFilter
+
+TOOL_SOURCE = """
+from discord.ext.commands import Cog
+
+EXECUTED.append({name!r})
+
+
+class {name}(Cog):
+    pass
+"""
+
+
+def write_tool(root: Path, directory: str, name: str) -> Path:
+    """Write a __tool__.py defining a single Cog that records its execution."""
+    tool_path = root / directory / "__tool__.py"
+    tool_path.parent.mkdir(parents=True)
+    tool_path.write_text(TOOL_SOURCE.format(name=name), encoding="utf-8")
+    return tool_path
+
+
+class TestToolFilter:
+    """Test the ToolFilter class."""
+
+    def test_empty_filter_selects_everything(self, tmp_path: Path) -> None:
+        """Test that a filter without rules keeps every file without parsing it."""
+        tool_path = write_tool(tmp_path, "echo", "Echo")
+        tool_filter = ToolFilter()
+
+        with mock.patch("concord.infrastructure.discord.tool_filter.discover_cogs") as mock_discover:
+            selected = tool_filter.select_files(tmp_path, [tool_path])
+
+        assert selected == [tool_path]
+        mock_discover.assert_not_called()
+
+    def test_class_and_path_exclusions(self, tmp_path: Path) -> None:
+        """Test that class name globs and path globs both exclude files before import."""
+        echo = write_tool(tmp_path, "echo", "Echo")
+        debug = write_tool(tmp_path, "debug", "DebugTool")
+        legacy = write_tool(tmp_path, "legacy/old", "Old")
+        tool_filter = ToolFilter(exclusions=["Debug*", "legacy/"])
+
+        selected = tool_filter.select_files(tmp_path, [echo, debug, legacy])
+
+        assert selected == [echo]
+        assert [(skipped.name, skipped.reason) for skipped in tool_filter.skipped] == [
+            ("DebugTool", "excluded by 'Debug*'"),
+            ("Old", "excluded by 'legacy/*'"),
+        ]
+
+    def test_inclusions_keep_only_matching_tools(self, tmp_path: Path) -> None:
+        """Test that only tools matching an inclusion are selected, and exclusions still win."""
+        echo = write_tool(tmp_path, "echo", "Echo")
+        ping = write_tool(tmp_path, "ping", "Ping")
+        shout = write_tool(tmp_path, "shout", "Shout")
+        tool_filter = ToolFilter(inclusions=["Echo", "shout/*.py"], exclusions=["Shout"])
+
+        selected = tool_filter.select_files(tmp_path, [echo, ping, shout])
+
+        assert selected == [echo]
+        assert {skipped.name: skipped.reason for skipped in tool_filter.skipped} == {
+            "Ping": "not matched by inclusions",
+            "Shout": "excluded by 'Shout'",
+        }
+
+
+class TestImportWithToolFilter:
+    """Test import_classes_from_directory with a ToolFilter."""
+
+    def test_excluded_modules_are_never_executed(self, tmp_path: Path) -> None:
+        """Test that excluded tools are not executed and kept tools are imported."""
+        write_tool(tmp_path, "echo", "Echo")
+        write_tool(tmp_path, "debug", "DebugTool")
+        executed: list[str] = []
+
+        with mock.patch("builtins.EXECUTED", executed, create=True):
+            tools = import_classes_from_directory(
+                tmp_path.as_posix(),
+                ["__tool__.py"],
+                Cog,
+                tool_filter=ToolFilter(exclusions=["DebugTool"]),
+            )
+
+        assert [tool.class_type.__name__ for tool in tools] == ["Echo"]
+        assert executed == ["Echo"]
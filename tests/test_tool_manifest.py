@@ -0,0 +1,156 @@
+"""Tests for the pruned tool walker and its manifest."""
+
+import json
+import os
+from pathlib import Path
+from unittest import mock
+
+from concord.infrastructure.discord.tool_manifest import (
+    DEFAULT_PRUNE_PATTERNS,
+    ToolManifest,
+    find_tool_files,
+    manifest_path_for,
+)
+
+
+def make_tree(root: Path) -> None:
+    """Create a tool tree with directories that should be pruned."""
+    for relative in [
+        "tool1/__tool__.py",
+        "tool1/helper.py",
+        "group/tool2/__tool__.py",
+        ".venv/lib/__tool__.py",
+        "tool1/__pycache__/__tool__.py",
+        "vendor/site-packages/pkg/__tool__.py",
+    ]:
+        path = root / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("", encoding="utf-8")
+
+
+class TestFindToolFiles:
+    """Test the find_tool_files function."""
+
+    def test_find_with_include_name_and_default_prune(self, tmp_path: Path) -> None:
+        """Test that only included files outside pruned directories are found."""
+        make_tree(tmp_path)
+
+        result = find_tool_files(tmp_path, include_name=["__tool__.py"])
+
+        assert result == [tmp_path / "group/tool2/__tool__.py", tmp_path / "tool1/__tool__.py"]
+
+    def test_find_all_python_files(self, tmp_path: Path) -> None:
+        """Test that every .py file is found when include_name is None."""
+        make_tree(tmp_path)
+
+        result = find_tool_files(tmp_path)
+
+        assert tmp_path / "tool1/helper.py" in result
+        assert len(result) == 3
+
+    def test_custom_prune_patterns(self, tmp_path: Path) -> None:
+        """Test that custom prune patterns replace the defaults."""
+        make_tree(tmp_path)
+
+        result = find_tool_files(tmp_path, include_name=["__tool__.py"], prune_patterns=["group"])
+
+        assert tmp_path / "group/tool2/__tool__.py" not in result
+        assert tmp_path / ".venv/lib/__tool__.py" in result
+
+    def test_manifest_is_written(self, tmp_path: Path) -> None:
+        """Test that the manifest records directories and files with stat information."""
+        root = tmp_path / "tools"
+        make_tree(root)
+        manifest_path = tmp_path / "cache" / "tools.json"
+
+        find_tool_files(root, include_name=["__tool__.py"], manifest_path=manifest_path)
+
+        data = json.loads(manifest_path.read_text(encoding="utf-8"))
+        tool_file = (root / "tool1/__tool__.py").as_posix()
+        stat = Path(tool_file).stat()
+        assert data["files"][tool_file] == [stat.st_mtime_ns, stat.st_size, stat.st_ino]
+        assert (root / ".venv").as_posix() not in data["directories"]
+
+    def test_unchanged_directories_are_not_rescanned(self, tmp_path: Path) -> None:
+        """Test that a restart re-uses the entries of unchanged directories."""
+        root = tmp_path / "tools"
+        make_tree(root)
+        manifest_path = tmp_path / "tools.json"
+        first = find_tool_files(root, include_name=["__tool__.py"], manifest_path=manifest_path)
+
+        with mock.patch(
+            "concord.infrastructure.discord.tool_manifest.os.scandir",
+            side_effect=os.scandir,
+        ) as mock_scandir:
+            second = find_tool_files(root, include_name=["__tool__.py"], manifest_path=manifest_path)
+
+        assert second == first
+        mock_scandir.assert_not_called()
+
+    def test_changed_directory_is_rescanned(self, tmp_path: Path) -> None:
+        """Test that a new tool is found once its directory mtime changes."""
+        root = tmp_path / "tools"
+        make_tree(root)
+        manifest_path = tmp_path / "tools.json"
+        find_tool_files(root, include_name=["__tool__.py"], manifest_path=manifest_path)
+
+        new_tool = root / "tool3" / "__tool__.py"
+        new_tool.parent.mkdir()
+        new_tool.write_text("", encoding="utf-8")
+        stat = root.stat()
+        os.utime(root, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        result = find_tool_files(root, include_name=["__tool__.py"], manifest_path=manifest_path)
+
+        assert new_tool in result
+
+    def test_manifest_with_other_conditions_is_ignored(self, tmp_path: Path) -> None:
+        """Test that a manifest written with other prune patterns is not re-used."""
+        root = tmp_path / "tools"
+        make_tree(root)
+        manifest_path = tmp_path / "tools.json"
+        find_tool_files(root, include_name=["__tool__.py"], manifest_path=manifest_path)
+
+        manifest = ToolManifest.load(
+            manifest_path,
+            root=root,
+            include_name=["__tool__.py"],
+            prune_patterns=["other"],
+        )
+
+        assert manifest.directories == {}
+        assert manifest.files == {}
+
+    def test_broken_manifest_is_ignored(self, tmp_path: Path) -> None:
+        """Test that a broken manifest falls back to a full walk."""
+        make_tree(tmp_path / "tools")
+        manifest_path = tmp_path / "tools.json"
+        manifest_path.write_text("{broken", encoding="utf-8")
+        mock_logger = mock.Mock()
+
+        result = find_tool_files(
+            tmp_path / "tools",
+            include_name=["__tool__.py"],
+            manifest_path=manifest_path,
+            logger=mock_logger,
+        )
+
+        assert len(result) == 2
+        mock_logger.warning.assert_called_once()
+
+
+class TestManifestPathFor:
+    """Test the manifest_path_for function."""
+
+    def test_manifest_path_is_stable_per_root(self, tmp_path: Path) -> None:
+        """Test that each root gets its own stable manifest path."""
+        first = manifest_path_for(tmp_path, Path("/tools/a"))
+
+        assert first == manifest_path_for(tmp_path, Path("/tools/a"))
+        assert first != manifest_path_for(tmp_path, Path("/tools/b"))
+        assert first.parent == tmp_path
+
+    def test_default_prune_patterns(self) -> None:
+        """Test that virtualenvs and caches are pruned by default."""
+        assert ".*" in DEFAULT_PRUNE_PATTERNS
+        assert "__pycache__" in DEFAULT_PRUNE_PATTERNS